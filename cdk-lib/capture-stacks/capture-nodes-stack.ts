@@ -332,17 +332,6 @@ export class CaptureNodesStack extends cdk.Stack {
                 ]
             })
         );
-        configureIsmLambda.addToRolePolicy(
-            new iam.PolicyStatement({
-                effect: iam.Effect.ALLOW,
-                actions: [
-                    'cloudwatch:PutMetricData',
-                ],
-                resources: [
-                    '*'
-                ]
-            })
-        );
 
         // Create a rule to funnel appropriate events to our configure Lambda
         const configureRule = new events.Rule(this, 'RuleConfigureIsm', {
@@ -71,7 +71,11 @@ export class OpenSearchDomainStack extends Stack {
                 masterNodes: props.planCluster.osDomain.masterNodes.count,
                 masterNodeInstanceType: props.planCluster.osDomain.masterNodes.instanceType,
                 dataNodes: props.planCluster.osDomain.dataNodes.count,
-                dataNodeInstanceType: props.planCluster.osDomain.dataNodes.instanceType
+                dataNodeInstanceType: props.planCluster.osDomain.dataNodes.instanceType,
+                ...(props.planCluster.osDomain.warmNodes ? {
+                    warmNodes: props.planCluster.osDomain.warmNodes.count,
+                    warmInstanceType: props.planCluster.osDomain.warmNodes.instanceType,
+                } : {})
             },
             ebs: {
                 volumeSize: props.planCluster.osDomain.dataNodes.volumeSize,
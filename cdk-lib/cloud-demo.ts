@@ -137,6 +137,7 @@ case 'MirrorMgmtParams':
         subnetSsmParamNames: params.listSubnetSsmParams,
         vpcId: params.idVpc,
         vpcCidrs: params.vpcCidrs,
+        mirrorProfile: params.mirrorProfile,
         vpcSsmParamName: params.nameVpcSsmParam,
         vpceServiceId: params.idVpceService,
         mirrorVni: params.idVni,
@@ -41,6 +41,7 @@ export interface MirrorMgmtParamsRaw extends CommandParamsRaw {
     listSubnetIds: string[];
     listSubnetSsmParams: string[];
     vpcCidrs: string[];
+    mirrorProfile: types.MirrorProfile;
 }
 
 /**
@@ -103,4 +104,5 @@ export interface MirrorMgmtParams extends CommandParams {
     listSubnetIds: string[];
     listSubnetSsmParams: string[];
     vpcCidrs: string[];
+    mirrorProfile: types.MirrorProfile;
 }
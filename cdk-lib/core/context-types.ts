@@ -33,12 +33,25 @@ export interface MasterNodesPlan {
     instanceType: string;
 }
 
+/**
+ * Structure to hold the capacity plan for an OS Domain's UltraWarm nodes
+ */
+export interface WarmNodesPlan {
+    count: number;
+    instanceType: string;
+    storage: number;
+}
+
 /**
  * Structure to hold the overall capacity plan for an OS Domain
  */
 export interface OSDomainPlan {
     dataNodes: DataNodesPlan;
     masterNodes: MasterNodesPlan;
+    sessionsShards?: number; // Applied by the ConfigureIsm Lambda as an index template, not by CloudFormation
+    warmNodes?: WarmNodesPlan | null;
+    sessionsRotation?: string | null; // Applied through the Arkime config and the ConfigureIsm Lambda, not by CloudFormation
+    sessionsRotationChangedAt?: string | null; // Only used for the Viewers' config, not by CloudFormation
 }
 
 /**
@@ -121,3 +134,23 @@ export interface ExtraTag {
     key: string;
     value: string
 }
+
+/**
+ * Structure to hold a protocol/port match in a VPC's Mirroring Profile
+ */
+export interface PortRule {
+    protocol: number;
+    fromPort: number | null;
+    toPort: number | null;
+}
+
+/**
+ * Structure to hold the Mirroring Profile that narrows what is mirrored from a User VPC
+ */
+export interface MirrorProfile {
+    packetLength: number | null;
+    includeRules: PortRule[];
+    excludeRules: PortRule[];
+    subnetOverrides: Record<string, {packetLength?: number | null}>;
+    maxSessionsPerTarget?: number | null;
+}
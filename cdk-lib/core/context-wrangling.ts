@@ -125,6 +125,7 @@ function validateArgs(args: ValidateArgs) : (prms.ClusterMgmtParams | prms.Deplo
             listSubnetIds: rawMirrorMgmtParamsObj.listSubnetIds,
             listSubnetSsmParams: rawMirrorMgmtParamsObj.listSubnetSsmParams,
             vpcCidrs: rawMirrorMgmtParamsObj.vpcCidrs,
+            mirrorProfile: rawMirrorMgmtParamsObj.mirrorProfile,
         };
         return mirrorMgmtParams;
     }
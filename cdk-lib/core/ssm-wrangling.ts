@@ -44,6 +44,7 @@ export interface ViewerSsmValue {
 export interface VpcSsmValue {
     readonly busArn: string;
     readonly mirrorFilterId: string;
+    readonly mirrorProfile: context.MirrorProfile;
     readonly mirrorVni: string;
     readonly vpcId: string;
 }
\ No newline at end of file
@@ -7,10 +7,13 @@ import * as events from 'aws-cdk-lib/aws-events';
 import * as targets from 'aws-cdk-lib/aws-events-targets';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
 import * as logs from 'aws-cdk-lib/aws-logs';
+import * as sqs from 'aws-cdk-lib/aws-sqs';
 import * as ssm from 'aws-cdk-lib/aws-ssm';
 import * as path from 'path';
 
+import {MirrorProfile, PortRule} from '../core/context-types';
 import {SubnetSsmValue, VpcSsmValue} from '../core/ssm-wrangling';
 import * as constants from '../core/constants';
 
@@ -21,6 +24,7 @@ export interface VpcMirrorStackProps extends StackProps {
     readonly vpcId: string;
     readonly vpcCidrs: string[];
     readonly vpcSsmParamName: string;
+    readonly mirrorProfile: MirrorProfile;
     readonly vpceServiceId: string;
     readonly mirrorVni: string;
 }
@@ -91,15 +95,6 @@ export class VpcMirrorStack extends Stack {
                 description: 'Reject all intra-VPC traffic'
             });
         }
-        new ec2.CfnTrafficMirrorFilterRule(this, 'FRule-AllowOtherOutbound', {
-            destinationCidrBlock: '0.0.0.0/0',
-            ruleAction: 'ACCEPT',
-            ruleNumber: 20,
-            sourceCidrBlock: '0.0.0.0/0',
-            trafficDirection: 'EGRESS',
-            trafficMirrorFilterId: filter.ref,
-            description: 'Accept all outbound traffic'
-        });
         for (let block_num = 0; block_num < props.vpcCidrs.length; block_num++) {
             new ec2.CfnTrafficMirrorFilterRule(this, `FRule-RejectLocalInbound-${block_num + 1}`, {
                 destinationCidrBlock: '0.0.0.0/0',
@@ -111,15 +106,40 @@ export class VpcMirrorStack extends Stack {
                 description: 'Reject all intra-VPC traffic'
             });
         }
-        new ec2.CfnTrafficMirrorFilterRule(this, 'FRule-AllowOtherInbound', {
-            destinationCidrBlock: '0.0.0.0/0',
-            ruleAction: 'ACCEPT',
-            ruleNumber: 20,
-            sourceCidrBlock: '0.0.0.0/0',
-            trafficDirection: 'INGRESS',
-            trafficMirrorFilterId: filter.ref,
-            description: 'Accept all inbound traffic'
-        });
+
+        // Apply the Mirroring Profile's protocol/port rules.  Exclusions are evaluated after the intra-VPC rejections.
+        // If there are inclusions, they replace the catch-all ACCEPT rules so only matching traffic is mirrored;
+        // otherwise, the catch-all must come after any exclusions.
+        const profile = props.mirrorProfile;
+        for (const direction of ['EGRESS', 'INGRESS']) {
+            profile.excludeRules.forEach((rule, index) => {
+                this.addPortRules(filter, direction, 'REJECT', 100 + (2 * index), rule, `FRule-Exclude-${direction}-${index + 1}`);
+            });
+            profile.includeRules.forEach((rule, index) => {
+                this.addPortRules(filter, direction, 'ACCEPT', 200 + (2 * index), rule, `FRule-Include-${direction}-${index + 1}`);
+            });
+        }
+        const acceptRuleNumber = profile.excludeRules.length > 0 ? 300 : 20;
+        if (profile.includeRules.length === 0) {
+            new ec2.CfnTrafficMirrorFilterRule(this, 'FRule-AllowOtherOutbound', {
+                destinationCidrBlock: '0.0.0.0/0',
+                ruleAction: 'ACCEPT',
+                ruleNumber: acceptRuleNumber,
+                sourceCidrBlock: '0.0.0.0/0',
+                trafficDirection: 'EGRESS',
+                trafficMirrorFilterId: filter.ref,
+                description: 'Accept all outbound traffic'
+            });
+            new ec2.CfnTrafficMirrorFilterRule(this, 'FRule-AllowOtherInbound', {
+                destinationCidrBlock: '0.0.0.0/0',
+                ruleAction: 'ACCEPT',
+                ruleNumber: acceptRuleNumber,
+                sourceCidrBlock: '0.0.0.0/0',
+                trafficDirection: 'INGRESS',
+                trafficMirrorFilterId: filter.ref,
+                description: 'Accept all inbound traffic'
+            });
+        }
 
         /**
          * Configure the resources to listen for raw AWS Service events in the User VPC Account/Region and convert
@@ -239,6 +259,9 @@ export class VpcMirrorStack extends Stack {
             retention: Duration.days(30),
         });
 
+        // Something has gone very wrong if this is exceeded; the coalescing Lambda's timeout is sized from it
+        const eniMirrorLambdaTimeout = Duration.seconds(30);
+
         // Create the Lambda that will set up the traffic mirroring for ENIs in our VPC
         const createLambda = new lambda.Function(this, 'CreateEniMirrorLambda', {
             functionName: `${props.clusterName}-CreateEniMirror-${props.vpcId}`,
@@ -253,7 +276,7 @@ export class VpcMirrorStack extends Stack {
                 },
             }),
             handler: 'lambda_handlers.create_eni_mirror_handler',
-            timeout:  Duration.seconds(30), // Something has gone very wrong if this is exceeded
+            timeout:  eniMirrorLambdaTimeout,
         });
         createLambda.addToRolePolicy(
             new iam.PolicyStatement({
@@ -277,40 +300,27 @@ export class VpcMirrorStack extends Stack {
             new iam.PolicyStatement({
                 effect: iam.Effect.ALLOW,
                 actions: [
-                    'ssm:GetParameter',
-                    'ssm:PutParameter',
+                    // Describe calls don't support resource-level permissions, so the scoped ec2:* above misses them
+                    'ec2:DescribeSubnets',
+                    'ec2:DescribeTrafficMirrorSessions',
                 ],
-                resources: [
-                    `arn:aws:ssm:${this.region}:${this.account}:*`
-                ]
+                resources: ['*']
             })
         );
         createLambda.addToRolePolicy(
             new iam.PolicyStatement({
                 effect: iam.Effect.ALLOW,
                 actions: [
-                    'cloudwatch:PutMetricData',
+                    'ssm:GetParameter',
+                    'ssm:GetParametersByPath', // To find the Targets of the VPC's subnets
+                    'ssm:PutParameter',
                 ],
                 resources: [
-                    '*'
+                    `arn:aws:ssm:${this.region}:${this.account}:*`
                 ]
             })
         );
 
-        // Create a rule to funnel appropriate events to our setup lambda
-        const createRule = new events.Rule(this, 'RuleCreateEniMirror', {
-            eventBus: vpcBus,
-            eventPattern: {
-                source: [constants.EVENT_SOURCE],
-                detailType: [constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR],
-                detail: {
-                    'vpc_id': events.Match.exactString(props.vpcId)
-                }
-            },
-            targets: [new targets.LambdaFunction(createLambda)]
-        });
-        createRule.node.addDependency(vpcBus);
-
         // Create the Lambda that will tear down the traffic mirroring for ENIs in our VPC
         const destroyLambda = new lambda.Function(this, 'DestroyEniMirrorLambda', {
             functionName: `${props.clusterName}-DestroyEniMirror-${props.vpcId}`,
@@ -325,7 +335,7 @@ export class VpcMirrorStack extends Stack {
                 },
             }),
             handler: 'lambda_handlers.destroy_eni_mirror_handler',
-            timeout:  Duration.seconds(30), // Something has gone very wrong if this is exceeded
+            timeout:  eniMirrorLambdaTimeout,
         });
         destroyLambda.addToRolePolicy(
             new iam.PolicyStatement({
@@ -352,36 +362,94 @@ export class VpcMirrorStack extends Stack {
                 ]
             })
         );
-        destroyLambda.addToRolePolicy(
-            new iam.PolicyStatement({
-                effect: iam.Effect.ALLOW,
-                actions: [
-                    'cloudwatch:PutMetricData',
-                ],
-                resources: [
-                    '*'
-                ]
-            })
+
+        /**
+         * Scaling activity in the User VPC can produce hundreds of ENI events at once.  Rather than invoke the
+         * Create/Destroy Lambdas once per event, we queue the events up and have a coalescing Lambda work through them
+         * in batches.  It collapses the events for each ENI down to a single action (skipping ENIs that came and went
+         * within the batch) and invokes the Create/Destroy Lambdas with bounded concurrency.
+         */
+        // In the worst case every dispatch in a batch runs to the Create/Destroy Lambda's timeout, DISPATCH_CONCURRENCY at
+        // a time, and the whole batch has to fit within the coalescing Lambda's timeout or it will be redelivered.
+        const dispatchConcurrency = 5;
+        const coalesceBatchSize = 40;
+        const coalesceLambdaTimeout = Duration.seconds(
+            Math.ceil(coalesceBatchSize / dispatchConcurrency) * eniMirrorLambdaTimeout.toSeconds() + 60
         );
 
-        // Create a rule to funnel appropriate events to our teardwon lambda
-        const destroyRule = new events.Rule(this, 'RuleDestroyEniMirror', {
+        const eniEventDlq = new sqs.Queue(this, 'EniEventDlq', {
+            retentionPeriod: Duration.days(14),
+        });
+        const eniEventQueue = new sqs.Queue(this, 'EniEventQueue', {
+            visibilityTimeout: Duration.seconds(6 * coalesceLambdaTimeout.toSeconds()), // AWS recommends 6x the consuming Lambda's timeout
+            deadLetterQueue: {
+                queue: eniEventDlq,
+                maxReceiveCount: 5,
+            },
+        });
+
+        // Create a rule to funnel appropriate events to our queue
+        const eniEventRule = new events.Rule(this, 'RuleEniMirrorEvents', {
             eventBus: vpcBus,
             eventPattern: {
                 source: [constants.EVENT_SOURCE],
-                detailType: [constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR],
+                detailType: [constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR],
                 detail: {
                     'vpc_id': events.Match.exactString(props.vpcId)
                 }
             },
-            targets: [new targets.LambdaFunction(destroyLambda)]
+            targets: [new targets.SqsQueue(eniEventQueue)]
+        });
+        eniEventRule.node.addDependency(vpcBus);
+
+        // Create the Lambda that batches up the queued events and dispatches them to the Create/Destroy Lambdas
+        const coalesceLambda = new lambda.Function(this, 'CoalesceEniEventsLambda', {
+            functionName: `${props.clusterName}-CoalesceEniEvents-${props.vpcId}`,
+            runtime: lambda.Runtime.PYTHON_3_9,
+            code: lambda.Code.fromAsset(path.resolve(__dirname, '..', '..', 'manage_arkime'), {
+                bundling: {
+                    image: lambda.Runtime.PYTHON_3_9.bundlingImage,
+                    command: [
+                        'bash', '-c',
+                        'pip install -r requirements.txt -t /asset-output && cp -au . /asset-output'
+                    ],
+                },
+            }),
+            handler: 'lambda_handlers.coalesce_eni_events_handler',
+            timeout:  coalesceLambdaTimeout,
+            environment: {
+                CLUSTER_NAME: props.clusterName,
+                VPC_ID: props.vpcId,
+                CREATE_LAMBDA_NAME: createLambda.functionName,
+                DESTROY_LAMBDA_NAME: destroyLambda.functionName,
+                DISPATCH_CONCURRENCY: dispatchConcurrency.toString(),
+            }
         });
-        destroyRule.node.addDependency(vpcBus);
+        coalesceLambda.addEventSource(new lambdaEventSources.SqsEventSource(eniEventQueue, {
+            batchSize: coalesceBatchSize,
+            maxBatchingWindow: Duration.seconds(20),
+            maxConcurrency: 2, // With DISPATCH_CONCURRENCY, caps the concurrent Create/Destroy invocations at 10
+            reportBatchItemFailures: true,
+        }));
+        createLambda.grantInvoke(coalesceLambda);
+        destroyLambda.grantInvoke(coalesceLambda);
+        coalesceLambda.addToRolePolicy(
+            new iam.PolicyStatement({
+                effect: iam.Effect.ALLOW,
+                actions: [
+                    'ssm:GetParameter',
+                ],
+                resources: [
+                    `arn:aws:ssm:${this.region}:${this.account}:*`
+                ]
+            })
+        );
 
         // This SSM parameter will enable us share the details of our VPC-specific Capture setup
         const vpcParamValue: VpcSsmValue = {
             busArn: vpcBus.eventBusArn,
             mirrorFilterId: filter.ref,
+            mirrorProfile: props.mirrorProfile,
             mirrorVni: props.mirrorVni,
             vpcId: props.vpcId,
         };
@@ -394,4 +462,34 @@ export class VpcMirrorStack extends Stack {
         });
         vpcParam.node.addDependency(filter);
     }
+
+    /**
+     * Adds a pair of Traffic Mirror Filter rules matching the protocol/port rule at either end of the connection
+     */
+    private addPortRules(filter: ec2.CfnTrafficMirrorFilter, direction: string, action: string, ruleNumber: number,
+                         rule: PortRule, idPrefix: string) {
+        const portRange = rule.fromPort === null ? undefined : {fromPort: rule.fromPort, toPort: rule.toPort ?? rule.fromPort};
+        new ec2.CfnTrafficMirrorFilterRule(this, `${idPrefix}-Dst`, {
+            destinationCidrBlock: '0.0.0.0/0',
+            destinationPortRange: portRange,
+            protocol: rule.protocol,
+            ruleAction: action,
+            ruleNumber: ruleNumber,
+            sourceCidrBlock: '0.0.0.0/0',
+            trafficDirection: direction,
+            trafficMirrorFilterId: filter.ref,
+            description: `Mirroring Profile ${action.toLowerCase()} rule`
+        });
+        new ec2.CfnTrafficMirrorFilterRule(this, `${idPrefix}-Src`, {
+            destinationCidrBlock: '0.0.0.0/0',
+            protocol: rule.protocol,
+            ruleAction: action,
+            ruleNumber: ruleNumber + 1,
+            sourceCidrBlock: '0.0.0.0/0',
+            sourcePortRange: portRange,
+            trafficDirection: direction,
+            trafficMirrorFilterId: filter.ref,
+            description: `Mirroring Profile ${action.toLowerCase()} rule`
+        });
+    }
 }
@@ -4,23 +4,40 @@ import logging
 import click
 
 from commands.vpc_add import cmd_vpc_add
+from commands.vpc_dedupe_sessions import cmd_vpc_dedupe_sessions
+from commands.vpc_mirror_latency import cmd_vpc_mirror_latency, DEFAULT_LATENCY_HOURS
+from commands.vpc_mirror_placement import cmd_vpc_mirror_placement
 from commands.config_list import cmd_config_list
 from commands.config_pull import cmd_config_pull
 from commands.config_update import cmd_config_update
+from commands.cluster_calibrate_storage import cmd_cluster_calibrate_storage
 from commands.cluster_create import cmd_cluster_create
 from commands.cluster_deregister_vpc import cmd_cluster_deregister_vpc
 from commands.cluster_destroy import cmd_cluster_destroy
+from commands.cluster_domain_sizing import cmd_cluster_domain_sizing
 from commands.cluster_register_vpc import cmd_cluster_register_vpc
 from commands.demo_traffic_deploy import cmd_demo_traffic_deploy
 from commands.demo_traffic_destroy import cmd_demo_traffic_destroy
 from commands.get_login_details import cmd_get_login_details
+from commands.clusters_health import cmd_clusters_health
 from commands.clusters_list import cmd_clusters_list
+from commands.cluster_metrics import cmd_cluster_metrics, DEFAULT_METRICS_HOURS
+from commands.plan_sweep import cmd_plan_sweep, DEFAULT_SWEEP_ROWS
 from commands.vpc_deregister_cluster import cmd_vpc_deregister_cluster
 from commands.vpc_register_cluster import cmd_vpc_register_cluster
 from commands.vpc_remove import cmd_vpc_remove
+from commands.vpc_status import cmd_vpc_status
 import core.constants as constants
-from core.capacity_planning import MAX_TRAFFIC, DEFAULT_SPI_DAYS, DEFAULT_REPLICAS, DEFAULT_S3_STORAGE_DAYS, DEFAULT_HISTORY_DAYS
+from core.capacity_planning import (MAX_TRAFFIC, DEFAULT_SPI_DAYS, DEFAULT_REPLICAS, DEFAULT_S3_STORAGE_DAYS, DEFAULT_HISTORY_DAYS,
+                                    DEFAULT_NUM_AZS)
 from core.logging_wrangler import LoggingWrangler, set_boto_log_level
+from core.mirror_inventory import DEFAULT_MAX_AGE_SECONDS
+from core.mirror_placement import DEFAULT_MAX_SESSIONS_PER_TARGET
+from core.capacity_sweep import SWEEP_AXES
+from core.storage_calibration import DEFAULT_CALIBRATION_DAYS
+from core.traffic_profile import DEFAULT_TRAFFIC_PERCENTILE, TRAFFIC_PERCENTILES
+from opensearch_interactions.fleet_runner import DEFAULT_FLEET_CONCURRENCY
+from opensearch_interactions.index_templates import INDEX_PROFILES
 
 logger = logging.getLogger(__name__)
 
@@ -138,9 +155,40 @@ cli.add_command(demo_traffic_destroy)
     type=(click.STRING, click.STRING),
     multiple=True,
     required=False)
+@click.option(
+    "--right-size-days",
+    help=("Instead of specifying --expected-traffic, size the existing Cluster for the mirrored traffic it has actually"
+          + " observed over this many days.  You will be shown the resulting changes before they are applied."),
+    default=None,
+    type=click.INT,
+    required=False)
+@click.option(
+    "--right-size-percentile",
+    help=("Which percentile of the observed traffic to size the Cluster for when using --right-size-days"),
+    default=DEFAULT_TRAFFIC_PERCENTILE,
+    type=click.Choice(TRAFFIC_PERCENTILES),
+    show_default=True,
+    required=False)
+@click.option(
+    "--hot-days",
+    help=("The number of days to keep SPI metadata on the OpenSearch Domain's data nodes before moving it to cheaper"
+          + " UltraWarm nodes for the rest of --spi-days.  Set to 0 to keep all of it on the data nodes.  Default: 0"),
+    default=None,
+    type=click.IntRange(min=0),
+    required=False)
+@click.option(
+    "--index-profile",
+    help=("The indexing settings for new Arkime sessions indices.  'ingest' favors indexing throughput: sessions take up"
+          + " to a minute to become searchable, a node failure can lose the last 30 seconds of them, and (without"
+          + " --hot-days) the current day's index has no replicas until it leaves the hot state.  'default' leaves the"
+          + " settings to Arkime and OpenSearch.  Default: default"),
+    default=None,
+    type=click.Choice(INDEX_PROFILES),
+    required=False)
 @click.pass_context
 def cluster_create(ctx, name, expected_traffic, spi_days, history_days, replicas, pcap_days, preconfirm_usage,
-                   just_print_cfn, capture_cidr, viewer_cidr, viewer_prefix_list, extra_tag):
+                   just_print_cfn, capture_cidr, viewer_cidr, viewer_prefix_list, extra_tag, right_size_days,
+                   right_size_percentile, hot_days, index_profile):
     profile = ctx.obj.get("profile")
     region = ctx.obj.get("region")
     extra_tags = []
@@ -148,7 +196,8 @@ def cluster_create(ctx, name, expected_traffic, spi_days, history_days, replicas
         for key, value in extra_tag:
             extra_tags.append({"key": key, "value": value})
     cmd_cluster_create(profile, region, name, expected_traffic, spi_days, history_days, replicas, pcap_days,
-                       preconfirm_usage, just_print_cfn, capture_cidr, viewer_cidr, viewer_prefix_list, extra_tags)
+                       preconfirm_usage, just_print_cfn, capture_cidr, viewer_cidr, viewer_prefix_list, extra_tags,
+                       right_size_days, right_size_percentile, hot_days, index_profile)
 cli.add_command(cluster_create)
 
 @click.command(help="Tears down the Arkime Cluster in your account; by default, leaves your data intact")
@@ -192,6 +241,137 @@ def clusters_list(ctx):
     cmd_clusters_list(profile, region)
 cli.add_command(clusters_list)
 
+@click.command(help=("Checks the health of the OpenSearch Domains of your deployed Arkime Clusters concurrently.  The"
+                     + " Domains are only reachable from within their Clusters' VPCs."))
+@click.option(
+    "--name",
+    help="The name of an Arkime Cluster to check.  Can be repeated.  Default: every deployed Cluster",
+    multiple=True,
+    required=False)
+@click.option(
+    "--max-concurrency",
+    help="The maximum number of Domains to check at once",
+    default=DEFAULT_FLEET_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(min=1),
+    required=False)
+@click.option(
+    "--json",
+    "output_json",
+    help="Also print the results, including each Domain's per-endpoint request latency, as JSON",
+    is_flag=True,
+    show_default=True,
+    default=False)
+@click.pass_context
+def clusters_health(ctx, name, max_concurrency, output_json):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_clusters_health(profile, region, list(name), max_concurrency, output_json)
+cli.add_command(clusters_health)
+
+@click.command(help=("Summarizes a Cluster's traffic, Capture Node, OpenSearch Domain, and mirroring metrics over a time"
+                     + " window and compares them against the Cluster's capacity plan"))
+@click.option("--name", help="The name of the Arkime Cluster to get the metrics of", required=True)
+@click.option(
+    "--hours",
+    help="How many hours back to report on",
+    default=DEFAULT_METRICS_HOURS,
+    show_default=True,
+    type=click.INT
+)
+@click.option(
+    "--metrics-region",
+    help=("A Region to pull the Cluster's metrics from; can be supplied multiple times to report on a Cluster name"
+          + " deployed in several Regions at once.  Defaults to the CLI's Region."),
+    default=None,
+    type=click.STRING,
+    multiple=True,
+    required=False)
+@click.option(
+    "--json",
+    "output_json",
+    help="Also prints the summary as JSON",
+    is_flag=True,
+    show_default=True,
+    default=False
+)
+@click.pass_context
+def cluster_metrics(ctx, name, hours, metrics_region, output_json):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_cluster_metrics(profile, region, name, hours, list(metrics_region), output_json)
+cli.add_command(cluster_metrics)
+
+@click.command(help=("Compares the live OpenSearch Domain's disk usage, JVM memory pressure, and write rejections against"
+                     + " the Cluster's capacity plan and recommends a resized Domain plan"))
+@click.option("--name", help="The name of the Arkime Cluster to report on", required=True)
+@click.option(
+    "--os-endpoint",
+    help=("The host to reach the Cluster's OpenSearch Domain at, e.g. through a tunnel.  Defaults to the Domain's VPC"
+          + " endpoint, which is only reachable from within the Cluster's VPC."),
+    default=None,
+    type=click.STRING,
+    required=False)
+@click.option(
+    "--json",
+    "output_json",
+    help="Also prints the report as JSON",
+    is_flag=True,
+    show_default=True,
+    default=False
+)
+@click.pass_context
+def cluster_domain_sizing(ctx, name, os_endpoint, output_json):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_cluster_domain_sizing(profile, region, name, os_endpoint, output_json)
+cli.add_command(cluster_domain_sizing)
+
+@click.command(help=("Measures how much OpenSearch and S3 storage a Cluster's traffic actually consumes and saves the"
+                     + " observed ratios, so future capacity plans for the Cluster use them instead of the defaults"))
+@click.option("--name", help="The name of the Arkime Cluster to calibrate", required=True)
+@click.option(
+    "--days",
+    help="How many complete (UTC) days of observations to calibrate from",
+    default=DEFAULT_CALIBRATION_DAYS,
+    show_default=True,
+    type=click.IntRange(min=1)
+)
+@click.option(
+    "--os-endpoint",
+    help=("The host to reach the Cluster's OpenSearch Domain at, e.g. through a tunnel.  Defaults to the Domain's VPC"
+          + " endpoint, which is only reachable from within the Cluster's VPC."),
+    default=None,
+    type=click.STRING,
+    required=False)
+@click.pass_context
+def cluster_calibrate_storage(ctx, name, days, os_endpoint):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_cluster_calibrate_storage(profile, region, name, days, os_endpoint)
+cli.add_command(cluster_calibrate_storage)
+
+@click.command(help=("Evaluates the capacity plan and estimated monthly cost of every combination of the supplied values,"
+                     + " without touching your AWS account.  Each value accepts a comma-separated list and/or"
+                     + " start:stop:step ranges, e.g. 0.5,1:10:1"))
+@click.option("--traffic", help="The amounts of traffic to plan for, in Gbps", required=True)
+@click.option("--spi-days", help="The days of SPI metadata to retain", default=str(DEFAULT_SPI_DAYS), show_default=True)
+@click.option("--replicas", help="The replicas of the SPI metadata to keep", default=str(DEFAULT_REPLICAS), show_default=True)
+@click.option("--pcap-days", help="The days of PCAP to retain", default=str(DEFAULT_S3_STORAGE_DAYS), show_default=True)
+@click.option("--azs", help="The numbers of Availability Zones to use", default=str(DEFAULT_NUM_AZS), show_default=True)
+@click.option(
+    "--curve-axis",
+    help="Which of the values to summarize the cost and size against",
+    default="traffic",
+    type=click.Choice(SWEEP_AXES),
+    show_default=True)
+@click.option("--rows", help="The most plans to print", default=DEFAULT_SWEEP_ROWS, type=click.INT, show_default=True)
+@click.option("--csv", "csv_path", help="Write every plan to this CSV file", default=None, type=click.STRING)
+@click.option("--json", "output_json", help="Also print the cost and size curve as JSON", is_flag=True, default=False)
+def plan_sweep(traffic, spi_days, replicas, pcap_days, azs, curve_axis, rows, csv_path, output_json):
+    cmd_plan_sweep(traffic, spi_days, replicas, pcap_days, azs, curve_axis, rows, csv_path, output_json)
+cli.add_command(plan_sweep)
+
 @click.command(help=("Sets up the specified VPC to have its traffic monitored by the specified, existing Arkime Cluster."
                     + "  By default, each VPC is assigned a Virtual Network Interface ID (VNI) unused by any other VPC"
                     + f" in the Cluster to uniquely identify it.  The starting default value is {constants.VNI_MIN}."))
@@ -208,23 +388,117 @@ cli.add_command(clusters_list)
     show_default=True,
     default=False
 )
+@click.option(
+    "--mirror-profile",
+    help=("Path to a JSON Mirroring Profile that narrows what is mirrored from the VPC: packet truncation length,"
+          + " protocol/port include and exclude rules, and per-subnet overrides.  Mirrors everything if not supplied."),
+    default=None,
+    type=click.STRING
+)
 @click.pass_context
-def vpc_add(ctx, cluster_name, vpc_id, force_vni, just_print_cfn):
+def vpc_add(ctx, cluster_name, vpc_id, force_vni, just_print_cfn, mirror_profile):
     profile = ctx.obj.get("profile")
     region = ctx.obj.get("region")
-    cmd_vpc_add(profile, region, cluster_name, vpc_id, force_vni, just_print_cfn)
+    cmd_vpc_add(profile, region, cluster_name, vpc_id, force_vni, just_print_cfn, mirror_profile)
 cli.add_command(vpc_add)
 
 @click.command(help="Removes traffic monitoring from the specified VPC being performed by the specified Arkime Cluster")
 @click.option("--cluster-name", help="The name of the Arkime Cluster performing monitoring", required=True)
 @click.option("--vpc-id", help="The VPC ID to remove monitoring from", required=True)
+@click.option(
+    "--wait",
+    help=("Waits for every Traffic Mirroring Session in the VPC to be torn down, and confirms none remain, before"
+          + " removing the VPC's shared mirroring components"),
+    is_flag=True,
+    show_default=True,
+    default=False
+)
 @click.pass_context
-def vpc_remove(ctx, cluster_name, vpc_id):
+def vpc_remove(ctx, cluster_name, vpc_id, wait):
     profile = ctx.obj.get("profile")
     region = ctx.obj.get("region")
-    cmd_vpc_remove(profile, region, cluster_name, vpc_id)
+    cmd_vpc_remove(profile, region, cluster_name, vpc_id, wait)
 cli.add_command(vpc_remove)
 
+@click.command(help=("Finds ENIs in a monitored VPC that have more than one Traffic Mirroring Session, which doubles"
+                     + " the traffic sent to the Capture Nodes.  Call w/ creds for the VPC's AWS Account."))
+@click.option("--cluster-name", help="The name of the Arkime Cluster performing monitoring", required=True)
+@click.option("--vpc-id", help="The VPC ID to scan for duplicate Sessions", required=True)
+@click.option(
+    "--delete",
+    help="Deletes the duplicate Sessions, keeping the one recorded for each ENI",
+    is_flag=True,
+    show_default=True,
+    default=False
+)
+@click.pass_context
+def vpc_dedupe_sessions(ctx, cluster_name, vpc_id, delete):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_vpc_dedupe_sessions(profile, region, cluster_name, vpc_id, delete)
+cli.add_command(vpc_dedupe_sessions)
+
+@click.command(help=("Shows how the Traffic Mirroring Sessions of a monitored VPC are spread across its Mirroring Targets,"
+                     + " compared to each Target's limit.  Call w/ creds for the VPC's AWS Account."))
+@click.option("--cluster-name", help="The name of the Arkime Cluster performing monitoring", required=True)
+@click.option("--vpc-id", help="The VPC ID to report on", required=True)
+@click.option(
+    "--max-sessions-per-target",
+    help=("The number of Sessions each Mirroring Target is planned to carry.  Defaults to the VPC's Mirroring Profile"
+          + f" (maxSessionsPerTarget), or {DEFAULT_MAX_SESSIONS_PER_TARGET} if it doesn't set one."),
+    default=None,
+    type=click.INT
+)
+@click.pass_context
+def vpc_mirror_placement(ctx, cluster_name, vpc_id, max_sessions_per_target):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_vpc_mirror_placement(profile, region, cluster_name, vpc_id, max_sessions_per_target)
+cli.add_command(vpc_mirror_placement)
+
+@click.command(help=("Shows how long it takes for a new EC2 Instance or Fargate Task's ENIs to be mirrored in a monitored VPC,"
+                     + " broken down by stage.  Call w/ creds for the VPC's AWS Account."))
+@click.option("--cluster-name", help="The name of the Arkime Cluster performing monitoring", required=True)
+@click.option("--vpc-id", help="The VPC ID to report on", required=True)
+@click.option(
+    "--hours",
+    help="How many hours back to report on",
+    default=DEFAULT_LATENCY_HOURS,
+    show_default=True,
+    type=click.INT
+)
+@click.pass_context
+def vpc_mirror_latency(ctx, cluster_name, vpc_id, hours):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_vpc_mirror_latency(profile, region, cluster_name, vpc_id, hours)
+cli.add_command(vpc_mirror_latency)
+
+@click.command(help=("Shows what fraction of the mirrorable ENIs in a monitored VPC are being mirrored, and which aren't."
+                     + "  Answers from a local inventory that is refreshed when stale.  Call w/ creds for the VPC's AWS Account."))
+@click.option("--cluster-name", help="The name of the Arkime Cluster performing monitoring", required=True)
+@click.option("--vpc-id", help="The VPC ID to report on", required=True)
+@click.option(
+    "--force-refresh",
+    help="Refreshes the local inventory from AWS even if it is recent",
+    is_flag=True,
+    show_default=True,
+    default=False
+)
+@click.option(
+    "--max-age",
+    help="How old (in seconds) the local inventory can be before it's refreshed from AWS",
+    default=DEFAULT_MAX_AGE_SECONDS,
+    show_default=True,
+    type=click.INT
+)
+@click.pass_context
+def vpc_status(ctx, cluster_name, vpc_id, force_refresh, max_age):
+    profile = ctx.obj.get("profile")
+    region = ctx.obj.get("region")
+    cmd_vpc_status(profile, region, cluster_name, vpc_id, force_refresh, max_age)
+cli.add_command(vpc_status)
+
 @click.command(help="Updates specified Arkime Cluster's Capture/Viewer configuration")
 @click.option("--cluster-name", help="The name of the Arkime Cluster to operate on", required=True)
 @click.option("--capture",
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import json
 import logging
 import os
 import shutil
-from typing import Dict, Type, TypeVar
+from typing import Dict, List, Type, TypeVar
 
 from aws_interactions.aws_environment import AwsEnvironment
 from core.constants import get_repo_root_dir, is_valid_cluster_name, InvalidClusterName
@@ -131,6 +132,12 @@ def _get_default_viewer_config_dir_path() -> str:
     current_file_path = os.path.abspath(os.path.dirname(__file__))
     return os.path.join(current_file_path, "default_config", "viewer")
 
+def _get_default_capture_config_ini_path() -> str:
+    return os.path.join(_get_default_capture_config_dir_path(), "config.ini")
+
+def _get_default_viewer_config_ini_path() -> str:
+    return os.path.join(_get_default_viewer_config_dir_path(), "config.ini")
+
 def get_cluster_dir_name(cluster_name: str, aws_env: AwsEnvironment) -> str:
     # We should validate earlier, but practice defense in depth
     if not is_valid_cluster_name(cluster_name):
@@ -175,6 +182,24 @@ def get_viewer_archive_path(cluster_name: str, aws_env: AwsEnvironment, parent_d
     cluster_dir_path = get_cluster_dir_path(cluster_name, aws_env, parent_dir)
     return os.path.join(cluster_dir_path, "viewer.zip")
 
+def get_capture_config_ini_path(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str):
+    capture_dir_path = get_capture_dir_path(cluster_name, aws_env, parent_dir)
+    return os.path.join(capture_dir_path, "config.ini")
+
+def get_capture_tuning_path(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str):
+    # Kept beside the capture directory, rather than in it, so it isn't shipped to the Capture Nodes
+    cluster_dir_path = get_cluster_dir_path(cluster_name, aws_env, parent_dir)
+    return os.path.join(cluster_dir_path, "capture-tuning.json")
+
+def get_viewer_config_ini_path(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str):
+    viewer_dir_path = get_viewer_dir_path(cluster_name, aws_env, parent_dir)
+    return os.path.join(viewer_dir_path, "config.ini")
+
+def get_viewer_tuning_path(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str):
+    # Kept beside the viewer directory, rather than in it, so it isn't shipped to the Viewer Nodes
+    cluster_dir_path = get_cluster_dir_path(cluster_name, aws_env, parent_dir)
+    return os.path.join(cluster_dir_path, "viewer-tuning.json")
+
 def _create_config_dir(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str) -> str:
     cluster_dir_path = get_cluster_dir_path(cluster_name, aws_env, parent_dir)
 
@@ -241,8 +266,119 @@ def get_viewer_config_archive(cluster_name: str, aws_env: AwsEnvironment) -> Loc
 
     return viewer_config_archive
 
+class SectionNotInConfig(Exception):
+    def __init__(self, section: str):
+        super().__init__(f"The config.ini does not have a [{section}] section")
+
+def _read_ini_section(lines: List[str], section: str) -> Dict[str, str]:
+    values = {}
+    in_section = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            in_section = (stripped[1:-1] == section)
+        elif in_section and "=" in stripped and not stripped.startswith("#"):
+            key, value = stripped.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+def _write_ini_section_values(lines: List[str], section: str, values: Dict[str, str]) -> List[str]:
+    """
+    Sets the supplied keys in the section, in place where they already exist, preserving all the other lines (and
+    comments) around them.  Keys the section doesn't have yet are appended to the end of it.
+    """
+    next_lines = []
+    remaining = dict(values)
+    in_section = False
+    section_end = None
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            if in_section:
+                section_end = len(next_lines)
+            in_section = (stripped[1:-1] == section)
+        elif in_section and "=" in stripped and not stripped.startswith("#"):
+            key = stripped.split("=", 1)[0].strip()
+            if key in remaining:
+                next_lines.append(f"{key}={remaining.pop(key)}\n")
+                continue
+        next_lines.append(line)
+
+    if in_section:
+        section_end = len(next_lines)
+    if section_end is None:
+        raise SectionNotInConfig(section)
+
+    # Don't leave the new keys stranded after the section's trailing blank lines
+    while section_end > 0 and not next_lines[section_end - 1].strip():
+        section_end -= 1
+    if section_end > 0 and not next_lines[section_end - 1].endswith("\n"):
+        next_lines[section_end - 1] += "\n"
+    new_lines = [f"{key}={value}\n" for key, value in remaining.items()]
+    return next_lines[:section_end] + new_lines + next_lines[section_end:]
+
+def render_capture_tuning(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str, settings: Dict[str, str]) -> bool:
+    """
+    Writes the plan-driven capture settings into the Cluster's Capture config.ini, returning whether it changed.
+
+    A setting is only managed while its value in the config.ini is still the one we last rendered (or shipped in the
+    default config); if an operator has edited it since, their value is preserved.  The values we last rendered are
+    tracked in a file beside the capture config directory.
+    """
+    return _render_tuning(
+        "Capture",
+        get_capture_config_ini_path(cluster_name, aws_env, parent_dir),
+        get_capture_tuning_path(cluster_name, aws_env, parent_dir),
+        _get_default_capture_config_ini_path(),
+        settings
+    )
 
+def render_viewer_tuning(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str, settings: Dict[str, str]) -> bool:
+    """
+    Writes the plan-driven viewer settings into the Cluster's Viewer config.ini, returning whether it changed.  Operator
+    overrides are preserved the same way as render_capture_tuning().
+    """
+    return _render_tuning(
+        "Viewer",
+        get_viewer_config_ini_path(cluster_name, aws_env, parent_dir),
+        get_viewer_tuning_path(cluster_name, aws_env, parent_dir),
+        _get_default_viewer_config_ini_path(),
+        settings
+    )
 
-
-
-
+def _render_tuning(component: str, config_path: str, tuning_path: str, default_config_path: str,
+                   settings: Dict[str, str]) -> bool:
+    with open(config_path, "r") as config_file:
+        lines = config_file.readlines()
+    current_values = _read_ini_section(lines, "default")
+
+    # Settings we've never rendered before are still at their shipped defaults, unless an operator has changed them
+    with open(default_config_path, "r") as default_file:
+        baseline_values = _read_ini_section(default_file.readlines(), "default")
+    rendered_values = {}
+    if os.path.exists(tuning_path):
+        with open(tuning_path, "r") as tuning_file:
+            rendered_values = json.load(tuning_file)
+    baseline_values.update(rendered_values)
+
+    managed_values = {}
+    for key, value in settings.items():
+        current = current_values.get(key)
+        if current is None or current == baseline_values.get(key):
+            managed_values[key] = value
+        elif current != value:
+            logger.info(f"Preserving the operator's override of {key}={current} in the {component} config (plan suggests {value})")
+
+    next_lines = _write_ini_section_values(lines, "default", managed_values)
+    changed = next_lines != lines
+    if changed:
+        logger.info(f"Writing plan-driven {component.lower()} settings to: {config_path}")
+        with open(config_path, "w") as config_file:
+            config_file.writelines(next_lines)
+
+    # Only record what we actually wrote; a preserved key keeps its old baseline so it stays the operator's
+    rendered_values.update(managed_values)
+    with open(tuning_path, "w") as tuning_file:
+        json.dump(rendered_values, tuning_file, indent=4)
+
+    return changed
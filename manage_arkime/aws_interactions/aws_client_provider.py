@@ -106,6 +106,11 @@ class AwsClientProvider:
         client = session.client("iam")
         return client
 
+    def get_lambda(self):
+        session = self._get_session()
+        client = session.client("lambda")
+        return client
+
     def get_opensearch(self):
         session = self._get_session()
         client = session.client("opensearch")
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+import atexit
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 import json
 import logging
+import math
+import sys
+import threading
+import time
 from typing import Dict, List
 
 from aws_interactions.aws_client_provider import AwsClientProvider
@@ -12,6 +19,35 @@ logger = logging.getLogger(__name__)
 
 CW_ARKIME_EVENT_NAMESPACE="Arkime/Events"
 
+LISTENER_EVENT_TYPE="AwsEventListener"
+LISTENER_METRIC_FILTERED_ENI_TYPE="FilteredEniType"
+LISTENER_METRIC_CACHE_HIT="InstanceCacheHit"
+
+CREATE_METRIC_TARGET_OVER_CAPACITY="TargetOverCapacity"
+
+COALESCER_EVENT_TYPE="CoalesceEniEvents"
+COALESCER_METRIC_RECEIVED="EventsReceived"
+COALESCER_METRIC_DISPATCHED="EventsDispatched"
+COALESCER_METRIC_COALESCED="EventsCoalesced"
+COALESCER_METRIC_FAILURE="DispatchFailures"
+
+LATENCY_METRIC_LISTENER="LatencyListener"
+LATENCY_METRIC_DELIVERY="LatencyDelivery"
+LATENCY_METRIC_CREATE="LatencyCreate"
+LATENCY_METRIC_END_TO_END="LatencyEndToEnd"
+LATENCY_METRICS=[LATENCY_METRIC_LISTENER, LATENCY_METRIC_DELIVERY, LATENCY_METRIC_CREATE, LATENCY_METRIC_END_TO_END]
+
+# See: https://docs.aws.amazon.com/AmazonCloudWatch/latest/APIReference/API_PutMetricData.html
+PUT_METRIC_DATA_MAX_DATUMS = 1000
+PUT_METRIC_DATA_MAX_VALUES = 150
+PUT_METRIC_DATA_MAX_BYTES = 1000000
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 60
+
+# See: https://docs.aws.amazon.com/AmazonCloudWatch/latest/APIReference/API_GetMetricData.html
+GET_METRIC_DATA_MAX_QUERIES = 500
+GET_METRIC_DATA_MAX_DATAPOINTS = 100800
+
 class ArkimeEventMetric(ABC):
     def __init__(self):
         pass
@@ -29,6 +65,39 @@ class ArkimeEventMetric(ABC):
     def metric_data(self) -> List[Dict[str, any]]:
         pass
 
+    @property
+    def emf_documents(self) -> List[Dict[str, any]]:
+        """
+        Renders the metrics in CloudWatch Embedded Metric Format; one document per distinct set of dimensions.  When
+        written to a Lambda's logs, CloudWatch extracts the metrics from them asynchronously.
+
+        See: https://docs.aws.amazon.com/AmazonCloudWatch/latest/monitoring/CloudWatch_Embedded_Metric_Format_Specification.html
+        """
+        timestamp = int(time.time() * 1000)
+
+        documents = {}
+        for datum in self.metric_data:
+            dimensions = {dimension["Name"]: dimension["Value"] for dimension in datum.get("Dimensions", [])}
+            key = tuple(sorted(dimensions.items()))
+            if key not in documents:
+                documents[key] = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [{
+                            "Namespace": self.namespace,
+                            "Dimensions": [list(dimensions.keys())],
+                            "Metrics": [],
+                        }],
+                    },
+                    **dimensions,
+                }
+
+            document = documents[key]
+            document["_aws"]["CloudWatchMetrics"][0]["Metrics"].append({"Name": datum["MetricName"], "Unit": self.unit})
+            document[datum["MetricName"]] = datum["Value"]
+
+        return list(documents.values())
+
     def __str__(self) -> str:
         metric = {
             "namespace": self.namespace,
@@ -93,7 +162,7 @@ class CreateEniMirrorEventOutcome(Enum):
     FAILURE="Failure"
 
 class CreateEniMirrorEventMetrics(ArkimeEventMetric):
-    def __init__(self, cluster_name: str, vpc_id: str, outcome: CreateEniMirrorEventOutcome):
+    def __init__(self, cluster_name: str, vpc_id: str, outcome: CreateEniMirrorEventOutcome, over_capacity: bool = False):
         super().__init__()
 
         self.cluster_name = cluster_name
@@ -104,6 +173,7 @@ class CreateEniMirrorEventMetrics(ArkimeEventMetric):
         self.value_abort_exists = 0
         self.value_abort_eni_type = 0
         self.value_failure = 0
+        self.value_over_capacity = 1 if over_capacity else 0
 
         if outcome == CreateEniMirrorEventOutcome.SUCCESS:
             self.value_success = 1
@@ -118,7 +188,8 @@ class CreateEniMirrorEventMetrics(ArkimeEventMetric):
     def metric_data(self) -> List[Dict[str, any]]:
         """
         We emit a metric value for each outcome of the operation, as it makes metric math and alarming easier.  Only one
-        metric value should be 1; the rest should be 0.
+        metric value should be 1; the rest should be 0.  We also emit whether the Session had to be placed on a Target
+        that was already at its planned limit.
         """
 
         shared_dimensions = {
@@ -152,8 +223,14 @@ class CreateEniMirrorEventMetrics(ArkimeEventMetric):
             "Value": self.value_failure
         }
         metric_abort_failure.update(shared_dimensions)
+
+        metric_over_capacity = {
+            "MetricName": CREATE_METRIC_TARGET_OVER_CAPACITY,
+            "Value": self.value_over_capacity
+        }
+        metric_over_capacity.update(shared_dimensions)
         
-        return [metric_success, metric_abort_exists, metric_abort_eni_type, metric_abort_failure]
+        return [metric_success, metric_abort_exists, metric_abort_eni_type, metric_abort_failure, metric_over_capacity]
 
 class DestroyEniMirrorEventOutcome(Enum):
     SUCCESS="Success"
@@ -205,6 +282,192 @@ class DestroyEniMirrorEventMetrics(ArkimeEventMetric):
         return [metric_success, metric_abort_failure]
 
 
+class AwsEventListenerOutcome(Enum):
+    PROCESSED="Processed"
+    FILTERED_OTHER_VPC="FilteredOtherVpc"
+    FILTERED_NO_ENIS="FilteredNoEnis"
+    FAILURE="Failure"
+
+class AwsEventListenerMetrics(ArkimeEventMetric):
+    def __init__(self, cluster_name: str, vpc_id: str, outcome: AwsEventListenerOutcome, filtered_enis: int = 0,
+                 cache_hit: bool = False):
+        super().__init__()
+
+        self.cluster_name = cluster_name
+        self.vpc_id = vpc_id
+        self.event_type = LISTENER_EVENT_TYPE
+
+        self.value_processed = 0
+        self.value_filtered_other_vpc = 0
+        self.value_filtered_no_enis = 0
+        self.value_failure = 0
+        self.value_filtered_eni_type = filtered_enis
+        self.value_cache_hit = 1 if cache_hit else 0
+
+        if outcome == AwsEventListenerOutcome.PROCESSED:
+            self.value_processed = 1
+        elif outcome == AwsEventListenerOutcome.FILTERED_OTHER_VPC:
+            self.value_filtered_other_vpc = 1
+        elif outcome == AwsEventListenerOutcome.FILTERED_NO_ENIS:
+            self.value_filtered_no_enis = 1
+        elif outcome == AwsEventListenerOutcome.FAILURE:
+            self.value_failure = 1
+
+    @property
+    def metric_data(self) -> List[Dict[str, any]]:
+        """
+        Like the other Event Metrics, we emit a value for each outcome so that the fraction of AWS Service events
+        filtered out (versus turned into mirroring work) is easy to graph.  We also emit the number of ENIs skipped due
+        to their type and whether the instance's details came from the listener's cache.
+        """
+
+        shared_dimensions = {
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": self.cluster_name},
+                {"Name": "VpcId", "Value": self.vpc_id},
+                {"Name": "EventType", "Value": self.event_type},
+            ]
+        }
+
+        metric_values = [
+            (AwsEventListenerOutcome.PROCESSED.value, self.value_processed),
+            (AwsEventListenerOutcome.FILTERED_OTHER_VPC.value, self.value_filtered_other_vpc),
+            (AwsEventListenerOutcome.FILTERED_NO_ENIS.value, self.value_filtered_no_enis),
+            (AwsEventListenerOutcome.FAILURE.value, self.value_failure),
+            (LISTENER_METRIC_FILTERED_ENI_TYPE, self.value_filtered_eni_type),
+            (LISTENER_METRIC_CACHE_HIT, self.value_cache_hit),
+        ]
+
+        metrics = []
+        for name, value in metric_values:
+            metric = {
+                "MetricName": name,
+                "Value": value
+            }
+            metric.update(shared_dimensions)
+            metrics.append(metric)
+
+        return metrics
+
+class CoalesceEniEventsMetrics(ArkimeEventMetric):
+    def __init__(self, cluster_name: str, vpc_id: str, received: int, dispatched: int, coalesced: int, failed: int):
+        super().__init__()
+
+        self.cluster_name = cluster_name
+        self.vpc_id = vpc_id
+        self.event_type = COALESCER_EVENT_TYPE
+
+        self.value_received = received
+        self.value_dispatched = dispatched
+        self.value_coalesced = coalesced
+        self.value_failure = failed
+
+    @property
+    def metric_data(self) -> List[Dict[str, any]]:
+        """
+        Unlike the other Event Metrics, these are counts per batch rather than an outcome per event.  The ratio of
+        events coalesced to events received shows how much work the batching is saving us during scaling storms.
+        """
+
+        shared_dimensions = {
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": self.cluster_name},
+                {"Name": "VpcId", "Value": self.vpc_id},
+                {"Name": "EventType", "Value": self.event_type},
+            ]
+        }
+
+        metric_values = [
+            (COALESCER_METRIC_RECEIVED, self.value_received),
+            (COALESCER_METRIC_DISPATCHED, self.value_dispatched),
+            (COALESCER_METRIC_COALESCED, self.value_coalesced),
+            (COALESCER_METRIC_FAILURE, self.value_failure),
+        ]
+
+        metrics = []
+        for name, value in metric_values:
+            metric = {
+                "MetricName": name,
+                "Value": value
+            }
+            metric.update(shared_dimensions)
+            metrics.append(metric)
+
+        return metrics
+
+class CreateEniMirrorLatencyMetrics(ArkimeEventMetric):
+    def __init__(self, cluster_name: str, vpc_id: str, source_event_time: float, published_time: float,
+                 started_time: float, completed_time: float):
+        """
+        All times are epoch seconds: when the AWS Service event (e.g. EC2 Instance "running") was generated, when our
+        listener published the resulting CreateEniMirrorEvent, when the Create Lambda started handling it, and when
+        the Mirroring Session was in place.
+        """
+        super().__init__()
+
+        self.cluster_name = cluster_name
+        self.vpc_id = vpc_id
+        self.event_type = constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR
+
+        self.value_listener = self._to_millis(published_time - source_event_time)
+        self.value_delivery = self._to_millis(started_time - published_time)
+        self.value_create = self._to_millis(completed_time - started_time)
+        self.value_end_to_end = self._to_millis(completed_time - source_event_time)
+
+    @staticmethod
+    def _to_millis(duration_seconds: float) -> int:
+        # The timestamps come from different clocks (AWS Services' and our Lambdas'), so tiny negatives are possible
+        return max(0, int(duration_seconds * 1000))
+
+    @property
+    def unit(self) -> str:
+        return "Milliseconds"
+
+    @property
+    def metric_data(self) -> List[Dict[str, any]]:
+        """
+        How long each stage between an ENI appearing and its traffic being mirrored took; packets sent by the ENI
+        during that window aren't captured.  Emitted once per Session created, so CloudWatch percentiles give the
+        distribution.
+        """
+
+        shared_dimensions = {
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": self.cluster_name},
+                {"Name": "VpcId", "Value": self.vpc_id},
+                {"Name": "EventType", "Value": self.event_type},
+            ]
+        }
+
+        metric_values = [
+            (LATENCY_METRIC_LISTENER, self.value_listener),
+            (LATENCY_METRIC_DELIVERY, self.value_delivery),
+            (LATENCY_METRIC_CREATE, self.value_create),
+            (LATENCY_METRIC_END_TO_END, self.value_end_to_end),
+        ]
+
+        metrics = []
+        for name, value in metric_values:
+            metric = {
+                "MetricName": name,
+                "Value": value,
+                "Unit": self.unit
+            }
+            metric.update(shared_dimensions)
+            metrics.append(metric)
+
+        return metrics
+
+def emit_event_metrics(metrics: ArkimeEventMetric):
+    """
+    Writes the metrics to stdout in Embedded Metric Format.  This is how our Lambdas report metrics: it costs no AWS
+    API call (or its latency/throttling) on the invocation's critical path.  Outside of Lambda, nothing picks these
+    lines up, so use put_event_metrics() instead.
+    """
+    for document in metrics.emf_documents:
+        sys.stdout.write(json.dumps(document) + "\n")
+    sys.stdout.flush()
+
 def put_event_metrics(metrics: ArkimeEventMetric, aws_client_provider: AwsClientProvider):
     logger.debug(f"Putting Arkime Event metrics: {metrics}")
 
@@ -213,3 +476,260 @@ def put_event_metrics(metrics: ArkimeEventMetric, aws_client_provider: AwsClient
         Namespace=metrics.namespace,
         MetricData=metrics.metric_data
     )
+
+
+class _MetricAggregate:
+    """
+    The datapoints recorded for a single metric name + dimension set.  We keep the exact distribution of values while
+    there are few enough distinct ones for a Values/Counts datum (which preserves percentiles), and otherwise fall back
+    to a StatisticValues datum.
+    """
+    def __init__(self):
+        self.value_counts: Dict[float, int] = {}
+        self.sample_count = 0
+        self.sum = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: float):
+        self.sample_count += 1
+        self.sum += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+        if self.value_counts is not None:
+            self.value_counts[value] = self.value_counts.get(value, 0) + 1
+            if len(self.value_counts) > PUT_METRIC_DATA_MAX_VALUES:
+                self.value_counts = None
+
+    def to_datum(self, metric_name: str, dimensions: Dict[str, str], unit: str) -> Dict[str, any]:
+        datum = {
+            "MetricName": metric_name,
+            "Dimensions": [{"Name": name, "Value": value} for name, value in dimensions.items()],
+            "Unit": unit,
+        }
+        if self.value_counts is not None:
+            datum["Values"] = list(self.value_counts.keys())
+            datum["Counts"] = list(self.value_counts.values())
+        else:
+            datum["StatisticValues"] = {
+                "SampleCount": self.sample_count,
+                "Sum": self.sum,
+                "Minimum": self.minimum,
+                "Maximum": self.maximum,
+            }
+        return datum
+
+class MetricsBuffer:
+    """
+    Aggregates metric datapoints in memory and sends them with as few PutMetricData calls as possible, for CLI
+    operations that record an outcome for each of thousands of items.  Datapoints sharing a metric name and dimensions
+    are rolled up into a single datum.  The buffer is flushed once it holds a full request's worth of datums, once
+    flush_interval_seconds has passed since the last flush, and when it's closed (or the process exits).
+
+    Safe to record to from multiple threads at once.  Use it as a context manager to make sure it's flushed.
+    """
+    def __init__(self, aws_client_provider: AwsClientProvider, namespace: str = CW_ARKIME_EVENT_NAMESPACE,
+                 dimensions: Dict[str, str] = None, flush_interval_seconds: int = DEFAULT_FLUSH_INTERVAL_SECONDS,
+                 max_datums: int = PUT_METRIC_DATA_MAX_DATUMS):
+        self._aws_provider = aws_client_provider
+        self.namespace = namespace
+        self.dimensions = dimensions if dimensions else {}
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_datums = max_datums
+
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, _MetricAggregate] = {}
+        self._last_flush = time.time()
+        self._closed = False
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, metric_name: str, value: float, dimensions: Dict[str, str] = None, unit: str = "None"):
+        all_dimensions = {**self.dimensions, **(dimensions if dimensions else {})}
+        key = (metric_name, tuple(all_dimensions.items()), unit)
+
+        with self._lock:
+            if key not in self._pending:
+                self._pending[key] = _MetricAggregate()
+            self._pending[key].add(value)
+
+            should_flush = (len(self._pending) >= self.max_datums
+                            or (time.time() - self._last_flush) >= self.flush_interval_seconds)
+
+        if should_flush:
+            self.flush()
+
+    def add_event_metrics(self, metrics: ArkimeEventMetric):
+        for datum in metrics.metric_data:
+            dimensions = {dimension["Name"]: dimension["Value"] for dimension in datum.get("Dimensions", [])}
+            self.add(datum["MetricName"], datum["Value"], dimensions, metrics.unit)
+
+    def flush(self) -> int:
+        """
+        Sends everything recorded so far.  Returns the number of datums sent.  Metrics are a side channel, so a failed
+        send is logged rather than raised.
+        """
+        # Swap out the pending datapoints so other threads can keep recording while we're talking to CloudWatch
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._last_flush = time.time()
+
+        if not pending:
+            return 0
+
+        datums = [
+            aggregate.to_datum(metric_name, dict(dimensions), unit)
+            for (metric_name, dimensions, unit), aggregate in pending.items()
+        ]
+
+        cw_client = self._aws_provider.get_cloudwatch()
+        num_sent = 0
+        for batch in _get_put_metric_data_batches(datums, self.max_datums):
+            try:
+                cw_client.put_metric_data(Namespace=self.namespace, MetricData=batch)
+                num_sent += len(batch)
+            except Exception as ex:
+                logger.warning(f"Unable to put {len(batch)} metric datum(s) to CloudWatch: {ex}")
+
+        logger.debug(f"Flushed {num_sent}/{len(datums)} metric datum(s) to CloudWatch")
+        return num_sent
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.flush()
+
+def get_metric_percentiles(namespace: str, metric_name: str, dimensions: Dict[str, str], start_time: datetime,
+                           end_time: datetime, percentiles: List[str], aws_client_provider: AwsClientProvider) -> Dict[str, float]:
+    """
+    Gets the sample count and requested percentiles (e.g. "p50") of the metric over the whole time window, or an
+    empty dict if there were no datapoints in it.
+    """
+    cw_client = aws_client_provider.get_cloudwatch()
+    period_seconds = max(3600, int((end_time - start_time).total_seconds()) // 3600 * 3600)
+    response = cw_client.get_metric_statistics(
+        Namespace=namespace,
+        MetricName=metric_name,
+        Dimensions=[{"Name": name, "Value": value} for name, value in dimensions.items()],
+        StartTime=start_time,
+        EndTime=end_time,
+        Period=period_seconds,
+        Statistics=["SampleCount"],
+        ExtendedStatistics=percentiles
+    )
+
+    datapoints = response.get("Datapoints", [])
+    if not datapoints:
+        return {}
+
+    # Our period covers the whole window, so we'll only get more than one datapoint if it doesn't line up exactly
+    # with CloudWatch's period boundaries; use the fullest one
+    datapoint = max(datapoints, key=lambda d: d.get("SampleCount", 0))
+    values = {"SampleCount": datapoint.get("SampleCount", 0)}
+    values.update(datapoint.get("ExtendedStatistics", {}))
+    return values
+
+@dataclass
+class MetricQuery:
+    key: str # How the caller refers to the query's results
+    namespace: str
+    metric_name: str
+    dimensions: Dict[str, str]
+    stat: str
+
+    def to_metric_data_query(self, query_id: str, period: int) -> Dict[str, any]:
+        return {
+            "Id": query_id,
+            "MetricStat": {
+                "Metric": {
+                    "Namespace": self.namespace,
+                    "MetricName": self.metric_name,
+                    "Dimensions": [{"Name": name, "Value": value} for name, value in self.dimensions.items()],
+                },
+                "Period": period,
+                "Stat": self.stat,
+            },
+            "ReturnData": True,
+        }
+
+def get_metric_data_period(start_time: datetime, end_time: datetime, min_period: int = 60,
+                           num_queries: int = GET_METRIC_DATA_MAX_QUERIES) -> int:
+    """
+    The finest period (a multiple of 60 seconds) that keeps a batch of queries (a full one, by default) over the time
+    window under the GetMetricData datapoint limit.
+    """
+    max_datapoints_per_query = GET_METRIC_DATA_MAX_DATAPOINTS // min(num_queries, GET_METRIC_DATA_MAX_QUERIES)
+    window_seconds = (end_time - start_time).total_seconds()
+    required_period = math.ceil(window_seconds / max_datapoints_per_query / 60) * 60
+    return max(min_period, required_period)
+
+def get_metric_data(queries: List[MetricQuery], start_time: datetime, end_time: datetime, period: int,
+                    aws_client_provider: AwsClientProvider, with_timestamps: bool = False) -> Dict[str, List[float]]:
+    """
+    Runs the queries with as few GetMetricData calls as possible (up to 500 queries each) and returns each query's
+    datapoint values, oldest first, by the query's key.  With with_timestamps, each datapoint is instead a
+    (timestamp, value) tuple, as CloudWatch omits the periods that have no data.
+    """
+    cw_client = aws_client_provider.get_cloudwatch()
+    results = {query.key: [] for query in queries}
+
+    for batch_start in range(0, len(queries), GET_METRIC_DATA_MAX_QUERIES):
+        batch = queries[batch_start:batch_start + GET_METRIC_DATA_MAX_QUERIES]
+        # Query IDs have a restricted format, so we use our own and map them back to the caller's keys
+        keys_by_id = {f"q{index}": query.key for index, query in enumerate(batch)}
+        metric_data_queries = [query.to_metric_data_query(f"q{index}", period) for index, query in enumerate(batch)]
+
+        values_by_id = {query_id: [] for query_id in keys_by_id.keys()}
+        next_token = None
+        while True:
+            optional_args = {"NextToken": next_token} if next_token else {}
+            response = cw_client.get_metric_data(
+                MetricDataQueries=metric_data_queries,
+                StartTime=start_time,
+                EndTime=end_time,
+                ScanBy="TimestampAscending",
+                **optional_args
+            )
+            for result in response.get("MetricDataResults", []):
+                if with_timestamps:
+                    values_by_id[result["Id"]].extend(zip(result.get("Timestamps", []), result.get("Values", [])))
+                else:
+                    values_by_id[result["Id"]].extend(result.get("Values", []))
+
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+
+        for query_id, values in values_by_id.items():
+            results[keys_by_id[query_id]] = values
+
+    return results
+
+def _get_put_metric_data_batches(datums: List[Dict[str, any]], max_datums: int) -> List[List[Dict[str, any]]]:
+    """
+    Splits the datums into requests that respect both the datum-count and payload-size limits of PutMetricData
+    """
+    batches = []
+    current_batch = []
+    current_bytes = 0
+    for datum in datums:
+        datum_bytes = len(json.dumps(datum))
+        if current_batch and (len(current_batch) >= max_datums or current_bytes + datum_bytes > PUT_METRIC_DATA_MAX_BYTES):
+            batches.append(current_batch)
+            current_batch = []
+            current_bytes = 0
+        current_batch.append(datum)
+        current_bytes += datum_bytes
+
+    if current_batch:
+        batches.append(current_batch)
+    return batches
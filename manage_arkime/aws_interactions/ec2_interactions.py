@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import hashlib
 import logging
 from typing import List, Dict
 
@@ -36,6 +37,22 @@ def get_subnets_of_vpc(vpc_id: str, aws_provider: AwsClientProvider) -> List[str
 
     return subnet_ids
 
+def get_azs_of_subnets(subnet_ids: List[str], aws_provider: AwsClientProvider) -> Dict[str, str]:
+    """
+    Returns a mapping of the specified subnets to the Availability Zone each lives in
+    """
+    ec2_client = aws_provider.get_ec2()
+    subnets_response = ec2_client.describe_subnets(SubnetIds=subnet_ids)
+    subnet_azs = {subnet["SubnetId"]: subnet["AvailabilityZone"] for subnet in subnets_response["Subnets"]}
+
+    next_token = subnets_response.get("NextToken")
+    while next_token:
+        subnets_response = ec2_client.describe_subnets(SubnetIds=subnet_ids, NextToken=next_token)
+        subnet_azs.update({subnet["SubnetId"]: subnet["AvailabilityZone"] for subnet in subnets_response["Subnets"]})
+        next_token = subnets_response.get("NextToken")
+
+    return subnet_azs
+
 @dataclass
 class NetworkInterface:
     vpc_id: str
@@ -93,43 +110,189 @@ def get_enis_of_subnet(subnet_id: str, aws_provider: AwsClientProvider) -> List[
 
     return network_interfaces
 
+DESCRIBE_ENIS_PAGE_SIZE = 1000 # The max the API allows
+
+def get_enis_of_vpc(vpc_id: str, aws_provider: AwsClientProvider) -> List[NetworkInterface]:
+    """
+    Gets every ENI in the VPC, in as few (large) pages as possible
+    """
+    ec2_client = aws_provider.get_ec2()
+    filters = [{"Name": "vpc-id", "Values": [vpc_id]}]
+
+    network_interfaces = []
+    next_token = None
+    while True:
+        optional_args = {"NextToken": next_token} if next_token else {}
+        describe_eni_response = ec2_client.describe_network_interfaces(
+            Filters=filters,
+            MaxResults=DESCRIBE_ENIS_PAGE_SIZE,
+            **optional_args
+        )
+        network_interfaces.extend([
+            NetworkInterface(eni["VpcId"], eni["SubnetId"], eni["NetworkInterfaceId"], eni["InterfaceType"])
+            for eni in describe_eni_response.get("NetworkInterfaces", [])
+        ])
+
+        next_token = describe_eni_response.get("NextToken")
+        if not next_token:
+            break
+
+    return network_interfaces
+
+@dataclass
+class MirrorSession:
+    session_id: str
+    eni_id: str
+    target_id: str
+    filter_id: str
+    vni: int
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'session_id': self.session_id,
+            'eni_id': self.eni_id,
+            'target_id': self.target_id,
+            'filter_id': self.filter_id,
+            'vni': self.vni,
+        }
+
 NON_MIRRORABLE_ENI_TYPES = ["gateway_load_balancer_endpoint", "nat_gateway"]
 
+# The error EC2 returns when a ClientToken is re-used with different parameters, i.e. when another invocation already
+# created (or is creating) the ENI/Filter/VNI's Session with a different request (e.g. on another Target)
+MIRROR_SESSION_CONFLICT_CODES = ["IdempotentParameterMismatch"]
+
 class NonMirrorableEniType(Exception):
     def __init__(self, eni: NetworkInterface):
         self.eni = eni
         super().__init__(f"The ENI {eni.eni_id} is of type {eni.eni_type}, which is not mirrorable")
 
+def get_mirror_session_client_token(eni_id: str, traffic_filter: str, virtual_network: int) -> str:
+    """
+    EC2 treats repeated CreateTrafficMirrorSession calls carrying the same ClientToken as a single request.  Deriving
+    the token from the ENI, Filter, and VNI means that racing invocations for the same ENI (such as vpc-add and an EC2
+    running event) converge on one Session instead of creating duplicates.  The Target is left out because racing
+    invocations can pick different ones; the later request then fails with a conflict rather than making a second
+    Session.  The token is capped at 64 characters.
+    """
+    raw_token = f"{eni_id}-{traffic_filter}-{virtual_network}"
+    return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()[:64]
+
 """
 Sets up a VPC Traffic Mirroring Session on a given ENI towards the specified Traffic Target using the specified
-Traffic Filter and returns the Traffic Session ID.
+Traffic Filter and returns the Session.  If the Session already exists for the ENI/Filter/VNI combination, returns the
+existing Session instead, which may be on a different Target.  If packet_length is supplied, each mirrored packet is
+truncated to that many bytes.
 """
-def mirror_eni(eni: NetworkInterface, traffic_target: str, traffic_filter: str, vpc_id: str, aws_provider: AwsClientProvider, virtual_network: int = 123) -> str:
+def mirror_eni(eni: NetworkInterface, traffic_target: str, traffic_filter: str, vpc_id: str, aws_provider: AwsClientProvider,
+               virtual_network: int = 123, packet_length: int = None) -> MirrorSession:
     if eni.eni_type in NON_MIRRORABLE_ENI_TYPES:
         raise NonMirrorableEniType(eni)
 
+    # Leaving PacketLength off mirrors the whole packet
+    optional_args = {"PacketLength": packet_length} if packet_length else {}
+
     ec2_client = aws_provider.get_ec2()
-    create_session_response = ec2_client.create_traffic_mirror_session(
-        NetworkInterfaceId=eni.eni_id,
-        TrafficMirrorTargetId=traffic_target,
-        TrafficMirrorFilterId=traffic_filter,
-        SessionNumber=1,
-        VirtualNetworkId=virtual_network,
-        TagSpecifications=[
-            {
-                "ResourceType": "traffic-mirror-session",
-                "Tags": [
-                    {
-                        "Key": "Name",
-                        "Value": f"{vpc_id}-{eni.eni_id}"
-                    },
-                ]
-            },
-        ],
-    )
+    try:
+        create_session_response = ec2_client.create_traffic_mirror_session(
+            NetworkInterfaceId=eni.eni_id,
+            TrafficMirrorTargetId=traffic_target,
+            TrafficMirrorFilterId=traffic_filter,
+            SessionNumber=1,
+            VirtualNetworkId=virtual_network,
+            TagSpecifications=[
+                {
+                    "ResourceType": "traffic-mirror-session",
+                    "Tags": [
+                        {
+                            "Key": "Name",
+                            "Value": f"{vpc_id}-{eni.eni_id}"
+                        },
+                    ]
+                },
+            ],
+            ClientToken=get_mirror_session_client_token(eni.eni_id, traffic_filter, virtual_network),
+            **optional_args
+        )
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] not in MIRROR_SESSION_CONFLICT_CODES:
+            raise
+
+        # Another invocation beat us to it, possibly on a different Target.  If a Session already exists for this
+        # ENI/Filter/VNI combination, that's the one we want.
+        existing_sessions = get_mirror_sessions_of_eni(eni.eni_id, aws_provider, traffic_filter=traffic_filter,
+                                                       virtual_network=virtual_network)
+        if not existing_sessions:
+            raise
 
-    return create_session_response["TrafficMirrorSession"]["TrafficMirrorSessionId"]
+        logger.info(f"Mirroring Session already exists for ENI {eni.eni_id} ({exc.response['Error']['Code']});"
+                    + f" using {existing_sessions[0].session_id} on Target {existing_sessions[0].target_id}")
+        return existing_sessions[0]
+
+    session_id = create_session_response["TrafficMirrorSession"]["TrafficMirrorSessionId"]
+    return MirrorSession(session_id, eni.eni_id, traffic_target, traffic_filter, virtual_network)
+
+def _to_mirror_sessions(describe_response: Dict[str, any]) -> List[MirrorSession]:
+    return [
+        MirrorSession(
+            session["TrafficMirrorSessionId"],
+            session["NetworkInterfaceId"],
+            session["TrafficMirrorTargetId"],
+            session["TrafficMirrorFilterId"],
+            session.get("VirtualNetworkId"),
+        )
+        for session in describe_response.get("TrafficMirrorSessions", [])
+    ]
 
+def _get_mirror_sessions(filters: List[Dict[str, any]], aws_provider: AwsClientProvider) -> List[MirrorSession]:
+    ec2_client = aws_provider.get_ec2()
+    describe_response = ec2_client.describe_traffic_mirror_sessions(Filters=filters)
+    sessions = _to_mirror_sessions(describe_response)
+
+    next_token = describe_response.get("NextToken")
+    while next_token:
+        describe_response = ec2_client.describe_traffic_mirror_sessions(Filters=filters, NextToken=next_token)
+        sessions.extend(_to_mirror_sessions(describe_response))
+        next_token = describe_response.get("NextToken")
+
+    return sessions
+
+def get_mirror_sessions_of_eni(eni_id: str, aws_provider: AwsClientProvider, traffic_target: str = None,
+                               virtual_network: int = None, traffic_filter: str = None) -> List[MirrorSession]:
+    """
+    Gets the Traffic Mirroring Sessions whose source is the specified ENI, optionally narrowed to a specific Target,
+    VNI, and/or Filter.
+    """
+    filters = [{"Name": "network-interface-id", "Values": [eni_id]}]
+    if traffic_target:
+        filters.append({"Name": "traffic-mirror-target-id", "Values": [traffic_target]})
+    if traffic_filter:
+        filters.append({"Name": "traffic-mirror-filter-id", "Values": [traffic_filter]})
+    if virtual_network is not None:
+        filters.append({"Name": "virtual-network-id", "Values": [str(virtual_network)]})
+
+    return _get_mirror_sessions(filters, aws_provider)
+
+def get_mirror_sessions_of_filter(traffic_filter: str, aws_provider: AwsClientProvider) -> List[MirrorSession]:
+    """
+    Gets the Traffic Mirroring Sessions using the specified Traffic Filter; as each User VPC has its own Filter, this
+    is every Session we've created for that VPC.
+    """
+    return _get_mirror_sessions([{"Name": "traffic-mirror-filter-id", "Values": [traffic_filter]}], aws_provider)
+
+def get_duplicate_mirror_sessions(traffic_filter: str, aws_provider: AwsClientProvider) -> Dict[str, List[MirrorSession]]:
+    """
+    Scans the Traffic Mirroring Sessions using the specified (VPC-specific) Traffic Filter and returns those ENIs that
+    are the source of more than one Session, mapped to their Sessions.  Each duplicate means the ENI's traffic is being
+    sent to the Capture Nodes more than once.
+    """
+    sessions = get_mirror_sessions_of_filter(traffic_filter, aws_provider)
+
+    sessions_by_eni: Dict[str, List[MirrorSession]] = {}
+    for session in sessions:
+        sessions_by_eni.setdefault(session.eni_id, []).append(session)
+
+    return {eni_id: eni_sessions for eni_id, eni_sessions in sessions_by_eni.items() if len(eni_sessions) > 1}
 
 class MirrorDoesntExist(Exception):
     def __init__(self, session: str):
@@ -191,4 +354,19 @@ def get_azs_in_region(aws_provider: AwsClientProvider) -> List[str]:
     azs = [az["ZoneName"] for az in response["AvailabilityZones"]]
     azs.sort() # Ensure stable ordering
 
-    return azs
\ No newline at end of file
+    return azs
+
+def get_gwlb_arns_of_endpoint_service(service_id: str, aws_provider: AwsClientProvider) -> List[str]:
+    """
+    Gets the ARNs of the Gateway Load Balancers behind a VPC Endpoint Service, such as the one fronting our Capture
+    Nodes.
+    """
+    ec2_client = aws_provider.get_ec2()
+    response = ec2_client.describe_vpc_endpoint_service_configurations(
+        ServiceIds=[service_id]
+    )
+
+    gwlb_arns = []
+    for service_config in response.get("ServiceConfigurations", []):
+        gwlb_arns.extend(service_config.get("GatewayLoadBalancerArns", []))
+    return gwlb_arns
@@ -1,14 +1,26 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 import json
 import logging
+import time
 from typing import Dict, List
 
 from aws_interactions.aws_client_provider import AwsClientProvider
+from aws_interactions.cloudwatch_interactions import MetricsBuffer
 import core.constants as constants
 
 
 logger = logging.getLogger(__name__)
 
+# EventBridge accepts at most this many entries per PutEvents call
+PUT_EVENTS_MAX_ENTRIES = 10
+DEFAULT_PUT_EVENTS_CONCURRENCY = 8
+
+METRIC_EVENTS_PUT = "EventsPut"
+METRIC_EVENTS_FAILED = "EventsFailed"
+METRIC_PUT_EVENTS_LATENCY = "PutEventsLatency"
+
 class ArkimeEvent(ABC):
     @classmethod
     def from_event_dict(cls, raw_event: Dict[str, any]):
@@ -44,27 +56,62 @@ class ArkimeEvent(ABC):
         return self.source == other.source and self.detail_type == other.detail_type and self.details == other.details
     
 class ConfigureIsmEvent(ArkimeEvent):
-    def __init__(self, history_days: int, spi_days: int, replicas: int):
+    def __init__(self, history_days: int, spi_days: int, replicas: int, sessions_shards: int = None, hot_days: int = None,
+                 warm_tier: bool = None, index_profile: str = None, sessions_rotation: str = None):
         super().__init__()
 
         self.history_days = history_days
         self.spi_days = spi_days
         self.replicas = replicas
+        self.sessions_shards = sessions_shards
+        self.hot_days = hot_days
+        self.warm_tier = warm_tier
+        self.index_profile = index_profile
+        self.sessions_rotation = sessions_rotation
 
     @property
     def details(self) -> Dict[str, any]:
-        return {
+        details = {
             "history_days": self.history_days,
             "spi_days": self.spi_days,
             "replicas": self.replicas,
         }
+        # Only plans made after shard planning was added have a shard count
+        if self.sessions_shards is not None:
+            details["sessions_shards"] = self.sessions_shards
+        # Only Domains with an UltraWarm tier move their sessions data off the hot nodes
+        if self.warm_tier:
+            details["hot_days"] = self.hot_days
+            details["warm_tier"] = self.warm_tier
+        # Only Clusters that have chosen an index settings profile have their indexing settings managed
+        if self.index_profile:
+            details["index_profile"] = self.index_profile
+        # Only plans made after rotation planning was added have a rotation; the rest rotate daily
+        if self.sessions_rotation:
+            details["sessions_rotation"] = self.sessions_rotation
+        return details
 
     @property
     def detail_type(self) -> str:
         return constants.EVENT_DETAIL_TYPE_CONFIGURE_ISM
 
+def get_event_timestamp(raw_event: Dict[str, any]) -> float:
+    """
+    The epoch time at which an AWS Service generated the EventBridge event, or None if it doesn't say
+    """
+    raw_time = raw_event.get("time")
+    if not raw_time:
+        return None
+    return datetime.fromisoformat(raw_time.replace("Z", "+00:00")).timestamp()
+
 class CreateEniMirrorEvent(ArkimeEvent):
-    def __init__(self, cluster_name: str, vpc_id: str, subnet_id: str, eni_id: str, eni_type: str, traffic_filter_id: str, vni: int):
+    def __init__(self, cluster_name: str, vpc_id: str, subnet_id: str, eni_id: str, eni_type: str, traffic_filter_id: str, vni: int,
+                 source_event_time: float = None, published_time: float = None):
+        """
+        source_event_time is when the AWS Service event (e.g. an EC2 Instance reaching "running") that led to this event
+        was generated, and published_time is when we put this event to the bus; both are epoch seconds.  They're only
+        set for events generated by the listener and are how we measure the time it takes to start mirroring an ENI.
+        """
         super().__init__()
 
         self.cluster_name = cluster_name
@@ -74,10 +121,12 @@ class CreateEniMirrorEvent(ArkimeEvent):
         self.eni_type = eni_type
         self.traffic_filter_id = traffic_filter_id
         self.vni = vni
+        self.source_event_time = source_event_time
+        self.published_time = published_time
 
     @property
     def details(self) -> Dict[str, any]:
-        return {
+        details = {
             "cluster_name": self.cluster_name,
             "vpc_id": self.vpc_id,
             "subnet_id": self.subnet_id,
@@ -86,6 +135,10 @@ class CreateEniMirrorEvent(ArkimeEvent):
             "traffic_filter_id": self.traffic_filter_id,
             "vni": self.vni,
         }
+        if self.source_event_time is not None:
+            details["source_event_time"] = self.source_event_time
+            details["published_time"] = self.published_time
+        return details
 
     @property
     def detail_type(self) -> str:
@@ -114,7 +167,10 @@ class DestroyEniMirrorEvent(ArkimeEvent):
         return constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR
 
 
-def put_events(events: List[ArkimeEvent], event_bus_arn: str, aws_client_provider: AwsClientProvider):
+def put_events(events: List[ArkimeEvent], event_bus_arn: str, aws_client_provider: AwsClientProvider) -> int:
+    """
+    Puts the events to the bus and returns the number that EventBridge failed to accept
+    """
     logger.debug(f"Putting {len(events)} events to Event Bus {event_bus_arn}...")
     for event in events:
         logger.debug(f"Putting Event: {str(event)}")
@@ -130,6 +186,41 @@ def put_events(events: List[ArkimeEvent], event_bus_arn: str, aws_client_provide
     ]
 
     events_client = aws_client_provider.get_events()
-    events_client.put_events(
+    response = events_client.put_events(
         Entries=event_entries
     )
+    return response.get("FailedEntryCount", 0)
+
+def put_events_in_batches(events: List[ArkimeEvent], event_bus_arn: str, aws_client_provider: AwsClientProvider,
+                          max_workers: int = DEFAULT_PUT_EVENTS_CONCURRENCY, metrics_buffer: MetricsBuffer = None) -> int:
+    """
+    Puts a large number of events to the bus in full-sized batches, several batches at a time, logging progress as
+    it goes.  Returns the number of events that EventBridge failed to accept.  If a metrics buffer is supplied, the
+    outcome and latency of each batch are recorded to it.
+    """
+    batches = [events[i:i + PUT_EVENTS_MAX_ENTRIES] for i in range(0, len(events), PUT_EVENTS_MAX_ENTRIES)]
+
+    def put_batch(batch: List[ArkimeEvent]) -> int:
+        start_time = time.time()
+        try:
+            batch_failed = put_events(batch, event_bus_arn, aws_client_provider)
+        except Exception as ex:
+            logger.warning(f"Unable to put a batch of {len(batch)} events: {ex}")
+            batch_failed = len(batch)
+
+        if metrics_buffer:
+            metrics_buffer.add(METRIC_EVENTS_PUT, len(batch) - batch_failed)
+            metrics_buffer.add(METRIC_EVENTS_FAILED, batch_failed)
+            metrics_buffer.add(METRIC_PUT_EVENTS_LATENCY, int((time.time() - start_time) * 1000), unit="Milliseconds")
+        return batch_failed
+
+    num_sent = 0
+    num_failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(put_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            num_sent += len(futures[future])
+            num_failed += future.result()
+            logger.info(f"Sent {num_sent}/{len(events)} events ({num_failed} failed)")
+
+    return num_failed
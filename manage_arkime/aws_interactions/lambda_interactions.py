@@ -0,0 +1,30 @@
+import json
+import logging
+from typing import Dict
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+
+logger = logging.getLogger(__name__)
+
+class LambdaInvocationFailed(Exception):
+    def __init__(self, function_name: str, error: str):
+        super().__init__(f"Invocation of Lambda {function_name} failed: {error}")
+
+def invoke_lambda(function_name: str, payload: Dict[str, any], aws_provider: AwsClientProvider) -> Dict[str, any]:
+    """
+    Synchronously invokes the Lambda and returns its (JSON) response.  Raises if the invocation itself failed, such as
+    by an unhandled exception or a timeout in the function.
+    """
+    logger.debug(f"Invoking Lambda {function_name}...")
+    lambda_client = aws_provider.get_lambda()
+    response = lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType="RequestResponse",
+        Payload=json.dumps(payload).encode("utf-8"),
+    )
+
+    raw_payload = response["Payload"].read()
+    if "FunctionError" in response:
+        raise LambdaInvocationFailed(function_name, raw_payload.decode("utf-8"))
+
+    return json.loads(raw_payload) if raw_payload else {}
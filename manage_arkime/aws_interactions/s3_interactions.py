@@ -1,3 +1,4 @@
+from datetime import date, datetime, timezone
 from enum import Enum
 import logging
 import os
@@ -189,6 +190,30 @@ def list_bucket_objects(bucket_name: str, aws_provider: AwsClientProvider, prefi
     
     return all_objects
 
+def get_bytes_written_by_day(bucket_name: str, start: datetime, end: datetime, aws_provider: AwsClientProvider,
+                             prefix: str = None) -> Dict[date, int]:
+    """
+    Sums the size of all objects in an S3 bucket last modified in the window [start, end), by the (UTC) day they were
+    last modified
+    """
+    s3_client = aws_provider.get_s3()
+
+    paginator = s3_client.get_paginator('list_objects_v2')
+    page_iterator = (
+        paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+        if prefix
+        else paginator.paginate(Bucket=bucket_name)
+    )
+
+    bytes_by_day: Dict[date, int] = {}
+    for page in page_iterator:
+        for obj in page.get('Contents', []):
+            if start <= obj["LastModified"] < end:
+                day = obj["LastModified"].astimezone(timezone.utc).date()
+                bytes_by_day[day] = bytes_by_day.get(day, 0) + obj["Size"]
+
+    return bytes_by_day
+
 def get_object_user_metadata(bucket_name: str, s3_key: str, aws_provider: AwsClientProvider) -> Dict[str, str]:
     """
     Gets the user-defined object metadata for a specified S3 Key
@@ -12,6 +12,10 @@ class ParamDoesNotExist(Exception):
     def __init__(self, param_name: str):
         super().__init__(f"The SSM Parameter {param_name} does not exist")
 
+class ParamAlreadyExists(Exception):
+    def __init__(self, param_name: str):
+        super().__init__(f"The SSM Parameter {param_name} already exists")
+
 def get_ssm_param_value(param_name: str, aws_client_provider: AwsClientProvider) -> str:
     return _get_ssm_param(param_name, aws_client_provider)["Value"]
 
@@ -62,15 +66,20 @@ def put_ssm_param(param_name: str, param_value: str, aws_client_provider: AwsCli
     logger.debug(f"Putting SSM Parameter {param_name}; overwrite enabled: {overwrite}.  Value: {param_value}")
 
     ssm_client = aws_client_provider.get_ssm()
-    ssm_client.put_parameter(
-        Name=param_name,
-        Description=description,
-        Value=param_value,
-        Type="String",
-        AllowedPattern=pattern,
-        Tier='Standard',
-        Overwrite=overwrite
-    )
+    try:
+        ssm_client.put_parameter(
+            Name=param_name,
+            Description=description,
+            Value=param_value,
+            Type="String",
+            AllowedPattern=pattern,
+            Tier='Standard',
+            Overwrite=overwrite
+        )
+    except ClientError as exc:
+        if exc.response['Error']['Code'] == 'ParameterAlreadyExists':
+            raise ParamAlreadyExists(param_name=param_name)
+        raise
 
 def delete_ssm_param(param_name: str, aws_client_provider: AwsClientProvider):
     ssm_client = aws_client_provider.get_ssm()
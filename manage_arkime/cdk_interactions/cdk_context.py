@@ -5,6 +5,7 @@ from typing import Dict, List
 
 import core.constants as constants
 from core.capacity_planning import ClusterPlan
+from core.mirror_profile import MirrorProfile
 from core.user_config import UserConfig
 
 @dataclass
@@ -94,8 +95,8 @@ def _generate_cluster_context(name: str, viewer_cert_arn: str, cluster_plan: Clu
     }
 
 def generate_vpc_add_context(cluster_name: str, vpc_id: str, subnet_ids: str, vpce_service_id: str, vni: int,
-                             cidrs: List[str]) -> Dict[str, str]:
-    add_context = _generate_mirroring_context(cluster_name, vpc_id, subnet_ids, vpce_service_id, vni, cidrs)
+                             cidrs: List[str], mirror_profile: MirrorProfile = None) -> Dict[str, str]:
+    add_context = _generate_mirroring_context(cluster_name, vpc_id, subnet_ids, vpce_service_id, vni, cidrs, mirror_profile)
     add_context[constants.CDK_CONTEXT_CMD_VAR] = constants.CMD_vpc_add
     return add_context
 
@@ -110,7 +111,10 @@ def generate_vpc_remove_context(cluster_name: str, vpc_id: str, subnet_ids: str,
     return remove_context
 
 def _generate_mirroring_context(cluster_name: str, vpc_id: str, subnet_ids: str, vpce_service_id: str, vni: int,
-                                cidrs: List[str]) -> Dict[str, str]:
+                                cidrs: List[str], mirror_profile: MirrorProfile = None) -> Dict[str, str]:
+    if not mirror_profile:
+        mirror_profile = MirrorProfile()
+
     cmd_params = {
         "nameCluster": cluster_name,
         "nameVpcMirrorStack": constants.get_vpc_mirror_setup_stack_name(cluster_name, vpc_id),
@@ -120,7 +124,8 @@ def _generate_mirroring_context(cluster_name: str, vpc_id: str, subnet_ids: str,
         "idVpceService": vpce_service_id,
         "listSubnetIds": subnet_ids,
         "listSubnetSsmParams": [constants.get_subnet_ssm_param_name(cluster_name, vpc_id, subnet_id) for subnet_id in subnet_ids],
-        "vpcCidrs": cidrs
+        "vpcCidrs": cidrs,
+        "mirrorProfile": mirror_profile.to_dict()
     }
 
     return {
@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta, timezone
+import json
+import logging
+from typing import Dict
+
+import requests
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.cloudwatch_interactions as cwi
+import aws_interactions.ec2_interactions as ec2i
+import aws_interactions.s3_interactions as s3
+import aws_interactions.ssm_operations as ssm_ops
+from core.capacity_planning import ClusterPlan, SESSIONS_ROTATION_WEEKLY
+import core.constants as constants
+import core.shell_interactions as shell
+from core.storage_calibration import (StorageCalibration, NotEnoughObservations, calibrate_storage,
+                                      get_sessions_bytes_by_day)
+from core.traffic_profile import get_observed_traffic_query, TRAFFIC_QUERY_KEY
+from opensearch_interactions.ism_policies import INDEX_PATTERN_SESSIONS
+from opensearch_interactions.cluster_client import get_cluster_os_client, UNREACHABLE_DOMAIN_HINT
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+class CouldntListSessionsIndices(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Unable to list the sessions indices (code {status_code}): {text}")
+
+def cmd_cluster_calibrate_storage(profile: str, region: str, name: str, days: int, os_endpoint: str) -> StorageCalibration:
+    logger.debug(f"Invoking cluster-calibrate-storage with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    # Only look at complete (UTC) days, so the traffic, SPI, and PCAP all cover the same window
+    end_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(days=days)
+
+    try:
+        cluster_details = json.loads(ssm_ops.get_ssm_param_value(constants.get_cluster_ssm_param_name(name), aws_provider))
+    except ssm_ops.ParamDoesNotExist:
+        logger.error(f"The Cluster {name} does not appear to exist")
+        logger.warning("Aborting...")
+        return None
+
+    # Weekly index names don't say which day each session came from, so there's nothing to compare the traffic with
+    capacity_plan = ClusterPlan.from_dict(cluster_details["capacityPlan"])
+    if capacity_plan.osDomain.sessionsRotation == SESSIONS_ROTATION_WEEKLY:
+        logger.error(f"The Cluster {name} rotates its sessions indices weekly, so its sessions data can't be split into"
+                     + " days to calibrate against the traffic; its capacity plan will keep using the default ratios")
+        logger.warning("Aborting...")
+        return None
+
+    logger.info(f"Pulling the Cluster's traffic, SPI, and PCAP over the last {days} full day(s)...")
+    try:
+        traffic_by_day = _get_traffic_bytes_by_day(cluster_details["vpceServiceId"], start_time, end_time, aws_provider)
+        sessions_by_day = _get_sessions_bytes_by_day(name, os_endpoint, start_time, end_time, aws_provider)
+    except CouldntListSessionsIndices as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return None
+    except requests.exceptions.ConnectionError as e:
+        logger.error(e)
+        logger.error(UNREACHABLE_DOMAIN_HINT)
+        logger.warning("Aborting...")
+        return None
+
+    bucket_name = ssm_ops.get_ssm_param_value(constants.get_capture_bucket_ssm_param_name(name), aws_provider)
+    pcap_by_day = s3.get_bytes_written_by_day(bucket_name, start_time, end_time, aws_provider)
+
+    try:
+        calibration = calibrate_storage(traffic_by_day, sessions_by_day, pcap_by_day, days, datetime.now(timezone.utc))
+    except NotEnoughObservations as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return None
+    logger.info(calibration.get_report())
+    if calibration.days < days:
+        logger.warning(f"Only {calibration.days} of the {days} day(s) had both traffic and sessions indices to compare")
+
+    implausible_ratios = calibration.get_implausible_ratios()
+    if implausible_ratios:
+        for description in implausible_ratios:
+            logger.warning(description)
+        if not _confirm_implausible_calibration():
+            logger.info("Aborting per user response")
+            return None
+
+    # Future capacity plans for the Cluster will use the calibrated ratios instead of the defaults
+    ssm_ops.put_ssm_param(
+        constants.get_storage_calibration_ssm_param_name(name),
+        json.dumps(calibration.to_dict()),
+        aws_provider,
+        description="The observed storage ratios of the Cluster",
+        overwrite=True
+    )
+    logger.info("Saved the calibration; run cluster-create to re-plan the Cluster with it")
+
+    return calibration
+
+def _confirm_implausible_calibration() -> bool:
+    confirm_prompt = (
+        "The calibrated ratios are far from the defaults.  That usually means some of the Cluster's data wasn't found,"
+        + " e.g. the wrong --os-endpoint or more --days than the Cluster retains, and planning from them could badly"
+        + " resize the Cluster.\n"
+        + "Do you want to save the calibration anyway (y/yes or n/no)? "
+    )
+    prompt_response = shell.louder_input(message=confirm_prompt, print_header=True)
+    return prompt_response.strip().lower() in ["y", "yes"]
+
+def _get_traffic_bytes_by_day(vpce_service_id: str, start_time: datetime, end_time: datetime,
+                              aws_provider: AwsClientProvider) -> Dict[date, float]:
+    gwlb_arns = ec2i.get_gwlb_arns_of_endpoint_service(vpce_service_id, aws_provider)
+    if not gwlb_arns:
+        return {}
+    gwlb_dimension = gwlb_arns[0].split(":loadbalancer/")[-1]
+
+    results = cwi.get_metric_data(
+        [get_observed_traffic_query(gwlb_dimension)], start_time, end_time, SECONDS_PER_DAY, aws_provider,
+        with_timestamps=True
+    )
+    return {timestamp.astimezone(timezone.utc).date(): value for timestamp, value in results.get(TRAFFIC_QUERY_KEY, [])}
+
+def _get_sessions_bytes_by_day(cluster_name: str, os_endpoint: str, start_time: datetime, end_time: datetime,
+                               aws_provider: AwsClientProvider) -> Dict[date, int]:
+    os_client = get_cluster_os_client(cluster_name, aws_provider, os_endpoint)
+    response = os_client.cat_indices(INDEX_PATTERN_SESSIONS)
+    if not response.succeeded:
+        raise CouldntListSessionsIndices(response.status_code, response.response_text)
+
+    bytes_by_day = get_sessions_bytes_by_day(response.response_json or [])
+    return {
+        day: num_bytes for day, num_bytes in bytes_by_day.items()
+        if start_time.date() <= day < end_time.date()
+    }
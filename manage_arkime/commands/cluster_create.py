@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 import ipaddress
 import json
 import logging
@@ -9,6 +10,7 @@ import arkime_interactions.config_wrangling as config_wrangling
 from aws_interactions.acm_interactions import upload_default_elb_cert
 from aws_interactions.aws_client_provider import AwsClientProvider
 from aws_interactions.aws_environment import AwsEnvironment
+import aws_interactions.cloudwatch_interactions as cwi
 import aws_interactions.events_interactions as events
 import aws_interactions.ec2_interactions as ec2
 import aws_interactions.s3_interactions as s3
@@ -19,12 +21,16 @@ import cdk_interactions.cfn_wrangling as cfn
 import core.constants as constants
 from core.local_file import LocalFile, S3File
 from core.usage_report import UsageReport
-from core.price_report import PriceReport
+from core.capture_tuning import get_capture_tuning, get_viewer_tuning_settings
+from core.price_report import PriceReport, PCAP_STORAGE_RATIO
+from core.storage_calibration import StorageCalibration
+from core.traffic_profile import (TrafficProfile, NoTrafficObserved, DEFAULT_TRAFFIC_PERCENTILE, bytes_to_gbps,
+                                  get_observed_traffic_query, get_traffic_profile, TRAFFIC_QUERY_KEY)
 import core.compatibility as compat
 from core.capacity_planning import (get_capture_node_capacity_plan, get_viewer_node_capacity_plan, get_ecs_sys_resource_plan, get_os_domain_plan,
                                     ClusterPlan, VpcPlan, get_capture_vpc_plan, S3Plan, DEFAULT_S3_STORAGE_CLASS,
                                     CaptureNodesPlan, ViewerNodesPlan, DataNodesPlan, EcsSysResourcePlan, MasterNodesPlan, OSDomainPlan,
-                                    get_viewer_vpc_plan)
+                                    get_viewer_vpc_plan, get_sessions_rotation_changed_at, MAGIC_FACTOR)
 import core.versioning as ver
 from core.user_config import UserConfig
 
@@ -32,7 +38,8 @@ logger = logging.getLogger(__name__)
 
 def cmd_cluster_create(profile: str, region: str, name: str, expected_traffic: float, spi_days: int, history_days: int, replicas: int,
                        pcap_days: int, preconfirm_usage: bool, just_print_cfn: bool, capture_cidr: str, viewer_cidr: str, viewer_prefix_list: str,
-                       extra_tags: List[Dict[str, str]]):
+                       extra_tags: List[Dict[str, str]], right_size_days: int = None,
+                       right_size_percentile: str = DEFAULT_TRAFFIC_PERCENTILE, hot_days: int = None, index_profile: str = None):
     logger.debug(f"Invoking cluster-create with profile '{profile}' and region '{region}'")
 
     aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
@@ -49,21 +56,50 @@ def cmd_cluster_create(profile: str, region: str, name: str, expected_traffic: f
             logger.warning("Aborting...")
             return
 
+    # If asked, derive the expected traffic from what the Cluster has actually been seeing
+    if right_size_days:
+        if expected_traffic is not None:
+            logger.error("You can't both specify the expected traffic and ask for it to be right-sized from observations")
+            logger.warning("Aborting...")
+            return
+        if is_initial_invocation:
+            logger.error("The Cluster must already exist and be capturing traffic in order to right-size it")
+            logger.warning("Aborting...")
+            return
+
+        try:
+            traffic_profile = _get_observed_traffic_profile(name, right_size_days, aws_provider)
+        except NoTrafficObserved as e:
+            logger.error(e)
+            logger.warning("Aborting...")
+            return
+
+        expected_traffic = traffic_profile.get_recommended_traffic(right_size_percentile)
+        logger.info(traffic_profile.get_report())
+        logger.info(f"Right-sizing the Cluster for the observed {right_size_percentile} traffic of {expected_traffic} Gbps")
+        if traffic_profile.is_bursty(right_size_percentile):
+            logger.warning(f"The observed peak of {traffic_profile.peak:.3f} Gbps exceeds the Capture Nodes' scaling headroom"
+                           + f" over the {right_size_percentile}; traffic during the largest bursts may be dropped")
+
     # Generate our capacity plan, then confirm it's what the user expected and it's safe to proceed with the operation
     previous_user_config = _get_previous_user_config(name, aws_provider)
-    next_user_config = _get_next_user_config(name, expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags, aws_provider)
+    next_user_config = _get_next_user_config(name, expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags, aws_provider,
+                                             hot_days=hot_days, index_profile=index_profile)
     previous_capacity_plan = _get_previous_capacity_plan(name, aws_provider)
-    next_capacity_plan = _get_next_capacity_plan(next_user_config, previous_capacity_plan, capture_cidr, viewer_cidr, aws_provider)
+    storage_calibration = _get_storage_calibration(name, aws_provider)
+    next_capacity_plan = _get_next_capacity_plan(next_user_config, previous_capacity_plan, capture_cidr, viewer_cidr, aws_provider,
+                                                 storage_calibration=storage_calibration)
 
     if not _should_proceed_with_operation(is_initial_invocation, previous_capacity_plan, next_capacity_plan, previous_user_config,
-                                          next_user_config, preconfirm_usage, capture_cidr, viewer_cidr):
+                                          next_user_config, preconfirm_usage, capture_cidr, viewer_cidr,
+                                          storage_calibration=storage_calibration):
         return
 
     # Set up the cert the Viewers use for HTTPS
     cert_arn = _set_up_viewer_cert(name, aws_provider)
 
     # Set up the Arkime Config so it's available in-AWS
-    _set_up_arkime_config(name, aws_provider)
+    _set_up_arkime_config(name, aws_provider, next_capacity_plan, next_user_config)
 
     # Define the CFN Resources and CDK Context
     stacks_to_deploy = _get_stacks_to_deploy(name, next_user_config, next_capacity_plan)
@@ -84,7 +120,11 @@ def cmd_cluster_create(profile: str, region: str, name: str, expected_traffic: f
         cdk_client.deploy(stacks_to_deploy, context=create_context)
 
         # Kick off Events to ensure that ISM is set up on the CFN-created OpenSearch Domain
-        _configure_ism(name, next_user_config.historyDays, next_user_config.spiDays, next_user_config.replicas, aws_provider)
+        _configure_ism(name, next_user_config.historyDays, next_user_config.spiDays, next_user_config.replicas,
+                       next_capacity_plan.osDomain.sessionsShards, aws_provider, hot_days=next_user_config.hotDays,
+                       warm_tier=next_capacity_plan.osDomain.warmNodes is not None,
+                       index_profile=next_user_config.indexProfile,
+                       sessions_rotation=next_capacity_plan.osDomain.sessionsRotation)
 
 def _is_initial_invocation(cluster_name: str, aws_provider: AwsClientProvider) -> bool:
     # Used to figure out whether consider this invocation is the "initial" creation of the cluster.  Helpful for
@@ -107,7 +147,8 @@ def _is_initial_invocation(cluster_name: str, aws_provider: AwsClientProvider) -
 
 def _should_proceed_with_operation(initial_invocation: bool, previous_capacity_plan: ClusterPlan, next_capacity_plan: ClusterPlan,
                                    previous_user_config: UserConfig, next_user_config: UserConfig, preconfirm_usage: bool,
-                                   capture_cidr_block: str, viewer_cidr_block: str) -> bool:
+                                   capture_cidr_block: str, viewer_cidr_block: str,
+                                   storage_calibration: StorageCalibration = None) -> bool:
 
     if (not initial_invocation) and (capture_cidr_block or viewer_cidr_block):
         # We can't change the CIDR without tearing down the VPC, which effectively means tearing down the entire
@@ -126,7 +167,8 @@ def _should_proceed_with_operation(initial_invocation: bool, previous_capacity_p
                          f" CIDR ({str(capture_network)}).  Please ensure these two CIDRs do not overlap.")
             return False
 
-    if not _confirm_usage(previous_capacity_plan, next_capacity_plan, previous_user_config, next_user_config, preconfirm_usage):
+    if not _confirm_usage(previous_capacity_plan, next_capacity_plan, previous_user_config, next_user_config, preconfirm_usage,
+                          storage_calibration=storage_calibration):
         logger.info("Aborting per user response")
         return False
 
@@ -139,6 +181,29 @@ def _should_proceed_with_operation(initial_invocation: bool, previous_capacity_p
 
     return True
 
+def _get_observed_traffic_profile(cluster_name: str, days: int, aws_provider: AwsClientProvider) -> TrafficProfile:
+    # All the mirrored traffic arrives at the Capture Nodes through the Cluster's GWLB, so its ProcessedBytes is the
+    # most direct measure of what the Cluster needs to handle
+    vpce_service_id = ssm_ops.get_ssm_param_json_value(
+        constants.get_cluster_ssm_param_name(cluster_name),
+        "vpceServiceId",
+        aws_provider
+    )
+    gwlb_arns = ec2.get_gwlb_arns_of_endpoint_service(vpce_service_id, aws_provider)
+    if not gwlb_arns:
+        raise NoTrafficObserved()
+    gwlb_dimension = gwlb_arns[0].split(":loadbalancer/")[-1]
+
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(days=days)
+    period = cwi.get_metric_data_period(start_time, end_time, min_period=300, num_queries=1)
+
+    logger.info(f"Pulling the Cluster's observed traffic over the last {days} day(s)...")
+    results = cwi.get_metric_data([get_observed_traffic_query(gwlb_dimension)], start_time, end_time, period, aws_provider)
+    throughputs = [bytes_to_gbps(value, period) for value in results.get(TRAFFIC_QUERY_KEY, [])]
+
+    return get_traffic_profile(throughputs, period)
+
 def _get_previous_user_config(cluster_name: str, aws_provider: AwsClientProvider) -> UserConfig:
     # Pull the existing config, if possible
     try:
@@ -154,7 +219,8 @@ def _get_previous_user_config(cluster_name: str, aws_provider: AwsClientProvider
         return UserConfig(None, None, None, None, None)
 
 def _get_next_user_config(cluster_name: str, expected_traffic: float, spi_days: int, history_days: int, replicas: int,
-                          pcap_days: int, viewer_prefix_list: str, extra_tags: str, aws_provider: AwsClientProvider) -> UserConfig:
+                          pcap_days: int, viewer_prefix_list: str, extra_tags: str, aws_provider: AwsClientProvider,
+                          hot_days: int = None, index_profile: str = None) -> UserConfig:
     # At least one parameter isn't defined
     if None in [expected_traffic, spi_days, replicas, pcap_days, history_days, viewer_prefix_list]:
         # Re-use the existing configuration if it exists
@@ -183,14 +249,20 @@ def _get_next_user_config(cluster_name: str, expected_traffic: float, spi_days:
                 user_config.viewerPrefixList = viewer_prefix_list
             if extra_tags is not None:
                 user_config.extraTags = extra_tags
+            if hot_days is not None:
+                user_config.hotDays = hot_days
+            if index_profile is not None:
+                user_config.indexProfile = index_profile
             return user_config
 
         # Existing configuration doesn't exist, use defaults
         except ssm_ops.ParamDoesNotExist:
-            return UserConfig(expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags)
+            return UserConfig(expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags,
+                              hot_days, index_profile)
     # All of the parameters defined
     else:
-        return UserConfig(expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags)
+        return UserConfig(expected_traffic, spi_days, history_days, replicas, pcap_days, viewer_prefix_list, extra_tags,
+                          hot_days, index_profile)
 
 def _get_previous_capacity_plan(cluster_name: str, aws_provider: AwsClientProvider) -> ClusterPlan:
     # Pull the existing plan, if possible
@@ -214,13 +286,47 @@ def _get_previous_capacity_plan(cluster_name: str, aws_provider: AwsClientProvid
             None
         )
 
+def _get_storage_calibration(cluster_name: str, aws_provider: AwsClientProvider) -> StorageCalibration:
+    # Pull the Cluster's observed storage ratios, if it's been calibrated
+    try:
+        stored_calibration = ssm_ops.get_ssm_param_value(
+            constants.get_storage_calibration_ssm_param_name(cluster_name),
+            aws_provider
+        )
+    except ssm_ops.ParamDoesNotExist:
+        return None
+
+    calibration = StorageCalibration.from_dict(json.loads(stored_calibration))
+    logger.info(f"Planning storage with the Cluster's calibration from {calibration.calibratedAt}")
+    logger.info(calibration.get_report())
+    for description in calibration.get_implausible_ratios():
+        logger.warning(f"{description}; re-run cluster-calibrate-storage if this isn't expected")
+    return calibration
+
 def _get_next_capacity_plan(user_config: UserConfig, previous_capacity_plan: ClusterPlan, next_capture_cidr: str,
-                            next_viewer_cidr: str, aws_provider: AwsClientProvider) -> ClusterPlan:
+                            next_viewer_cidr: str, aws_provider: AwsClientProvider,
+                            storage_calibration: StorageCalibration = None) -> ClusterPlan:
     az_in_region = ec2.get_azs_in_region(aws_provider)
+    storage_ratio = storage_calibration.spiRatio if storage_calibration else MAGIC_FACTOR
 
     capture_plan = get_capture_node_capacity_plan(user_config.expectedTraffic, az_in_region)
     capture_vpc_plan = get_capture_vpc_plan(previous_capacity_plan.captureVpc, next_capture_cidr, az_in_region)
-    os_domain_plan = get_os_domain_plan(user_config.expectedTraffic, user_config.spiDays, user_config.replicas, len(capture_vpc_plan.azs))
+    os_domain_plan = get_os_domain_plan(user_config.expectedTraffic, user_config.spiDays, user_config.replicas, len(capture_vpc_plan.azs),
+                                        user_config.hotDays, storage_ratio=storage_ratio)
+    if storage_calibration:
+        # Make the calibration's effect visible before it's used, as it can resize the Domain considerably
+        default_os_domain_plan = get_os_domain_plan(user_config.expectedTraffic, user_config.spiDays, user_config.replicas,
+                                                    len(capture_vpc_plan.azs), user_config.hotDays, storage_ratio=MAGIC_FACTOR)
+        logger.info(f"With the storage calibration (ratio of {storage_ratio:.4f}), the OpenSearch Domain's data nodes are planned"
+                    + f" as {_describe_data_nodes(os_domain_plan.dataNodes)} instead of"
+                    + f" {_describe_data_nodes(default_os_domain_plan.dataNodes)} (default ratio of {MAGIC_FACTOR})")
+    # The Viewers keep searching every sessions index until those from an earlier rotation have aged out
+    os_domain_plan.sessionsRotationChangedAt = get_sessions_rotation_changed_at(
+        previous_capacity_plan.osDomain, os_domain_plan.sessionsRotation, datetime.now(timezone.utc)
+    )
+    if user_config.hotDays and not os_domain_plan.warmNodes:
+        logger.warning(f"The hot days ({user_config.hotDays}) cover the full Session Retention ({user_config.spiDays} days);"
+                       + " no UltraWarm tier will be provisioned")
     ecs_resource_plan = get_ecs_sys_resource_plan(capture_plan.instanceType)
     s3_plan = S3Plan(DEFAULT_S3_STORAGE_CLASS, user_config.pcapDays)
     viewer_plan = get_viewer_node_capacity_plan(user_config.expectedTraffic)
@@ -228,11 +334,15 @@ def _get_next_capacity_plan(user_config: UserConfig, previous_capacity_plan: Clu
 
     return ClusterPlan(capture_plan, capture_vpc_plan, ecs_resource_plan, os_domain_plan, s3_plan, viewer_plan, viewer_vpc_plan)
 
+def _describe_data_nodes(data_nodes: DataNodesPlan) -> str:
+    return f"{data_nodes.count}x {data_nodes.instanceType} with {data_nodes.volumeSize} GiB each"
+
 def _confirm_usage(prev_capacity_plan: ClusterPlan, next_capacity_plan: ClusterPlan, prev_user_config: UserConfig,
-                   next_user_config: UserConfig, preconfirm_usage: bool) -> bool:
+                   next_user_config: UserConfig, preconfirm_usage: bool, storage_calibration: StorageCalibration = None) -> bool:
 
     report = UsageReport(prev_capacity_plan, next_capacity_plan, prev_user_config, next_user_config)
-    price_report = PriceReport(next_capacity_plan, next_user_config)
+    pcap_ratio = storage_calibration.pcapRatio if storage_calibration else PCAP_STORAGE_RATIO
+    price_report = PriceReport(next_capacity_plan, next_user_config, pcap_ratio=pcap_ratio)
 
     logger.info(f"Cost estimate report:\n{price_report.get_report()}")
     if preconfirm_usage:
@@ -283,7 +393,8 @@ def _upload_arkime_config_if_necessary(cluster_name: str, bucket_name: str, s3_k
         overwrite=True
     )
 
-def _set_up_arkime_config(cluster_name: str, aws_provider: AwsClientProvider):
+def _set_up_arkime_config(cluster_name: str, aws_provider: AwsClientProvider, capacity_plan: ClusterPlan = None,
+                          user_config: UserConfig = None):
     # Get constants
     aws_env = aws_provider.get_aws_env()
     bucket_name = constants.get_config_bucket_name(aws_env.aws_account, aws_env.aws_region, cluster_name)
@@ -294,6 +405,27 @@ def _set_up_arkime_config(cluster_name: str, aws_provider: AwsClientProvider):
     cluster_config_parent_dir_path = constants.get_repo_root_dir()
     config_wrangling.set_up_arkime_config_dir(cluster_name, aws_env, cluster_config_parent_dir_path)
 
+    # Tune the Capture config for the capacity plan, leaving any settings the operator has changed alone
+    if capacity_plan and user_config:
+        sessions_rotation = capacity_plan.osDomain.sessionsRotation
+        capture_tuning = get_capture_tuning(capacity_plan.captureNodes, user_config.expectedTraffic, sessions_rotation)
+        tuning_changed = config_wrangling.render_capture_tuning(
+            cluster_name, aws_env, cluster_config_parent_dir_path, capture_tuning.to_config_settings()
+        )
+        if tuning_changed:
+            logger.info("Updated the Capture config's plan-driven settings; if the Cluster's Capture config has already"
+                        + " been deployed, run config-update to roll them out")
+
+        # The Viewers need to know how the Capture Nodes rotate the sessions indices to search them
+        viewer_tuning_changed = config_wrangling.render_viewer_tuning(
+            cluster_name, aws_env, cluster_config_parent_dir_path,
+            get_viewer_tuning_settings(sessions_rotation, capacity_plan.osDomain.sessionsRotationChangedAt,
+                                       user_config.spiDays)
+        )
+        if viewer_tuning_changed:
+            logger.info("Updated the Viewer config's plan-driven settings; if the Cluster's Viewer config has already"
+                        + " been deployed, run config-update to roll them out")
+
     # Check whether the S3 bucket exists and whether we have access; error and abort if we don't have access
     try:
         s3.ensure_bucket_exists(bucket_name, aws_provider)
@@ -348,12 +480,15 @@ def _set_up_viewer_cert(name: str, aws_provider: AwsClientProvider) -> str:
 
     return cert_arn
 
-def _configure_ism(cluster_name: str, history_days: int, spi_days: int, replicas: int, aws_provider: AwsClientProvider):
+def _configure_ism(cluster_name: str, history_days: int, spi_days: int, replicas: int, sessions_shards: int,
+                   aws_provider: AwsClientProvider, hot_days: int = None, warm_tier: bool = False, index_profile: str = None,
+                   sessions_rotation: str = None):
     event_bus_arn = ssm_ops.get_ssm_param_json_value(constants.get_cluster_ssm_param_name(cluster_name), "busArn", aws_provider)
 
-    # Configure ISM on the OpenSearch Domain
+    # Configure ISM and the sessions index template on the OpenSearch Domain
     events.put_events(
-        [events.ConfigureIsmEvent(history_days, spi_days, replicas)],
+        [events.ConfigureIsmEvent(history_days, spi_days, replicas, sessions_shards, hot_days, warm_tier, index_profile,
+                                  sessions_rotation)],
         event_bus_arn,
         aws_provider
     )
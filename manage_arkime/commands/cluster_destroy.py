@@ -66,6 +66,7 @@ def cmd_cluster_destroy(profile: str, region: str, name: str, destroy_everything
 
     # Destroy any additional remaining state
     _delete_arkime_config_from_datastore(name, aws_provider)
+    _delete_storage_calibration(name, aws_provider)
 
 def _destroy_viewer_cert(cluster_name: str, aws_provider: AwsClientProvider):
     # Only destroy up the certificate if it exists
@@ -81,6 +82,17 @@ def _destroy_viewer_cert(cluster_name: str, aws_provider: AwsClientProvider):
     destroy_cert(cert_arn, aws_provider) # destroy first so if op fails we still know the ARN
     delete_ssm_param(cert_ssm_param, aws_provider)
 
+def _delete_storage_calibration(cluster_name: str, aws_provider: AwsClientProvider):
+    # Only delete the calibration if the Cluster was calibrated
+    calibration_ssm_param = constants.get_storage_calibration_ssm_param_name(cluster_name)
+    try:
+        get_ssm_param_value(calibration_ssm_param, aws_provider)
+    except ParamDoesNotExist:
+        logger.debug(f"Storage calibration does not exist; skipping deletion")
+        return
+
+    delete_ssm_param(calibration_ssm_param, aws_provider)
+
 def _delete_arkime_config_from_datastore(cluster_name: str, aws_provider: AwsClientProvider):
     # Delete the Arkime config details in Param Store
     delete_ssm_param(
@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+import json
+import logging
+
+import requests
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+from core.capacity_planning import ClusterPlan, is_warm_tiered, SESSIONS_ROTATION_WEEKLY
+import core.constants as constants
+from core.domain_sizing import DomainObservation, DomainSizingReport, NoDataNodesObserved, observe_domain, recommend_os_domain_plan
+from core.user_config import UserConfig
+from opensearch_interactions.cluster_client import get_cluster_os_client, UNREACHABLE_DOMAIN_HINT
+from opensearch_interactions.ism_policies import INDEX_PATTERN_SESSIONS
+from opensearch_interactions.opensearch_client import OpenSearchClient
+from opensearch_interactions.rest_ops import RESTResponse
+
+logger = logging.getLogger(__name__)
+
+class CouldntQueryDomain(Exception):
+    def __init__(self, response: RESTResponse):
+        super().__init__(f"Unable to query the OpenSearch Domain at {response.url} (code {response.status_code}):"
+                         + f" {response.response_text}")
+
+def cmd_cluster_domain_sizing(profile: str, region: str, name: str, os_endpoint: str, output_json: bool) -> DomainSizingReport:
+    logger.debug(f"Invoking cluster-domain-sizing with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    try:
+        cluster_details = json.loads(ssm_ops.get_ssm_param_value(constants.get_cluster_ssm_param_name(name), aws_provider))
+    except ssm_ops.ParamDoesNotExist:
+        logger.error(f"The Cluster {name} does not appear to exist")
+        logger.warning("Aborting...")
+        return None
+    capacity_plan = ClusterPlan.from_dict(cluster_details["capacityPlan"])
+    user_config = UserConfig.from_dict(cluster_details["userConfig"])
+
+    # The daily growth comes from the sessions indices' dates, which weekly index names don't have
+    if capacity_plan.osDomain.sessionsRotation == SESSIONS_ROTATION_WEEKLY:
+        logger.error(f"The Cluster {name} rotates its sessions indices weekly, so its daily growth can't be measured"
+                     + " to size the OpenSearch Domain")
+        logger.warning("Aborting...")
+        return None
+
+    logger.info("Pulling the OpenSearch Domain's allocation, node stats, and settings...")
+    try:
+        os_client = get_cluster_os_client(name, aws_provider, os_endpoint)
+        observed = _observe_domain(os_client, user_config.replicas)
+    except (CouldntQueryDomain, NoDataNodesObserved) as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return None
+    except requests.exceptions.ConnectionError as e:
+        logger.error(e)
+        logger.error(UNREACHABLE_DOMAIN_HINT)
+        logger.warning("Aborting...")
+        return None
+
+    # Only the hot days' worth of SPI data stays on the data nodes when there's a warm tier
+    tiered = is_warm_tiered(user_config.spiDays, user_config.hotDays)
+    retention_days = user_config.hotDays if tiered else user_config.spiDays
+    recommended_plan = recommend_os_domain_plan(capacity_plan.osDomain, observed, retention_days, user_config.replicas,
+                                                len(capacity_plan.captureVpc.azs))
+
+    report = DomainSizingReport(capacity_plan.osDomain, recommended_plan, observed, retention_days)
+    logger.info(f"OpenSearch Domain sizing report:\n{report.get_report()}")
+    if report.needs_resizing():
+        logger.info("To resize the Domain, calibrate the Cluster's storage model with cluster-calibrate-storage and/or"
+                    + " update its --expected-traffic, then re-run cluster-create")
+
+    if output_json:
+        logger.info(f"Domain Sizing: \n{json.dumps(report.to_dict(), indent=4)}")
+    return report
+
+def _get_json(response: RESTResponse) -> any:
+    if not response.succeeded:
+        raise CouldntQueryDomain(response)
+    return response.response_json
+
+def _observe_domain(os_client: OpenSearchClient, replicas: int) -> DomainObservation:
+    return observe_domain(
+        allocation=_get_json(os_client.cat_allocation()),
+        nodes_stats=_get_json(os_client.get_nodes_stats()),
+        cluster_settings=_get_json(os_client.get_cluster_settings()),
+        sessions_indices=_get_json(os_client.cat_indices(INDEX_PATTERN_SESSIONS)) or [],
+        replicas=replicas,
+        today=datetime.now(timezone.utc).date(),
+    )
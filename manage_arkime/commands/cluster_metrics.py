@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+from typing import Dict, List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.cloudwatch_interactions as cwi
+import aws_interactions.ec2_interactions as ec2i
+import aws_interactions.ssm_operations as ssm_ops
+from core.capacity_planning import ClusterPlan
+from core.metrics_report import (ClusterMetricsReport, ClusterMetricsSources, get_cluster_metrics_queries,
+                                 summarize_cluster_metrics)
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_HOURS = 24
+
+def cmd_cluster_metrics(profile: str, region: str, cluster_name: str, hours: int, regions: List[str],
+                        output_json: bool) -> List[Dict[str, any]]:
+    logger.debug(f"Invoking cluster-metrics with profile '{profile}' and region '{region}'")
+
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(hours=hours)
+    target_regions = regions if regions else [region]
+
+    logger.info(f"Pulling the metrics of Cluster {cluster_name} over the last {hours} hour(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, len(target_regions))) as executor:
+        reports = list(executor.map(
+            lambda target_region: _get_region_report(profile, target_region, cluster_name, start_time, end_time),
+            target_regions
+        ))
+
+    reports = [report for report in reports if report]
+    if not reports:
+        logger.warning("Aborting...")
+        return []
+
+    for report in reports:
+        logger.info(report.get_report())
+
+    summary = [report.to_dict() for report in reports]
+    if output_json:
+        logger.info(f"Cluster Metrics: \n{json.dumps(summary, indent=4)}")
+    return summary
+
+def _get_region_report(profile: str, region: str, cluster_name: str, start_time: datetime,
+                       end_time: datetime) -> ClusterMetricsReport:
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+    aws_env = aws_provider.get_aws_env()
+
+    cluster_param_name = constants.get_cluster_ssm_param_name(cluster_name)
+    try:
+        cluster_details = json.loads(ssm_ops.get_ssm_param_value(cluster_param_name, aws_provider))
+        capture_details = json.loads(ssm_ops.get_ssm_param_value(
+            constants.get_capture_details_ssm_param_name(cluster_name),
+            aws_provider
+        ))
+    except ssm_ops.ParamDoesNotExist:
+        logger.error(f"The Cluster {cluster_name} does not appear to exist in {aws_env.aws_region}")
+        return None
+
+    # The GWLB's metrics are reported against the last part of its ARN: gwy/<name>/<id>
+    gwlb_arns = ec2i.get_gwlb_arns_of_endpoint_service(cluster_details["vpceServiceId"], aws_provider)
+    gwlb_dimension = gwlb_arns[0].split(":loadbalancer/")[-1] if gwlb_arns else None
+
+    # Cross-account VPCs report their mirroring metrics in their own account, so we only see our own account's
+    vpc_ids = [
+        name for name in ssm_ops.get_ssm_names_by_path(f"{cluster_param_name}/vpcs", aws_provider)
+        if name.startswith("vpc-")
+    ]
+
+    sources = ClusterMetricsSources(
+        cluster_name,
+        aws_env.aws_account,
+        gwlb_dimension,
+        capture_details["ecsCluster"],
+        capture_details["ecsService"],
+        cluster_details["osDomainName"],
+        vpc_ids
+    )
+    plan = ClusterPlan.from_dict(cluster_details["capacityPlan"])
+    period = cwi.get_metric_data_period(start_time, end_time, min_period=300)
+
+    queries = get_cluster_metrics_queries(sources, plan, period)
+    logger.debug(f"Running {len(queries)} metric queries in {aws_env.aws_region}...")
+    results = cwi.get_metric_data(queries, start_time, end_time, period, aws_provider)
+
+    return summarize_cluster_metrics(sources, plan, period, aws_env.aws_region, results)
@@ -0,0 +1,58 @@
+import json
+import logging
+from typing import Dict, List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from opensearch_interactions.cluster_client import get_cluster_os_client, UNREACHABLE_DOMAIN_HINT
+from opensearch_interactions.fleet_runner import FleetResult, run_on_fleet
+
+logger = logging.getLogger(__name__)
+
+def cmd_clusters_health(profile: str, region: str, names: List[str], max_concurrency: int,
+                        output_json: bool) -> List[Dict[str, any]]:
+    logger.debug(f"Invoking clusters-health with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    deployed_names = ssm_ops.get_ssm_names_by_path(constants.SSM_CLUSTERS_PREFIX, aws_provider)
+    missing_names = [name for name in names if name not in deployed_names]
+    if missing_names:
+        logger.error(f"The Cluster(s) {', '.join(missing_names)} do not appear to exist")
+        logger.warning("Aborting...")
+        return []
+    cluster_names = list(names) if names else deployed_names
+
+    if not cluster_names:
+        logger.info("There are no Clusters to check")
+        return []
+
+    results = run_on_fleet(
+        cluster_names,
+        lambda cluster_name: get_cluster_os_client(cluster_name, aws_provider),
+        lambda os_client: os_client.get_cluster_health(),
+        max_workers=max_concurrency,
+    )
+
+    logger.info(f"OpenSearch Domain health:\n{_get_report(results)}")
+    if not all(result.succeeded for result in results):
+        logger.warning(UNREACHABLE_DOMAIN_HINT)
+
+    summary = [result.to_dict() for result in results]
+    if output_json:
+        logger.info(f"Cluster Health: \n{json.dumps(summary, indent=4)}")
+    return summary
+
+def _get_report(results: List[FleetResult]) -> str:
+    lines = []
+    for result in results:
+        if result.succeeded:
+            health = result.result
+            lines.append(
+                f"    {result.clusterName}: {health['status']} ({health['number_of_nodes']} nodes,"
+                + f" {health['unassigned_shards']} unassigned shards) in {result.durationSeconds:.2f}s"
+            )
+        else:
+            lines.append(f"    {result.clusterName}: FAILED ({result.error})")
+    return "\n".join(lines)
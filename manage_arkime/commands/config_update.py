@@ -9,9 +9,12 @@ from aws_interactions.aws_client_provider import AwsClientProvider
 import aws_interactions.ecs_interactions as ecs
 import aws_interactions.s3_interactions as s3
 import aws_interactions.ssm_operations as ssm_ops
+from core.capacity_planning import ClusterPlan
+from core.capture_tuning import get_capture_tuning, get_viewer_tuning_settings
 import core.compatibility as compat
 import core.constants as constants
 from core.local_file import LocalFile, S3File
+from core.user_config import UserConfig
 import core.versioning as ver
 
 logger = logging.getLogger(__name__)
@@ -44,6 +47,9 @@ def cmd_config_update(profile: str, region: str, cluster_name: str, capture: boo
 
     logger.info("Updating Arkime config for Capture Nodes, if necessary...")
     if capture or no_component_specified:
+        if not config_version:
+            _render_capture_tuning(cluster_name, aws_provider)
+
         should_bounce_capture_nodes = _update_config_if_necessary(
             cluster_name,
             bucket_name,
@@ -71,6 +77,9 @@ def cmd_config_update(profile: str, region: str, cluster_name: str, capture: boo
 
     logger.info("Updating Arkime config for Viewer Nodes, if necessary...")
     if viewer or no_component_specified:
+        if not config_version:
+            _render_viewer_tuning(cluster_name, aws_provider)
+
         should_bounce_viewer_nodes = _update_config_if_necessary(
             cluster_name,
             bucket_name,
@@ -96,6 +105,38 @@ def cmd_config_update(profile: str, region: str, cluster_name: str, capture: boo
     else:
         logger.info("Skipping Viewer Nodes due to user parameters supplied")
 
+def _render_capture_tuning(cluster_name: str, aws_provider: AwsClientProvider):
+    # Bring the local Capture config's plan-driven settings in line with the Cluster's current capacity plan
+    try:
+        cluster_param_name = constants.get_cluster_ssm_param_name(cluster_name)
+        capacity_plan = ClusterPlan.from_dict(ssm_ops.get_ssm_param_json_value(cluster_param_name, "capacityPlan", aws_provider))
+        user_config = UserConfig.from_dict(ssm_ops.get_ssm_param_json_value(cluster_param_name, "userConfig", aws_provider))
+    except ssm_ops.ParamDoesNotExist:
+        logger.warning("Unable to find the Cluster's capacity plan; leaving the Capture config's tuning as-is")
+        return
+
+    capture_tuning = get_capture_tuning(capacity_plan.captureNodes, user_config.expectedTraffic,
+                                        capacity_plan.osDomain.sessionsRotation)
+    config_wrangling.render_capture_tuning(
+        cluster_name, aws_provider.get_aws_env(), constants.get_repo_root_dir(), capture_tuning.to_config_settings()
+    )
+
+def _render_viewer_tuning(cluster_name: str, aws_provider: AwsClientProvider):
+    # Bring the local Viewer config's sessions index rotation in line with the Cluster's current capacity plan
+    try:
+        cluster_param_name = constants.get_cluster_ssm_param_name(cluster_name)
+        capacity_plan = ClusterPlan.from_dict(ssm_ops.get_ssm_param_json_value(cluster_param_name, "capacityPlan", aws_provider))
+        user_config = UserConfig.from_dict(ssm_ops.get_ssm_param_json_value(cluster_param_name, "userConfig", aws_provider))
+    except ssm_ops.ParamDoesNotExist:
+        logger.warning("Unable to find the Cluster's capacity plan; leaving the Viewer config's tuning as-is")
+        return
+
+    config_wrangling.render_viewer_tuning(
+        cluster_name, aws_provider.get_aws_env(), constants.get_repo_root_dir(),
+        get_viewer_tuning_settings(capacity_plan.osDomain.sessionsRotation,
+                                   capacity_plan.osDomain.sessionsRotationChangedAt, user_config.spiDays)
+    )
+
 def _update_config_if_necessary(cluster_name: str, bucket_name: str, s3_key_provider: Callable[[str], str], ssm_param: str,
                                 archive_provider: Callable[[str], LocalFile], switch_to_version: int,
                                 aws_provider: AwsClientProvider) -> bool:
@@ -0,0 +1,40 @@
+import json
+import logging
+import time
+from typing import Dict, List
+
+from core.capacity_sweep import (InvalidSweepValues, NumpyNotInstalled, PlanSweep, confirm_numpy_installed, parse_sweep_values,
+                                 sweep_capacity_plans)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SWEEP_ROWS = 20
+
+def cmd_plan_sweep(traffic: str, spi_days: str, replicas: str, pcap_days: str, num_azs: str, curve_axis: str,
+                   max_rows: int, csv_path: str, output_json: bool) -> PlanSweep:
+    logger.debug("Invoking plan-sweep")
+
+    try:
+        confirm_numpy_installed()
+        sweep_values = [parse_sweep_values(spec) for spec in [traffic, spi_days, replicas, pcap_days, num_azs]]
+    except (NumpyNotInstalled, InvalidSweepValues) as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return None
+
+    start_time = time.time()
+    sweep = sweep_capacity_plans(*sweep_values)
+    logger.info(f"Evaluated {sweep.size:,} capacity plans in {time.time() - start_time:.3f}s")
+
+    logger.info(f"Capacity plans:\n{sweep.get_table(max_rows)}")
+    logger.info(f"Cost and size by {curve_axis}:\n{sweep.get_curve_report(curve_axis)}")
+
+    if csv_path:
+        sweep.to_csv(csv_path)
+        logger.info(f"Wrote all of the capacity plans to {csv_path}")
+
+    if output_json:
+        curve: List[Dict[str, float]] = sweep.get_curve(curve_axis)
+        logger.info(f"Curve: \n{json.dumps(curve, indent=4)}")
+
+    return sweep
@@ -12,13 +12,27 @@ import cdk_interactions.cfn_wrangling as cfn
 import core.compatibility as compat
 import core.constants as constants
 from core.cross_account_wrangling import CrossAccountAssociation
+from core.filter_cidrs import get_filter_cidrs, TooManyFilterCidrs
+from core.mirror_profile import InvalidMirrorProfile, MirrorProfile, TooManyFilterRules, load_mirror_profile
 from core.vni_provider import SsmVniProvider, VniAlreadyUsed, VniOutsideRange, VniPoolExhausted
 
 logger = logging.getLogger(__name__)
 
-def cmd_vpc_add(profile: str, region: str, cluster_name: str, vpc_id: str, user_vni: int, just_print_cfn: bool):
+def cmd_vpc_add(profile: str, region: str, cluster_name: str, vpc_id: str, user_vni: int, just_print_cfn: bool,
+                mirror_profile_path: str = None):
     logger.debug(f"Invoking vpc-add with profile '{profile}' and region '{region}'")
 
+    # Load the user's Mirroring Profile, if any, before we touch anything
+    if mirror_profile_path:
+        try:
+            mirror_profile = load_mirror_profile(mirror_profile_path)
+        except InvalidMirrorProfile as e:
+            logger.error(e)
+            logger.warning("Aborting...")
+            return
+    else:
+        mirror_profile = MirrorProfile()
+
     # Use the current AWS Account to figure out if we need to do any cross-account actions
     aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
     try:
@@ -86,6 +100,26 @@ def cmd_vpc_add(profile: str, region: str, cluster_name: str, vpc_id: str, user_
         logger.warning("Aborting...")
         return
 
+    # Make sure the VPC's CIDRs will fit in its Traffic Mirror Filter before we deploy anything
+    try:
+        filter_cidrs = get_filter_cidrs(vpc_details.cidr_blocks)
+    except TooManyFilterCidrs as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return
+    if len(filter_cidrs) < len(vpc_details.cidr_blocks):
+        logger.info(f"Aggregated the VPC's CIDRs {vpc_details.cidr_blocks} into {filter_cidrs} for its Traffic Mirror Filter")
+
+    try:
+        mirror_profile.confirm_fits_filter(len(filter_cidrs))
+    except TooManyFilterRules as e:
+        logger.error(e)
+        logger.warning("Aborting...")
+        return
+    if mirror_profile.packetLength:
+        logger.info(f"Mirrored packets will be truncated to {mirror_profile.packetLength} bytes; expect roughly"
+                    + f" {mirror_profile.get_volume_ratio():.0%} of the VPC's traffic volume to reach the Capture Nodes")
+
     # Get the VPCE Service ID we set up with our Capture VPC
     vpce_service_id = ssm_ops.get_ssm_param_json_value(constants.get_cluster_ssm_param_name(cluster_name), "vpceServiceId", cluster_acct_provider)
 
@@ -94,7 +128,7 @@ def cmd_vpc_add(profile: str, region: str, cluster_name: str, vpc_id: str, user_
         constants.get_vpc_mirror_setup_stack_name(cluster_name, vpc_id)
     ]
     vpc_add_context = context.generate_vpc_add_context(cluster_name, vpc_id, subnet_ids, vpce_service_id, next_vni,
-                                                       vpc_details.cidr_blocks)
+                                                       filter_cidrs, mirror_profile)
 
     if just_print_cfn:
         # Remove the CDK output directory to ensure we don't copy over stale templates
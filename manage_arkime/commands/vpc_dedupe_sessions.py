@@ -0,0 +1,60 @@
+import json
+import logging
+from typing import Dict, List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ec2_interactions as ec2i
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+def cmd_vpc_dedupe_sessions(profile: str, region: str, cluster_name: str, vpc_id: str, delete: bool) -> Dict[str, List[str]]:
+    logger.debug(f"Invoking vpc-dedupe-sessions with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    vpc_param_name = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
+    try:
+        traffic_filter_id = ssm_ops.get_ssm_param_json_value(vpc_param_name, "mirrorFilterId", aws_provider)
+    except ssm_ops.ParamDoesNotExist:
+        logger.error(f"The VPC {vpc_id} does not appear to be monitored by the Cluster {cluster_name}; is it added?")
+        logger.warning("Aborting...")
+        return {}
+
+    logger.info(f"Scanning the Traffic Mirroring Sessions of VPC {vpc_id} for duplicates...")
+    duplicates = ec2i.get_duplicate_mirror_sessions(traffic_filter_id, aws_provider)
+    if not duplicates:
+        logger.info("No ENIs with duplicate Traffic Mirroring Sessions found")
+        return {}
+
+    # The Session recorded in SSM is the one our Lambdas will clean up later, so that's the one we keep
+    eni_params = ssm_ops.get_ssm_params_by_path(f"{vpc_param_name}/subnets", aws_provider, recursive=True)
+    recorded_sessions = {}
+    for param in eni_params:
+        if "/enis/" in param["Name"]:
+            param_value = json.loads(param["Value"])
+            recorded_sessions[param_value["eniId"]] = param_value["trafficSessionId"]
+
+    extra_sessions = {}
+    for eni_id, sessions in duplicates.items():
+        session_ids = sorted([session.session_id for session in sessions])
+        keep_id = recorded_sessions.get(eni_id, session_ids[0])
+        extra_sessions[eni_id] = [session_id for session_id in session_ids if session_id != keep_id]
+        logger.warning(f"ENI {eni_id} has {len(session_ids)} Traffic Mirroring Sessions; keeping {keep_id}, extra:"
+                       + f" {extra_sessions[eni_id]}")
+
+    if not delete:
+        logger.info(f"Found {len(extra_sessions)} ENI(s) with duplicate Sessions.  Re-run with --delete to remove the extras.")
+        return extra_sessions
+
+    for eni_id, session_ids in extra_sessions.items():
+        for session_id in session_ids:
+            logger.info(f"Deleting duplicate Traffic Mirroring Session {session_id} of ENI {eni_id}...")
+            try:
+                ec2i.delete_eni_mirroring(session_id, aws_provider)
+            except ec2i.MirrorDoesntExist:
+                logger.info(f"Traffic Mirroring Session {session_id} no longer exists; skipping...")
+
+    logger.info(f"Removed the duplicate Sessions of {len(extra_sessions)} ENI(s)")
+    return extra_sessions
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import Dict
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.cloudwatch_interactions as cwi
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_HOURS = 24
+LATENCY_PERCENTILES = ["p50", "p99"]
+
+# What each of the latency metrics measures, in the order they happen
+LATENCY_STAGES = {
+    cwi.LATENCY_METRIC_LISTENER: "ENI up -> listener published event",
+    cwi.LATENCY_METRIC_DELIVERY: "Event published -> Create Lambda started",
+    cwi.LATENCY_METRIC_CREATE: "Create Lambda started -> Session in place",
+    cwi.LATENCY_METRIC_END_TO_END: "ENI up -> Session in place (total)",
+}
+
+def cmd_vpc_mirror_latency(profile: str, region: str, cluster_name: str, vpc_id: str, hours: int) -> Dict[str, Dict[str, float]]:
+    logger.debug(f"Invoking vpc-mirror-latency with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(hours=hours)
+    dimensions = {
+        "ClusterName": cluster_name,
+        "VpcId": vpc_id,
+        "EventType": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+    }
+
+    logger.info(f"Pulling the mirroring latency of VPC {vpc_id} over the last {hours} hour(s)...")
+    latencies = {}
+    for metric_name in LATENCY_STAGES.keys():
+        latencies[metric_name] = cwi.get_metric_percentiles(
+            cwi.CW_ARKIME_EVENT_NAMESPACE,
+            metric_name,
+            dimensions,
+            start_time,
+            end_time,
+            LATENCY_PERCENTILES,
+            aws_provider
+        )
+
+    if not latencies[cwi.LATENCY_METRIC_END_TO_END]:
+        logger.warning(f"No Mirroring Sessions were created for ENIs in VPC {vpc_id} in the last {hours} hour(s)")
+        return latencies
+
+    report_text = f"Mirroring Latency of VPC {vpc_id} over the last {hours} hour(s):\n"
+    report_text += f"    {'Stage':<45} {'Count':>8} {'p50 (ms)':>10} {'p99 (ms)':>10}\n"
+    for metric_name, description in LATENCY_STAGES.items():
+        values = latencies[metric_name]
+        report_text += (f"    {description:<45} {int(values.get('SampleCount', 0)):>8}"
+                        + f" {values.get('p50', 0):>10.0f} {values.get('p99', 0):>10.0f}\n")
+    logger.info(report_text)
+
+    return latencies
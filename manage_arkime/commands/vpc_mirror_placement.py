@@ -0,0 +1,40 @@
+import logging
+from typing import List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from core.mirror_placement import DEFAULT_MAX_SESSIONS_PER_TARGET, MirrorPlacementPlanner, TargetLoad, get_target_loads
+from core.mirror_profile import get_vpc_mirror_profile
+
+logger = logging.getLogger(__name__)
+
+def cmd_vpc_mirror_placement(profile: str, region: str, cluster_name: str, vpc_id: str, max_sessions_per_target: int) -> List[TargetLoad]:
+    logger.debug(f"Invoking vpc-mirror-placement with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+
+    vpc_param_name = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
+    try:
+        traffic_filter_id = ssm_ops.get_ssm_param_json_value(vpc_param_name, "mirrorFilterId", aws_provider)
+    except ssm_ops.ParamDoesNotExist:
+        logger.error(f"The VPC {vpc_id} does not appear to be monitored by the Cluster {cluster_name}; is it added?")
+        logger.warning("Aborting...")
+        return []
+
+    # Use the same limit the Create Lambda plans against unless told otherwise
+    if not max_sessions_per_target:
+        mirror_profile = get_vpc_mirror_profile(cluster_name, vpc_id, aws_provider)
+        max_sessions_per_target = mirror_profile.maxSessionsPerTarget or DEFAULT_MAX_SESSIONS_PER_TARGET
+
+    target_loads = get_target_loads(cluster_name, vpc_id, traffic_filter_id, aws_provider, max_sessions_per_target)
+    planner = MirrorPlacementPlanner(target_loads)
+    logger.info(planner.get_report())
+
+    full_targets = [target.target_id for target in target_loads if not target.has_capacity]
+    if full_targets:
+        logger.warning(f"The following Traffic Mirroring Targets are at their Session limit: {full_targets}")
+        logger.warning("New Sessions will still be placed on the least-loaded Target in their AZ; raise the VPC's"
+                       + " maxSessionsPerTarget or monitor more subnets to spread them further")
+
+    return target_loads
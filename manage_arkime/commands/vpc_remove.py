@@ -1,7 +1,11 @@
 import json
 import logging
+import time
+from typing import List, Tuple
 
 from aws_interactions.aws_client_provider import AwsClientProvider
+from aws_interactions.cloudwatch_interactions import MetricsBuffer
+import aws_interactions.ec2_interactions as ec2i
 import aws_interactions.events_interactions as events
 import aws_interactions.ssm_operations as ssm_ops
 from cdk_interactions.cdk_client import CdkClient
@@ -13,8 +17,12 @@ from core.vni_provider import SsmVniProvider
 
 logger = logging.getLogger(__name__)
 
+TEARDOWN_TIMEOUT_SECONDS = 600
+TEARDOWN_POLL_SECONDS = 10
 
-def cmd_vpc_remove(profile: str, region: str, cluster_name: str, vpc_id: str):
+VPC_REMOVE_EVENT_TYPE = "VpcRemove"
+
+def cmd_vpc_remove(profile: str, region: str, cluster_name: str, vpc_id: str, wait: bool = False):
     logger.debug(f"Invoking vpc-remove with profile '{profile}' and region '{region}'")
 
     # Use the current AWS Account to figure out if we need to do any cross-account actions
@@ -61,17 +69,27 @@ def cmd_vpc_remove(profile: str, region: str, cluster_name: str, vpc_id: str):
     )
     vpc_ssm_param = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
     event_bus_arn = ssm_ops.get_ssm_param_json_value(vpc_ssm_param, "busArn", vpc_acct_provider)
-    subnet_search_path = f"{vpc_ssm_param}/subnets"
-    subnet_configs = [json.loads(config["Value"]) for config in ssm_ops.get_ssm_params_by_path(subnet_search_path, vpc_acct_provider)]
-    subnet_ids = [config['subnetId'] for config in subnet_configs]
-    for subnet_id in subnet_ids:
-        eni_search_path = f"{constants.get_subnet_ssm_param_name(cluster_name, vpc_id, subnet_id)}/enis"
-        eni_ids = ssm_ops.get_ssm_names_by_path(eni_search_path, vpc_acct_provider)
-        
-        for eni_id in eni_ids:
-            logger.info(f"Initiating teardown of mirroring session for ENI {eni_id}")
-            destroy_event = events.DestroyEniMirrorEvent(cluster_name, vpc_id, subnet_id, eni_id)
-            events.put_events([destroy_event], event_bus_arn, vpc_acct_provider)
+    subnet_ids, eni_records = _get_subnets_and_enis(cluster_name, vpc_id, vpc_acct_provider)
+
+    logger.info(f"Initiating teardown of mirroring sessions for {len(eni_records)} ENI(s)...")
+    destroy_events = [events.DestroyEniMirrorEvent(cluster_name, vpc_id, subnet_id, eni_id) for subnet_id, eni_id in eni_records]
+    metrics_dimensions = {"ClusterName": cluster_name, "VpcId": vpc_id, "EventType": VPC_REMOVE_EVENT_TYPE}
+    with MetricsBuffer(vpc_acct_provider, dimensions=metrics_dimensions) as metrics_buffer:
+        num_failed = events.put_events_in_batches(destroy_events, event_bus_arn, vpc_acct_provider,
+                                                  metrics_buffer=metrics_buffer)
+    if num_failed:
+        logger.error(f"Unable to initiate teardown for {num_failed} ENI(s); the VPC's shared mirroring components can't be"
+                     + " removed while their Sessions exist.  Please try again.")
+        logger.warning("Aborting...")
+        return
+
+    if wait:
+        traffic_filter_id = ssm_ops.get_ssm_param_json_value(vpc_ssm_param, "mirrorFilterId", vpc_acct_provider)
+        if not _wait_for_teardown(cluster_name, vpc_id, traffic_filter_id, len(eni_records), vpc_acct_provider):
+            logger.error(f"Mirroring Sessions still exist in VPC {vpc_id} after {TEARDOWN_TIMEOUT_SECONDS} seconds.  Check"
+                         + " the Destroy ENI Mirror Lambda's logs, then try again.")
+            logger.warning("Aborting...")
+            return
 
     # Make the VNI available to for re-use by another VPC.  Technically, the VNI's usage is tied to the ENI-specific
     # AWS resources rather than the CDK-generated ones, so we perform this before our CDK operation in case it fails.
@@ -87,3 +105,43 @@ def cmd_vpc_remove(profile: str, region: str, cluster_name: str, vpc_id: str):
     vpc_remove_context = context.generate_vpc_remove_context(cluster_name, vpc_id, subnet_ids, vpce_service_id)
 
     cdk_client.destroy(stacks_to_destroy, context=vpc_remove_context)
+
+
+def _get_subnets_and_enis(cluster_name: str, vpc_id: str, aws_provider: AwsClientProvider) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Pulls the subnets we monitor in the VPC and the (subnet ID, ENI ID) of each ENI we're mirroring, using a single
+    recursive listing of the VPC's SSM Parameters.
+    """
+    subnet_search_path = f"{constants.get_vpc_ssm_param_name(cluster_name, vpc_id)}/subnets"
+    params = ssm_ops.get_ssm_params_by_path(subnet_search_path, aws_provider, recursive=True)
+
+    subnet_ids = []
+    eni_records = []
+    for param in params:
+        # ENI params are named .../subnets/<subnet id>/enis/<eni id>
+        name_parts = param["Name"].split("/")
+        if len(name_parts) >= 3 and name_parts[-2] == "enis":
+            eni_records.append((name_parts[-3], name_parts[-1]))
+        else:
+            subnet_ids.append(json.loads(param["Value"])["subnetId"])
+
+    return subnet_ids, eni_records
+
+def _wait_for_teardown(cluster_name: str, vpc_id: str, traffic_filter_id: str, num_enis: int,
+                       aws_provider: AwsClientProvider) -> bool:
+    """
+    Waits until the Destroy Lambda has cleaned up every ENI's record and no Sessions are left using the VPC's Filter.
+    Returns whether that happened before we timed out.
+    """
+    deadline = time.time() + TEARDOWN_TIMEOUT_SECONDS
+    while True:
+        _, remaining_enis = _get_subnets_and_enis(cluster_name, vpc_id, aws_provider)
+        remaining_sessions = ec2i.get_mirror_sessions_of_filter(traffic_filter_id, aws_provider)
+        logger.info(f"Teardown progress: {num_enis - len(remaining_enis)}/{num_enis} ENI(s) cleaned up,"
+                    + f" {len(remaining_sessions)} Session(s) remaining")
+
+        if not remaining_enis and not remaining_sessions:
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(TEARDOWN_POLL_SECONDS)
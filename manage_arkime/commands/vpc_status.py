@@ -0,0 +1,37 @@
+import logging
+import time
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from core.mirror_inventory import MirrorInventory, VpcStatus, get_inventory_path, refresh_vpc
+
+logger = logging.getLogger(__name__)
+
+def cmd_vpc_status(profile: str, region: str, cluster_name: str, vpc_id: str, force_refresh: bool, max_age: int) -> VpcStatus:
+    logger.debug(f"Invoking vpc-status with profile '{profile}' and region '{region}'")
+
+    aws_provider = AwsClientProvider(aws_profile=profile, aws_region=region)
+    aws_env = aws_provider.get_aws_env()
+
+    inventory = MirrorInventory(get_inventory_path(cluster_name, aws_env, constants.get_repo_root_dir()))
+    try:
+        refreshed_at = inventory.get_refreshed_at(vpc_id)
+        if force_refresh or refreshed_at is None or (time.time() - refreshed_at) > max_age:
+            logger.info(f"Refreshing the local inventory of VPC {vpc_id}...")
+            start_time = time.time()
+            try:
+                stats = refresh_vpc(inventory, cluster_name, vpc_id, aws_provider)
+            except ssm_ops.ParamDoesNotExist:
+                logger.error(f"The VPC {vpc_id} does not appear to be monitored by the Cluster {cluster_name}; is it added?")
+                logger.warning("Aborting...")
+                return None
+            logger.info(f"Refreshed in {time.time() - start_time:.1f}s ({stats.added} added, {stats.updated} updated,"
+                        + f" {stats.removed} removed)")
+
+        vpc_status = inventory.get_vpc_status(vpc_id)
+    finally:
+        inventory.close()
+
+    logger.info(vpc_status.get_report())
+    return vpc_status
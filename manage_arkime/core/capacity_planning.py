@@ -1,4 +1,5 @@
 from dataclasses import dataclass, fields
+from datetime import datetime
 import math
 import logging
 import re
@@ -16,23 +17,51 @@ DEFAULT_SPI_DAYS = 30 # How many days of SPI metadata to keep in the OS Domain
 DEFAULT_REPLICAS = 1 # How replicas of metadata to keep in the OS Domain
 DEFAULT_HISTORY_DAYS = 365 # How many days of Arkime Viewer user history to keep in the OS Domain
 DEFAULT_NUM_AZS = 2 # How many AWS Availability zones to utilize
+HOURS_PER_MONTH = 730 # How AWS prices a month of On-Demand usage
+
+CAPTURE_MEMORY_PER_GBPS = 3 * 1024 # MiB of ECS memory a Capture Node needs per Gbps it handles; arbitrarily chosen
+CAPTURE_NETWORK_FACTOR = 2 # Each Capture Node receives its mirrored traffic, then sends up to as much again to S3 as PCAP
 
 @dataclass
 class CaptureInstance:
     instanceType: str
-    trafficPer: float # The traffic in Gbps each instance of this type can handle
+    trafficPer: float # The traffic in Gbps each instance of this type can handle; capped by its network bandwidth
     maxTraffic: float # The max traffic in Gbps a cluster of this type should handle
     minNodes: int # The minimum number of nodes we should have of this type
     ecsCPU: int
     ecsMemory: int
-
-# These are the possible instances types we assign for capture nodes
-T3_MEDIUM = CaptureInstance("t3.medium", 0.25, 2 * 0.25, 1, 1536, 3072)
-M5_XLARGE = CaptureInstance("m5.xlarge", 2.0, MAX_TRAFFIC, 2, 3584, 15360)
+    networkBandwidth: float = None # The instance's baseline (sustained, not "up to") network bandwidth, in Gbps
+    hourlyPrice: float = None # us-east-1 On-Demand, in USD
+    isArm: bool = False
+
+    def __post_init__(self):
+        # The node's sustained bandwidth has to carry both its mirrored traffic and the PCAP it uploads
+        if self.networkBandwidth:
+            self.trafficPer = min(self.trafficPer, self.networkBandwidth / CAPTURE_NETWORK_FACTOR)
+
+# These are the possible instances types we assign for capture nodes.  The traffic each can handle is driven by its
+# vCPUs (~0.5 Gbps apiece), up to what its baseline bandwidth can carry; the ECS resources leave 512 CPU units and 1 GiB
+# of memory for the host.
+# See: https://docs.aws.amazon.com/ec2/latest/instancetypes/co.html#co_network and
+# https://aws.amazon.com/ec2/pricing/on-demand/
+T3_MEDIUM = CaptureInstance("t3.medium", 0.25, 2 * 0.25, 1, 1536, 3072, 0.256, 0.0416)
+M5_XLARGE = CaptureInstance("m5.xlarge", 2.0, MAX_TRAFFIC, 2, 3584, 15360, 1.25, 0.1920)
+C6I_XLARGE = CaptureInstance("c6i.xlarge", 2.0, MAX_TRAFFIC, 2, 3584, 7168, 1.562, 0.1700)
+C5N_2XLARGE = CaptureInstance("c5n.2xlarge", 4.0, MAX_TRAFFIC, 2, 7680, 20480, 10, 0.4320)
+C6IN_2XLARGE = CaptureInstance("c6in.2xlarge", 4.0, MAX_TRAFFIC, 2, 7680, 15360, 12.5, 0.4536)
+C6IN_4XLARGE = CaptureInstance("c6in.4xlarge", 8.0, MAX_TRAFFIC, 2, 15872, 31744, 25, 0.9072)
+C6GN_XLARGE = CaptureInstance("c6gn.xlarge", 2.0, MAX_TRAFFIC, 2, 3584, 7168, 6.3, 0.1728, isArm=True)
+C7GN_2XLARGE = CaptureInstance("c7gn.2xlarge", 4.0, MAX_TRAFFIC, 2, 7680, 15360, 25, 0.4992, isArm=True)
 
 CAPTURE_INSTANCES = [
     T3_MEDIUM,
-    M5_XLARGE
+    M5_XLARGE,
+    C6I_XLARGE,
+    C5N_2XLARGE,
+    C6IN_2XLARGE,
+    C6IN_4XLARGE,
+    C6GN_XLARGE,
+    C7GN_2XLARGE,
 ]
 
 @dataclass
@@ -70,6 +99,21 @@ DATA_INSTANCES = [
     DataInstance("or1.8xlarge.search", 12*1024, sys.maxsize)
 ]
 
+# UltraWarm nodes serve read-only indices out of S3-backed managed storage, so they need no replicas.  A Domain needs at
+# least two of them, and they require dedicated master nodes and non-burstable (i.e. not T2/T3) hot data nodes.
+# https://docs.aws.amazon.com/opensearch-service/latest/developerguide/ultrawarm.html
+@dataclass
+class WarmInstance:
+    type: str
+    maxStorage: int # in GiB
+    maxNodes: int
+
+WARM_INSTANCES = [
+    WarmInstance("ultrawarm1.medium.search", 1536, 10),
+    WarmInstance("ultrawarm1.large.search", 20*1024, 150),
+]
+MIN_WARM_NODES = 2
+
 class TooMuchTraffic(Exception):
     def __init__(self, expected_traffic: int):
         super().__init__(f"User's expected traffic ({expected_traffic} Gbps) exceeds the limit of a single cluster ({MAX_TRAFFIC})")
@@ -97,6 +141,56 @@ class CaptureNodesPlan:
             "minCount": self.minCount,
         }
 
+@dataclass
+class CaptureInstanceChoice:
+    instance: CaptureInstance
+    desiredCount: int
+    monthlyCost: float
+    explanation: List[str]
+
+def get_capture_instance_rejection(instance: CaptureInstance, expected_traffic: float = None) -> str:
+    """
+    Why the instance type can't be used for Capture Nodes, if it can't; without an expected traffic, only the reasons
+    that hold regardless of traffic are considered.
+    """
+    if instance.isArm:
+        return "the Capture Node image and AMI are x86_64 only"
+    if expected_traffic is not None and expected_traffic > instance.maxTraffic:
+        return f"only suited to clusters of up to {instance.maxTraffic} Gbps"
+    if instance.ecsMemory < instance.trafficPer * CAPTURE_MEMORY_PER_GBPS:
+        return f"its {instance.ecsMemory} MiB of ECS memory is too little for {instance.trafficPer} Gbps"
+    return None
+
+def choose_capture_instance(expected_traffic: float) -> CaptureInstanceChoice:
+    """
+    Picks the cheapest feasible instance type, and how many of them, to handle the indicated traffic load.  Ties go to
+    the option with fewer nodes.
+
+    expected_traffic: The expected traffic volume for the Arkime cluster, in Gigabits Per Second (Gbps)
+    """
+
+    options = []
+    explanation = []
+    for instance in CAPTURE_INSTANCES:
+        rejection = get_capture_instance_rejection(instance, expected_traffic)
+        if rejection:
+            explanation.append(f"{instance.instanceType}: rejected; {rejection}")
+            continue
+
+        desired_instances = max(
+            instance.minNodes,
+            math.ceil(expected_traffic/instance.trafficPer)
+        )
+        monthly_cost = desired_instances * instance.hourlyPrice * HOURS_PER_MONTH
+        options.append((monthly_cost, desired_instances, instance))
+        explanation.append(f"{instance.instanceType}: {desired_instances} node(s) at {instance.trafficPer} Gbps each"
+                           + f" for ${monthly_cost:,.2f}/mo")
+
+    monthly_cost, desired_instances, chosen_instance = min(options, key=lambda option: (option[0], option[1]))
+    explanation.insert(0, f"Chose {desired_instances} {chosen_instance.instanceType} Capture Node(s), the cheapest feasible"
+                          + f" option for {expected_traffic} Gbps:")
+    return CaptureInstanceChoice(chosen_instance, desired_instances, monthly_cost, explanation)
+
 def get_capture_node_capacity_plan(expected_traffic: float, azs: List[str]) -> CaptureNodesPlan:
     """
     Creates a capacity plan for the indicated traffic load.
@@ -111,18 +205,14 @@ def get_capture_node_capacity_plan(expected_traffic: float, azs: List[str]) -> C
     if expected_traffic > MAX_TRAFFIC:
         raise TooMuchTraffic(expected_traffic)
 
-    chosen_instance = next(instance for instance in CAPTURE_INSTANCES if expected_traffic <= instance.maxTraffic)
-
-    desired_instances = max(
-        chosen_instance.minNodes,
-        math.ceil(expected_traffic/chosen_instance.trafficPer)
-    )
+    choice = choose_capture_instance(expected_traffic)
+    logger.info("\n    ".join(choice.explanation))
 
     return CaptureNodesPlan(
-        chosen_instance.instanceType,
-        desired_instances,
-        math.ceil(desired_instances * CAPACITY_BUFFER_FACTOR),
-        chosen_instance.minNodes
+        choice.instance.instanceType,
+        choice.desiredCount,
+        math.ceil(choice.desiredCount * CAPACITY_BUFFER_FACTOR),
+        choice.instance.minNodes
     )
 
 @dataclass
@@ -199,6 +289,35 @@ It is based on awick@'s experience, and encompasses the following sub-factors:
 """
 MAGIC_FACTOR = 0.03
 
+# Arkime is a write-heavy usecase so recommended data/shard is 30-50 GiB, per the docs.
+# See: https://docs.aws.amazon.com/opensearch-service/latest/developerguide/sizing-domains.html#bp-sharding
+# Although https://docs.aws.amazon.com/opensearch-service/latest/developerguide/petabyte-scale.html
+# says 100GiB is ok.
+TARGET_SHARD_SIZE = 50 # GiB
+MAX_SHARDS_PER_INDEX = 1024 # OpenSearch's limit
+
+# How often Arkime starts a new sessions index (its rotateIndex setting), and how many days of data each index holds.
+# Arkime names each index for the time its data covers rather than writing through an alias, so these are how we keep
+# its indices (and shards) near the target size.  See: https://arkime.com/settings#rotateIndex
+SESSIONS_ROTATION_DAILY = "daily"
+SESSIONS_ROTATION_WEEKLY = "weekly"
+SESSIONS_ROTATIONS = {
+    "hourly": 1 / 24,
+    "hourly2": 2 / 24,
+    "hourly3": 3 / 24,
+    "hourly4": 4 / 24,
+    "hourly6": 6 / 24,
+    "hourly8": 8 / 24,
+    "hourly12": 12 / 24,
+    SESSIONS_ROTATION_DAILY: 1,
+    SESSIONS_ROTATION_WEEKLY: 7,
+}
+# Each data node's indexing buffer is shared by the shards being written to, so the index being written to shouldn't
+# need more than a couple of target-size shards per node
+MAX_WRITE_SHARDS_PER_NODE = 2
+# Weekly indices are deleted a week at a time, so they're only worthwhile when the retention spans several weeks
+MIN_WEEKLY_SPI_DAYS = 28
+
 @dataclass
 class DataNodesPlan:
     count: int
@@ -230,39 +349,73 @@ class MasterNodesPlan:
             "instanceType": self.instanceType
         }
 
+@dataclass
+class WarmNodesPlan:
+    count: int
+    instanceType: str
+    storage: int # GiB of managed storage
+
+    def __eq__(self, other) -> bool:
+        return (other is not None and self.count == other.count and self.instanceType == other.instanceType
+                and self.storage == other.storage)
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "count": self.count,
+            "instanceType": self.instanceType,
+            "storage": self.storage
+        }
+
 T_OSDomainPlan = TypeVar('T_OSDomainPlan', bound='OSDomainPlan')
 
 @dataclass
 class OSDomainPlan:
     dataNodes: DataNodesPlan
     masterNodes: MasterNodesPlan
+    sessionsShards: int = None # Primary shards of each Arkime sessions index
+    warmNodes: WarmNodesPlan = None # The UltraWarm tier, if the SPI data is tiered
+    sessionsRotation: str = None # How often Arkime starts a new sessions index; plans without one rotate daily
+    sessionsRotationChangedAt: str = None # ISO-8601, UTC; when a plan last changed the rotation, if one ever has
 
     def __eq__(self, other) -> bool:
         return (self.dataNodes == other.dataNodes
-                and self.masterNodes == other.masterNodes)
+                and self.masterNodes == other.masterNodes
+                and self.sessionsShards == other.sessionsShards
+                and self.warmNodes == other.warmNodes
+                and self.sessionsRotation == other.sessionsRotation
+                and self.sessionsRotationChangedAt == other.sessionsRotationChangedAt)
 
     def to_dict(self) -> Dict[str, any]:
         return {
             "dataNodes": self.dataNodes.to_dict(),
-            "masterNodes": self.masterNodes.to_dict()
+            "masterNodes": self.masterNodes.to_dict(),
+            "sessionsShards": self.sessionsShards,
+            "warmNodes": self.warmNodes.to_dict() if self.warmNodes else None,
+            "sessionsRotation": self.sessionsRotation,
+            "sessionsRotationChangedAt": self.sessionsRotationChangedAt,
         }
 
     @classmethod
     def from_dict(cls: Type[T_OSDomainPlan], input: Dict[str, any]) -> T_OSDomainPlan:
         data_nodes = DataNodesPlan(**input["dataNodes"])
         master_nodes = MasterNodesPlan(**input["masterNodes"])
-        return cls(data_nodes, master_nodes)
+        sessions_shards = input.get("sessionsShards")
+        warm_nodes = WarmNodesPlan(**input["warmNodes"]) if input.get("warmNodes") else None
+        sessions_rotation = input.get("sessionsRotation")
+        sessions_rotation_changed_at = input.get("sessionsRotationChangedAt")
+        return cls(data_nodes, master_nodes, sessions_shards, warm_nodes, sessions_rotation, sessions_rotation_changed_at)
 
-def _get_storage_per_replica(expected_traffic: float, spi_days: int) -> float:
+def _get_storage_per_replica(expected_traffic: float, spi_days: int, storage_ratio: float = MAGIC_FACTOR) -> float:
     """
     Predict the required OpenSearch domain storage for each replica, in GiB
 
     expected_traffic: traffic volume to the capture nodes, in Gbps
     spi_days: the number of days to retain the SPI data stored in the OpenSearch Domain
+    storage_ratio: the Domain storage needed per byte of traffic; the MAGIC_FACTOR unless calibrated for the Cluster
     """
-    return (spi_days * 24 * 60 * 60) * expected_traffic/8 * MAGIC_FACTOR
+    return (spi_days * 24 * 60 * 60) * expected_traffic/8 * storage_ratio
 
-def _get_total_storage(expected_traffic: float, spi_days: int, replicas: int) -> float:
+def _get_total_storage(expected_traffic: float, spi_days: int, replicas: int, storage_ratio: float = MAGIC_FACTOR) -> float:
     """
     Predict the total required OpenSearch domain storage, in GiB
 
@@ -270,9 +423,9 @@ def _get_total_storage(expected_traffic: float, spi_days: int, replicas: int) ->
     spi_days: the number of days to retain the SPI data stored in the OpenSearch Domain
     replicas: the number of replicas to have of the data
     """
-    return _get_storage_per_replica(expected_traffic, spi_days) * (1 + replicas)
+    return _get_storage_per_replica(expected_traffic, spi_days, storage_ratio) * (1 + replicas)
 
-def _get_data_node_plan(total_storage: float, num_azs: int) -> DataNodesPlan:
+def _get_data_node_plan(total_storage: float, num_azs: int, allow_burstable: bool = True) -> DataNodesPlan:
     """
     Per the OpenSearch Service limits doc [1], you can have a maximum of 10 T2/T3 data nodes or 80 of other types by
     default.  You can raise this limit up to 200.  To keep things simple, we will assume if the user needs more storage
@@ -289,11 +442,13 @@ def _get_data_node_plan(total_storage: float, num_azs: int) -> DataNodesPlan:
     [2] https://github.com/arkime/aws-aio/issues/56#issuecomment-1563652060
 
     total_storage: full storage requirement for all data, including replicas, in GiB
+    allow_burstable: whether T3 instances may be used
     """
 
     node = next (
         instance for instance in DATA_INSTANCES if (
             total_storage <= instance.maxNodes * instance.volSize
+            and (allow_burstable or not instance.type.startswith("t3"))
         )
     )
 
@@ -309,6 +464,99 @@ def _get_data_node_plan(total_storage: float, num_azs: int) -> DataNodesPlan:
 
     return plan
 
+def _get_warm_node_plan(warm_storage: float) -> WarmNodesPlan:
+    """
+    warm_storage: storage required for the data in the warm tier, in GiB
+    """
+    node = next(
+        instance for instance in WARM_INSTANCES if (
+            warm_storage <= instance.maxNodes * instance.maxStorage
+        )
+    )
+    num_of_nodes = max(math.ceil(warm_storage / node.maxStorage), MIN_WARM_NODES)
+
+    return WarmNodesPlan(
+        count = num_of_nodes,
+        instanceType = node.type,
+        storage = math.ceil(warm_storage)
+    )
+
+def get_sessions_rotation(expected_traffic: float, data_node_count: int, allow_weekly: bool,
+                          storage_ratio: float = MAGIC_FACTOR) -> str:
+    """
+    How often Arkime should start a new sessions index.  Daily suits most Clusters.  Busy ones rotate every few hours
+    (as rarely as will fit) so the index being written to needs no more than a couple of target-size shards per data
+    node; quiet ones with long retention rotate weekly so they don't accumulate hundreds of tiny shards.
+
+    expected_traffic: traffic volume to the capture nodes, in Gbps
+    data_node_count: the number of data nodes in the OpenSearch Domain
+    allow_weekly: whether the retention is long enough, and the data stays hot long enough, to rotate weekly
+    """
+    daily_index_size = _get_storage_per_replica(expected_traffic, 1, storage_ratio)
+    return _get_rotation_for_daily_index_size(daily_index_size, data_node_count, allow_weekly)
+
+def _get_rotation_for_daily_index_size(daily_index_size: float, data_node_count: int, allow_weekly: bool) -> str:
+    """
+    daily_index_size: the size of the primary copy of a day's sessions data, in GiB
+    data_node_count: the number of data nodes in the OpenSearch Domain
+    allow_weekly: whether the retention is long enough, and the data stays hot long enough, to rotate weekly
+    """
+    max_index_size = TARGET_SHARD_SIZE * min(data_node_count * MAX_WRITE_SHARDS_PER_NODE, MAX_SHARDS_PER_INDEX)
+    if daily_index_size > max_index_size:
+        sub_daily = sorted(
+            (days, rotation) for rotation, days in SESSIONS_ROTATIONS.items()
+            if days < 1 and daily_index_size * days <= max_index_size
+        )
+        return sub_daily[-1][1] if sub_daily else "hourly"
+
+    if allow_weekly and daily_index_size * SESSIONS_ROTATIONS[SESSIONS_ROTATION_WEEKLY] <= TARGET_SHARD_SIZE:
+        return SESSIONS_ROTATION_WEEKLY
+    return SESSIONS_ROTATION_DAILY
+
+def get_sessions_rotation_changed_at(prev_plan: OSDomainPlan, next_rotation: str, now: datetime) -> str:
+    """
+    When the sessions rotation last changed, carried forward from the previous plan until the rotation changes again.  A
+    new Domain has no indices from an earlier rotation, so its rotation hasn't changed.
+
+    prev_plan: the OpenSearch Domain's previous plan
+    next_rotation: the rotation of the OpenSearch Domain's next plan
+    now: the time the next plan is made
+    """
+    if prev_plan.dataNodes.count is None:
+        return None
+
+    prev_rotation = prev_plan.sessionsRotation or SESSIONS_ROTATION_DAILY
+    if prev_rotation != (next_rotation or SESSIONS_ROTATION_DAILY):
+        return now.isoformat()
+    return prev_plan.sessionsRotationChangedAt
+
+def get_sessions_shard_count(expected_traffic: float, data_node_count: int, storage_ratio: float = MAGIC_FACTOR,
+                             rotation: str = SESSIONS_ROTATION_DAILY) -> int:
+    """
+    The number of primary shards each Arkime sessions index should have.  We want shards near the target size,
+    and a count that spreads evenly across the data nodes; so a multiple of the data node count if we need at least
+    that many, otherwise the smallest count that divides evenly into it.
+
+    expected_traffic: traffic volume to the capture nodes, in Gbps
+    data_node_count: the number of data nodes in the OpenSearch Domain
+    rotation: how often Arkime starts a new sessions index
+    """
+    index_size = _get_storage_per_replica(expected_traffic, 1, storage_ratio) * SESSIONS_ROTATIONS[rotation]
+    return _get_shard_count_for_index_size(index_size, data_node_count)
+
+def _get_shard_count_for_index_size(index_size: float, data_node_count: int) -> int:
+    """
+    index_size: the size of the primary copy of the index, in GiB
+    data_node_count: the number of data nodes in the OpenSearch Domain
+    """
+    needed_shards = max(1, math.ceil(index_size / TARGET_SHARD_SIZE))
+
+    if needed_shards >= data_node_count:
+        shards = math.ceil(needed_shards / data_node_count) * data_node_count
+    else:
+        shards = next(count for count in range(needed_shards, data_node_count + 1) if data_node_count % count == 0)
+    return min(shards, MAX_SHARDS_PER_INDEX)
+
 def _get_master_node_plan(storage_per_replica: float, data_node_count: int, data_node_type: str) -> MasterNodesPlan:
     """
     We follow the sizing recommendation in the docs [1].  One complicating
@@ -318,12 +566,7 @@ def _get_master_node_plan(storage_per_replica: float, data_node_count: int, data
     storage_per_replica: storage required for each replica, in GiB
     """
 
-    # Arkime is a write-heavy usecase so recommended data/shard is 30-50 GiB, per the docs.
-    # See: https://docs.aws.amazon.com/opensearch-service/latest/developerguide/sizing-domains.html#bp-sharding
-    # Although https://docs.aws.amazon.com/opensearch-service/latest/developerguide/petabyte-scale.html
-    # says 100GiB is ok.
-    storage_per_shard = 50 # GiB
-    num_shards = math.ceil(storage_per_replica / storage_per_shard)
+    num_shards = math.ceil(storage_per_replica / TARGET_SHARD_SIZE)
     isArm = not data_node_type.startswith("t3")
 
     chosen_instance = next(
@@ -339,7 +582,35 @@ def _get_master_node_plan(storage_per_replica: float, data_node_count: int, data
         instanceType = chosen_instance.instanceType
     )
 
-def get_os_domain_plan(expected_traffic: float, spi_days: int, replicas: int, num_azs: int) -> OSDomainPlan:
+def get_os_domain_plan_for_storage(total_storage: float, replicas: int, num_azs: int, daily_index_size: float,
+                                   allow_burstable: bool = True, allow_weekly: bool = False) -> OSDomainPlan:
+    """
+    Get the OpenSearch Domain capacity required to hold a known amount of data, such as a live Domain is observed to
+    need, rather than an amount predicted from the expected traffic
+
+    total_storage: full storage requirement for all data, including replicas, in GiB
+    replicas: the number of replicas to have of the data
+    num_azs: the number of AZs in the domain's VPC
+    daily_index_size: the size of the primary copy of a day's sessions data, in GiB
+    allow_burstable: whether T3 data nodes may be used
+    allow_weekly: whether the sessions indices may rotate weekly
+    """
+    data_node_plan = _get_data_node_plan(total_storage, num_azs, allow_burstable)
+    master_node_plan = _get_master_node_plan(total_storage / (1 + replicas), data_node_plan.count, data_node_plan.instanceType)
+    sessions_rotation = _get_rotation_for_daily_index_size(daily_index_size, data_node_plan.count, allow_weekly)
+    sessions_shards = _get_shard_count_for_index_size(daily_index_size * SESSIONS_ROTATIONS[sessions_rotation],
+                                                      data_node_plan.count)
+
+    return OSDomainPlan(data_node_plan, master_node_plan, sessions_shards, sessionsRotation=sessions_rotation)
+
+def is_warm_tiered(spi_days: int, hot_days: int) -> bool:
+    """
+    Whether the SPI data should move to an UltraWarm tier after its hot days
+    """
+    return bool(hot_days) and 0 < hot_days < spi_days
+
+def get_os_domain_plan(expected_traffic: float, spi_days: int, replicas: int, num_azs: int, hot_days: int = None,
+                       storage_ratio: float = MAGIC_FACTOR) -> OSDomainPlan:
     """
     Get the OpenSearch Domain capacity required to satisify the expected traffic
 
@@ -347,15 +618,29 @@ def get_os_domain_plan(expected_traffic: float, spi_days: int, replicas: int, nu
     spi_days: the number of days to retain the SPI data stored in the OpenSearch Domain
     replicas: the number of replicas to have of the data
     num_azs: the number of AZs in the domain's VPC
+    hot_days: if fewer than spi_days, the days of SPI data to keep on the data nodes before moving it to UltraWarm
+    storage_ratio: the Domain storage needed per byte of traffic, if it's been calibrated for the Cluster
     """
 
-    storage_per_replica = _get_storage_per_replica(expected_traffic, spi_days)
-    total_storage = _get_total_storage(expected_traffic, spi_days, replicas)
+    storage_per_replica = _get_storage_per_replica(expected_traffic, spi_days, storage_ratio)
+
+    if is_warm_tiered(spi_days, hot_days):
+        hot_storage = _get_total_storage(expected_traffic, hot_days, replicas, storage_ratio)
+        data_node_plan = _get_data_node_plan(hot_storage, num_azs, allow_burstable=False)
+        warm_node_plan = _get_warm_node_plan(_get_storage_per_replica(expected_traffic, spi_days - hot_days, storage_ratio))
+    else:
+        total_storage = _get_total_storage(expected_traffic, spi_days, replicas, storage_ratio)
+        data_node_plan = _get_data_node_plan(total_storage, num_azs)
+        warm_node_plan = None
 
-    data_node_plan = _get_data_node_plan(total_storage, num_azs)
     master_node_plan = _get_master_node_plan(storage_per_replica, data_node_plan.count, data_node_plan.instanceType)
 
-    return OSDomainPlan(data_node_plan, master_node_plan)
+    # Weekly indices stay hot for their whole week, so they don't mix with a warm tier
+    allow_weekly = not warm_node_plan and spi_days >= MIN_WEEKLY_SPI_DAYS
+    sessions_rotation = get_sessions_rotation(expected_traffic, data_node_plan.count, allow_weekly, storage_ratio)
+    sessions_shards = get_sessions_shard_count(expected_traffic, data_node_plan.count, storage_ratio, sessions_rotation)
+
+    return OSDomainPlan(data_node_plan, master_node_plan, sessions_shards, warm_node_plan, sessions_rotation)
 
 class InvalidCidr(Exception):
     def __init__(self, cidr_str: str):
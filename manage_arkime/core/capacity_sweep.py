@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import re
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is the optional "sweep" extra, which keeps it out of the Lambda bundles that install this package
+    np = None
+
+from core.capacity_planning import (CAPTURE_INSTANCES, DATA_INSTANCES, MASTER_INSTANCES, MASTER_NODE_COUNT, MAGIC_FACTOR,
+                                    MAX_TRAFFIC, MINIMUM_TRAFFIC, HOURS_PER_MONTH, get_capture_instance_rejection)
+from core.price_report import AWS_SECS_PER_MONTH, PCAP_STORAGE_RATIO, US_EAST_1_PRICES
+
+logger = logging.getLogger(__name__)
+
+# Exploring capacity plans one cluster-create at a time is slow, so this evaluates the same capacity planning and cost
+# estimate logic over a whole grid of inputs at once.  Each step is computed for every point with NumPy array operations,
+# looping only over the (short) instance catalogs; test_capacity_sweep.py confirms the results match the per-point planners
+# and PriceReport.
+
+SWEEP_AXES = ["traffic", "spiDays", "replicas", "pcapDays", "numAzs"]
+
+# A non-negative decimal number, such as "2", "0.5", "1.", or ".5"
+SWEEP_NUMBER_PATTERN = r"(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)"
+
+class NumpyNotInstalled(Exception):
+    def __init__(self):
+        super().__init__("Sweeping capacity plans requires NumPy; install it with: (cd manage_arkime ; pip install -e '.[sweep]')")
+
+class InvalidSweepValues(Exception):
+    def __init__(self, spec: str):
+        super().__init__(f"Unable to parse the sweep values '{spec}'; expected a comma-separated list and/or"
+                         + " start:stop:step ranges")
+
+def confirm_numpy_installed():
+    if np is None:
+        raise NumpyNotInstalled()
+
+def parse_sweep_values(spec: str) -> np.ndarray:
+    """
+    Parses a spec like "0.5,1,2:10:2" into the values it describes; ranges include their stop value.
+    """
+    values = []
+    for part in str(spec).split(","):
+        part = part.strip()
+        if re.fullmatch(SWEEP_NUMBER_PATTERN, part):
+            values.append(float(part))
+        elif re.fullmatch(f"{SWEEP_NUMBER_PATTERN}:{SWEEP_NUMBER_PATTERN}:{SWEEP_NUMBER_PATTERN}", part):
+            start, stop, step = (float(value) for value in part.split(":"))
+            if step <= 0:
+                raise InvalidSweepValues(spec)
+            # Nudge the stop so floating point error doesn't drop it
+            values.extend(np.arange(start, stop + step / 2, step).tolist())
+        else:
+            raise InvalidSweepValues(spec)
+    return np.unique(np.array(values, dtype=float))
+
+def _get_capture_plans(traffic: np.ndarray, prices: Dict[str, float]) -> Dict[str, np.ndarray]:
+    # Mirrors choose_capture_instance(): the cheapest feasible option, ties going to fewer nodes
+    best_cost = np.full(traffic.shape, np.inf)
+    best_count = np.zeros(traffic.shape)
+    best_index = np.full(traffic.shape, -1)
+    for index, instance in enumerate(CAPTURE_INSTANCES):
+        if get_capture_instance_rejection(instance):
+            continue
+
+        count = np.maximum(instance.minNodes, np.ceil(traffic / instance.trafficPer))
+        cost = count * instance.hourlyPrice * HOURS_PER_MONTH
+        better = (traffic <= instance.maxTraffic) & (
+            (cost < best_cost) | ((cost == best_cost) & (count < best_count))
+        )
+        best_cost = np.where(better, cost, best_cost)
+        best_count = np.where(better, count, best_count)
+        best_index = np.where(better, index, best_index)
+
+    monthly_cost = np.zeros(traffic.shape)
+    for index, instance in enumerate(CAPTURE_INSTANCES):
+        if instance.instanceType in prices:
+            monthly_cost = np.where(best_index == index, best_count * prices[instance.instanceType], monthly_cost)
+
+    return {"captureInstance": best_index, "captureNodes": best_count, "captureCost": monthly_cost}
+
+def _get_os_domain_plans(traffic: np.ndarray, spi_days: np.ndarray, replicas: np.ndarray, num_azs: np.ndarray,
+                         prices: Dict[str, float]) -> Dict[str, np.ndarray]:
+    # Mirrors get_os_domain_plan()
+    storage_per_replica = (spi_days * 24 * 60 * 60) * traffic/8 * MAGIC_FACTOR
+    total_storage = storage_per_replica * (1 + replicas)
+
+    data_index = np.full(traffic.shape, -1)
+    for index, instance in reversed(list(enumerate(DATA_INSTANCES))):
+        data_index = np.where(total_storage <= instance.maxNodes * instance.volSize, index, data_index)
+
+    vol_size = np.array([instance.volSize for instance in DATA_INSTANCES], dtype=float)[data_index]
+    data_count = np.maximum(np.ceil(total_storage / vol_size), 2)
+    data_count = np.where(num_azs == 2, np.ceil(data_count / 2) * 2, data_count)
+
+    num_shards = np.ceil(storage_per_replica / 50)
+    data_is_arm = np.array([not instance.type.startswith("t3") for instance in DATA_INSTANCES])[data_index]
+    master_index = np.full(traffic.shape, -1)
+    for index, instance in reversed(list(enumerate(MASTER_INSTANCES))):
+        fits = (data_is_arm == instance.isArm) & (num_shards <= instance.maxShards) & (data_count <= instance.maxNodes)
+        master_index = np.where(fits, index, master_index)
+
+    data_price = np.array([prices[instance.type] for instance in DATA_INSTANCES])[data_index]
+    master_price = np.array([prices[instance.instanceType] for instance in MASTER_INSTANCES])[master_index]
+    monthly_cost = (
+        data_count * data_price
+        + MASTER_NODE_COUNT * master_price
+        + data_count * vol_size * prices["ebs-GB"]
+    )
+
+    return {
+        "osStorage": total_storage,
+        "dataInstance": data_index,
+        "dataNodes": data_count,
+        "masterInstance": master_index,
+        "osCost": monthly_cost,
+    }
+
+def _get_variable_costs(traffic: np.ndarray, pcap_days: np.ndarray, prices: Dict[str, float]) -> np.ndarray:
+    # Mirrors the variable costs of PriceReport, which only bill positive amounts
+    traffic_bytes = traffic / 8
+    s3 = np.ceil(pcap_days * traffic_bytes * PCAP_STORAGE_RATIO * 60 * 60 * 24)
+    lb_gb = np.ceil(traffic_bytes * AWS_SECS_PER_MONTH)
+    return (
+        np.minimum(s3, 50000) * prices["s3-STANDARD-50-GB"]
+        + np.maximum(np.minimum(s3 - 50000, 450000), 0) * prices["s3-STANDARD-450-GB"]
+        + np.maximum(s3 - 500000, 0) * prices["s3-STANDARD-REST-GB"]
+        + lb_gb * (prices["gwlb-GB"] + prices["gwlbe-GB"])
+        + prices["trafficmirror"]
+    )
+
+@dataclass
+class PlanSweep:
+    columns: Dict[str, np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return len(self.columns["traffic"])
+
+    def get_table(self, max_rows: int = None) -> str:
+        capture_types = [instance.instanceType for instance in CAPTURE_INSTANCES]
+        data_types = [instance.type for instance in DATA_INSTANCES]
+
+        table_text = (f"    {'Gbps':>8} {'SPI Days':>8} {'Replicas':>8} {'PCAP Days':>9} {'AZs':>4} {'Capture Nodes':>22}"
+                      + f" {'OS Data Nodes':>26} {'OS Storage (GiB)':>17} {'Cost/mo':>12}\n")
+        num_rows = self.size if max_rows is None else min(self.size, max_rows)
+        for row in range(num_rows):
+            capture = f"{int(self.columns['captureNodes'][row])} x {capture_types[self.columns['captureInstance'][row]]}"
+            data = f"{int(self.columns['dataNodes'][row])} x {data_types[self.columns['dataInstance'][row]]}"
+            table_text += (f"    {self.columns['traffic'][row]:>8g} {self.columns['spiDays'][row]:>8g}"
+                           + f" {self.columns['replicas'][row]:>8g} {self.columns['pcapDays'][row]:>9g}"
+                           + f" {self.columns['numAzs'][row]:>4g} {capture:>22} {data:>26}"
+                           + f" {self.columns['osStorage'][row]:>17,.0f} ${self.columns['monthlyCost'][row]:>11,.2f}\n")
+        if num_rows < self.size:
+            table_text += f"    ... and {self.size - num_rows} more\n"
+        return table_text
+
+    def get_curve(self, axis: str = "traffic") -> List[Dict[str, float]]:
+        """
+        How the monthly cost and cluster size vary along the axis, across every other swept value
+        """
+        values, inverse = np.unique(self.columns[axis], return_inverse=True)
+        inverse = inverse.ravel()
+
+        def reduce(ufunc: np.ufunc, column: str, initial: float) -> np.ndarray:
+            reduced = np.full(values.shape, initial)
+            ufunc.at(reduced, inverse, self.columns[column])
+            return reduced
+
+        min_cost = reduce(np.minimum, "monthlyCost", np.inf)
+        max_cost = reduce(np.maximum, "monthlyCost", -np.inf)
+        max_capture_nodes = reduce(np.maximum, "captureNodes", 0)
+        max_data_nodes = reduce(np.maximum, "dataNodes", 0)
+
+        return [
+            {
+                axis: float(values[index]),
+                "minCost": float(min_cost[index]),
+                "maxCost": float(max_cost[index]),
+                "maxCaptureNodes": int(max_capture_nodes[index]),
+                "maxDataNodes": int(max_data_nodes[index]),
+            }
+            for index in range(len(values))
+        ]
+
+    def get_curve_report(self, axis: str = "traffic") -> str:
+        report_text = (f"    {axis:>10} {'Min Cost/mo':>14} {'Max Cost/mo':>14} {'Max Capture Nodes':>18}"
+                       + f" {'Max OS Data Nodes':>18}\n")
+        for point in self.get_curve(axis):
+            report_text += (f"    {point[axis]:>10g} ${point['minCost']:>13,.2f} ${point['maxCost']:>13,.2f}"
+                            + f" {point['maxCaptureNodes']:>18} {point['maxDataNodes']:>18}\n")
+        return report_text
+
+    def to_csv(self, path: str):
+        names = list(self.columns.keys())
+        np.savetxt(path, np.column_stack([self.columns[name] for name in names]), delimiter=",",
+                   header=",".join(names), comments="", fmt="%g")
+
+def sweep_capacity_plans(traffic: np.ndarray, spi_days: np.ndarray, replicas: np.ndarray, pcap_days: np.ndarray,
+                         num_azs: np.ndarray, prices: Dict[str, float] = None) -> PlanSweep:
+    """
+    Evaluates the capacity plan and estimated monthly cost of every combination of the supplied values.  Traffic is
+    in Gbps; points over the limit of a single cluster are dropped, as cluster-create would refuse them.  The Viewer
+    Nodes are assumed to share the Capture VPC.
+    """
+    prices = prices if prices else US_EAST_1_PRICES
+
+    grid = np.meshgrid(traffic, spi_days, replicas, pcap_days, num_azs, indexing="ij")
+    columns = {axis: values.ravel().astype(float) for axis, values in zip(SWEEP_AXES, grid)}
+
+    in_bounds = columns["traffic"] <= MAX_TRAFFIC
+    if not in_bounds.all():
+        logger.warning(f"Skipping traffic values over the {MAX_TRAFFIC} Gbps limit of a single cluster")
+        columns = {axis: values[in_bounds] for axis, values in columns.items()}
+
+    # The capture planner treats very low traffic as the minimum, but the OS Domain planner and estimate don't
+    planned_traffic = np.maximum(columns["traffic"], MINIMUM_TRAFFIC)
+    columns.update(_get_capture_plans(planned_traffic, prices))
+    columns.update(_get_os_domain_plans(columns["traffic"], columns["spiDays"], columns["replicas"], columns["numAzs"],
+                                        prices))
+
+    viewer_nodes = np.where(columns["traffic"] <= MINIMUM_TRAFFIC, 1, 2)
+    columns["monthlyCost"] = (
+        columns["captureCost"]
+        + viewer_nodes * prices["fargate"]
+        + columns["osCost"]
+        + _get_variable_costs(columns["traffic"], columns["pcapDays"], prices)
+    )
+    return PlanSweep(columns)
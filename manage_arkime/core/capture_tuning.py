@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import math
+from typing import Dict
+
+from core.capacity_planning import (CaptureInstance, CaptureNodesPlan, CAPTURE_INSTANCES, SESSIONS_ROTATION_DAILY,
+                                    SESSIONS_ROTATIONS, UnknownInstanceType)
+
+# The Capture Nodes' config.ini ships with settings suited to the smallest instance and the most verbose logging.  These
+# derive Arkime's capture performance settings from the instance type and traffic the capacity plan chose instead.
+# See: https://arkime.com/settings and https://arkime.com/faq#arkime-capture-performance
+
+READER_THREAD_GBPS = 2.5 # The traffic a single AF_PACKET v3 reader thread keeps up with
+MAX_READER_THREADS = 12 # Arkime's limit for tpacketv3NumThreads
+MAX_PACKET_THREADS = 24 # Arkime's limit for packetThreads
+
+TPACKETV3_BLOCK_SIZE = 8 * 1024 * 1024 # Arkime's default ring buffer block size; enough for ~1 Gbps per reader
+MAX_TPACKETV3_BLOCK_SIZE = 64 * 1024 * 1024
+
+DB_BULK_SIZE_PER_GBPS = 1000000 # bytes of SPI per OpenSearch bulk request, per Gbps of traffic
+MIN_DB_BULK_SIZE = 300000 # Arkime's default
+MAX_DB_BULK_SIZE = 4000000
+DB_CONNS_PER_PACKET_THREAD = 10
+MIN_DB_CONNS = 30 # Arkime's default
+
+PCAP_TARGET_FILE_G = 1 # We'd rather not write PCAP objects much smaller than this to S3
+MAX_PCAP_FILE_TIME_M = 5 # ...but don't hold PCAP back from S3 longer than this to get there
+MAX_PCAP_FILE_SIZE_G = 12 # Arkime's default
+
+# ISM keeps each sessions index until its newest data has aged past the retention, so an index made just before a
+# rotation change can outlive the change by the retention plus the longest span of data an index holds
+MAX_ROTATION_DAYS = math.ceil(max(SESSIONS_ROTATIONS.values()))
+
+def _get_capture_instance(instance_type: str) -> CaptureInstance:
+    instance = next((instance for instance in CAPTURE_INSTANCES if instance.instanceType == instance_type), None)
+    if instance is None:
+        raise UnknownInstanceType(instance_type)
+    return instance
+
+def _gbps_to_gb_per_min(gbps: float) -> float:
+    return gbps / 8 * 60
+
+@dataclass
+class CaptureTuning:
+    packetThreads: int
+    tpacketv3NumThreads: int
+    tpacketv3BlockSize: int # bytes
+    dbBulkSize: int # bytes
+    maxESConns: int
+    maxFileSizeG: int
+    maxFileTimeM: int
+    debug: int = 0
+    logESRequests: bool = False
+    rotateIndex: str = SESSIONS_ROTATION_DAILY # How often to start a new sessions index
+
+    def to_config_settings(self) -> Dict[str, str]:
+        """
+        The settings as they should appear in the [default] section of the Capture Nodes' config.ini
+        """
+        return {
+            "debug": str(self.debug),
+            "logESRequests": "true" if self.logESRequests else "false",
+            "tpacketv3NumThreads": str(self.tpacketv3NumThreads),
+            "tpacketv3BlockSize": str(self.tpacketv3BlockSize),
+            "maxFileSizeG": str(self.maxFileSizeG),
+            "maxFileTimeM": str(self.maxFileTimeM),
+            "packetThreads": str(self.packetThreads),
+            "dbBulkSize": str(self.dbBulkSize),
+            "maxESConns": str(self.maxESConns),
+            "rotateIndex": self.rotateIndex,
+        }
+
+def get_viewer_tuning_settings(sessions_rotation: str, rotation_changed_at: str = None, spi_days: int = 0,
+                               now: datetime = None) -> Dict[str, str]:
+    """
+    The settings as they should appear in the [default] section of the Viewer Nodes' config.ini.  The Viewers work out
+    which sessions indices to search from rotateIndex, so it must match the Capture Nodes'.  Indices made under an
+    earlier rotation are only found by searching every index, so Clusters that don't rotate daily do that, as do
+    Clusters whose rotation changed recently enough that ISM may not have deleted the old rotation's indices yet.
+
+    sessions_rotation: how often the OpenSearch Domain's plan has Arkime start a new sessions index
+    rotation_changed_at: when the OpenSearch Domain's plan last changed the rotation (ISO-8601), if it ever has
+    spi_days: the number of days of sessions data the Cluster retains
+    now: the time to evaluate the settings at; defaults to the current time
+    """
+    rotation = sessions_rotation or SESSIONS_ROTATION_DAILY
+    query_all = rotation != SESSIONS_ROTATION_DAILY or _has_old_rotation_indices(rotation_changed_at, spi_days, now)
+    return {
+        "rotateIndex": rotation,
+        "queryAllIndices": "true" if query_all else "false",
+    }
+
+def _has_old_rotation_indices(rotation_changed_at: str, spi_days: int, now: datetime) -> bool:
+    if not rotation_changed_at:
+        return False
+    changed_at = datetime.fromisoformat(rotation_changed_at)
+    now = now or datetime.now(timezone.utc)
+    return now < changed_at + timedelta(days=spi_days + MAX_ROTATION_DAYS)
+
+def get_capture_tuning(capture_plan: CaptureNodesPlan, expected_traffic: float,
+                       sessions_rotation: str = None) -> CaptureTuning:
+    """
+    The threading, ring buffer, and OpenSearch bulk settings are sized for the most traffic a node of the planned type
+    is expected to handle before the Cluster scales out.  The PCAP file limits are sized for each node's share of the
+    expected traffic, so quiet Clusters don't fill S3 with tiny objects.
+
+    capture_plan: the Capture Nodes' capacity plan
+    expected_traffic: the Cluster's expected traffic, in Gbps
+    sessions_rotation: how often the OpenSearch Domain's plan has Arkime start a new sessions index
+    """
+    instance = _get_capture_instance(capture_plan.instanceType)
+
+    # Leave the reader threads their own cores and give the packet (i.e. parsing) threads the rest
+    vcpus = max(1, math.floor(instance.ecsCPU / 1024))
+    reader_threads = min(MAX_READER_THREADS, max(1, math.ceil(instance.trafficPer / READER_THREAD_GBPS)))
+    packet_threads = min(MAX_PACKET_THREADS, max(1, vcpus - reader_threads))
+
+    # Each reader's ring needs to absorb bursts in proportion to the traffic it's reading
+    traffic_per_reader = instance.trafficPer / reader_threads
+    block_multiple = 2 ** math.ceil(math.log2(traffic_per_reader)) if traffic_per_reader > 1 else 1
+    block_size = min(MAX_TPACKETV3_BLOCK_SIZE, TPACKETV3_BLOCK_SIZE * block_multiple)
+
+    # Fewer, larger bulk requests (spread over more connections) keep OpenSearch from being the bottleneck
+    bulk_size = min(MAX_DB_BULK_SIZE, max(MIN_DB_BULK_SIZE, math.ceil(instance.trafficPer * DB_BULK_SIZE_PER_GBPS)))
+    es_conns = max(MIN_DB_CONNS, packet_threads * DB_CONNS_PER_PACKET_THREAD)
+
+    # Roll PCAP files often enough that they reach S3 promptly, but not so often that each is a sliver
+    node_share = expected_traffic / max(1, capture_plan.desiredCount)
+    node_share_per_min = _gbps_to_gb_per_min(node_share)
+    file_time = (
+        MAX_PCAP_FILE_TIME_M if node_share_per_min <= 0
+        else min(MAX_PCAP_FILE_TIME_M, max(1, math.ceil(PCAP_TARGET_FILE_G / node_share_per_min)))
+    )
+    file_size = min(MAX_PCAP_FILE_SIZE_G, max(1, math.ceil(_gbps_to_gb_per_min(instance.trafficPer) * file_time)))
+
+    return CaptureTuning(
+        packetThreads=packet_threads,
+        tpacketv3NumThreads=reader_threads,
+        tpacketv3BlockSize=block_size,
+        dbBulkSize=bulk_size,
+        maxESConns=es_conns,
+        maxFileSizeG=file_size,
+        maxFileTimeM=file_time,
+        rotateIndex=sessions_rotation or SESSIONS_ROTATION_DAILY,
+    )
@@ -0,0 +1,262 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+import math
+import re
+from typing import Dict, List
+
+from core.capacity_planning import (CAPACITY_BUFFER_FACTOR, MASTER_INSTANCES, MIN_WEEKLY_SPI_DAYS, MasterNodesPlan,
+                                    OSDomainPlan, SESSIONS_ROTATION_DAILY, get_os_domain_plan_for_storage)
+from core.storage_calibration import OS_RESERVED_STORAGE_FACTOR, get_sessions_bytes_by_day
+
+# The OpenSearch Domain's capacity plan is a prediction made before the Cluster sees any traffic.  These compare it with
+# what the live Domain reports about its disk usage, heap, and write rejections, and re-plan the Domain from those.
+# See: https://docs.aws.amazon.com/opensearch-service/latest/developerguide/handling-errors.html
+
+JVM_PRESSURE_TARGET = 75 # percent; above this, the Domain spends too long garbage collecting
+DEFAULT_HIGH_WATERMARK = 90 # percent; OpenSearch's default
+HIGH_WATERMARK_SETTING = "cluster.routing.allocation.disk.watermark.high"
+DEFAULT_GROWTH_DAYS = 7 # The complete days of sessions indices to average the growth over
+GIB = 1024 ** 3
+
+class NoDataNodesObserved(Exception):
+    def __init__(self):
+        super().__init__("The OpenSearch Domain didn't report any data nodes")
+
+def parse_high_watermark(cluster_settings: Dict[str, Dict[str, str]]) -> float:
+    """
+    Finds the effective high disk watermark, as a percent, in the output of _cluster/settings with flat settings
+    """
+    for section in ["transient", "persistent", "defaults"]:
+        value = cluster_settings.get(section, {}).get(HIGH_WATERMARK_SETTING)
+        if value is None:
+            continue
+
+        match = re.fullmatch(r"\s*([0-9.]+)\s*%\s*", str(value))
+        if match:
+            return float(match.group(1))
+        try:
+            ratio = float(value)
+            if ratio <= 1:
+                return ratio * 100
+        except ValueError:
+            pass
+        # Absolute watermarks (e.g. 10gb) don't translate into a percent of differently-sized nodes
+        return DEFAULT_HIGH_WATERMARK
+    return DEFAULT_HIGH_WATERMARK
+
+def _is_warm_node(node: Dict[str, any]) -> bool:
+    return node.get("attributes", {}).get("box_type") == "warm"
+
+def _is_data_node(node: Dict[str, any]) -> bool:
+    return any(role.startswith("data") for role in node.get("roles", [])) and not _is_warm_node(node)
+
+def _is_dedicated_master_node(node: Dict[str, any]) -> bool:
+    roles = node.get("roles", [])
+    return ("master" in roles or "cluster_manager" in roles) and not _is_data_node(node) and not _is_warm_node(node)
+
+def _get_daily_growth(sessions_indices: List[Dict[str, str]], replicas: int, today: date, growth_days: int) -> float:
+    bytes_by_day = get_sessions_bytes_by_day(sessions_indices)
+    window = [bytes_by_day[day] for day in bytes_by_day if today - timedelta(days=growth_days) <= day < today]
+    if not window:
+        return 0
+    return sum(window) / len(window) * (1 + replicas)
+
+@dataclass
+class DomainObservation:
+    dataNodeCount: int
+    masterNodeCount: int
+    diskUsed: int # bytes, across the (hot) data nodes
+    diskTotal: int # bytes, across the (hot) data nodes
+    highWatermark: float # percent
+    dataJvmPressure: float # the highest heap usage of any data node, in percent
+    masterJvmPressure: float # the highest heap usage of any dedicated master node, in percent
+    writeRejections: int # across all nodes, since they started
+    dailyGrowth: float # bytes per day, across all copies of the sessions indices
+
+    def get_steady_state(self, retention_days: int) -> float:
+        """
+        The disk the data nodes will use once expired indices are being deleted as fast as new ones arrive, in bytes
+        """
+        return max(self.diskUsed, self.dailyGrowth * retention_days)
+
+    def get_headroom_days(self, retention_days: int, disk_total: float = None) -> float:
+        """
+        The days until the data nodes reach the high watermark at the current growth rate; None if they never will,
+        because the data expires before it gets there.
+
+        retention_days: the days of SPI data kept on the data nodes
+        disk_total: the data nodes' total disk, in bytes, if not the observed total
+        """
+        disk_total = self.diskTotal if disk_total is None else disk_total
+        disk_limit = disk_total * self.highWatermark / 100
+        if self.dailyGrowth <= 0 or self.get_steady_state(retention_days) <= disk_limit:
+            return None
+        return max(0, (disk_limit - self.diskUsed) / self.dailyGrowth)
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "dataNodeCount": self.dataNodeCount,
+            "masterNodeCount": self.masterNodeCount,
+            "diskUsed": self.diskUsed,
+            "diskTotal": self.diskTotal,
+            "highWatermark": self.highWatermark,
+            "dataJvmPressure": self.dataJvmPressure,
+            "masterJvmPressure": self.masterJvmPressure,
+            "writeRejections": self.writeRejections,
+            "dailyGrowth": self.dailyGrowth,
+        }
+
+def observe_domain(allocation: List[Dict[str, str]], nodes_stats: Dict[str, any], cluster_settings: Dict[str, any],
+                   sessions_indices: List[Dict[str, str]], replicas: int, today: date,
+                   growth_days: int = DEFAULT_GROWTH_DAYS) -> DomainObservation:
+    """
+    Boils the live Domain's state down to what matters for sizing it.  Accepts the JSON output of _cat/allocation and
+    _cat/indices (with sizes in bytes), _nodes/stats, and _cluster/settings (with defaults and flat settings).
+
+    replicas: the number of replicas of the sessions indices
+    today: the current (UTC) date; only the complete days before it count towards the growth
+    """
+    nodes = list(nodes_stats.get("nodes", {}).values())
+    data_nodes = [node for node in nodes if _is_data_node(node)]
+    master_nodes = [node for node in nodes if _is_dedicated_master_node(node)]
+    data_node_names = {node["name"] for node in data_nodes}
+
+    data_allocations = [row for row in allocation if row.get("node") in data_node_names and row.get("disk.total")]
+    if not data_allocations:
+        raise NoDataNodesObserved()
+
+    def max_heap(node_group: List[Dict[str, any]]) -> float:
+        return max((node["jvm"]["mem"]["heap_used_percent"] for node in node_group), default=0)
+
+    return DomainObservation(
+        dataNodeCount=len(data_allocations),
+        masterNodeCount=len(master_nodes),
+        diskUsed=sum(int(row["disk.used"]) for row in data_allocations),
+        diskTotal=sum(int(row["disk.total"]) for row in data_allocations),
+        highWatermark=parse_high_watermark(cluster_settings),
+        dataJvmPressure=max_heap(data_nodes),
+        masterJvmPressure=max_heap(master_nodes),
+        writeRejections=sum(node.get("thread_pool", {}).get("write", {}).get("rejected", 0) for node in nodes),
+        dailyGrowth=_get_daily_growth(sessions_indices, replicas, today, growth_days),
+    )
+
+def _get_larger_master_type(current_type: str, planned_type: str) -> str:
+    # The next size up from whichever of the two is larger, within the planned architecture
+    planned = next(instance for instance in MASTER_INSTANCES if instance.instanceType == planned_type)
+    family = [instance.instanceType for instance in MASTER_INSTANCES if instance.isArm == planned.isArm]
+
+    current_index = family.index(current_type) if current_type in family else -1
+    planned_index = family.index(planned_type)
+    if planned_index > current_index:
+        return planned_type
+    return family[min(current_index + 1, len(family) - 1)]
+
+def recommend_os_domain_plan(current_plan: OSDomainPlan, observed: DomainObservation, retention_days: int, replicas: int,
+                             num_azs: int) -> OSDomainPlan:
+    """
+    Re-plan the Domain from what it's observed to need.  The data nodes need room for the retention period's growth
+    (or what's already stored, if more) below the high watermark.  A Domain under heap pressure or rejecting writes is
+    short on compute rather than disk, so it gets proportionally more of the data nodes it has.
+
+    retention_days: the days of SPI data kept on the data nodes (i.e. the hot days, if the Domain has a warm tier)
+    replicas: the number of replicas to have of the data
+    num_azs: the number of AZs in the domain's VPC
+    """
+    storage_needed = observed.get_steady_state(retention_days) / (observed.highWatermark / 100) * OS_RESERVED_STORAGE_FACTOR / GIB
+
+    compute_factor = observed.dataJvmPressure / JVM_PRESSURE_TARGET
+    if observed.writeRejections:
+        compute_factor = max(compute_factor, CAPACITY_BUFFER_FACTOR)
+    if compute_factor > 1:
+        current_storage = current_plan.dataNodes.count * current_plan.dataNodes.volumeSize
+        storage_needed = max(storage_needed, current_storage * compute_factor)
+
+    daily_index_size = observed.dailyGrowth / (1 + replicas) / GIB
+    no_warm_tier = current_plan.warmNodes is None
+    plan = get_os_domain_plan_for_storage(storage_needed, replicas, num_azs, daily_index_size,
+                                          allow_burstable=no_warm_tier,
+                                          allow_weekly=no_warm_tier and retention_days >= MIN_WEEKLY_SPI_DAYS)
+
+    if observed.masterJvmPressure > JVM_PRESSURE_TARGET:
+        plan.masterNodes = MasterNodesPlan(
+            plan.masterNodes.count,
+            _get_larger_master_type(current_plan.masterNodes.instanceType, plan.masterNodes.instanceType)
+        )
+
+    # The warm tier is sized from the retention settings, which live usage doesn't change
+    plan.warmNodes = current_plan.warmNodes
+    return plan
+
+def _get_planned_disk(plan: OSDomainPlan) -> float:
+    # The disk OpenSearch sees on the planned data nodes, after the Domain's reserved storage, in bytes
+    return plan.dataNodes.count * plan.dataNodes.volumeSize * GIB / OS_RESERVED_STORAGE_FACTOR
+
+def _format_days(days: float) -> str:
+    return "unbounded" if days is None else str(math.floor(days))
+
+def _format_rotation(rotation: str) -> str:
+    return rotation or SESSIONS_ROTATION_DAILY
+
+def _to_gb(num_bytes: float) -> int:
+    return math.ceil(num_bytes / GIB)
+
+@dataclass
+class DomainSizingReport:
+    current: OSDomainPlan
+    recommended: OSDomainPlan
+    observed: DomainObservation
+    retention_days: int # The days of SPI data kept on the data nodes
+
+    def _line(self, name: str, oldVal: any, newVal: any) -> str:
+        if oldVal is None or oldVal == newVal:
+            return f"    {name}: {newVal}\n"
+        else:
+            return f"    {name}: \033[1m{oldVal} -> {newVal}\033[0m\n"
+
+    def get_current_headroom_days(self) -> float:
+        return self.observed.get_headroom_days(self.retention_days)
+
+    def get_recommended_headroom_days(self) -> float:
+        return self.observed.get_headroom_days(self.retention_days, _get_planned_disk(self.recommended))
+
+    def needs_resizing(self) -> bool:
+        return (self.current.dataNodes != self.recommended.dataNodes
+                or self.current.masterNodes != self.recommended.masterNodes)
+
+    def get_report(self) -> str:
+        current = self.current
+        recommended = self.recommended
+        report_text = (
+            "Observed:\n"
+            + self._line("Data Node Count", None, self.observed.dataNodeCount)
+            + self._line("Dedicated Master Node Count", None, self.observed.masterNodeCount)
+            + self._line("Data Node Disk Used [GB]", None, _to_gb(self.observed.diskUsed))
+            + self._line("Data Node Disk Total [GB]", None, _to_gb(self.observed.diskTotal))
+            + self._line("High Disk Watermark [%]", None, self.observed.highWatermark)
+            + self._line("Daily Growth [GB]", None, _to_gb(self.observed.dailyGrowth))
+            + self._line("Steady-State Disk Used [GB]", None, _to_gb(self.observed.get_steady_state(self.retention_days)))
+            + self._line("Max Data Node JVM Memory Pressure [%]", None, self.observed.dataJvmPressure)
+            + self._line("Max Master Node JVM Memory Pressure [%]", None, self.observed.masterJvmPressure)
+            + self._line("Write Rejections", None, self.observed.writeRejections)
+            + "OpenSearch Domain:\n"
+            + self._line("Master Node Count", current.masterNodes.count, recommended.masterNodes.count)
+            + self._line("Master Node Type", current.masterNodes.instanceType, recommended.masterNodes.instanceType)
+            + self._line("Data Node Count", current.dataNodes.count, recommended.dataNodes.count)
+            + self._line("Data Node Type", current.dataNodes.instanceType, recommended.dataNodes.instanceType)
+            + self._line("Data Node Volume Size [GB]", current.dataNodes.volumeSize, recommended.dataNodes.volumeSize)
+            + self._line("Sessions Index Rotation", _format_rotation(current.sessionsRotation),
+                         _format_rotation(recommended.sessionsRotation))
+            + self._line("Sessions Index Shards", current.sessionsShards, recommended.sessionsShards)
+            + self._line("Headroom [days]", _format_days(self.get_current_headroom_days()),
+                         _format_days(self.get_recommended_headroom_days()))
+        )
+        return report_text
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "observed": self.observed.to_dict(),
+            "current": self.current.to_dict(),
+            "recommended": self.recommended.to_dict(),
+            "currentHeadroomDays": self.get_current_headroom_days(),
+            "recommendedHeadroomDays": self.get_recommended_headroom_days(),
+        }
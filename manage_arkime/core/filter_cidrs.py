@@ -0,0 +1,40 @@
+import ipaddress
+from typing import List
+
+# AWS allows 10 rules per direction in a Traffic Mirror Filter.  We need one of those in each direction for the
+# catch-all ACCEPT rule, leaving the rest for REJECT rules covering the User VPC's own CIDRs.  This also keeps the
+# REJECT rules' numbers (starting at 10) below that of the ACCEPT rule (20).
+# See: https://docs.aws.amazon.com/vpc/latest/mirroring/traffic-mirroring-limits.html
+MAX_RULES_PER_DIRECTION = 10
+MAX_REJECT_RULES_PER_DIRECTION = MAX_RULES_PER_DIRECTION - 1
+
+class TooManyFilterCidrs(Exception):
+    def __init__(self, cidrs: List[str]):
+        self.cidrs = cidrs
+        super().__init__(f"The VPC's CIDRs can only be reduced to {len(cidrs)} blocks ({cidrs}), but a Traffic Mirror"
+                         + f" Filter only has room for {MAX_REJECT_RULES_PER_DIRECTION} per direction")
+
+def aggregate_cidrs(cidrs: List[str]) -> List[str]:
+    """
+    Merges overlapping and adjacent CIDRs into the smallest equivalent set of blocks.  The result is ordered with the
+    largest blocks first; lacking real traffic numbers, the size of a block is our best guess at how much traffic will
+    match it, so packets are rejected after as few rule evaluations as possible.
+    """
+    networks = [ipaddress.ip_network(cidr, strict=False) for cidr in cidrs]
+
+    # collapse_addresses() can't mix IPv4 and IPv6
+    collapsed = []
+    for version in [4, 6]:
+        collapsed.extend(ipaddress.collapse_addresses([n for n in networks if n.version == version]))
+
+    collapsed.sort(key=lambda n: (-n.num_addresses, n.version, n.network_address))
+    return [str(network) for network in collapsed]
+
+def get_filter_cidrs(cidrs: List[str]) -> List[str]:
+    """
+    Returns the CIDRs to generate Traffic Mirror Filter rules for, raising if they won't fit in the Filter.
+    """
+    aggregated = aggregate_cidrs(cidrs)
+    if len(aggregated) > MAX_REJECT_RULES_PER_DIRECTION:
+        raise TooManyFilterCidrs(aggregated)
+    return aggregated
@@ -0,0 +1,183 @@
+from dataclasses import dataclass, field
+import logging
+from typing import Callable, Dict, List
+
+import aws_interactions.cloudwatch_interactions as cwi
+from core.capacity_planning import CAPTURE_INSTANCES, ClusterPlan
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+# Judging whether a Cluster is keeping up means looking at its traffic, Capture Nodes, OpenSearch Domain, and mirroring
+# Lambdas side-by-side.  We pull all of those with one batch of GetMetricData queries and boil each down to its average
+# and peak over the time window, alongside what the Cluster's capacity plan says it should be able to handle.
+
+@dataclass
+class ClusterMetricsSources:
+    """
+    The identifiers of the AWS resources a Cluster's metrics are reported against
+    """
+    cluster_name: str
+    aws_account: str
+    gwlb_dimension: str # The GWLB's "LoadBalancer" dimension, e.g. gwy/name/id
+    ecs_cluster: str
+    ecs_service: str
+    os_domain: str
+    vpc_ids: List[str] = field(default_factory=list)
+
+@dataclass
+class MetricSummary:
+    name: str
+    unit: str
+    average: float = None
+    peak: float = None
+    total: float = None
+    capacity: float = None # What the capacity plan says we can handle, in the same unit
+
+    @property
+    def utilization(self) -> float:
+        if self.peak is None or not self.capacity:
+            return None
+        return self.peak / self.capacity
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'name': self.name,
+            'unit': self.unit,
+            'average': self.average,
+            'peak': self.peak,
+            'total': self.total,
+            'capacity': self.capacity,
+            'utilization': self.utilization,
+        }
+
+@dataclass
+class _SummarySpec:
+    name: str
+    unit: str
+    namespace: str
+    metric_name: str
+    dimensions: Dict[str, str]
+    average_stat: str
+    peak_stat: str
+    transform: Callable[[float], float] = None # Converts a datapoint into the summary's unit
+    capacity: float = None
+    is_count: bool = False # Whether to report the total over the window
+
+    @property
+    def average_key(self) -> str:
+        return f"{self.name}/average"
+
+    @property
+    def peak_key(self) -> str:
+        return f"{self.name}/peak"
+
+    def get_queries(self) -> List[cwi.MetricQuery]:
+        return [
+            cwi.MetricQuery(self.average_key, self.namespace, self.metric_name, self.dimensions, self.average_stat),
+            cwi.MetricQuery(self.peak_key, self.namespace, self.metric_name, self.dimensions, self.peak_stat),
+        ]
+
+    def summarize(self, results: Dict[str, List[float]]) -> MetricSummary:
+        transform = self.transform if self.transform else (lambda value: value)
+        average_values = [transform(value) for value in results.get(self.average_key, [])]
+        peak_values = [transform(value) for value in results.get(self.peak_key, [])]
+
+        summary = MetricSummary(self.name, self.unit, capacity=self.capacity)
+        if average_values:
+            summary.average = sum(average_values) / len(average_values)
+            if self.is_count:
+                summary.total = sum(average_values)
+        if peak_values:
+            summary.peak = max(peak_values)
+        return summary
+
+def _get_summary_specs(sources: ClusterMetricsSources, plan: ClusterPlan, period: int) -> List[_SummarySpec]:
+    ecs_dimensions = {"ClusterName": sources.ecs_cluster, "ServiceName": sources.ecs_service}
+    os_dimensions = {"DomainName": sources.os_domain, "ClientId": sources.aws_account}
+    volume_size = plan.osDomain.dataNodes.volumeSize
+
+    # How much traffic the planned number of Capture Nodes can handle
+    capture_instance = next((i for i in CAPTURE_INSTANCES if i.instanceType == plan.captureNodes.instanceType), None)
+    capture_capacity = capture_instance.trafficPer * plan.captureNodes.desiredCount if capture_instance else None
+
+    specs = []
+    if sources.gwlb_dimension:
+        specs.append(_SummarySpec(
+            "CaptureTraffic", "Gbps", "AWS/GatewayELB", "ProcessedBytes", {"LoadBalancer": sources.gwlb_dimension},
+            "Sum", "Sum", transform=lambda value: value * 8 / period / 1e9, capacity=capture_capacity
+        ))
+
+    specs.extend([
+        _SummarySpec("CaptureCPU", "%", "AWS/ECS", "CPUUtilization", ecs_dimensions, "Average", "Maximum", capacity=100),
+        _SummarySpec("CaptureMemory", "%", "AWS/ECS", "MemoryUtilization", ecs_dimensions, "Average", "Maximum", capacity=100),
+        _SummarySpec("OSIndexingRate", "docs/min", "AWS/ES", "IndexingRate", os_dimensions, "Average", "Maximum"),
+        _SummarySpec("OSCPU", "%", "AWS/ES", "CPUUtilization", os_dimensions, "Average", "Maximum", capacity=100),
+        _SummarySpec("OSJVMMemoryPressure", "%", "AWS/ES", "JVMMemoryPressure", os_dimensions, "Average", "Maximum",
+                     capacity=100),
+        # FreeStorageSpace is in MiB; the least free space is the most used
+        _SummarySpec("OSStorageUsedPerNode", "GiB", "AWS/ES", "FreeStorageSpace", os_dimensions, "Average", "Minimum",
+                     transform=lambda value: volume_size - value / 1024, capacity=volume_size),
+    ])
+
+    for vpc_id in sources.vpc_ids:
+        create_dimensions = {
+            "ClusterName": sources.cluster_name, "VpcId": vpc_id, "EventType": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR
+        }
+        destroy_dimensions = {
+            "ClusterName": sources.cluster_name, "VpcId": vpc_id, "EventType": constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR
+        }
+        specs.extend([
+            _SummarySpec(f"{vpc_id}/EniMirrorsCreated", "count", cwi.CW_ARKIME_EVENT_NAMESPACE,
+                         cwi.CreateEniMirrorEventOutcome.SUCCESS.value, create_dimensions, "Sum", "Sum", is_count=True),
+            _SummarySpec(f"{vpc_id}/EniMirrorCreateFailures", "count", cwi.CW_ARKIME_EVENT_NAMESPACE,
+                         cwi.CreateEniMirrorEventOutcome.FAILURE.value, create_dimensions, "Sum", "Sum", is_count=True),
+            _SummarySpec(f"{vpc_id}/EniMirrorDestroyFailures", "count", cwi.CW_ARKIME_EVENT_NAMESPACE,
+                         cwi.DestroyEniMirrorEventOutcome.FAILURE.value, destroy_dimensions, "Sum", "Sum", is_count=True),
+        ])
+
+    return specs
+
+@dataclass
+class ClusterMetricsReport:
+    cluster_name: str
+    region: str
+    period: int
+    summaries: List[MetricSummary] = field(default_factory=list)
+
+    def get_report(self) -> str:
+        def fmt(value: float, suffix: str = "") -> str:
+            return "-" if value is None else f"{value:,.2f}{suffix}"
+
+        report_text = f"Metrics of Cluster {self.cluster_name} in {self.region} ({self.period}s periods):\n"
+        report_text += (f"    {'Metric':<45} {'Unit':<9} {'Average':>12} {'Peak':>12} {'Total':>12} {'Planned':>12}"
+                        + f" {'Peak/Plan':>10}\n")
+        for summary in self.summaries:
+            utilization = None if summary.utilization is None else summary.utilization * 100
+            report_text += (f"    {summary.name:<45} {summary.unit:<9} {fmt(summary.average):>12} {fmt(summary.peak):>12}"
+                            + f" {fmt(summary.total):>12} {fmt(summary.capacity):>12} {fmt(utilization, '%'):>10}\n")
+        return report_text
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'clusterName': self.cluster_name,
+            'region': self.region,
+            'period': self.period,
+            'metrics': [summary.to_dict() for summary in self.summaries],
+        }
+
+def get_cluster_metrics_queries(sources: ClusterMetricsSources, plan: ClusterPlan, period: int) -> List[cwi.MetricQuery]:
+    queries = []
+    for spec in _get_summary_specs(sources, plan, period):
+        queries.extend(spec.get_queries())
+    return queries
+
+def summarize_cluster_metrics(sources: ClusterMetricsSources, plan: ClusterPlan, period: int, region: str,
+                              results: Dict[str, List[float]]) -> ClusterMetricsReport:
+    specs = _get_summary_specs(sources, plan, period)
+    return ClusterMetricsReport(
+        sources.cluster_name,
+        region,
+        period,
+        [spec.summarize(results) for spec in specs]
+    )
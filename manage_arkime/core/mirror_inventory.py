@@ -0,0 +1,232 @@
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Tuple
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+from aws_interactions.aws_environment import AwsEnvironment
+import aws_interactions.ec2_interactions as ec2i
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+# Answering "which ENIs in this VPC aren't being mirrored?" means joining what EC2 knows (ENIs, Sessions) against what
+# we've recorded in SSM, which for a large VPC is a lot of paginated API calls.  We keep a local SQLite copy of that
+# state so repeated questions can be answered straight from disk.  Refreshing it pulls each dataset with a single
+# VPC-scoped, paginated listing and writes only the rows that were added, changed, or removed since the last refresh.
+
+DEFAULT_MAX_AGE_SECONDS = 300
+
+# table name -> (key column, other columns).  Every table is also keyed by the VPC its rows belong to.
+INVENTORY_TABLES = {
+    "subnets": ("subnet_id", ["target_id"]),
+    "enis": ("eni_id", ["subnet_id", "eni_type"]),
+    "sessions": ("session_id", ["eni_id", "target_id"]),
+    "records": ("eni_id", ["subnet_id", "session_id"]),
+}
+
+def get_inventory_path(cluster_name: str, aws_env: AwsEnvironment, parent_dir: str) -> str:
+    return os.path.join(parent_dir, f"inventory-{cluster_name}-{aws_env.aws_account}-{aws_env.aws_region}.db")
+
+@dataclass
+class RefreshStats:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            'added': self.added,
+            'updated': self.updated,
+            'removed': self.removed,
+        }
+
+@dataclass
+class VpcStatus:
+    vpc_id: str
+    refreshed_at: float
+    total_enis: int
+    mirrorable_enis: int
+    mirrored_enis: int
+    unmirrored: List[ec2i.NetworkInterface] = field(default_factory=list)
+    duplicate_enis: List[str] = field(default_factory=list)
+    orphaned_sessions: List[str] = field(default_factory=list)
+    stale_records: List[str] = field(default_factory=list)
+
+    @property
+    def mirrored_fraction(self) -> float:
+        return self.mirrored_enis / self.mirrorable_enis if self.mirrorable_enis else 1.0
+
+    def get_report(self, max_listed: int = 20) -> str:
+        refreshed_ago = int(time.time() - self.refreshed_at)
+        report_text = (f"Mirroring Status of VPC {self.vpc_id} (as of {refreshed_ago}s ago):\n"
+                       + f"    {self.mirrored_enis}/{self.mirrorable_enis} mirrorable ENIs are mirrored"
+                       + f" [{self.mirrored_fraction:.1%}] ({self.total_enis} ENIs total)\n")
+
+        sections = [
+            ("Unmirrored ENIs", [f"{eni.eni_id} ({eni.subnet_id}, {eni.eni_type})" for eni in self.unmirrored]),
+            ("ENIs with duplicate Sessions", self.duplicate_enis),
+            ("Sessions without a record", self.orphaned_sessions),
+            ("Records of ENIs that no longer exist", self.stale_records),
+        ]
+        for title, items in sections:
+            if not items:
+                continue
+            report_text += f"    {title}: {len(items)}\n"
+            for item in items[:max_listed]:
+                report_text += f"        {item}\n"
+            if len(items) > max_listed:
+                report_text += f"        ...and {len(items) - max_listed} more\n"
+
+        return report_text
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'vpcId': self.vpc_id,
+            'refreshedAt': self.refreshed_at,
+            'totalEnis': self.total_enis,
+            'mirrorableEnis': self.mirrorable_enis,
+            'mirroredEnis': self.mirrored_enis,
+            'unmirrored': [eni.to_dict() for eni in self.unmirrored],
+            'duplicateEnis': self.duplicate_enis,
+            'orphanedSessions': self.orphaned_sessions,
+            'staleRecords': self.stale_records,
+        }
+
+class MirrorInventory:
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path)
+        self._create_tables()
+
+    def close(self):
+        self._conn.close()
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS vpcs (vpc_id TEXT PRIMARY KEY, filter_id TEXT, refreshed_at REAL)")
+            for table, (key_column, columns) in INVENTORY_TABLES.items():
+                column_defs = ", ".join([f"{column} TEXT" for column in columns])
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({key_column} TEXT PRIMARY KEY, vpc_id TEXT, {column_defs})")
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_by_vpc ON {table} (vpc_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_by_eni ON sessions (eni_id)")
+
+    def get_refreshed_at(self, vpc_id: str) -> float:
+        """
+        When the VPC's contents were last refreshed, or None if they never have been
+        """
+        row = self._conn.execute("SELECT refreshed_at FROM vpcs WHERE vpc_id = ?", (vpc_id,)).fetchone()
+        return row[0] if row else None
+
+    def sync_vpc(self, vpc_id: str, filter_id: str, contents: Dict[str, Dict[str, Tuple]]) -> RefreshStats:
+        """
+        Brings the stored contents of the VPC in line with the supplied ones, writing only the rows that differ.
+        contents maps each inventory table to {key: (other column values)}.
+        """
+        stats = RefreshStats()
+        with self._conn:
+            for table, rows in contents.items():
+                self._sync_table(table, vpc_id, rows, stats)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vpcs (vpc_id, filter_id, refreshed_at) VALUES (?, ?, ?)",
+                (vpc_id, filter_id, time.time())
+            )
+        return stats
+
+    def _sync_table(self, table: str, vpc_id: str, rows: Dict[str, Tuple], stats: RefreshStats):
+        key_column, columns = INVENTORY_TABLES[table]
+        column_list = ", ".join(columns)
+
+        existing = {
+            row[0]: tuple(row[1:])
+            for row in self._conn.execute(f"SELECT {key_column}, {column_list} FROM {table} WHERE vpc_id = ?", (vpc_id,))
+        }
+
+        upserts = [(key, vpc_id) + tuple(values) for key, values in rows.items() if existing.get(key) != tuple(values)]
+        deletes = [(key,) for key in existing.keys() if key not in rows]
+
+        placeholders = ", ".join(["?"] * (len(columns) + 2))
+        self._conn.executemany(f"INSERT OR REPLACE INTO {table} ({key_column}, vpc_id, {column_list}) VALUES ({placeholders})", upserts)
+        self._conn.executemany(f"DELETE FROM {table} WHERE {key_column} = ?", deletes)
+
+        num_added = len([row for row in upserts if row[0] not in existing])
+        stats.added += num_added
+        stats.updated += len(upserts) - num_added
+        stats.removed += len(deletes)
+
+    def get_vpc_status(self, vpc_id: str) -> VpcStatus:
+        non_mirrorable = ", ".join(["?"] * len(ec2i.NON_MIRRORABLE_ENI_TYPES))
+        mirrorable_query = (f"SELECT e.eni_id, e.subnet_id, e.eni_type FROM enis e JOIN subnets s ON e.subnet_id = s.subnet_id"
+                            + f" WHERE e.vpc_id = ? AND e.eni_type NOT IN ({non_mirrorable})")
+        mirrorable_args = (vpc_id, *ec2i.NON_MIRRORABLE_ENI_TYPES)
+
+        total_enis = self._conn.execute("SELECT COUNT(*) FROM enis WHERE vpc_id = ?", (vpc_id,)).fetchone()[0]
+        mirrorable_enis = self._conn.execute(f"SELECT COUNT(*) FROM ({mirrorable_query})", mirrorable_args).fetchone()[0]
+        unmirrored = [
+            ec2i.NetworkInterface(vpc_id, subnet_id, eni_id, eni_type)
+            for eni_id, subnet_id, eni_type in self._conn.execute(
+                f"SELECT * FROM ({mirrorable_query}) m"
+                + " WHERE NOT EXISTS (SELECT 1 FROM sessions x WHERE x.eni_id = m.eni_id AND x.vpc_id = ?) ORDER BY m.eni_id",
+                mirrorable_args + (vpc_id,)
+            )
+        ]
+        duplicate_enis = [row[0] for row in self._conn.execute(
+            "SELECT eni_id FROM sessions WHERE vpc_id = ? GROUP BY eni_id HAVING COUNT(*) > 1 ORDER BY eni_id", (vpc_id,)
+        )]
+        orphaned_sessions = [row[0] for row in self._conn.execute(
+            "SELECT x.session_id FROM sessions x LEFT JOIN records r ON x.eni_id = r.eni_id"
+            + " WHERE x.vpc_id = ? AND r.eni_id IS NULL ORDER BY x.session_id", (vpc_id,)
+        )]
+        stale_records = [row[0] for row in self._conn.execute(
+            "SELECT r.eni_id FROM records r LEFT JOIN enis e ON r.eni_id = e.eni_id"
+            + " WHERE r.vpc_id = ? AND e.eni_id IS NULL ORDER BY r.eni_id", (vpc_id,)
+        )]
+
+        return VpcStatus(
+            vpc_id,
+            self.get_refreshed_at(vpc_id),
+            total_enis,
+            mirrorable_enis,
+            mirrorable_enis - len(unmirrored),
+            unmirrored,
+            duplicate_enis,
+            orphaned_sessions,
+            stale_records
+        )
+
+def refresh_vpc(inventory: MirrorInventory, cluster_name: str, vpc_id: str, aws_provider: AwsClientProvider) -> RefreshStats:
+    """
+    Pulls the current state of the monitored VPC from SSM and EC2 and applies it to the inventory
+    """
+    vpc_param_name = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
+    traffic_filter_id = ssm_ops.get_ssm_param_json_value(vpc_param_name, "mirrorFilterId", aws_provider)
+
+    # One recursive listing gets both our subnet and ENI records
+    subnets = {}
+    records = {}
+    for param in ssm_ops.get_ssm_params_by_path(f"{vpc_param_name}/subnets", aws_provider, recursive=True):
+        param_value = json.loads(param["Value"])
+        name_parts = param["Name"].split("/")
+        if len(name_parts) >= 3 and name_parts[-2] == "enis":
+            records[param_value["eniId"]] = (name_parts[-3], param_value.get("trafficSessionId"))
+        else:
+            subnets[param_value["subnetId"]] = (param_value.get("mirrorTargetId"),)
+
+    enis = {
+        eni.eni_id: (eni.subnet_id, eni.eni_type)
+        for eni in ec2i.get_enis_of_vpc(vpc_id, aws_provider)
+    }
+    sessions = {
+        session.session_id: (session.eni_id, session.target_id)
+        for session in ec2i.get_mirror_sessions_of_filter(traffic_filter_id, aws_provider)
+    }
+
+    return inventory.sync_vpc(vpc_id, traffic_filter_id, {
+        "subnets": subnets,
+        "enis": enis,
+        "sessions": sessions,
+        "records": records,
+    })
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+import json
+import logging
+from typing import Dict, List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ec2_interactions as ec2i
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+# AWS does not publish a hard cap on the Sessions that can use a Gateway Load Balancer Endpoint as their Target, but
+# each Endpoint's throughput is limited.  We use a Session count as a stand-in for load; this default is deliberately
+# conservative and can be overridden with the VPC's Mirroring Profile (maxSessionsPerTarget).
+DEFAULT_MAX_SESSIONS_PER_TARGET = 500
+
+@dataclass
+class TargetLoad:
+    target_id: str
+    subnet_id: str
+    az: str
+    sessions: int
+    limit: int
+
+    @property
+    def utilization(self) -> float:
+        return self.sessions / self.limit if self.limit else 1.0
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.sessions < self.limit
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'targetId': self.target_id,
+            'subnetId': self.subnet_id,
+            'az': self.az,
+            'sessions': self.sessions,
+            'limit': self.limit,
+        }
+
+class NoTargetForSubnet(Exception):
+    def __init__(self, subnet_id: str):
+        super().__init__(f"There is no Traffic Mirroring Target for subnet {subnet_id}")
+
+class TargetsAtCapacity(Exception):
+    def __init__(self, subnet_id: str, az: str):
+        super().__init__(f"Every Traffic Mirroring Target available to subnet {subnet_id} (AZ {az}) is at its Session limit")
+
+class MirrorPlacementPlanner:
+    """
+    Decides which Traffic Mirroring Target a new Session should use.  Each subnet we monitor has its own Target, but
+    a busy subnet would otherwise pile all of its Sessions onto that one Endpoint.  We instead spread Sessions across
+    every Target in the source's Availability Zone (keeping the mirrored traffic in-AZ), picking the least-loaded one
+    and preferring the subnet's own Target when loads are tied.  The limit is a planning figure rather than an AWS
+    quota, so when every Target in the AZ is at it the caller can still choose to go over.
+    """
+
+    def __init__(self, targets: List[TargetLoad]):
+        self.targets = targets
+
+    def get_target(self, subnet_id: str, allow_over_capacity: bool = False) -> TargetLoad:
+        home_target = next((t for t in self.targets if t.subnet_id == subnet_id), None)
+        if not home_target:
+            raise NoTargetForSubnet(subnet_id)
+
+        az_targets = [t for t in self.targets if t.az == home_target.az]
+        candidates = [t for t in az_targets if t.has_capacity]
+        if not candidates:
+            if not allow_over_capacity:
+                raise TargetsAtCapacity(subnet_id, home_target.az)
+            candidates = az_targets
+
+        return min(candidates, key=lambda t: (t.utilization, t.target_id != home_target.target_id, t.target_id))
+
+    def place(self, subnet_id: str, allow_over_capacity: bool = False) -> TargetLoad:
+        """
+        Picks the Target for a new Session in the subnet and counts the Session against it
+        """
+        target = self.get_target(subnet_id, allow_over_capacity)
+        target.sessions += 1
+        return target
+
+    def get_report(self) -> str:
+        report_text = "Traffic Mirroring Target Load:\n"
+        for target in sorted(self.targets, key=lambda t: (t.az, t.subnet_id)):
+            report_text += (f"    {target.target_id} ({target.subnet_id}, {target.az}): {target.sessions}/{target.limit}"
+                            + f" Sessions [{target.utilization:.0%}]\n")
+        return report_text
+
+def get_target_loads(cluster_name: str, vpc_id: str, traffic_filter_id: str, aws_provider: AwsClientProvider,
+                     max_sessions_per_target: int = DEFAULT_MAX_SESSIONS_PER_TARGET) -> List[TargetLoad]:
+    """
+    Pulls the Targets we've created for the User VPC (one per subnet) out of SSM and counts the Sessions currently
+    using each of them.
+    """
+    vpc_param_name = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
+    subnet_params = ssm_ops.get_ssm_params_by_path(f"{vpc_param_name}/subnets", aws_provider)
+
+    subnet_targets = {}
+    for param in subnet_params:
+        param_value = json.loads(param["Value"])
+        subnet_targets[param_value["subnetId"]] = param_value["mirrorTargetId"]
+
+    if not subnet_targets:
+        return []
+
+    subnet_azs = ec2i.get_azs_of_subnets(list(subnet_targets.keys()), aws_provider)
+
+    session_counts = {}
+    for session in ec2i.get_mirror_sessions_of_filter(traffic_filter_id, aws_provider):
+        session_counts[session.target_id] = session_counts.get(session.target_id, 0) + 1
+
+    return [
+        TargetLoad(target_id, subnet_id, subnet_azs.get(subnet_id), session_counts.get(target_id, 0), max_sessions_per_target)
+        for subnet_id, target_id in subnet_targets.items()
+    ]
@@ -0,0 +1,200 @@
+from dataclasses import dataclass, field
+import json
+from typing import Dict, List, Type, TypeVar
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from core.filter_cidrs import MAX_RULES_PER_DIRECTION
+
+# A Mirroring Profile narrows down what a User VPC sends to the Capture Nodes.  It can truncate each mirrored packet to
+# its first N bytes (set on each Traffic Mirroring Session) and include/exclude traffic by protocol and port (rules in
+# the VPC's Traffic Mirror Filter).  Packet truncation can be overridden per subnet.  It also caps the number of
+# Sessions we plan to place on each of the VPC's Traffic Mirroring Targets.
+#
+# The Profile is supplied to vpc-add as a JSON file, e.g.:
+#
+# {
+#     "packetLength": 256,
+#     "excludeRules": [{"protocol": "tcp", "fromPort": 443, "toPort": 443}],
+#     "includeRules": [],
+#     "subnetOverrides": {"subnet-0123456789": {"packetLength": null}},
+#     "maxSessionsPerTarget": 1000
+# }
+
+PROTOCOL_NUMBERS = {
+    "icmp": 1,
+    "tcp": 6,
+    "udp": 17,
+}
+
+# Mirrored packets are VXLAN-encapsulated, and the result must fit within a jumbo frame; stay comfortably below that
+MAX_PACKET_LENGTH = 8500
+
+# A rough average size of the packets on a typical network, in bytes.  Used to estimate how much truncation will
+# reduce the traffic volume sent to the Capture Nodes.
+AVERAGE_PACKET_SIZE = 800
+
+class InvalidMirrorProfile(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"The Mirroring Profile is invalid: {reason}")
+
+class TooManyFilterRules(Exception):
+    def __init__(self, num_rules: int):
+        super().__init__(f"The Mirroring Profile requires {num_rules} Traffic Mirror Filter rules per direction, but a"
+                         + f" Filter only allows {MAX_RULES_PER_DIRECTION}")
+
+T_PortRule = TypeVar('T_PortRule', bound='PortRule')
+
+@dataclass
+class PortRule:
+    protocol: int
+    fromPort: int = None
+    toPort: int = None
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'protocol': self.protocol,
+            'fromPort': self.fromPort,
+            'toPort': self.toPort,
+        }
+
+    @classmethod
+    def from_dict(cls: Type[T_PortRule], input: Dict[str, any]) -> T_PortRule:
+        protocol = input.get("protocol")
+        if isinstance(protocol, str):
+            if protocol.lower() not in PROTOCOL_NUMBERS:
+                raise InvalidMirrorProfile(f"unknown protocol '{protocol}'; use one of {list(PROTOCOL_NUMBERS.keys())} or an IP protocol number")
+            protocol = PROTOCOL_NUMBERS[protocol.lower()]
+        if not _is_int(protocol) or not (0 <= protocol <= 255):
+            raise InvalidMirrorProfile(f"protocol must be a name or IP protocol number, not '{protocol}'")
+
+        from_port = input.get("fromPort")
+        to_port = input.get("toPort")
+        if from_port is None and to_port is not None:
+            raise InvalidMirrorProfile(f"toPort '{to_port}' was supplied without a fromPort")
+        if to_port is None:
+            to_port = from_port
+
+        if from_port is not None:
+            if protocol not in [PROTOCOL_NUMBERS["tcp"], PROTOCOL_NUMBERS["udp"]]:
+                raise InvalidMirrorProfile("ports can only be specified for TCP and UDP rules")
+            for key, port in [("fromPort", from_port), ("toPort", to_port)]:
+                if not _is_int(port) or not (0 <= port <= 65535):
+                    raise InvalidMirrorProfile(f"{key} must be a port number between 0 and 65535, not '{port}'")
+            if from_port > to_port:
+                raise InvalidMirrorProfile(f"invalid port range {from_port}-{to_port}")
+
+        return cls(protocol, from_port, to_port)
+
+T_MirrorProfile = TypeVar('T_MirrorProfile', bound='MirrorProfile')
+
+@dataclass
+class MirrorProfile:
+    packetLength: int = None
+    includeRules: List[PortRule] = field(default_factory=list)
+    excludeRules: List[PortRule] = field(default_factory=list)
+    subnetOverrides: Dict[str, Dict[str, any]] = field(default_factory=dict)
+    maxSessionsPerTarget: int = None
+
+    def get_packet_length(self, subnet_id: str) -> int:
+        """
+        The truncation length for Sessions in the subnet, or None to mirror whole packets
+        """
+        override = self.subnetOverrides.get(subnet_id, {})
+        return override["packetLength"] if "packetLength" in override else self.packetLength
+
+    def get_filter_rules_per_direction(self, num_cidrs: int) -> int:
+        """
+        The number of Traffic Mirror Filter rules the Profile needs in each direction.  Each port rule needs a pair of
+        Filter rules (one for each end of the connection), and without include rules we need a catch-all ACCEPT rule.
+        """
+        num_accept_rules = 2 * len(self.includeRules) if self.includeRules else 1
+        return num_cidrs + 2 * len(self.excludeRules) + num_accept_rules
+
+    def confirm_fits_filter(self, num_cidrs: int):
+        num_rules = self.get_filter_rules_per_direction(num_cidrs)
+        if num_rules > MAX_RULES_PER_DIRECTION:
+            raise TooManyFilterRules(num_rules)
+
+    def get_volume_ratio(self) -> float:
+        """
+        Estimates the fraction of the VPC's traffic volume that will reach the Capture Nodes.  We can only account
+        for truncation; the impact of the port rules depends on the VPC's traffic mix.
+        """
+        if not self.packetLength:
+            return 1.0
+        return min(1.0, self.packetLength / AVERAGE_PACKET_SIZE)
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'packetLength': self.packetLength,
+            'includeRules': [rule.to_dict() for rule in self.includeRules],
+            'excludeRules': [rule.to_dict() for rule in self.excludeRules],
+            'subnetOverrides': self.subnetOverrides,
+            'maxSessionsPerTarget': self.maxSessionsPerTarget,
+        }
+
+    @classmethod
+    def from_dict(cls: Type[T_MirrorProfile], input: Dict[str, any]) -> T_MirrorProfile:
+        if not isinstance(input, dict):
+            raise InvalidMirrorProfile(f"the Profile must be an object of settings, not '{input}'")
+
+        packet_length = input.get("packetLength")
+        _confirm_packet_length(packet_length)
+
+        subnet_overrides = input.get("subnetOverrides", {})
+        if not isinstance(subnet_overrides, dict):
+            raise InvalidMirrorProfile(f"subnetOverrides must map subnet IDs to their settings, not '{subnet_overrides}'")
+        for subnet_id, override in subnet_overrides.items():
+            if not isinstance(override, dict):
+                raise InvalidMirrorProfile(f"subnetOverrides for subnet {subnet_id} must be an object of settings, not '{override}'")
+            unknown_keys = set(override.keys()) - {"packetLength"}
+            if unknown_keys:
+                raise InvalidMirrorProfile(f"subnet {subnet_id} overrides unsupported settings {sorted(unknown_keys)}")
+            _confirm_packet_length(override.get("packetLength"))
+
+        max_sessions_per_target = input.get("maxSessionsPerTarget")
+        if max_sessions_per_target is not None and (not _is_int(max_sessions_per_target) or max_sessions_per_target < 1):
+            raise InvalidMirrorProfile(f"maxSessionsPerTarget must be a positive integer, not '{max_sessions_per_target}'")
+
+        return cls(
+            packet_length,
+            _parse_port_rules(input, "includeRules"),
+            _parse_port_rules(input, "excludeRules"),
+            subnet_overrides,
+            max_sessions_per_target
+        )
+
+def _is_int(value: any) -> bool:
+    # JSON true/false load as bools, which Python also considers ints
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _parse_port_rules(input: Dict[str, any], key: str) -> List[PortRule]:
+    raw_rules = input.get(key, [])
+    if not isinstance(raw_rules, list) or not all(isinstance(rule, dict) for rule in raw_rules):
+        raise InvalidMirrorProfile(f"{key} must be a list of rule objects, not '{raw_rules}'")
+    return [PortRule.from_dict(rule) for rule in raw_rules]
+
+def _confirm_packet_length(packet_length: int):
+    if packet_length is None:
+        return
+    if not _is_int(packet_length) or not (1 <= packet_length <= MAX_PACKET_LENGTH):
+        raise InvalidMirrorProfile(f"packetLength must be between 1 and {MAX_PACKET_LENGTH} bytes, not '{packet_length}'")
+
+def load_mirror_profile(profile_path: str) -> MirrorProfile:
+    try:
+        with open(profile_path, "r") as profile_file:
+            raw_profile = json.load(profile_file)
+    except (OSError, json.JSONDecodeError) as ex:
+        raise InvalidMirrorProfile(f"unable to read {profile_path}: {ex}")
+
+    return MirrorProfile.from_dict(raw_profile)
+
+def get_vpc_mirror_profile(cluster_name: str, vpc_id: str, aws_provider: AwsClientProvider) -> MirrorProfile:
+    """
+    Pulls the Profile stored with the User VPC's configuration.  VPCs added before Profiles existed mirror everything.
+    """
+    vpc_param_name = constants.get_vpc_ssm_param_name(cluster_name, vpc_id)
+    raw_vpc_config = json.loads(ssm_ops.get_ssm_param_value(vpc_param_name, aws_provider))
+    return MirrorProfile.from_dict(raw_vpc_config.get("mirrorProfile", {}))
@@ -1,10 +1,11 @@
-from core.capacity_planning import ClusterPlan
+from core.capacity_planning import ClusterPlan, CAPTURE_INSTANCES, HOURS_PER_MONTH
 from core.user_config import UserConfig
 from typing import Dict
 import math
 
-AWS_HOURS_PER_MONTH=730
+AWS_HOURS_PER_MONTH=HOURS_PER_MONTH
 AWS_SECS_PER_MONTH=60*60*AWS_HOURS_PER_MONTH
+PCAP_STORAGE_RATIO=0.25 # Expect to only save 25% of pcap because of TLS and zlib
 
 US_EAST_1_PRICES: Dict[str, float] = {
     # https://aws.amazon.com/opensearch-service/pricing/
@@ -17,10 +18,12 @@ US_EAST_1_PRICES: Dict[str, float] = {
     "r6g.2xlarge.search": 0.6690 * AWS_HOURS_PER_MONTH,
     "r6g.4xlarge.search": 1.3390 * AWS_HOURS_PER_MONTH,
     "or1.8xlarge.search": 3.3460 * AWS_HOURS_PER_MONTH,
+    "ultrawarm1.medium.search": 0.2380 * AWS_HOURS_PER_MONTH,
+    "ultrawarm1.large.search": 2.6800 * AWS_HOURS_PER_MONTH,
+    "ultrawarm-GB": 0.024,
 
     # https://aws.amazon.com/ec2/pricing/on-demand/
-    "t3.medium": 0.0416 * AWS_HOURS_PER_MONTH,
-    "m5.xlarge": 0.1920 * AWS_HOURS_PER_MONTH,
+    **{instance.instanceType: instance.hourlyPrice * AWS_HOURS_PER_MONTH for instance in CAPTURE_INSTANCES},
 
     # https://aws.amazon.com/s3/pricing/
     "s3-STANDARD-50-GB": 0.023,
@@ -40,10 +43,12 @@ US_EAST_1_PRICES: Dict[str, float] = {
 
 
 class PriceReport:
-    def __init__(self, plan: ClusterPlan, config: UserConfig, prices: Dict[str, float] = None):
+    def __init__(self, plan: ClusterPlan, config: UserConfig, prices: Dict[str, float] = None,
+                 pcap_ratio: float = PCAP_STORAGE_RATIO):
         self._plan = plan
         self._config = config
         self._prices = prices if prices else US_EAST_1_PRICES.copy()
+        self._pcap_ratio = pcap_ratio
 
         self._total = 0
 
@@ -61,12 +66,20 @@ class PriceReport:
         else:
             return f"   {name:23} {num:9,} * ${cost:9.4f}/mo = ${cost * num:10.2f}/mo\n"
 
+    def _warm_lines(self) -> str:
+        warm_nodes = self._plan.osDomain.warmNodes
+        if not warm_nodes:
+            return ""
+        return (
+            self._line("OS Warm Node", warm_nodes.instanceType, warm_nodes.count)
+            + self._line("OS Warm Storage", "ultrawarm-GB", warm_nodes.storage)
+        )
+
     def get_report(self) -> str:
         tgw_attachments = 2 if self._plan.viewerVpc else 0
 
         expectedTraffic = self._config.expectedTraffic/8
-        # Expect to only saving 25% of pcap because of TLS and zlib
-        s3 = math.ceil(self._plan.s3.pcapStorageDays * expectedTraffic * 0.25 * 60 * 60 * 24)
+        s3 = math.ceil(self._plan.s3.pcapStorageDays * expectedTraffic * self._pcap_ratio * 60 * 60 * 24)
         report_text = (
             "Estimated OnDemand costs based on us-east-1 pricing. Your actual cost may vary depending on usage, region, discounts, and additional services used:\n"
             + "Allocated:\n"
@@ -75,6 +88,7 @@ class PriceReport:
             + self._line("OS Master Node", self._plan.osDomain.masterNodes.instanceType, self._plan.osDomain.masterNodes.count)
             + self._line("OS Data Node", self._plan.osDomain.dataNodes.instanceType, self._plan.osDomain.dataNodes.count)
             + self._line("OS Storage", "ebs-GB", self._plan.osDomain.dataNodes.count*self._plan.osDomain.dataNodes.volumeSize)
+            + self._warm_lines()
             + self._line("TGW Attachments", "transitgateway", tgw_attachments)
             + "Variable:\n"
             + self._line("PCAP Storage first 50TB", "s3-STANDARD-50-GB", min(s3, 50000))
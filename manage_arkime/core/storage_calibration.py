@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+import re
+from typing import Dict, List
+
+from core.capacity_planning import MAGIC_FACTOR
+from core.price_report import PCAP_STORAGE_RATIO
+
+# The capacity planners convert traffic into OpenSearch and S3 storage with fixed ratios (MAGIC_FACTOR and
+# PCAP_STORAGE_RATIO) that are, at best, educated guesses for any particular Cluster.  Once a Cluster has been capturing
+# for a while, we can measure what its traffic actually turned into and plan with that instead.
+
+DEFAULT_CALIBRATION_DAYS = 7
+
+# The sessions indices' store size already includes OpenSearch's indexing overhead, but not the space the Domain reserves
+# for Linux (5%) and the OpenSearch Service (20%), which the MAGIC_FACTOR does account for.
+# See: https://docs.aws.amazon.com/opensearch-service/latest/developerguide/sizing-domains.html
+OS_RESERVED_STORAGE_FACTOR = 1 / ((1 - 0.05) * (1 - 0.20))
+
+# Arkime names its daily (and hourly) sessions indices like arkime_sessions3-230503 (and arkime_sessions3-230503h05)
+SESSIONS_INDEX_DATE_REGEX = re.compile(r"^.*sessions3-(\d{6})(h\d{2})?$")
+
+# The defaults are rough, but a measured ratio this many times larger or smaller than them is more likely to mean the
+# measurement is wrong (e.g. the indices or PCAP weren't all found) than that the Cluster is that unusual.
+MAX_RATIO_DEVIATION = 10
+
+class NotEnoughObservations(Exception):
+    def __init__(self, days: int, reason: str):
+        super().__init__(f"Unable to calibrate from the last {days} full day(s); {reason}")
+
+def get_sessions_bytes_by_day(indices: List[Dict[str, str]]) -> Dict[date, int]:
+    """
+    Sums the primary store size of the sessions indices for each day.  Accepts the output of _cat/indices in JSON form,
+    with sizes in bytes.
+    """
+    bytes_by_day: Dict[date, int] = {}
+    for index in indices:
+        match = SESSIONS_INDEX_DATE_REGEX.match(index["index"])
+        if not match:
+            continue # Not rotated daily or hourly, so we can't tell which day it holds
+        day = datetime.strptime(match.group(1), "%y%m%d").date()
+        bytes_by_day[day] = bytes_by_day.get(day, 0) + int(index["pri.store.size"] or 0)
+    return bytes_by_day
+
+@dataclass
+class StorageCalibration:
+    spiRatio: float # OpenSearch storage per byte of traffic, per replica
+    pcapRatio: float # S3 storage per byte of traffic
+    days: int # The number of days observed
+    trafficBytes: int # The traffic observed over those days
+    calibratedAt: str # ISO-8601, UTC
+
+    def __eq__(self, other) -> bool:
+        return (self.spiRatio == other.spiRatio and self.pcapRatio == other.pcapRatio and self.days == other.days
+                and self.trafficBytes == other.trafficBytes and self.calibratedAt == other.calibratedAt)
+
+    def get_implausible_ratios(self) -> List[str]:
+        """
+        Describes each ratio that is more than MAX_RATIO_DEVIATION times larger or smaller than its default
+        """
+        implausible = []
+        for name, ratio, default in [("OpenSearch", self.spiRatio, MAGIC_FACTOR), ("S3 PCAP", self.pcapRatio, PCAP_STORAGE_RATIO)]:
+            if not (default / MAX_RATIO_DEVIATION <= ratio <= default * MAX_RATIO_DEVIATION):
+                implausible.append(f"{name} storage per byte of traffic is {ratio:.4f}, over {MAX_RATIO_DEVIATION}x away from"
+                                   + f" the default of {default}")
+        return implausible
+
+    def get_report(self) -> str:
+        return (f"Storage calibration from {self.days} day(s) and {self.trafficBytes / 1024**4:.3f} TiB of traffic:\n"
+                + f"    OpenSearch storage per byte of traffic: {self.spiRatio:.4f} (default: {MAGIC_FACTOR})\n"
+                + f"    S3 PCAP storage per byte of traffic: {self.pcapRatio:.4f} (default: {PCAP_STORAGE_RATIO})\n")
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "spiRatio": self.spiRatio,
+            "pcapRatio": self.pcapRatio,
+            "days": self.days,
+            "trafficBytes": self.trafficBytes,
+            "calibratedAt": self.calibratedAt,
+        }
+
+    @classmethod
+    def from_dict(cls, input: Dict[str, any]):
+        return cls(**input)
+
+def calibrate_storage(traffic_by_day: Dict[date, float], sessions_by_day: Dict[date, int], pcap_by_day: Dict[date, int],
+                      days: int, calibrated_at: datetime) -> StorageCalibration:
+    """
+    traffic_by_day: the mirrored traffic the Cluster received on each day
+    sessions_by_day: the primary store size of each day's sessions indices
+    pcap_by_day: the PCAP written to S3 on each day
+
+    Only the days with both traffic and sessions indices are compared, so a gap in either (e.g. indices that have aged
+    out, or a Cluster that wasn't capturing yet) doesn't skew the ratios.
+    """
+    if not any(traffic_by_day.values()):
+        raise NotEnoughObservations(days, "the Cluster didn't observe any traffic")
+
+    observed_days = [day for day, num_bytes in traffic_by_day.items() if num_bytes and sessions_by_day.get(day)]
+    if not observed_days:
+        raise NotEnoughObservations(days, "no day with traffic has sessions indices; are they rotated daily or hourly, and"
+                                    + " is the OpenSearch endpoint correct?")
+
+    traffic_bytes = sum(traffic_by_day[day] for day in observed_days)
+    sessions_bytes = sum(sessions_by_day[day] for day in observed_days)
+    pcap_bytes = sum(pcap_by_day.get(day, 0) for day in observed_days)
+    if not pcap_bytes:
+        raise NotEnoughObservations(days, "no PCAP was written to S3 on the days with traffic")
+
+    return StorageCalibration(
+        spiRatio=sessions_bytes * OS_RESERVED_STORAGE_FACTOR / traffic_bytes,
+        pcapRatio=pcap_bytes / traffic_bytes,
+        days=len(observed_days),
+        trafficBytes=int(traffic_bytes),
+        calibratedAt=calibrated_at.isoformat(),
+    )
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+import math
+from typing import Dict, List
+
+import aws_interactions.cloudwatch_interactions as cwi
+from core.capacity_planning import CAPACITY_BUFFER_FACTOR, MINIMUM_TRAFFIC
+
+# The --expected-traffic a user gives at Cluster creation is a guess.  Once the Cluster has been running a while, the
+# Gateway Load Balancer in front of the Capture Nodes has a record of how much mirrored traffic actually arrived, which
+# we can boil down to a profile and use to right-size the Cluster instead.
+
+TRAFFIC_PERCENTILES = ["p95", "p99"]
+DEFAULT_TRAFFIC_PERCENTILE = "p99"
+
+TRAFFIC_QUERY_KEY = "ObservedTraffic"
+
+class NoTrafficObserved(Exception):
+    def __init__(self):
+        super().__init__("There are no observations of the Cluster's mirrored traffic to right-size it from")
+
+def get_observed_traffic_query(gwlb_dimension: str) -> cwi.MetricQuery:
+    """
+    The total bytes the Cluster's GWLB forwarded to the Capture Nodes in each period
+    """
+    return cwi.MetricQuery(TRAFFIC_QUERY_KEY, "AWS/GatewayELB", "ProcessedBytes", {"LoadBalancer": gwlb_dimension}, "Sum")
+
+def bytes_to_gbps(num_bytes: float, period: int) -> float:
+    return num_bytes * 8 / period / 1e9
+
+def _get_percentile(sorted_values: List[float], percentile: float) -> float:
+    # Linear interpolation between the closest ranks
+    rank = (len(sorted_values) - 1) * percentile / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+@dataclass
+class TrafficProfile:
+    samples: int
+    period: int # seconds
+    mean: float # Gbps
+    p95: float # Gbps
+    p99: float # Gbps
+    peak: float # Gbps
+
+    @property
+    def peakToMean(self) -> float:
+        if not self.mean:
+            return None
+        return self.peak / self.mean
+
+    def get_recommended_traffic(self, percentile: str = DEFAULT_TRAFFIC_PERCENTILE) -> float:
+        """
+        The expected traffic, in Gbps, to plan the Cluster around; rounded up to the nearest 0.01 Gbps
+        """
+        observed = getattr(self, percentile)
+        return max(MINIMUM_TRAFFIC, math.ceil(observed * 100) / 100)
+
+    def is_bursty(self, percentile: str = DEFAULT_TRAFFIC_PERCENTILE) -> bool:
+        """
+        Whether the traffic's peaks exceed the headroom the Capture Nodes' scaling buffer provides over the percentile
+        """
+        return self.peak > self.get_recommended_traffic(percentile) * CAPACITY_BUFFER_FACTOR
+
+    def get_report(self) -> str:
+        peak_to_mean = "-" if self.peakToMean is None else f"{self.peakToMean:.2f}"
+        return (f"Observed mirrored traffic ({self.samples} samples of {self.period}s):\n"
+                + f"    Mean: {self.mean:.3f} Gbps\n"
+                + f"    p95: {self.p95:.3f} Gbps\n"
+                + f"    p99: {self.p99:.3f} Gbps\n"
+                + f"    Peak: {self.peak:.3f} Gbps\n"
+                + f"    Peak-to-Mean: {peak_to_mean}\n")
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "samples": self.samples,
+            "period": self.period,
+            "mean": self.mean,
+            "p95": self.p95,
+            "p99": self.p99,
+            "peak": self.peak,
+        }
+
+def get_traffic_profile(throughputs: List[float], period: int) -> TrafficProfile:
+    """
+    Summarizes the observed throughput of each period, in Gbps
+    """
+    if not throughputs:
+        raise NoTrafficObserved()
+
+    sorted_values = sorted(throughputs)
+    return TrafficProfile(
+        samples=len(sorted_values),
+        period=period,
+        mean=sum(sorted_values) / len(sorted_values),
+        p95=_get_percentile(sorted_values, 95),
+        p99=_get_percentile(sorted_values, 99),
+        peak=sorted_values[-1],
+    )
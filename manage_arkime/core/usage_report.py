@@ -1,5 +1,5 @@
 import core.shell_interactions as shell
-from core.capacity_planning import ClusterPlan
+from core.capacity_planning import ClusterPlan, SESSIONS_ROTATION_DAILY
 from core.user_config import UserConfig
 
 from dataclasses import dataclass
@@ -20,11 +20,43 @@ class UsageReport:
         else:
             return f"    {name}: \033[1m{oldVal} -> {newVal}\033[0m\n"
 
+    def _warm_lines(self) -> str:
+        prev_warm = self.prev_plan.osDomain.warmNodes
+        next_warm = self.next_plan.osDomain.warmNodes
+        if not prev_warm and not next_warm:
+            return ""
+
+        def get(plan, attr):
+            return getattr(plan, attr) if plan else None
+
+        return (
+            self._line("Hot Retention [days]", self.prev_config.hotDays, self.next_config.hotDays)
+            + self._line("Warm Node Count", get(prev_warm, "count"), get(next_warm, "count"))
+            + self._line("Warm Node Type", get(prev_warm, "instanceType"), get(next_warm, "instanceType"))
+            + self._line("Warm Storage [GB]", get(prev_warm, "storage"), get(next_warm, "storage"))
+        )
+
+    def _index_profile_line(self) -> str:
+        if not self.prev_config.indexProfile and not self.next_config.indexProfile:
+            return ""
+        return self._line("Index Settings Profile", self.prev_config.indexProfile, self.next_config.indexProfile)
+
+    def _rotation_line(self) -> str:
+        prev_domain = self.prev_plan.osDomain
+        next_domain = self.next_plan.osDomain
+        if not prev_domain.sessionsRotation and not next_domain.sessionsRotation:
+            return ""
+
+        # Plans made before the rotation was planned rotated daily, if they were planned at all
+        prev_rotation = prev_domain.sessionsRotation or (SESSIONS_ROTATION_DAILY if prev_domain.sessionsShards else None)
+        return self._line("Sessions Index Rotation", prev_rotation, next_domain.sessionsRotation)
+
     def get_report(self) -> str:
         report_text = (
             "Arkime Metadata:\n"
             + self._line("Session Retention [days]", self.prev_config.spiDays, self.next_config.spiDays)
             + self._line("User History Retention [days]", self.prev_config.historyDays, self.next_config.historyDays)
+            + self._index_profile_line()
             + "Capture Nodes:\n"
             + self._line("Max Count", self.prev_plan.captureNodes.maxCount, self.next_plan.captureNodes.maxCount)
             + self._line("Desired Count", self.prev_plan.captureNodes.desiredCount, self.next_plan.captureNodes.desiredCount)
@@ -39,6 +71,9 @@ class UsageReport:
             + self._line("Data Node Count", self.prev_plan.osDomain.dataNodes.count, self.next_plan.osDomain.dataNodes.count)
             + self._line("Data Node Type", self.prev_plan.osDomain.dataNodes.instanceType, self.next_plan.osDomain.dataNodes.instanceType)
             + self._line("Data Node Volume Size [GB]", self.prev_plan.osDomain.dataNodes.volumeSize, self.next_plan.osDomain.dataNodes.volumeSize)
+            + self._rotation_line()
+            + self._line("Sessions Index Shards", self.prev_plan.osDomain.sessionsShards, self.next_plan.osDomain.sessionsShards)
+            + self._warm_lines()
             + "S3:\n"
             + self._line("PCAP Retention [days]", self.prev_plan.s3.pcapStorageDays, self.next_plan.s3.pcapStorageDays)
         )
@@ -15,8 +15,11 @@ class UserConfig:
     pcapDays: int
     viewerPrefixList: str = None
     extraTags: List[Dict[str, str]] = None
+    hotDays: int = None
+    indexProfile: str = None
 
-    def __init__(self, expectedTraffic: float, spiDays: int, historyDays: int, replicas: int, pcapDays: int, viewerPrefixList: str = None, extraTags: List[Dict[str, str]] = []):
+    def __init__(self, expectedTraffic: float, spiDays: int, historyDays: int, replicas: int, pcapDays: int, viewerPrefixList: str = None, extraTags: List[Dict[str, str]] = [],
+                 hotDays: int = None, indexProfile: str = None):
         self.expectedTraffic = expectedTraffic
         self.spiDays = spiDays
         self.historyDays = historyDays
@@ -24,6 +27,8 @@ class UserConfig:
         self.pcapDays = pcapDays
         self.viewerPrefixList = viewerPrefixList
         self.extraTags = extraTags
+        self.hotDays = hotDays
+        self.indexProfile = indexProfile
 
         if (expectedTraffic is None):
             self.expectedTraffic = MINIMUM_TRAFFIC
@@ -62,6 +67,8 @@ class UserConfig:
                 self.replicas == other.replicas and
                 self.pcapDays == other.pcapDays and
                 self.viewerPrefixList == other.viewerPrefixList and
+                self.hotDays == other.hotDays and
+                self.indexProfile == other.indexProfile and
                 set1 == set2)
 
     def to_dict(self) -> Dict[str, any]:
@@ -73,5 +80,7 @@ class UserConfig:
             'historyDays': self.historyDays,
             'viewerPrefixList': self.viewerPrefixList,
             'extraTags': self.extraTags,
+            'hotDays': self.hotDays,
+            'indexProfile': self.indexProfile,
         }
 
@@ -2,11 +2,14 @@ from enum import Enum
 import json
 import logging
 import os
-from typing import Dict, List
+import time
+from typing import Dict, List, Tuple
 
 from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.cloudwatch_interactions as cwi
 import aws_interactions.ec2_interactions as ec2i
 import aws_interactions.events_interactions as events
+from lambda_aws_event_listener.instance_eni_cache import InstanceEniCache
 
 class AwsEventType(Enum):
     EC2_RUNNING="Ec2Running"
@@ -24,6 +27,9 @@ class AwsEventListenerHandler:
         console_handler = logging.StreamHandler()
         self.logger.addHandler(console_handler)
 
+        # Lives as long as the Lambda container does, so warm invocations can skip the EC2 lookups
+        self.instance_cache = InstanceEniCache()
+
     def handler(self, event: Dict[str, any], context):
         # Log the triggering event; first thing every Lambda should do
         self.logger.info("Event:")
@@ -80,18 +86,16 @@ class AwsEventListenerHandler:
         self.logger.info(f"Processing EC2 Instance: {instance_id}")
 
         aws_provider = AwsClientProvider(aws_compute=True)
-        enis = ec2i.get_enis_of_instance(instance_id, aws_provider)
-        self.logger.info(f"ENIs:\n{json.dumps([eni.to_dict() for eni in enis])}")
-
-        # We can't (currently) filter EC2 state-change events at the EventBridge Rule level, so it's possible this
-        # event belongs to a different VPC's instance
-        if enis and enis[0].vpc_id != vpc_id:
-            self.logger.info(f"EC2 instance {instance_id} is in another VPC ({enis[0].vpc_id}); aborting")
-            return {"statusCode": 200}  
+        enis = self._get_mirrorable_enis(instance_id, cluster_name, vpc_id, aws_provider)
+        if not enis:
+            return {"statusCode": 200}
 
+        source_event_time = events.get_event_timestamp(raw_event)
+        published_time = time.time()
         create_events = []
         for eni in enis:
-            create_event = events.CreateEniMirrorEvent(cluster_name, vpc_id, eni.subnet_id, eni.eni_id, eni.eni_type, traffic_filter_id, mirror_vni)
+            create_event = events.CreateEniMirrorEvent(cluster_name, vpc_id, eni.subnet_id, eni.eni_id, eni.eni_type, traffic_filter_id,
+                                                       mirror_vni, source_event_time=source_event_time, published_time=published_time)
             self.logger.info(f"Preparing CreateEniMirrorEvent: {create_event}")
             create_events.append(create_event)
 
@@ -106,15 +110,10 @@ class AwsEventListenerHandler:
         self.logger.info(f"Processing EC2 Instance: {instance_id}")
 
         aws_provider = AwsClientProvider(aws_compute=True)
-        enis = ec2i.get_enis_of_instance(instance_id, aws_provider)
-        self.logger.info(f"ENIs:\n{json.dumps([eni.to_dict() for eni in enis])}")
+        enis = self._get_mirrorable_enis(instance_id, cluster_name, vpc_id, aws_provider)
+        if not enis:
+            return {"statusCode": 200}
 
-        # We can't (currently) filter EC2 state-change events at the EventBridge Rule level, so it's possible this
-        # event belongs to a different VPC's instance
-        if enis and enis[0].vpc_id != vpc_id:
-            self.logger.info(f"EC2 instance {instance_id} is in another VPC ({enis[0].vpc_id}); aborting")
-            return {"statusCode": 200}  
-        
         destroy_events = []
         for eni in enis:
             destroy_event = events.DestroyEniMirrorEvent(cluster_name, vpc_id, eni.subnet_id, eni.eni_id)
@@ -126,19 +125,67 @@ class AwsEventListenerHandler:
 
         return {"statusCode": 200}
 
+    def _get_mirrorable_enis(self, instance_id: str, cluster_name: str, vpc_id: str, 
+            aws_provider: AwsClientProvider) -> List[ec2i.NetworkInterface]:
+        """
+        Returns the ENIs of the instance that we should act on, or an empty list if there's nothing to do.  Records
+        how much we filtered out, and why, in CloudWatch.
+        """
+        enis, cache_hit = self._get_enis_of_instance(instance_id, vpc_id, aws_provider)
+        self.logger.info(f"ENIs (cache hit: {cache_hit}):\n{json.dumps([eni.to_dict() for eni in enis])}")
+
+        # We can't (currently) filter EC2 state-change events at the EventBridge Rule level, so it's possible this
+        # event belongs to a different VPC's instance
+        if enis and enis[0].vpc_id != vpc_id:
+            self.logger.info(f"EC2 instance {instance_id} is in another VPC ({enis[0].vpc_id}); aborting")
+            cwi.emit_event_metrics(
+                cwi.AwsEventListenerMetrics(cluster_name, vpc_id, cwi.AwsEventListenerOutcome.FILTERED_OTHER_VPC, cache_hit=cache_hit)
+            )
+            return []
+
+        # No point in sending events downstream for ENIs the Create/Destroy Lambdas would just reject
+        mirrorable_enis = [eni for eni in enis if eni.eni_type not in ec2i.NON_MIRRORABLE_ENI_TYPES]
+        num_filtered = len(enis) - len(mirrorable_enis)
+        if num_filtered:
+            self.logger.info(f"Skipping {num_filtered} ENI(s) of non-mirrorable types")
+
+        if not mirrorable_enis:
+            self.logger.info(f"EC2 instance {instance_id} has no mirrorable ENIs; aborting")
+            outcome = cwi.AwsEventListenerOutcome.FILTERED_NO_ENIS
+        else:
+            outcome = cwi.AwsEventListenerOutcome.PROCESSED
+
+        cwi.emit_event_metrics(
+            cwi.AwsEventListenerMetrics(cluster_name, vpc_id, outcome, filtered_enis=num_filtered, cache_hit=cache_hit)
+        )
+        return mirrorable_enis
+
+    def _get_enis_of_instance(self, instance_id: str, vpc_id: str, 
+            aws_provider: AwsClientProvider) -> Tuple[List[ec2i.NetworkInterface], bool]:
+        enis = self.instance_cache.get(instance_id, vpc_id)
+        if enis is not None:
+            return enis, True
+
+        enis = ec2i.get_enis_of_instance(instance_id, aws_provider)
+        self.instance_cache.put(instance_id, enis)
+        return enis, False
+
     def _handle_fargate_running(self, raw_event: Dict[str, any], event_bus_arn: str, cluster_name: str, vpc_id: str, 
             traffic_filter_id: str, mirror_vni: int) -> Dict[str, int]:
         
         eni_details = self._get_fargate_eni_details(raw_event)
         aws_provider = AwsClientProvider(aws_compute=True)
         
+        source_event_time = events.get_event_timestamp(raw_event)
+        published_time = time.time()
         create_events = []
         for eni_detail in eni_details:
             eni_id = eni_detail["eni_id"]
             subnet_id = eni_detail["subnet_id"]
 
             # The set ENI type for Fargate Containers is "interface"
-            create_event = events.CreateEniMirrorEvent(cluster_name, vpc_id, subnet_id, eni_id, "interface", traffic_filter_id, mirror_vni)
+            create_event = events.CreateEniMirrorEvent(cluster_name, vpc_id, subnet_id, eni_id, "interface", traffic_filter_id,
+                                                       mirror_vni, source_event_time=source_event_time, published_time=published_time)
             self.logger.info(f"Preparing CreateEniMirrorEvent: {create_event}")
             create_events.append(create_event)
 
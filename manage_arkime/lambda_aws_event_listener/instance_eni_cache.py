@@ -0,0 +1,50 @@
+from collections import OrderedDict
+import time
+from typing import List
+
+import aws_interactions.ec2_interactions as ec2i
+
+# The EC2 state-change events our listener receives can't be scoped to a VPC at the EventBridge Rule level, so every
+# instance start/stop in the Account/Region costs us a DescribeInstances call just to learn it isn't ours.  Lambda
+# containers are re-used between invocations, so we hold onto what we've learned about recently-seen instances.
+#
+# An instance can never change VPCs, so entries for instances in other VPCs never go stale.  The ENIs attached to one
+# of our own instances can change over its lifetime though, so those entries are only trusted for a short window.
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_OWN_VPC_TTL_SECONDS = 60
+
+class InstanceEniCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, own_vpc_ttl: int = DEFAULT_OWN_VPC_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.own_vpc_ttl = own_vpc_ttl
+        self._entries = OrderedDict() # instance_id -> (timestamp, List[NetworkInterface])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, instance_id: str, own_vpc_id: str) -> List[ec2i.NetworkInterface]:
+        """
+        Returns the cached ENIs of the instance, or None if we don't have a usable entry for it.  Entries for instances
+        in own_vpc_id expire after own_vpc_ttl seconds.
+        """
+        entry = self._entries.get(instance_id)
+        if not entry:
+            return None
+
+        timestamp, enis = entry
+        if self._is_in_vpc(enis, own_vpc_id) and (time.time() - timestamp) > self.own_vpc_ttl:
+            del self._entries[instance_id]
+            return None
+
+        self._entries.move_to_end(instance_id)
+        return enis
+
+    def put(self, instance_id: str, enis: List[ec2i.NetworkInterface]):
+        self._entries[instance_id] = (time.time(), enis)
+        self._entries.move_to_end(instance_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_in_vpc(self, enis: List[ec2i.NetworkInterface], vpc_id: str) -> bool:
+        return not enis or enis[0].vpc_id == vpc_id
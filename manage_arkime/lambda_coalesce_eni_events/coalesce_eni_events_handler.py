@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+from typing import Dict, List
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.cloudwatch_interactions as cwi
+import aws_interactions.events_interactions as events
+import aws_interactions.lambda_interactions as lambdai
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from lambda_coalesce_eni_events.eni_event_coalescer import CoalescedEniEvent, coalesce_eni_events
+
+DEFAULT_DISPATCH_CONCURRENCY = 5
+
+class CoalesceEniEventsHandler:
+    def __init__(self):
+        self.logger = logging.getLogger()
+        self.logger.handlers = []  # Make sure we're starting with a clean slate
+        self.logger.setLevel(logging.INFO)
+
+        console_handler = logging.StreamHandler()
+        self.logger.addHandler(console_handler)
+
+    def handler(self, event: Dict[str, any], context):
+        # Log the triggering event; first thing every Lambda should do
+        self.logger.info("Event:")
+        self.logger.info(json.dumps(event))
+
+        records = event.get("Records", [])
+
+        # Ensure our Lambda will always tell the queue which messages to retry
+        try:
+            self.logger.info(f"Pulling context from Lambda Environment Variables...")
+            cluster_name = os.environ["CLUSTER_NAME"]
+            vpc_id = os.environ["VPC_ID"]
+            create_lambda_name = os.environ["CREATE_LAMBDA_NAME"]
+            destroy_lambda_name = os.environ["DESTROY_LAMBDA_NAME"]
+            dispatch_concurrency = int(os.environ.get("DISPATCH_CONCURRENCY", DEFAULT_DISPATCH_CONCURRENCY))
+
+            batch = coalesce_eni_events(records)
+            self.logger.info(f"Received {batch.num_received} event(s) covering {len(batch.events)} ENI(s)")
+
+            aws_provider = AwsClientProvider(aws_compute=True)
+
+            to_dispatch = batch.to_dispatch
+            for cancelled_event in batch.cancelled:
+                if self._has_mirroring(cancelled_event, aws_provider):
+                    self.logger.info(f"ENI {cancelled_event.eni_id} was mirrored by an earlier batch; will still tear it down")
+                    to_dispatch.append(cancelled_event)
+                else:
+                    self.logger.info(f"ENI {cancelled_event.eni_id} was created and destroyed within the batch; skipping")
+
+            self.logger.info(f"Dispatching {len(to_dispatch)} event(s) with concurrency {dispatch_concurrency}...")
+            failed_message_ids = list(batch.malformed_message_ids)
+            num_failed_dispatches = 0
+            with ThreadPoolExecutor(max_workers=dispatch_concurrency) as executor:
+                results = executor.map(
+                    lambda e: self._dispatch(e, create_lambda_name, destroy_lambda_name, aws_provider),
+                    to_dispatch
+                )
+                for coalesced_event, succeeded in zip(to_dispatch, results):
+                    if not succeeded:
+                        num_failed_dispatches += 1
+                        failed_message_ids.extend(coalesced_event.message_ids)
+
+            self.logger.info(f"Dispatched {len(to_dispatch)} event(s); {num_failed_dispatches} failed")
+            cwi.emit_event_metrics(
+                cwi.CoalesceEniEventsMetrics(
+                    cluster_name,
+                    vpc_id,
+                    received=batch.num_received,
+                    dispatched=len(to_dispatch),
+                    coalesced=batch.num_received - len(batch.malformed_message_ids) - len(to_dispatch),
+                    failed=num_failed_dispatches + len(batch.malformed_message_ids)
+                )
+            )
+            return self._get_response(failed_message_ids)
+
+        except Exception as ex:
+            # This should only handle completely unexpected exceptions.  We don't know which messages were handled, so
+            # have the queue redeliver all of them; the Create/Destroy Lambdas are safe to re-run.
+            self.logger.error(ex, exc_info=True)
+
+            return self._get_response([record["messageId"] for record in records])
+
+    def _has_mirroring(self, coalesced_event: CoalescedEniEvent, aws_provider: AwsClientProvider) -> bool:
+        destroy_event = events.DestroyEniMirrorEvent.from_event_dict(coalesced_event.raw_event)
+        eni_param_name = constants.get_eni_ssm_param_name(
+            destroy_event.cluster_name,
+            destroy_event.vpc_id,
+            destroy_event.subnet_id,
+            destroy_event.eni_id
+        )
+        try:
+            ssm_ops.get_ssm_param_value(eni_param_name, aws_provider)
+            return True
+        except ssm_ops.ParamDoesNotExist:
+            return False
+
+    def _dispatch(self, coalesced_event: CoalescedEniEvent, create_lambda_name: str, destroy_lambda_name: str,
+                  aws_provider: AwsClientProvider) -> bool:
+        if coalesced_event.detail_type == constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR:
+            function_name = create_lambda_name
+        else:
+            function_name = destroy_lambda_name
+
+        try:
+            response = lambdai.invoke_lambda(function_name, coalesced_event.raw_event, aws_provider)
+        except Exception as ex:
+            self.logger.error(f"Dispatch of {coalesced_event.detail_type} for ENI {coalesced_event.eni_id} failed: {ex}")
+            return False
+
+        if response.get("statusCode") != 200:
+            self.logger.warning(f"{coalesced_event.detail_type} for ENI {coalesced_event.eni_id} returned {response}")
+            return False
+        return True
+
+    def _get_response(self, failed_message_ids: List[str]) -> Dict[str, any]:
+        # See: https://docs.aws.amazon.com/lambda/latest/dg/with-sqs.html#services-sqs-batchfailurereporting
+        return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids]}
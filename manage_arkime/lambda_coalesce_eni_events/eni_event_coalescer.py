@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+import json
+import logging
+from typing import Dict, List
+
+import core.constants as constants
+
+logger = logging.getLogger(__name__)
+
+# When an Auto Scaling Group or ECS Service in a User VPC scales by hundreds of instances/tasks at once, the listener
+# emits an ENI event for each of them in quick succession.  Rather than fan each one out to its own Create/Destroy
+# Lambda invocation, the events are queued up and handed to us in batches.  Within a batch, we boil the events for each
+# ENI down to the single action that reflects its final state:
+#
+# * Repeated Creates (or Destroys) for the same ENI collapse into one
+# * A Create followed by a Destroy means the ENI came and went within the batch window (e.g. a short-lived task), so
+#   there's likely nothing to do at all.  It's possible a Session was created for it by an earlier batch though, so
+#   the pair is flagged as cancelled and the caller decides whether the Destroy still needs to happen.
+
+@dataclass
+class CoalescedEniEvent:
+    eni_id: str
+    raw_event: Dict[str, any] # The EventBridge event to act on
+    message_ids: List[str] # The queue messages this event stands in for
+    cancelled: bool = False
+
+    @property
+    def detail_type(self) -> str:
+        return self.raw_event["detail-type"]
+
+@dataclass
+class CoalescedBatch:
+    events: List[CoalescedEniEvent] = field(default_factory=list)
+    malformed_message_ids: List[str] = field(default_factory=list)
+    num_received: int = 0
+
+    @property
+    def to_dispatch(self) -> List[CoalescedEniEvent]:
+        return [e for e in self.events if not e.cancelled]
+
+    @property
+    def cancelled(self) -> List[CoalescedEniEvent]:
+        return [e for e in self.events if e.cancelled]
+
+def coalesce_eni_events(records: List[Dict[str, any]]) -> CoalescedBatch:
+    """
+    Coalesces a batch of SQS records, each containing a Create/Destroy ENI Mirror EventBridge event, into at most one
+    action per ENI.
+    """
+    batch = CoalescedBatch(num_received=len(records))
+
+    # eni_id -> [(message_id, raw_event)], in arrival order
+    events_by_eni: Dict[str, List] = {}
+    for record in records:
+        message_id = record["messageId"]
+        try:
+            raw_event = json.loads(record["body"])
+            eni_id = raw_event["detail"]["eni_id"]
+            if raw_event["detail-type"] not in [constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR]:
+                raise ValueError(f"Unexpected detail-type {raw_event['detail-type']}")
+        except (KeyError, TypeError, ValueError) as ex:
+            logger.warning(f"Unable to parse message {message_id}: {ex}")
+            batch.malformed_message_ids.append(message_id)
+            continue
+
+        events_by_eni.setdefault(eni_id, []).append((message_id, raw_event))
+
+    for eni_id, eni_events in events_by_eni.items():
+        # Standard queues don't guarantee ordering, so go by when the events were generated.  EventBridge timestamps
+        # only have second granularity; ties keep their arrival order.
+        eni_events = sorted(eni_events, key=lambda pair: pair[1].get("time", ""))
+        message_ids = [message_id for message_id, _ in eni_events]
+        detail_types = [raw_event["detail-type"] for _, raw_event in eni_events]
+        final_event = eni_events[-1][1]
+
+        cancelled = (
+            final_event["detail-type"] == constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR
+            and constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR in detail_types
+        )
+        batch.events.append(CoalescedEniEvent(eni_id, final_event, message_ids, cancelled))
+
+    return batch
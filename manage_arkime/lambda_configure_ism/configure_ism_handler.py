@@ -9,6 +9,7 @@ import aws_interactions.cloudwatch_interactions as cwi
 import aws_interactions.events_interactions as events
 import opensearch_interactions.ism_interactions as ism
 import opensearch_interactions.opensearch_client as client
+import opensearch_interactions.template_interactions as templates
 
 class ConfigureIsmHandler:
     def __init__(self):
@@ -44,14 +45,19 @@ class ConfigureIsmHandler:
             opensearch_client = client.OpenSearchClient(f"https://{opensearch_endpoint}", 443, auth)
 
             ism.setup_user_history_ism(ism_event.history_days, opensearch_client)
-            ism.setup_sessions_ism(ism_event.spi_days, ism_event.replicas, opensearch_client)
+            ism.setup_sessions_ism(ism_event.spi_days, ism_event.replicas, opensearch_client, ism_event.hot_days,
+                                   bool(ism_event.warm_tier), ism_event.sessions_rotation)
+            if ism_event.sessions_shards:
+                templates.setup_sessions_shards_template(ism_event.sessions_shards, opensearch_client)
+            if ism_event.index_profile:
+                templates.setup_sessions_index_profile(ism_event.index_profile, bool(ism_event.warm_tier),
+                                                       opensearch_client, ism_event.sessions_rotation)
             
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.ConfigureIsmEventMetrics(
                     cluster_name, 
                     cwi.ConfigureIsmEventOutcome.SUCCESS
-                ),
-                aws_provider
+                )
             )
             return {"statusCode": 200}
 
@@ -60,12 +66,11 @@ class ConfigureIsmHandler:
             # be handled and return a 200)
             self.logger.error(ex, exc_info=True)
 
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.ConfigureIsmEventMetrics(
                     cluster_name,
                     cwi.ConfigureIsmEventOutcome.FAILURE
-                ),
-                aws_provider
+                )
             )
             return {"statusCode": 500}
 
@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Dict
+import time
+from typing import Dict, Tuple
 
 from aws_interactions.aws_client_provider import AwsClientProvider
 import aws_interactions.cloudwatch_interactions as cwi
@@ -8,6 +9,9 @@ import aws_interactions.ec2_interactions as ec2i
 import aws_interactions.events_interactions as events
 import aws_interactions.ssm_operations as ssm_ops
 import core.constants as constants
+import core.mirror_placement as placement
+from core.mirror_profile import MirrorProfile, get_vpc_mirror_profile
+from lambda_create_eni_mirror.target_load_cache import TargetLoadCache
 
 class CreateEniMirrorHandler:
     def __init__(self):
@@ -18,7 +22,12 @@ class CreateEniMirrorHandler:
         console_handler = logging.StreamHandler()
         self.logger.addHandler(console_handler)
 
+        # Lives as long as the Lambda container does, so warm invocations can skip re-counting every Target's Sessions
+        self.target_load_cache = TargetLoadCache()
+
     def handler(self, event: Dict[str, any], context):
+        started_time = time.time()
+
         # Log the triggering event; first thing every Lambda should do
         self.logger.info("Event:")
         self.logger.info(json.dumps(event))
@@ -42,62 +51,96 @@ class CreateEniMirrorHandler:
             try:
                 ssm_ops.get_ssm_param_value(eni_param_name, aws_provider)
                 self.logger.info(f"Mirroring already configured for ENI {create_event.eni_id}; aborting...")
-                cwi.put_event_metrics(
+                cwi.emit_event_metrics(
                     cwi.CreateEniMirrorEventMetrics(
                         create_event.cluster_name, 
                         create_event.vpc_id,
                         cwi.CreateEniMirrorEventOutcome.ABORTED_EXISTS
-                    ),
-                    aws_provider
+                    )
                 )
                 return {"statusCode": 200}
             except ssm_ops.ParamDoesNotExist:
                 self.logger.info(f"Confirmed SSM Param does not exist for ENI {create_event.eni_id}")
                 pass 
 
-            subnet_param_name = constants.get_subnet_ssm_param_name(create_event.cluster_name, create_event.vpc_id, create_event.subnet_id)
-            traffic_target_id = ssm_ops.get_ssm_param_json_value(subnet_param_name, "mirrorTargetId", aws_provider)
+            mirror_profile = get_vpc_mirror_profile(create_event.cluster_name, create_event.vpc_id, aws_provider)
+            traffic_target_id, over_capacity = self._get_traffic_target(create_event, mirror_profile, aws_provider)
+            packet_length = mirror_profile.get_packet_length(create_event.subnet_id)
 
-            self.logger.info(f"Creating Mirroring Session...")
+            self.logger.info(f"Creating Mirroring Session to Target {traffic_target_id} (packet length: {packet_length or 'full'})...")
             eni = ec2i.NetworkInterface(create_event.vpc_id, create_event.subnet_id, create_event.eni_id, create_event.eni_type)
             try:
-                traffic_session_id = ec2i.mirror_eni(
+                traffic_session = ec2i.mirror_eni(
                     eni,
                     traffic_target_id,
                     create_event.traffic_filter_id,
                     create_event.vpc_id,
                     aws_provider,
-                    virtual_network=create_event.vni
+                    virtual_network=create_event.vni,
+                    packet_length=packet_length
                 )
             except ec2i.NonMirrorableEniType:
                 self.logger.warning(f"Eni {eni.eni_id} is of unsupported type {eni.eni_type}; aborting...")
-                cwi.put_event_metrics(
+                cwi.emit_event_metrics(
                     cwi.CreateEniMirrorEventMetrics(
                         create_event.cluster_name, 
                         create_event.vpc_id,
                         cwi.CreateEniMirrorEventOutcome.ABORTED_ENI_TYPE
-                    ),
-                    aws_provider
+                    )
                 )
                 return {"statusCode": 200}
 
+            # A concurrent invocation may have created the ENI's Session first, on a Target of its own choosing
+            traffic_session_id = traffic_session.session_id
+            if traffic_session.target_id != traffic_target_id:
+                self.logger.info(f"ENI {eni.eni_id} was mirrored concurrently to Target {traffic_session.target_id}")
+                traffic_target_id = traffic_session.target_id
+                over_capacity = False
+
             self.logger.info(f"Creating SSM Parameter: {eni_param_name}")
-            ssm_ops.put_ssm_param(
-                eni_param_name, 
-                json.dumps({"eniId": eni.eni_id, "trafficSessionId": traffic_session_id}),
-                aws_provider,
-                description=f"Mirroring details for {eni.eni_id}",
-                pattern=".*"
-            )
+            try:
+                ssm_ops.put_ssm_param(
+                    eni_param_name,
+                    json.dumps({"eniId": eni.eni_id, "trafficSessionId": traffic_session_id, "mirrorTargetId": traffic_target_id}),
+                    aws_provider,
+                    description=f"Mirroring details for {eni.eni_id}",
+                    pattern=".*"
+                )
+            except ssm_ops.ParamAlreadyExists:
+                # A concurrent invocation for the same ENI got here first.  Because Session creation is idempotent
+                # on the ENI/Filter/VNI, we both ended up with the same Session and there's nothing left to do.
+                self.logger.info(f"SSM Param for ENI {create_event.eni_id} was created concurrently; aborting...")
+                cwi.emit_event_metrics(
+                    cwi.CreateEniMirrorEventMetrics(
+                        create_event.cluster_name,
+                        create_event.vpc_id,
+                        cwi.CreateEniMirrorEventOutcome.ABORTED_EXISTS
+                    )
+                )
+                return {"statusCode": 200}
 
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.CreateEniMirrorEventMetrics(
                     create_event.cluster_name, 
                     create_event.vpc_id,
-                    cwi.CreateEniMirrorEventOutcome.SUCCESS
-                ),
-                aws_provider
+                    cwi.CreateEniMirrorEventOutcome.SUCCESS,
+                    over_capacity=over_capacity
+                )
             )
+
+            # Only events generated by our listener know when the ENI came into being
+            if create_event.source_event_time is not None:
+                latency_metrics = cwi.CreateEniMirrorLatencyMetrics(
+                    create_event.cluster_name,
+                    create_event.vpc_id,
+                    create_event.source_event_time,
+                    create_event.published_time,
+                    started_time,
+                    time.time()
+                )
+                self.logger.info(f"Mirroring of ENI {create_event.eni_id} began {latency_metrics.value_end_to_end}ms after"
+                                 + " it came up")
+                cwi.emit_event_metrics(latency_metrics)
             return {"statusCode": 200}
 
         except Exception as ex:
@@ -105,13 +148,54 @@ class CreateEniMirrorHandler:
             # be handled and return a 200)
             self.logger.error(ex, exc_info=True)
 
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.CreateEniMirrorEventMetrics(
                     create_event.cluster_name, 
                     create_event.vpc_id,
                     cwi.CreateEniMirrorEventOutcome.FAILURE
-                ),
-                aws_provider
+                )
             )
             return {"statusCode": 500}
 
+    def _get_traffic_target(self, create_event: events.CreateEniMirrorEvent, mirror_profile: MirrorProfile,
+                            aws_provider: AwsClientProvider) -> Tuple[str, bool]:
+        """
+        Picks the Traffic Mirroring Target for the ENI's Session.  Also returns whether the Target was already at its
+        planned limit; rather than leave the ENI unmirrored, we go over the limit on the least-loaded Target in the AZ.
+        """
+        # If an earlier attempt already created the Session, stick with its Target so we don't end up with two
+        existing_sessions = [
+            session for session in ec2i.get_mirror_sessions_of_eni(create_event.eni_id, aws_provider)
+            if session.filter_id == create_event.traffic_filter_id
+        ]
+        if existing_sessions:
+            self.logger.info(f"ENI {create_event.eni_id} already has Session {existing_sessions[0].session_id}")
+            return existing_sessions[0].target_id, False
+
+        max_sessions_per_target = mirror_profile.maxSessionsPerTarget or placement.DEFAULT_MAX_SESSIONS_PER_TARGET
+        target_loads = self.target_load_cache.get(create_event.vpc_id, create_event.traffic_filter_id, max_sessions_per_target)
+
+        # A subnet added since we cached the loads won't be in them yet
+        if target_loads is None or not any(t.subnet_id == create_event.subnet_id for t in target_loads):
+            target_loads = placement.get_target_loads(
+                create_event.cluster_name,
+                create_event.vpc_id,
+                create_event.traffic_filter_id,
+                aws_provider,
+                max_sessions_per_target
+            )
+            self.target_load_cache.put(create_event.vpc_id, create_event.traffic_filter_id, max_sessions_per_target, target_loads)
+
+        planner = placement.MirrorPlacementPlanner(target_loads)
+        self.logger.info(planner.get_report())
+
+        over_capacity = False
+        try:
+            target = planner.place(create_event.subnet_id)
+        except placement.TargetsAtCapacity as ex:
+            self.logger.warning(f"{ex}; using the least-loaded Target anyway")
+            target = planner.place(create_event.subnet_id, allow_over_capacity=True)
+            over_capacity = True
+
+        self.logger.info(f"Placing Session for ENI {create_event.eni_id} on Target {target.target_id} ({target.subnet_id})")
+        return target.target_id, over_capacity
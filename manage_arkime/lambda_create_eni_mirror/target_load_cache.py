@@ -0,0 +1,41 @@
+import time
+from typing import List
+
+from core.mirror_placement import TargetLoad
+
+# Working out how loaded each of a User VPC's Traffic Mirroring Targets is means reading the subnets' SSM Parameters,
+# describing the subnets, and paging through every Session on the VPC's Filter; far too much to repeat for every ENI
+# when a burst of them comes up.  Lambda containers are re-used between invocations, so we hold onto the loads and
+# count the Sessions we place against them ourselves.
+#
+# Other containers place Sessions (and the Destroy Lambda removes them) without us knowing, so our counts drift; the
+# limit is only a planning figure, so we accept that and re-read the real loads after a short window.
+
+DEFAULT_TTL_SECONDS = 300
+
+class TargetLoadCache:
+    def __init__(self, ttl: int = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries = {} # (vpc_id, traffic_filter_id, max_sessions_per_target) -> (timestamp, List[TargetLoad])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, vpc_id: str, traffic_filter_id: str, max_sessions_per_target: int) -> List[TargetLoad]:
+        """
+        Returns the cached Target loads for the VPC, or None if we don't have a usable entry for it
+        """
+        key = (vpc_id, traffic_filter_id, max_sessions_per_target)
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+
+        timestamp, target_loads = entry
+        if (time.time() - timestamp) > self.ttl:
+            del self._entries[key]
+            return None
+
+        return target_loads
+
+    def put(self, vpc_id: str, traffic_filter_id: str, max_sessions_per_target: int, target_loads: List[TargetLoad]):
+        self._entries[(vpc_id, traffic_filter_id, max_sessions_per_target)] = (time.time(), target_loads)
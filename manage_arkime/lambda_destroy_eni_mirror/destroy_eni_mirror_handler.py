@@ -46,13 +46,12 @@ class DestroyEniMirrorHandler:
             self.logger.info(f"Deleting SSM parameter for ENI {destroy_event.eni_id}: {eni_param}")
             ssm_ops.delete_ssm_param(eni_param, aws_provider)
 
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.DestroyEniMirrorEventMetrics(
                     destroy_event.cluster_name, 
                     destroy_event.vpc_id,
                     cwi.DestroyEniMirrorEventOutcome.SUCCESS
-                ),
-                aws_provider
+                )
             )
             return {"statusCode": 200}
 
@@ -61,12 +60,11 @@ class DestroyEniMirrorHandler:
             # be handled and return a 200)
             self.logger.error(ex, exc_info=True)
 
-            cwi.put_event_metrics(
+            cwi.emit_event_metrics(
                 cwi.DestroyEniMirrorEventMetrics(
                     destroy_event.cluster_name, 
                     destroy_event.vpc_id,
                     cwi.DestroyEniMirrorEventOutcome.FAILURE
-                ),
-                aws_provider
+                )
             )
             return {"statusCode": 500}
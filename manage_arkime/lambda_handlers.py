@@ -1,9 +1,11 @@
 from lambda_aws_event_listener.aws_event_listener_handler import AwsEventListenerHandler
+from lambda_coalesce_eni_events.coalesce_eni_events_handler import CoalesceEniEventsHandler
 from lambda_configure_ism.configure_ism_handler import ConfigureIsmHandler
 from lambda_create_eni_mirror.create_eni_mirror_handler import CreateEniMirrorHandler
 from lambda_destroy_eni_mirror.destroy_eni_mirror_handler import DestroyEniMirrorHandler
 
 aws_event_listener_handler = AwsEventListenerHandler().handler
+coalesce_eni_events_handler = CoalesceEniEventsHandler().handler
 configure_ism_handler = ConfigureIsmHandler().handler
 create_eni_mirror_handler = CreateEniMirrorHandler().handler
 destroy_eni_mirror_handler = DestroyEniMirrorHandler().handler
\ No newline at end of file
@@ -0,0 +1,37 @@
+import json
+import logging
+
+from requests.auth import HTTPBasicAuth
+
+from aws_interactions.aws_client_provider import AwsClientProvider
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from opensearch_interactions.opensearch_client import OpenSearchClient
+
+logger = logging.getLogger(__name__)
+
+UNREACHABLE_DOMAIN_HINT = ("The OpenSearch Domain is only reachable from within the Cluster's VPC; you may need to run this"
+                           + " command from there, or supply --os-endpoint to reach it through a tunnel")
+
+def get_cluster_os_client(cluster_name: str, aws_provider: AwsClientProvider, os_endpoint: str = None) -> OpenSearchClient:
+    """
+    Get a client for a Cluster's OpenSearch Domain, authenticated as the Domain's admin user.  The Domain is only
+    reachable at its VPC endpoint from within the Cluster's VPC, so callers elsewhere can supply the host of a tunnel to
+    it instead.
+    """
+    domain_details = json.loads(ssm_ops.get_ssm_param_value(
+        constants.get_opensearch_domain_ssm_param_name(cluster_name),
+        aws_provider
+    ))
+
+    if not os_endpoint:
+        domain_status = aws_provider.get_opensearch().describe_domain(DomainName=domain_details["domainName"])["DomainStatus"]
+        os_endpoint = domain_status["Endpoints"]["vpc"]
+    logger.debug(f"Using OpenSearch endpoint {os_endpoint}")
+
+    password = aws_provider.get_secretsmanager().get_secret_value(SecretId=domain_details["domainSecret"])["SecretString"]
+    return OpenSearchClient(
+        endpoint=f"https://{os_endpoint}",
+        port=443,
+        auth=HTTPBasicAuth("admin", password),
+    )
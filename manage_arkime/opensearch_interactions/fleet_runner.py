@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import time
+from typing import Callable, Dict, List
+
+from opensearch_interactions.opensearch_client import OpenSearchClient
+import opensearch_interactions.rest_ops as ops
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLEET_CONCURRENCY = 8
+
+@dataclass
+class FleetResult:
+    clusterName: str
+    succeeded: bool
+    result: any # Whatever the operation returned; the body of a RESTResponse
+    error: str
+    durationSeconds: float
+    requestTimings: Dict[str, Dict[str, float]] # Per-endpoint latency summary of the operation's requests
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "clusterName": self.clusterName,
+            "succeeded": self.succeeded,
+            "result": self.result,
+            "error": self.error,
+            "durationSeconds": self.durationSeconds,
+            "requestTimings": self.requestTimings,
+        }
+
+def run_on_fleet(cluster_names: List[str], get_client: Callable[[str], OpenSearchClient],
+                 operation: Callable[[OpenSearchClient], any],
+                 max_workers: int = DEFAULT_FLEET_CONCURRENCY) -> List[FleetResult]:
+    """
+    Apply the same operation to the OpenSearch Domain of each Cluster concurrently.  Each Domain gets its own client,
+    and so its own pool of connections, which all of the operation's requests to that Domain re-use.  A failure on one
+    Domain is captured in its result rather than stopping the others.
+
+    get_client: Returns the client for a Cluster's Domain
+    operation: Performs the work against a Domain; returning a failed RESTResponse or raising marks it as failed
+    """
+    if not cluster_names:
+        return []
+
+    logger.info(f"Running against the OpenSearch Domains of {len(cluster_names)} Cluster(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cluster_names)))) as executor:
+        return list(executor.map(
+            lambda cluster_name: _run_on_domain(cluster_name, get_client, operation),
+            cluster_names
+        ))
+
+def _run_on_domain(cluster_name: str, get_client: Callable[[str], OpenSearchClient],
+                   operation: Callable[[OpenSearchClient], any]) -> FleetResult:
+    client = None
+    start_time = time.perf_counter()
+    try:
+        client = get_client(cluster_name)
+        start_time = time.perf_counter()
+        result = operation(client)
+    except Exception as e:
+        logger.debug(f"Operation failed against Cluster {cluster_name}: {e}")
+        return FleetResult(cluster_name, False, None, str(e), time.perf_counter() - start_time, _get_timings(client))
+    duration = time.perf_counter() - start_time
+
+    if isinstance(result, ops.RESTResponse):
+        error = None if result.succeeded else f"{result.status_code}: {result.response_text}"
+        return FleetResult(cluster_name, result.succeeded, result.response_json, error, duration, _get_timings(client))
+    return FleetResult(cluster_name, True, result, None, duration, _get_timings(client))
+
+def _get_timings(client: OpenSearchClient) -> Dict[str, Dict[str, float]]:
+    return client.timings.get_summary() if client else {}
@@ -0,0 +1,76 @@
+import math
+from typing import Dict
+
+from core.capacity_planning import SESSIONS_ROTATION_DAILY, SESSIONS_ROTATIONS
+from opensearch_interactions.ism_policies import INDEX_PATTERN_SESSIONS
+
+# Arkime creates its own sessions index template (with the mappings) using the legacy _template API.  A composable
+# _index_template matching the same indices would cause OpenSearch to ignore Arkime's template entirely, so ours is a
+# legacy template too and, being a higher order, has its settings merged over the top of Arkime's.
+TEMPLATE_ID_SESSIONS_SHARDS = "arkime_aws_aio_sessions3_shards"
+TEMPLATE_ORDER_SESSIONS_SHARDS = 100
+
+def get_sessions_shards_template(shards: int) -> Dict[str, any]:
+    """
+    shards: Number of primary shards each new daily sessions index should have
+    """
+    return {
+        "index_patterns": [
+            INDEX_PATTERN_SESSIONS
+        ],
+        "order": TEMPLATE_ORDER_SESSIONS_SHARDS,
+        "settings": {
+            "index": {
+                "number_of_shards": shards
+            }
+        }
+    }
+
+# The index settings profiles a Cluster's sessions indices can use.  The default profile leaves the indexing settings to
+# Arkime and OpenSearch; the ingest profile trades how quickly new sessions become searchable, and how much of the most
+# recent data a node failure can lose, for indexing throughput.
+INDEX_PROFILE_DEFAULT = "default"
+INDEX_PROFILE_INGEST = "ingest"
+INDEX_PROFILES = [INDEX_PROFILE_DEFAULT, INDEX_PROFILE_INGEST]
+
+TEMPLATE_ID_SESSIONS_INGEST = "arkime_aws_aio_sessions3_ingest"
+TEMPLATE_ORDER_SESSIONS_INGEST = 101
+
+def get_sessions_ingest_settings(warm_tier: bool, rotation: str = None) -> Dict[str, str]:
+    """
+    warm_tier: Whether the sessions indices move to the Domain's UltraWarm nodes after their hot days
+    rotation: How often Arkime starts a new sessions index; defaults to daily
+
+    Returns the ingest profile's settings for sessions indices, as flat setting keys mapped to their string values (the
+    form OpenSearch returns them in)
+    """
+    settings = {
+        # Sessions are searchable once a minute rather than every second, so far fewer tiny segments are written
+        "index.refresh_interval": "60s",
+        # The translog is fsynced every 30 seconds rather than on every bulk request, and flushed less often
+        "index.translog.durability": "async",
+        "index.translog.sync_interval": "30s",
+        "index.translog.flush_threshold_size": "1gb",
+    }
+
+    # The sessions ISM policy restores the replicas when an index leaves its hot state, so it's only written to once.
+    # That's only worth the risk when the hot state lasts a day.  Indices on their way to UltraWarm, or rotated weekly,
+    # stay hot for many days, so they keep their replicas throughout.
+    rotation_days = SESSIONS_ROTATIONS[rotation or SESSIONS_ROTATION_DAILY]
+    if not warm_tier and math.ceil(rotation_days) <= 1:
+        settings["index.number_of_replicas"] = "0"
+
+    return settings
+
+def get_sessions_ingest_template(warm_tier: bool, rotation: str = None) -> Dict[str, any]:
+    """
+    warm_tier: Whether the sessions indices move to the Domain's UltraWarm nodes after their hot days
+    rotation: How often Arkime starts a new sessions index; defaults to daily
+    """
+    return {
+        "index_patterns": [
+            INDEX_PATTERN_SESSIONS
+        ],
+        "order": TEMPLATE_ORDER_SESSIONS_INGEST,
+        "settings": get_sessions_ingest_settings(warm_tier, rotation)
+    }
@@ -1,56 +1,104 @@
+import logging
+from typing import Dict, List, Tuple
+
+from core.capacity_planning import SESSIONS_ROTATION_DAILY, SESSIONS_ROTATIONS
 import opensearch_interactions.ism_policies as policies
 from opensearch_interactions.opensearch_client import OpenSearchClient
 
+logger = logging.getLogger(__name__)
 
+EXPLAIN_POLICY_ID_KEY = "index.plugins.index_state_management.policy_id"
+MAX_INDEX_STR_LENGTH = 2000 # Keeps the request line well below OpenSearch's 4 KB limit
 
 def setup_user_history_ism(history_days: int, client: OpenSearchClient):
-    # Create the new policy template
     policy = policies.get_user_history_ism_policy(history_days)
+    _setup_ism(policies.ISM_ID_HISTORY, policies.INDEX_PATTERN_HISTORY, policy, client)
+
+def setup_sessions_ism(spi_days: int, replicas: int, client: OpenSearchClient, hot_days: int = None, warm_tier: bool = False,
+                       rotation: str = None):
+    # Create the new policy template; data only stays hot longer than a day if it's moving to UltraWarm afterwards.  The
+    # policy covers indices of every rotation, so indices Arkime made before a rotation change age out on their own.
+    hot_days = hot_days if (warm_tier and hot_days) else 1
+    rotation_days = SESSIONS_ROTATIONS[rotation or SESSIONS_ROTATION_DAILY]
+    hot_days, warm_days = policies.get_sessions_ism_ages(spi_days, hot_days, rotation_days)
+    policy = policies.get_sessions_ism_policy(hot_days, warm_days, replicas, policies.ISM_DEFAULT_MERGE_SEGMENTS, warm_tier)
+    _setup_ism(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS, policy, client)
 
+def _setup_ism(policy_id: str, index_pattern: str, policy: Dict[str, any], client: OpenSearchClient):
     # Get the existing policy, if it exists
-    get_policy_raw = client.get_ism_policy(policies.ISM_ID_HISTORY)
+    get_policy_raw = client.get_ism_policy(policy_id)
 
-    # If it exists
-    if get_policy_raw.succeeded:
-        # Update the existing policy
+    if not get_policy_raw.succeeded:
+        logger.info(f"Creating ISM policy {policy_id}")
+        client.create_ism_policy(policy_id, policy)
+        policy_changed = True
+    elif is_policy_current(policy["policy"], get_policy_raw.response_json.get("policy")):
+        logger.info(f"ISM policy {policy_id} is already up to date; leaving it as-is")
+        policy_changed = False
+    else:
+        logger.info(f"Updating ISM policy {policy_id}")
         sequence_number = get_policy_raw.response_json["_seq_no"]
         primary_term = get_policy_raw.response_json["_primary_term"]
-        client.update_ism_policy(policies.ISM_ID_HISTORY, policy, sequence_number, primary_term)
+        client.update_ism_policy(policy_id, policy, sequence_number, primary_term)
+        policy_changed = True
 
-        # Ensure existing indices with that policy use the updated version
-        client.set_ism_policy_of_index(policies.ISM_ID_HISTORY, policies.INDEX_PATTERN_HISTORY)
+    # Changing the policy of an index makes the ISM plugin re-evaluate it, so only touch the indices that need it
+    managed, unmanaged = _get_indices_to_manage(policy_id, index_pattern, policy_changed, client)
+    for index_str in _get_index_strs(managed):
+        client.set_ism_policy_of_index(policy_id, index_str)
+    for index_str in _get_index_strs(unmanaged):
+        client.add_ism_policy_to_index(policy_id, index_str)
 
-        # Add the policy to any new indices
-        client.add_ism_policy_to_index(policies.ISM_ID_HISTORY, policies.INDEX_PATTERN_HISTORY)
-    else:
-        # Create the policy
-        client.create_ism_policy(policies.ISM_ID_HISTORY, policy)
-
-        # Add the policy to the indices
-        client.add_ism_policy_to_index(policies.ISM_ID_HISTORY, policies.INDEX_PATTERN_HISTORY)
+def is_policy_current(desired: any, existing: any) -> bool:
+    """
+    Whether an existing ISM policy, as returned by OpenSearch, matches the desired one.  OpenSearch stores the policy
+    with extra fields filled in (its ID and timestamps, default retries on each action, etc), so the existing policy
+    only needs to contain everything in the desired one.
+    """
+    if isinstance(desired, dict):
+        return (isinstance(existing, dict)
+                and all(key in existing and is_policy_current(value, existing[key]) for key, value in desired.items()))
+    if isinstance(desired, list):
+        return (isinstance(existing, list) and len(desired) == len(existing)
+                and all(is_policy_current(d, e) for d, e in zip(desired, existing)))
+    return desired == existing
 
-def setup_sessions_ism(spi_days: int, replicas: int, client: OpenSearchClient):
-    # Create the new policy template
-    policy = policies.get_sessions_ism_policy(1, spi_days - 1, replicas, policies.ISM_DEFAULT_MERGE_SEGMENTS)
+def _get_indices_to_manage(policy_id: str, index_pattern: str, policy_changed: bool,
+                           client: OpenSearchClient) -> Tuple[List[str], List[str]]:
+    """
+    Returns the indices matching the pattern whose policy should be changed to the given one, and those the policy should
+    be added to.  If the indices can't be listed, falls back to the whole pattern for both.
+    """
+    explain_raw = client.explain_ism_policy(index_pattern)
+    if not explain_raw.succeeded:
+        logger.warning(f"Unable to get the ISM state of {index_pattern}; applying {policy_id} to the whole pattern")
+        return ([index_pattern] if policy_changed else [], [index_pattern])
 
-    # Get the existing policy, if it exists
-    get_policy_raw = client.get_ism_policy(policies.ISM_ID_SESSIONS)
+    managed = []
+    unmanaged = []
+    for index_name, details in sorted(explain_raw.response_json.items()):
+        if not isinstance(details, dict): # Skip summary fields like "total_managed_indices"
+            continue
+        current_policy_id = details.get(EXPLAIN_POLICY_ID_KEY) or details.get("policy_id")
+        if not current_policy_id:
+            unmanaged.append(index_name)
+        elif policy_changed or current_policy_id != policy_id:
+            managed.append(index_name)
 
-    # If it exists
-    if get_policy_raw.succeeded:
-        # Update the existing policy
-        sequence_number = get_policy_raw.response_json["_seq_no"]
-        primary_term = get_policy_raw.response_json["_primary_term"]
-        client.update_ism_policy(policies.ISM_ID_SESSIONS, policy, sequence_number, primary_term)
-
-        # Ensure existing indices with that policy use the updated version
-        client.set_ism_policy_of_index(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS)
-
-        # Add the policy to any new indices
-        client.add_ism_policy_to_index(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS)
-    else:
-        # Create the policy
-        client.create_ism_policy(policies.ISM_ID_SESSIONS, policy)
+    logger.debug(f"{len(managed)} index(es) need {policy_id} updated, {len(unmanaged)} need it added")
+    return (managed, unmanaged)
 
-        # Add the policy to the indices
-        client.add_ism_policy_to_index(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS)
\ No newline at end of file
+def _get_index_strs(indices: List[str]) -> List[str]:
+    """
+    Joins the indices into comma-separated strings short enough to fit in a request path
+    """
+    index_strs = []
+    batch = []
+    for index in indices:
+        if batch and len(",".join(batch + [index])) > MAX_INDEX_STR_LENGTH:
+            index_strs.append(",".join(batch))
+            batch = []
+        batch.append(index)
+    if batch:
+        index_strs.append(",".join(batch))
+    return index_strs
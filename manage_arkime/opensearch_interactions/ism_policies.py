@@ -1,4 +1,5 @@
-from typing import Dict
+import math
+from typing import Dict, List, Tuple
 
 ISM_ID_HISTORY="arkime_history"
 INDEX_PATTERN_HISTORY = f"{ISM_ID_HISTORY}_v*"
@@ -44,12 +45,71 @@ ISM_ID_SESSIONS="arkime_sessions"
 INDEX_PATTERN_SESSIONS = f"{ISM_ID_SESSIONS}3-*"
 ISM_DEFAULT_MERGE_SEGMENTS=1
 
-def get_sessions_ism_policy(hot_days: int, warm_days: int, replicas: int, merge_segments: int) -> Dict[str, any]:
+def _get_sessions_warm_actions(replicas: int, merge_segments: int, warm_tier: bool) -> List[Dict[str, any]]:
+    force_merge = {
+        "retry": {
+            "count": 3,
+            "backoff": "exponential",
+            "delay": "1m"
+        },
+        "force_merge": {
+            "max_num_segments": merge_segments
+        }
+    }
+
+    # UltraWarm indices live in managed storage, so there's no replica count to manage once they've migrated
+    if warm_tier:
+        return [
+            force_merge,
+            {
+                "retry": {
+                    "count": 3,
+                    "backoff": "exponential",
+                    "delay": "1h"
+                },
+                "warm_migration": {}
+            }
+        ]
+
+    # The ingest index profile creates sessions indices without replicas and relies on this state to restore them, so
+    # that comes first; nothing that can stall (like an allocation filter no node satisfies) may run before it.
+    return [
+        {
+            "retry": {
+                "count": 3,
+                "backoff": "exponential",
+                "delay": "1m"
+            },
+            "replica_count": {
+                "number_of_replicas": replicas
+            }
+        },
+        force_merge
+    ]
+
+def get_sessions_ism_ages(spi_days: int, hot_days: int, rotation_days: float) -> Tuple[int, int]:
+    """
+    The hot and warm days to give get_sessions_ism_policy().  ISM ages an index from its creation, but Arkime keeps
+    writing to each sessions index until its rotation period ends, so an index must stay hot until it's complete and
+    must outlive the retention period by the span of data it holds.  Daily indices keep the ages they've always had.
+
+    spi_days: Number of days of sessions data to retain
+    hot_days: Number of days for the sessions data to stay in the "hot" state
+    rotation_days: Number of days of sessions data each index holds (e.g. 1/24 for hourly rotation, 7 for weekly)
+    """
+    period_days = math.ceil(rotation_days)
+    hot_days = max(hot_days, period_days)
+    total_days = max(spi_days + period_days - 1, hot_days)
+    return hot_days, total_days - hot_days
+
+def get_sessions_ism_policy(hot_days: int, warm_days: int, replicas: int, merge_segments: int,
+                            warm_tier: bool = False) -> Dict[str, any]:
     """
     hot_days: Number of days for the sessions data to stay in the "hot" state
     warm_days: Number of additional days for the sessions data to stay in a "warm" state after it has left the "hot" state
     replicas: Number of replicas of the sessions data to keep
     merge_segments: The maximum number of Lucene segments to allow after a merge occurs
+    warm_tier: Whether the "warm" state should migrate the data to the Domain's UltraWarm nodes
     """
     return {
         "policy": {
@@ -69,36 +129,7 @@ def get_sessions_ism_policy(hot_days: int, warm_days: int, replicas: int, merge_
                 },
                 {
                     "name": "warm",
-                    "actions": [
-                        {
-                            "retry": {
-                                "count": 3,
-                                "backoff": "exponential",
-                                "delay": "1m"
-                            },
-                            "force_merge": {
-                                "max_num_segments": merge_segments
-                            }
-                        },
-                        {
-                            "allocation": {
-                                "require": {
-                                    "molochtype": "warm"
-                                },
-                                "wait_for": True
-                            }
-                        },
-                        {
-                            "retry": {
-                                "count": 3,
-                                "backoff": "exponential",
-                                "delay": "1m"
-                            },
-                            "replica_count": {
-                                "number_of_replicas": replicas
-                            }
-                        }
-                    ],
+                    "actions": _get_sessions_warm_actions(replicas, merge_segments, warm_tier),
                     "transitions": [
                         {
                             "state_name": "delete",
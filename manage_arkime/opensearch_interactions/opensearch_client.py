@@ -9,11 +9,15 @@ logger = logging.getLogger(__name__)
 
 
 class OpenSearchClient:
-    def __init__(self, endpoint: str, port: int, auth: HTTPBasicAuth):
+    def __init__(self, endpoint: str, port: int, auth: HTTPBasicAuth, pool_size: int = ops.DEFAULT_POOL_SIZE):
         self.endpoint = endpoint
         self.port = port
         self.auth = auth
 
+        # Re-use connections to the Domain across calls, and record how long each call takes
+        self.timings = ops.RequestTimings()
+        self.session = ops.build_session(pool_size=pool_size, timings=self.timings)
+
     def __eq__(self, other) -> bool:
         return self.endpoint == other.endpoint and self.port == other.port and self.auth == other.auth
 
@@ -23,7 +27,7 @@ class OpenSearchClient:
         """
         logger.debug(f"Getting ISM policy:\n{policy_id}")
         rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_plugins/_ism/policies/{policy_id}")
-        return ops.perform_get(rest_path=rest_path, auth=self.auth)
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
     
     def create_ism_policy(self, policy_id: str, policy: Dict[str, any]) -> ops.RESTResponse:
         """
@@ -33,7 +37,7 @@ class OpenSearchClient:
         rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_plugins/_ism/policies/{policy_id}")
         headers = {"Content-Type": "application/json"}
 
-        return ops.perform_put(rest_path=rest_path, data=json.dumps(policy), headers=headers, auth=self.auth)
+        return ops.perform_put(rest_path=rest_path, data=json.dumps(policy), headers=headers, auth=self.auth, session=self.session)
     
     def update_ism_policy(self, policy_id: str, policy: Dict[str, any], seq_no: int, primary_term: int) -> ops.RESTResponse:
         """
@@ -43,7 +47,7 @@ class OpenSearchClient:
         rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_plugins/_ism/policies/{policy_id}?if_seq_no={seq_no}&if_primary_term={primary_term}")
         headers = {"Content-Type": "application/json"}
 
-        return ops.perform_put(rest_path=rest_path, data=json.dumps(policy), headers=headers, auth=self.auth)
+        return ops.perform_put(rest_path=rest_path, data=json.dumps(policy), headers=headers, auth=self.auth, session=self.session)
     
     def add_ism_policy_to_index(self, policy_id: str, index_str: str) -> ops.RESTResponse:
         """
@@ -54,7 +58,7 @@ class OpenSearchClient:
         policy_identifier = {"policy_id": policy_id}
         headers = {"Content-Type": "application/json"}
 
-        return ops.perform_post(rest_path=rest_path, data=json.dumps(policy_identifier), headers=headers, auth=self.auth)
+        return ops.perform_post(rest_path=rest_path, data=json.dumps(policy_identifier), headers=headers, auth=self.auth, session=self.session)
     
     def set_ism_policy_of_index(self, policy_id: str, index_str: str) -> ops.RESTResponse:
         """
@@ -65,4 +69,110 @@ class OpenSearchClient:
         policy_identifier = {"policy_id": policy_id}
         headers = {"Content-Type": "application/json"}
 
-        return ops.perform_post(rest_path=rest_path, data=json.dumps(policy_identifier), headers=headers, auth=self.auth)
+        return ops.perform_post(rest_path=rest_path, data=json.dumps(policy_identifier), headers=headers, auth=self.auth, session=self.session)
+
+    def explain_ism_policy(self, index_str: str) -> ops.RESTResponse:
+        """
+        Get the ISM policy and state of each OpenSearch index matching an index or pattern
+        """
+        logger.debug(f"Explaining ISM policy of index:\n{index_str}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_plugins/_ism/explain/{index_str}")
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def get_index_template(self, template_name: str) -> ops.RESTResponse:
+        """
+        Get an index template by its name
+        """
+        logger.debug(f"Getting index template:\n{template_name}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_template/{template_name}")
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def put_index_template(self, template_name: str, template: Dict[str, any]) -> ops.RESTResponse:
+        """
+        Create or replace an index template by its name
+        """
+        logger.debug(f"Putting index template:\n{template_name}\n{json.dumps(template)}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_template/{template_name}")
+        headers = {"Content-Type": "application/json"}
+
+        return ops.perform_put(rest_path=rest_path, data=json.dumps(template), headers=headers, auth=self.auth, session=self.session)
+
+    def delete_index_template(self, template_name: str) -> ops.RESTResponse:
+        """
+        Delete an index template by its name
+        """
+        logger.debug(f"Deleting index template:\n{template_name}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"_template/{template_name}")
+        return ops.perform_delete(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def get_index_settings(self, index_str: str) -> ops.RESTResponse:
+        """
+        Get the explicitly-set settings of each OpenSearch index matching an index or pattern, as flat keys
+        """
+        logger.debug(f"Getting index settings:\n{index_str}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"{index_str}/_settings?flat_settings=true")
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def put_index_settings(self, index_str: str, settings: Dict[str, any]) -> ops.RESTResponse:
+        """
+        Update the dynamic settings of each OpenSearch index matching an index or pattern; a setting of None resets it to
+        its default
+        """
+        logger.debug(f"Putting index settings:\n{index_str}\n{json.dumps(settings)}")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix=f"{index_str}/_settings")
+        headers = {"Content-Type": "application/json"}
+
+        return ops.perform_put(rest_path=rest_path, data=json.dumps(settings), headers=headers, auth=self.auth,
+                               session=self.session)
+
+    def cat_indices(self, index_str: str) -> ops.RESTResponse:
+        """
+        List the indices matching a pattern along with their primary store size (in bytes) and document count
+        """
+        logger.debug(f"Listing indices:\n{index_str}")
+        rest_path = ops.RESTPath(
+            prefix=self.endpoint,
+            port=self.port,
+            suffix=f"_cat/indices/{index_str}?format=json&bytes=b&h=index,pri.store.size,docs.count"
+        )
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def cat_allocation(self) -> ops.RESTResponse:
+        """
+        List the shard count and disk usage (in bytes) of each data node
+        """
+        logger.debug("Listing shard allocation")
+        rest_path = ops.RESTPath(
+            prefix=self.endpoint,
+            port=self.port,
+            suffix="_cat/allocation?format=json&bytes=b&h=node,shards,disk.indices,disk.used,disk.total,disk.percent"
+        )
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def get_cluster_health(self) -> ops.RESTResponse:
+        """
+        Get the health of the cluster: its status, node counts, and shard allocation
+        """
+        logger.debug("Getting cluster health")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix="_cluster/health")
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def get_nodes_stats(self) -> ops.RESTResponse:
+        """
+        Get the JVM and thread pool stats of every node
+        """
+        logger.debug("Getting node stats")
+        rest_path = ops.RESTPath(prefix=self.endpoint, port=self.port, suffix="_nodes/stats/jvm,thread_pool")
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
+
+    def get_cluster_settings(self) -> ops.RESTResponse:
+        """
+        Get the cluster-level settings, including the defaults, as flat keys
+        """
+        logger.debug("Getting cluster settings")
+        rest_path = ops.RESTPath(
+            prefix=self.endpoint,
+            port=self.port,
+            suffix="_cluster/settings?include_defaults=true&flat_settings=true"
+        )
+        return ops.perform_get(rest_path=rest_path, auth=self.auth, session=self.session)
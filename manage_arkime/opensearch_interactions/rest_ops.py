@@ -1,13 +1,25 @@
 from dataclasses import dataclass
 
+import gzip
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from typing import Dict
+from typing import Dict, List
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10 # Max connections kept alive to each host
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 0.5 # Sleeps 0.5s, 1s, 2s, 4s... between retries
+RETRY_STATUS_CODES = [429, 502, 503, 504] # OpenSearch's throttling and overload responses
+WRITE_RETRY_STATUS_CODES = [429, 503] # Responses that mean a write was rejected before being applied
+READ_METHODS = frozenset(["GET", "HEAD"])
+GZIP_MIN_BYTES = 1024 # Smaller request bodies aren't worth compressing
+
 
 class RESTOperationFailedException(Exception):
     def __init__(self, operation: str, url: str, status_code: int, text: str):
@@ -59,8 +71,90 @@ class RESTResponse:
         return json.dumps(self.to_dict())
 
 
-def perform_get(rest_path: RESTPath, params: dict = None, auth: HTTPBasicAuth = None) -> RESTResponse:
-    raw_reponse = requests.get(
+class RequestTimings:
+    """
+    Records the latency of each request made through a session, keyed by its method and path, via the session's
+    response hook
+    """
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+
+    def record(self, response: requests.Response, *args, **kwargs):
+        endpoint = f"{response.request.method} /{urlparse(response.url).path.lstrip('/')}"
+        latency = response.elapsed.total_seconds()
+        self.latencies.setdefault(endpoint, []).append(latency)
+        logger.debug(f"{endpoint} returned {response.status_code} in {latency:.3f}s")
+
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            endpoint: {
+                "count": len(latencies),
+                "mean": sum(latencies) / len(latencies),
+                "max": max(latencies),
+            }
+            for endpoint, latencies in self.latencies.items()
+        }
+
+
+class GzipAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter that gzips larger request bodies before sending them.  Responses are already decompressed by
+    requests, which advertises gzip in its default Accept-Encoding header.
+    """
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        body = request.body
+        if body and len(body) >= GZIP_MIN_BYTES and "Content-Encoding" not in request.headers:
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            request.body = gzip.compress(body)
+            request.headers["Content-Encoding"] = "gzip"
+            request.headers["Content-Length"] = str(len(request.body))
+        return super().send(request, **kwargs)
+
+
+class WriteSafeRetry(Retry):
+    """
+    A Retry that only retries writes when the response means they were rejected.  A gateway 502/504 can come back after
+    OpenSearch applied the write, and retrying it then either repeats the write or, for a conditional PUT like
+    update_ism_policy's, turns the success into a 409.
+    """
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() not in READ_METHODS and status_code not in WRITE_RETRY_STATUS_CODES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                  backoff_factor: float = DEFAULT_BACKOFF_FACTOR, timings: RequestTimings = None) -> requests.Session:
+    """
+    Build a Session that keeps a pool of connections alive to each host and retries with exponential backoff when the
+    request is throttled or the host is overloaded.  Reads are retried on any of RETRY_STATUS_CODES, but writes only on
+    WRITE_RETRY_STATUS_CODES, which mean the request was rejected rather than possibly applied; read errors aren't
+    retried for the same reason.  Once the retries are exhausted the final response is returned as usual rather than
+    raised.
+    """
+    retry = WriteSafeRetry(
+        total=max_retries,
+        read=0,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=None,
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = GzipAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if timings:
+        session.hooks["response"].append(timings.record)
+    return session
+
+
+def perform_get(rest_path: RESTPath, params: dict = None, auth: HTTPBasicAuth = None,
+                session: requests.Session = None) -> RESTResponse:
+    raw_reponse = (session or requests).get(
         url=str(rest_path),
         auth=auth,
         params=params
@@ -72,8 +166,8 @@ def perform_get(rest_path: RESTPath, params: dict = None, auth: HTTPBasicAuth =
 
 
 def perform_post(rest_path: RESTPath, data: str = None, params: dict = None, headers: dict = None,
-                 auth: HTTPBasicAuth = None) -> RESTResponse:
-    raw_reponse = requests.post(
+                 auth: HTTPBasicAuth = None, session: requests.Session = None) -> RESTResponse:
+    raw_reponse = (session or requests).post(
         url=str(rest_path),
         auth=auth,
         data=data,
@@ -87,8 +181,8 @@ def perform_post(rest_path: RESTPath, data: str = None, params: dict = None, hea
 
 
 def perform_delete(rest_path: RESTPath, data: str = None, params: dict = None, headers: dict = None,
-                 auth: HTTPBasicAuth = None) -> RESTResponse:
-    raw_reponse = requests.delete(
+                 auth: HTTPBasicAuth = None, session: requests.Session = None) -> RESTResponse:
+    raw_reponse = (session or requests).delete(
         url=str(rest_path),
         auth=auth,
         data=data,
@@ -102,8 +196,8 @@ def perform_delete(rest_path: RESTPath, data: str = None, params: dict = None, h
 
 
 def perform_put(rest_path: RESTPath, data: str = None, params: dict = None, headers: dict = None,
-                 auth: HTTPBasicAuth = None) -> RESTResponse:
-    raw_reponse = requests.put(
+                 auth: HTTPBasicAuth = None, session: requests.Session = None) -> RESTResponse:
+    raw_reponse = (session or requests).put(
         url=str(rest_path),
         auth=auth,
         data=data,
@@ -113,4 +207,4 @@ def perform_put(rest_path: RESTPath, data: str = None, params: dict = None, head
 
     rest_response = RESTResponse(raw_reponse)
     logger.debug(f"REST PUT Response : {rest_response}")
-    return rest_response
\ No newline at end of file
+    return rest_response
@@ -0,0 +1,113 @@
+import logging
+from typing import Dict, List
+
+import opensearch_interactions.index_templates as templates
+import opensearch_interactions.ism_policies as policies
+from opensearch_interactions.opensearch_client import OpenSearchClient
+import opensearch_interactions.rest_ops as ops
+
+logger = logging.getLogger(__name__)
+
+def setup_sessions_shards_template(shards: int, client: OpenSearchClient):
+    # Only new daily indices pick up the template; existing ones keep the shards they were created with
+    template = templates.get_sessions_shards_template(shards)
+
+    get_template_raw = client.get_index_template(templates.TEMPLATE_ID_SESSIONS_SHARDS)
+    if get_template_raw.succeeded:
+        existing_template = get_template_raw.response_json.get(templates.TEMPLATE_ID_SESSIONS_SHARDS, {})
+        existing_shards = existing_template.get("settings", {}).get("index", {}).get("number_of_shards")
+        if str(existing_shards) == str(shards):
+            logger.info(f"Sessions index template already sets {shards} shard(s); leaving it as-is")
+            return
+
+    logger.info(f"Setting the sessions index template to {shards} shard(s)")
+    put_template_raw = client.put_index_template(templates.TEMPLATE_ID_SESSIONS_SHARDS, template)
+    if not put_template_raw.succeeded:
+        raise ops.RESTOperationFailedException("PUT", put_template_raw.url, put_template_raw.status_code,
+                                               put_template_raw.response_text)
+
+def setup_sessions_index_profile(profile: str, warm_tier: bool, client: OpenSearchClient, rotation: str = None):
+    """
+    Apply an index settings profile to new sessions indices via a template, then bring the sessions indices still being
+    written to in line with it
+    """
+    if profile == templates.INDEX_PROFILE_INGEST:
+        settings = templates.get_sessions_ingest_settings(warm_tier, rotation)
+        _put_sessions_ingest_template(warm_tier, rotation, client)
+    else:
+        # Resetting the settings to None returns them to Arkime's and OpenSearch's defaults
+        settings = {key: None for key in templates.get_sessions_ingest_settings(warm_tier=False)}
+        _delete_sessions_ingest_template(client)
+
+    # Replicas are only dropped on new indices; removing them from an index that already holds data only adds risk
+    settings.pop("index.number_of_replicas", None)
+
+    for index in _get_hot_sessions_indices(client):
+        _update_index_settings(index, settings, client)
+
+def _put_sessions_ingest_template(warm_tier: bool, rotation: str, client: OpenSearchClient):
+    template = templates.get_sessions_ingest_template(warm_tier, rotation)
+
+    get_template_raw = client.get_index_template(templates.TEMPLATE_ID_SESSIONS_INGEST)
+    if get_template_raw.succeeded:
+        existing_template = get_template_raw.response_json.get(templates.TEMPLATE_ID_SESSIONS_INGEST, {})
+        if _flatten_settings(existing_template.get("settings", {})) == template["settings"]:
+            logger.info("Sessions ingest settings template is already up to date; leaving it as-is")
+            return
+
+    logger.info("Setting the sessions ingest settings template")
+    put_template_raw = client.put_index_template(templates.TEMPLATE_ID_SESSIONS_INGEST, template)
+    if not put_template_raw.succeeded:
+        raise ops.RESTOperationFailedException("PUT", put_template_raw.url, put_template_raw.status_code,
+                                               put_template_raw.response_text)
+
+def _delete_sessions_ingest_template(client: OpenSearchClient):
+    if not client.get_index_template(templates.TEMPLATE_ID_SESSIONS_INGEST).succeeded:
+        return
+
+    logger.info("Removing the sessions ingest settings template")
+    delete_template_raw = client.delete_index_template(templates.TEMPLATE_ID_SESSIONS_INGEST)
+    if not delete_template_raw.succeeded:
+        raise ops.RESTOperationFailedException("DELETE", delete_template_raw.url, delete_template_raw.status_code,
+                                               delete_template_raw.response_text)
+
+def _get_hot_sessions_indices(client: OpenSearchClient) -> List[str]:
+    explain_raw = client.explain_ism_policy(policies.INDEX_PATTERN_SESSIONS)
+    if not explain_raw.succeeded:
+        logger.warning("Unable to get the ISM state of the sessions indices; only new indices will use the profile")
+        return []
+
+    return sorted(
+        index for index, details in explain_raw.response_json.items()
+        if isinstance(details, dict) and (details.get("state") or {}).get("name") == "hot"
+    )
+
+def _update_index_settings(index: str, settings: Dict[str, str], client: OpenSearchClient):
+    get_settings_raw = client.get_index_settings(index)
+    if not get_settings_raw.succeeded:
+        logger.warning(f"Unable to get the settings of {index}; leaving it as-is")
+        return
+
+    current_settings = get_settings_raw.response_json.get(index, {}).get("settings", {})
+    drifted_settings = {key: value for key, value in settings.items() if current_settings.get(key) != value}
+    if not drifted_settings:
+        return
+
+    logger.info(f"Updating the settings of {index}: {drifted_settings}")
+    put_settings_raw = client.put_index_settings(index, drifted_settings)
+    if not put_settings_raw.succeeded:
+        raise ops.RESTOperationFailedException("PUT", put_settings_raw.url, put_settings_raw.status_code,
+                                               put_settings_raw.response_text)
+
+def _flatten_settings(settings: Dict[str, any], prefix: str = "") -> Dict[str, str]:
+    """
+    Turns nested settings, like {"index": {"refresh_interval": "60s"}}, into flat ones, like
+    {"index.refresh_interval": "60s"}
+    """
+    flat_settings = {}
+    for key, value in settings.items():
+        if isinstance(value, dict):
+            flat_settings.update(_flatten_settings(value, f"{prefix}{key}."))
+        else:
+            flat_settings[f"{prefix}{key}"] = str(value)
+    return flat_settings
@@ -18,5 +18,9 @@ setuptools.setup(
         "ruff",
         "requests",
     ],
+    extras_require={
+        # Only plan-sweep needs NumPy, and this package is also installed into every Lambda bundle
+        "sweep": ["numpy"],
+    },
     python_requires=">=3.9",
 )
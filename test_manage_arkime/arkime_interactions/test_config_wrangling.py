@@ -197,4 +197,142 @@ def test_WHEN_get_viewer_config_archive_called_THEN_as_expected(mock_zip_class,
             f"/parent/path/config-MyCluster01-{TEST_ENV.aws_account}-{TEST_ENV.aws_region}/viewer.zip"
         )
     ]
-    assert expected_zip_init_calls == mock_zip_class.call_args_list
\ No newline at end of file
+    assert expected_zip_init_calls == mock_zip_class.call_args_list
+def _set_up_capture_config(parent_dir: str, cluster_name: str, contents: str) -> str:
+    capture_dir = config.get_capture_dir_path(cluster_name, TEST_ENV, parent_dir)
+    os.makedirs(capture_dir)
+    config_path = config.get_capture_config_ini_path(cluster_name, TEST_ENV, parent_dir)
+    with open(config_path, "w") as config_file:
+        config_file.write(contents)
+    return config_path
+
+def test_WHEN_render_capture_tuning_called_AND_first_render_THEN_as_expected(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    config_path = _set_up_capture_config(
+        str(tmp_path),
+        cluster_name,
+        "[default]\ndebug=1\n# Reading\ntpacketv3NumThreads=1\n\n[headers-http-request]\nreferer=type:string\n"
+    )
+
+    # Run the test
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "tpacketv3NumThreads": "2", "dbBulkSize": "2000000"})
+
+    # Check the results
+    assert actual_value
+
+    with open(config_path, "r") as config_file:
+        expected_contents = (
+            "[default]\ndebug=0\n# Reading\ntpacketv3NumThreads=2\ndbBulkSize=2000000\n\n"
+            + "[headers-http-request]\nreferer=type:string\n"
+        )
+        assert expected_contents == config_file.read()
+
+    with open(config.get_capture_tuning_path(cluster_name, TEST_ENV, str(tmp_path)), "r") as tuning_file:
+        assert {"debug": "0", "tpacketv3NumThreads": "2", "dbBulkSize": "2000000"} == json.load(tuning_file)
+
+def test_WHEN_render_capture_tuning_called_AND_operator_override_THEN_preserved(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    config_path = _set_up_capture_config(str(tmp_path), cluster_name, "[default]\ndebug=1\npacketThreads=1\n")
+    config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "packetThreads": "2"})
+
+    # The operator turns debug logging back on
+    with open(config_path, "w") as config_file:
+        config_file.write("[default]\ndebug=2\npacketThreads=2\n")
+
+    # Run the test
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "packetThreads": "5"})
+
+    # Check the results
+    assert actual_value
+
+    with open(config_path, "r") as config_file:
+        assert "[default]\ndebug=2\npacketThreads=5\n" == config_file.read()
+
+def test_WHEN_render_capture_tuning_called_AND_plan_catches_up_to_override_THEN_still_preserved(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    config_path = _set_up_capture_config(str(tmp_path), cluster_name, "[default]\npacketThreads=1\n")
+    config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"packetThreads": "2"})
+
+    # The operator bumps packetThreads above what the plan suggests
+    with open(config_path, "w") as config_file:
+        config_file.write("[default]\npacketThreads=4\n")
+
+    # Run our test
+    # TEST 1: The plan suggests less than the operator's value
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"packetThreads": "3"})
+    assert not actual_value
+
+    # TEST 2: The plan catches up to the operator's value
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"packetThreads": "4"})
+    assert not actual_value
+
+    # TEST 3: The plan moves past the operator's value
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"packetThreads": "5"})
+    assert not actual_value
+
+    # Check our results
+    with open(config_path, "r") as config_file:
+        assert "[default]\npacketThreads=4\n" == config_file.read()
+
+    with open(config.get_capture_tuning_path(cluster_name, TEST_ENV, str(tmp_path)), "r") as tuning_file:
+        assert {"packetThreads": "2"} == json.load(tuning_file)
+
+def test_WHEN_render_capture_tuning_called_AND_no_change_THEN_as_expected(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    _set_up_capture_config(str(tmp_path), cluster_name, "[default]\ndebug=0\npacketThreads=2\n")
+    config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "packetThreads": "2"})
+
+    # Run the test
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "packetThreads": "2"})
+
+    # Check the results
+    assert not actual_value
+
+def test_WHEN_render_capture_tuning_called_AND_no_default_section_THEN_raises(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    _set_up_capture_config(str(tmp_path), cluster_name, "[other]\ndebug=1\n")
+
+    # Run the test
+    with pytest.raises(config.SectionNotInConfig):
+        config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0"})
+
+def test_WHEN_render_capture_tuning_called_AND_new_setting_THEN_managed_from_default(tmp_path):
+    # Set up our mock; an earlier render didn't manage rotateIndex, which is still at its shipped default
+    cluster_name = "MyCluster01"
+    config_path = _set_up_capture_config(str(tmp_path), cluster_name, "[default]\ndebug=0\nrotateIndex=daily\n")
+    config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0"})
+
+    # Run the test
+    actual_value = config.render_capture_tuning(cluster_name, TEST_ENV, str(tmp_path), {"debug": "0", "rotateIndex": "hourly12"})
+
+    # Check the results
+    assert actual_value
+
+    with open(config_path, "r") as config_file:
+        assert "[default]\ndebug=0\nrotateIndex=hourly12\n" == config_file.read()
+
+def test_WHEN_render_viewer_tuning_called_THEN_as_expected(tmp_path):
+    # Set up our mock
+    cluster_name = "MyCluster01"
+    viewer_dir = config.get_viewer_dir_path(cluster_name, TEST_ENV, str(tmp_path))
+    os.makedirs(viewer_dir)
+    config_path = config.get_viewer_config_ini_path(cluster_name, TEST_ENV, str(tmp_path))
+    with open(config_path, "w") as config_file:
+        config_file.write("[default]\nrotateIndex=daily\nviewPort=8005\n")
+
+    # Run the test
+    actual_value = config.render_viewer_tuning(cluster_name, TEST_ENV, str(tmp_path), {"rotateIndex": "weekly", "queryAllIndices": "true"})
+
+    # Check the results
+    assert actual_value
+
+    with open(config_path, "r") as config_file:
+        assert "[default]\nrotateIndex=weekly\nviewPort=8005\nqueryAllIndices=true\n" == config_file.read()
+
+    with open(config.get_viewer_tuning_path(cluster_name, TEST_ENV, str(tmp_path)), "r") as tuning_file:
+        assert {"rotateIndex": "weekly", "queryAllIndices": "true"} == json.load(tuning_file)
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import json
 import unittest.mock as mock
 
@@ -7,7 +9,8 @@ import core.constants as constants
 
 def test_WHEN_CreateEniMirrorEventMetrics_created_AND_success_THEN_correct_metrics():
     # Run our test
-    actual_value = cwi.CreateEniMirrorEventMetrics("cluster-1", "vpc-1", cwi.CreateEniMirrorEventOutcome.SUCCESS)
+    actual_value = cwi.CreateEniMirrorEventMetrics("cluster-1", "vpc-1", cwi.CreateEniMirrorEventOutcome.SUCCESS,
+                                                   over_capacity=True)
 
     # Check our results
     expected_namespace = cwi.CW_ARKIME_EVENT_NAMESPACE
@@ -50,6 +53,15 @@ def test_WHEN_CreateEniMirrorEventMetrics_created_AND_success_THEN_correct_metri
                 {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
             ]
         },
+        {
+            "MetricName": cwi.CREATE_METRIC_TARGET_OVER_CAPACITY,
+            "Value": 1,
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": "cluster-1"},
+                {"Name": "VpcId", "Value": "vpc-1"},
+                {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
+            ]
+        },
     ]
     assert expected_metric_data == actual_value.metric_data
 
@@ -98,6 +110,15 @@ def test_WHEN_CreateEniMirrorEventMetrics_created_AND_aborted_exists_THEN_correc
                 {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
             ]
         },
+        {
+            "MetricName": cwi.CREATE_METRIC_TARGET_OVER_CAPACITY,
+            "Value": 0,
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": "cluster-1"},
+                {"Name": "VpcId", "Value": "vpc-1"},
+                {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
+            ]
+        },
     ]
     assert expected_metric_data == actual_value.metric_data
 
@@ -146,6 +167,15 @@ def test_WHEN_CreateEniMirrorEventMetrics_created_AND_aborted_eni_type_THEN_corr
                 {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
             ]
         },
+        {
+            "MetricName": cwi.CREATE_METRIC_TARGET_OVER_CAPACITY,
+            "Value": 0,
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": "cluster-1"},
+                {"Name": "VpcId", "Value": "vpc-1"},
+                {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
+            ]
+        },
     ]
     assert expected_metric_data == actual_value.metric_data
 
@@ -194,6 +224,15 @@ def test_WHEN_CreateEniMirrorEventMetrics_created_AND_failure_THEN_correct_metri
                 {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
             ]
         },
+        {
+            "MetricName": cwi.CREATE_METRIC_TARGET_OVER_CAPACITY,
+            "Value": 0,
+            "Dimensions": [
+                {"Name": "ClusterName", "Value": "cluster-1"},
+                {"Name": "VpcId", "Value": "vpc-1"},
+                {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
+            ]
+        },
     ]
     assert expected_metric_data == actual_value.metric_data
 
@@ -258,6 +297,95 @@ def test_WHEN_DestroyEniMirrorEventMetrics_created_AND_failure_THEN_correct_metr
     assert expected_metric_data == actual_value.metric_data
 
 
+def test_WHEN_AwsEventListenerMetrics_created_AND_filtered_THEN_correct_metrics():
+    # Run our test
+    actual_value = cwi.AwsEventListenerMetrics("cluster-1", "vpc-1", cwi.AwsEventListenerOutcome.PROCESSED,
+                                               filtered_enis=2, cache_hit=True)
+
+    # Check our results
+    expected_namespace = cwi.CW_ARKIME_EVENT_NAMESPACE
+    assert expected_namespace == actual_value.namespace
+
+    expected_dimensions = [
+        {"Name": "ClusterName", "Value": "cluster-1"},
+        {"Name": "VpcId", "Value": "vpc-1"},
+        {"Name": "EventType", "Value": cwi.LISTENER_EVENT_TYPE},
+    ]
+    expected_metric_data = [
+        {"MetricName": cwi.AwsEventListenerOutcome.PROCESSED.value, "Value": 1, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.AwsEventListenerOutcome.FILTERED_OTHER_VPC.value, "Value": 0, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.AwsEventListenerOutcome.FILTERED_NO_ENIS.value, "Value": 0, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.AwsEventListenerOutcome.FAILURE.value, "Value": 0, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.LISTENER_METRIC_FILTERED_ENI_TYPE, "Value": 2, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.LISTENER_METRIC_CACHE_HIT, "Value": 1, "Dimensions": expected_dimensions},
+    ]
+    assert expected_metric_data == actual_value.metric_data
+
+def test_WHEN_CoalesceEniEventsMetrics_created_THEN_correct_metrics():
+    # Run our test
+    actual_value = cwi.CoalesceEniEventsMetrics("cluster-1", "vpc-1", received=10, dispatched=3, coalesced=6, failed=2)
+
+    # Check our results
+    expected_dimensions = [
+        {"Name": "ClusterName", "Value": "cluster-1"},
+        {"Name": "VpcId", "Value": "vpc-1"},
+        {"Name": "EventType", "Value": cwi.COALESCER_EVENT_TYPE},
+    ]
+    expected_metric_data = [
+        {"MetricName": cwi.COALESCER_METRIC_RECEIVED, "Value": 10, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.COALESCER_METRIC_DISPATCHED, "Value": 3, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.COALESCER_METRIC_COALESCED, "Value": 6, "Dimensions": expected_dimensions},
+        {"MetricName": cwi.COALESCER_METRIC_FAILURE, "Value": 2, "Dimensions": expected_dimensions},
+    ]
+    assert expected_metric_data == actual_value.metric_data
+
+@mock.patch("aws_interactions.cloudwatch_interactions.time")
+def test_WHEN_emf_documents_called_THEN_correct_documents(mock_time):
+    # Set up our mock
+    mock_time.time.return_value = 1234.5
+    test_metrics = cwi.ConfigureIsmEventMetrics("cluster-1", cwi.ConfigureIsmEventOutcome.SUCCESS)
+
+    # Run our test
+    actual_value = test_metrics.emf_documents
+
+    # Check our results
+    expected_value = [
+        {
+            "_aws": {
+                "Timestamp": 1234500,
+                "CloudWatchMetrics": [{
+                    "Namespace": cwi.CW_ARKIME_EVENT_NAMESPACE,
+                    "Dimensions": [["ClusterName", "EventType"]],
+                    "Metrics": [
+                        {"Name": cwi.ConfigureIsmEventOutcome.SUCCESS.value, "Unit": "None"},
+                        {"Name": cwi.ConfigureIsmEventOutcome.FAILURE.value, "Unit": "None"},
+                    ],
+                }],
+            },
+            "ClusterName": "cluster-1",
+            "EventType": constants.EVENT_DETAIL_TYPE_CONFIGURE_ISM,
+            cwi.ConfigureIsmEventOutcome.SUCCESS.value: 1,
+            cwi.ConfigureIsmEventOutcome.FAILURE.value: 0,
+        }
+    ]
+    assert expected_value == actual_value
+
+@mock.patch("aws_interactions.cloudwatch_interactions.sys")
+def test_WHEN_emit_event_metrics_called_THEN_writes_emf_lines(mock_sys):
+    # Set up our mock
+    mock_metrics = mock.Mock()
+    mock_metrics.emf_documents = [{"doc": 1}, {"doc": 2}]
+
+    # Run our test
+    cwi.emit_event_metrics(mock_metrics)
+
+    # Check our results
+    expected_write_calls = [
+        mock.call(json.dumps({"doc": 1}) + "\n"),
+        mock.call(json.dumps({"doc": 2}) + "\n"),
+    ]
+    assert expected_write_calls == mock_sys.stdout.write.call_args_list
+
 def test_WHEN_put_event_metrics_called_THEN_metrics_are_put():
     # Set up our mock
     mock_metrics = mock.Mock()
@@ -279,3 +407,337 @@ def test_WHEN_put_event_metrics_called_THEN_metrics_are_put():
         )
     ]
     assert expected_put_calls == mock_cw_client.put_metric_data.call_args_list
+
+def test_WHEN_MetricsBuffer_flushed_THEN_datapoints_aggregated():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider, dimensions={"ClusterName": "cluster-1"})
+
+    # Run our test
+    test_buffer.add("EventsPut", 10)
+    test_buffer.add("EventsPut", 10)
+    test_buffer.add("EventsPut", 7)
+    test_buffer.add("EventsPut", 3, dimensions={"VpcId": "vpc-1"})
+    actual_value = test_buffer.flush()
+    test_buffer.close()
+
+    # Check our results
+    assert 2 == actual_value
+
+    expected_put_calls = [
+        mock.call(
+            Namespace=cwi.CW_ARKIME_EVENT_NAMESPACE,
+            MetricData=[
+                {
+                    "MetricName": "EventsPut",
+                    "Dimensions": [{"Name": "ClusterName", "Value": "cluster-1"}],
+                    "Unit": "None",
+                    "Values": [10, 7],
+                    "Counts": [2, 1],
+                },
+                {
+                    "MetricName": "EventsPut",
+                    "Dimensions": [{"Name": "ClusterName", "Value": "cluster-1"}, {"Name": "VpcId", "Value": "vpc-1"}],
+                    "Unit": "None",
+                    "Values": [3],
+                    "Counts": [1],
+                },
+            ]
+        )
+    ]
+    assert expected_put_calls == mock_cw_client.put_metric_data.call_args_list
+
+def test_WHEN_MetricsBuffer_flushed_AND_many_distinct_values_THEN_uses_statistic_values():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider)
+
+    # Run our test
+    for value in range(cwi.PUT_METRIC_DATA_MAX_VALUES + 1):
+        test_buffer.add("Latency", value, unit="Milliseconds")
+    test_buffer.close()
+
+    # Check our results
+    expected_put_calls = [
+        mock.call(
+            Namespace=cwi.CW_ARKIME_EVENT_NAMESPACE,
+            MetricData=[
+                {
+                    "MetricName": "Latency",
+                    "Dimensions": [],
+                    "Unit": "Milliseconds",
+                    "StatisticValues": {
+                        "SampleCount": 151,
+                        "Sum": 11325.0,
+                        "Minimum": 0,
+                        "Maximum": 150,
+                    },
+                },
+            ]
+        )
+    ]
+    assert expected_put_calls == mock_cw_client.put_metric_data.call_args_list
+
+def test_WHEN_MetricsBuffer_full_THEN_flushes_in_max_size_batches():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider, max_datums=2)
+
+    # Run our test
+    test_buffer.add("Metric1", 1)
+    calls_after_first = len(mock_cw_client.put_metric_data.call_args_list)
+    test_buffer.add("Metric2", 1)
+    calls_after_second = len(mock_cw_client.put_metric_data.call_args_list)
+    test_buffer.add("Metric3", 1)
+    test_buffer.close()
+
+    # Check our results
+    assert 0 == calls_after_first
+    assert 1 == calls_after_second
+
+    actual_batches = [call.kwargs["MetricData"] for call in mock_cw_client.put_metric_data.call_args_list]
+    assert [["Metric1", "Metric2"], ["Metric3"]] == [[d["MetricName"] for d in batch] for batch in actual_batches]
+
+@mock.patch("aws_interactions.cloudwatch_interactions.time")
+def test_WHEN_MetricsBuffer_interval_passes_THEN_flushes(mock_time):
+    # Set up our mock
+    mock_time.time.side_effect = [0, 10, 61, 61, 62]
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider, flush_interval_seconds=60)
+
+    # Run our test
+    test_buffer.add("Metric1", 1)
+    calls_after_first = len(mock_cw_client.put_metric_data.call_args_list)
+    test_buffer.add("Metric1", 2)
+    calls_after_second = len(mock_cw_client.put_metric_data.call_args_list)
+    test_buffer.close()
+
+    # Check our results
+    assert 0 == calls_after_first
+    assert 1 == calls_after_second
+    assert 1 == len(mock_cw_client.put_metric_data.call_args_list) # Nothing left to send on close
+
+def test_WHEN_MetricsBuffer_put_fails_THEN_doesnt_raise():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_cw_client.put_metric_data.side_effect = Exception("Throttled")
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider)
+    test_buffer.add("Metric1", 1)
+
+    # Run our test
+    actual_value = test_buffer.flush()
+    test_buffer.close()
+
+    # Check our results
+    assert 0 == actual_value
+
+def test_WHEN_MetricsBuffer_added_to_concurrently_THEN_nothing_lost():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider, max_datums=3)
+
+    # Run our test
+    def record(thread_num: int):
+        for _ in range(500):
+            test_buffer.add(f"Metric{thread_num % 5}", 1)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(record, range(10)))
+    test_buffer.close()
+
+    # Check our results
+    all_datums = [datum for call in mock_cw_client.put_metric_data.call_args_list for datum in call.kwargs["MetricData"]]
+    assert 5000 == sum([sum(datum["Counts"]) for datum in all_datums])
+
+def test_WHEN_MetricsBuffer_add_event_metrics_called_THEN_records_each_datum():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_buffer = cwi.MetricsBuffer(mock_aws_provider)
+
+    # Run our test
+    test_buffer.add_event_metrics(cwi.ConfigureIsmEventMetrics("cluster-1", cwi.ConfigureIsmEventOutcome.SUCCESS))
+    test_buffer.add_event_metrics(cwi.ConfigureIsmEventMetrics("cluster-1", cwi.ConfigureIsmEventOutcome.FAILURE))
+    test_buffer.close()
+
+    # Check our results
+    actual_datums = mock_cw_client.put_metric_data.call_args.kwargs["MetricData"]
+    assert 2 == len(actual_datums)
+    assert {"Success": ([1, 0], [1, 1]), "Failure": ([0, 1], [1, 1])} == {
+        datum["MetricName"]: (datum["Values"], datum["Counts"]) for datum in actual_datums
+    }
+
+def test_WHEN_CreateEniMirrorLatencyMetrics_created_THEN_correct_metrics():
+    # Run our test
+    actual_value = cwi.CreateEniMirrorLatencyMetrics("cluster-1", "vpc-1", 100.0, 100.25, 103.0, 104.5).metric_data
+
+    # Check our results
+    expected_dimensions = [
+        {"Name": "ClusterName", "Value": "cluster-1"},
+        {"Name": "VpcId", "Value": "vpc-1"},
+        {"Name": "EventType", "Value": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR},
+    ]
+    expected_value = [
+        {"MetricName": cwi.LATENCY_METRIC_LISTENER, "Value": 250, "Unit": "Milliseconds", "Dimensions": expected_dimensions},
+        {"MetricName": cwi.LATENCY_METRIC_DELIVERY, "Value": 2750, "Unit": "Milliseconds", "Dimensions": expected_dimensions},
+        {"MetricName": cwi.LATENCY_METRIC_CREATE, "Value": 1500, "Unit": "Milliseconds", "Dimensions": expected_dimensions},
+        {"MetricName": cwi.LATENCY_METRIC_END_TO_END, "Value": 4500, "Unit": "Milliseconds", "Dimensions": expected_dimensions},
+    ]
+    assert expected_value == actual_value
+
+def test_WHEN_CreateEniMirrorLatencyMetrics_created_AND_clock_skew_THEN_no_negatives():
+    # Run our test
+    actual_value = cwi.CreateEniMirrorLatencyMetrics("cluster-1", "vpc-1", 100.5, 100.25, 103.0, 104.5)
+
+    # Check our results
+    assert 0 == actual_value.value_listener
+
+def test_WHEN_get_metric_percentiles_called_THEN_returns_values():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_cw_client.get_metric_statistics.return_value = {
+        "Datapoints": [
+            {"SampleCount": 2.0, "ExtendedStatistics": {"p50": 10.0, "p99": 30.0}},
+            {"SampleCount": 40.0, "ExtendedStatistics": {"p50": 1000.0, "p99": 3000.0}},
+        ]
+    }
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    start_time = datetime(2023, 5, 3, 0, 0, 0)
+    end_time = datetime(2023, 5, 4, 0, 0, 0)
+
+    # Run our test
+    actual_value = cwi.get_metric_percentiles(
+        "namespace", "metric-1", {"VpcId": "vpc-1"}, start_time, end_time, ["p50", "p99"], mock_aws_provider
+    )
+
+    # Check our results
+    assert {"SampleCount": 40.0, "p50": 1000.0, "p99": 3000.0} == actual_value
+
+    expected_get_calls = [
+        mock.call(
+            Namespace="namespace",
+            MetricName="metric-1",
+            Dimensions=[{"Name": "VpcId", "Value": "vpc-1"}],
+            StartTime=start_time,
+            EndTime=end_time,
+            Period=86400,
+            Statistics=["SampleCount"],
+            ExtendedStatistics=["p50", "p99"]
+        )
+    ]
+    assert expected_get_calls == mock_cw_client.get_metric_statistics.call_args_list
+
+def test_WHEN_get_metric_percentiles_called_AND_no_data_THEN_returns_empty():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_cw_client.get_metric_statistics.return_value = {"Datapoints": []}
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    # Run our test
+    actual_value = cwi.get_metric_percentiles(
+        "namespace", "metric-1", {}, datetime(2023, 5, 3), datetime(2023, 5, 3, 1), ["p50"], mock_aws_provider
+    )
+
+    # Check our results
+    assert {} == actual_value
+
+def test_WHEN_get_metric_data_period_called_THEN_respects_datapoint_limit():
+    # Run our test + check our results
+    assert 300 == cwi.get_metric_data_period(datetime(2023, 5, 3), datetime(2023, 5, 3, 6), min_period=300)
+    assert 60 == cwi.get_metric_data_period(datetime(2023, 5, 3), datetime(2023, 5, 3, 1))
+
+    # 30 days at 201 datapoints per query
+    actual_period = cwi.get_metric_data_period(datetime(2023, 5, 1), datetime(2023, 5, 31))
+    assert 0 == actual_period % 60
+    assert (30 * 86400 / actual_period) * cwi.GET_METRIC_DATA_MAX_QUERIES <= cwi.GET_METRIC_DATA_MAX_DATAPOINTS
+
+    # A single query can be much finer-grained
+    assert 60 == cwi.get_metric_data_period(datetime(2023, 5, 1), datetime(2023, 5, 31), num_queries=1)
+
+def test_WHEN_get_metric_data_called_THEN_batches_and_pages():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+
+    def get_metric_data(MetricDataQueries, StartTime, EndTime, ScanBy, NextToken=None):
+        if len(MetricDataQueries) == cwi.GET_METRIC_DATA_MAX_QUERIES and not NextToken:
+            return {"MetricDataResults": [{"Id": "q0", "Values": [1.0]}], "NextToken": "token-1"}
+        return {"MetricDataResults": [{"Id": "q0", "Values": [2.0]}, {"Id": "q1", "Values": [3.0]}]}
+    mock_cw_client.get_metric_data.side_effect = get_metric_data
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_queries = [
+        cwi.MetricQuery(f"metric-{i}", "namespace", "metric", {"Name": f"{i}"}, "Sum")
+        for i in range(cwi.GET_METRIC_DATA_MAX_QUERIES + 2)
+    ]
+
+    # Run our test
+    actual_value = cwi.get_metric_data(test_queries, datetime(2023, 5, 3), datetime(2023, 5, 4), 300, mock_aws_provider)
+
+    # Check our results
+    actual_batch_sizes = [len(call.kwargs["MetricDataQueries"]) for call in mock_cw_client.get_metric_data.call_args_list]
+    assert [500, 500, 2] == actual_batch_sizes
+    assert "token-1" == mock_cw_client.get_metric_data.call_args_list[1].kwargs["NextToken"]
+
+    assert [1.0, 2.0] == actual_value["metric-0"]
+    assert [3.0] == actual_value["metric-1"]
+    assert [] == actual_value["metric-2"]
+    assert [2.0] == actual_value["metric-500"]
+    assert [3.0] == actual_value["metric-501"]
+
+    expected_query = {
+        "Id": "q1",
+        "MetricStat": {
+            "Metric": {"Namespace": "namespace", "MetricName": "metric", "Dimensions": [{"Name": "Name", "Value": "1"}]},
+            "Period": 300,
+            "Stat": "Sum",
+        },
+        "ReturnData": True,
+    }
+    assert expected_query == mock_cw_client.get_metric_data.call_args_list[0].kwargs["MetricDataQueries"][1]
+
+def test_WHEN_get_metric_data_called_AND_with_timestamps_THEN_pairs_them():
+    # Set up our mock
+    mock_cw_client = mock.Mock()
+    mock_cw_client.get_metric_data.return_value = {
+        "MetricDataResults": [
+            {"Id": "q0", "Timestamps": [datetime(2023, 5, 3), datetime(2023, 5, 5)], "Values": [1.0, 2.0]},
+        ]
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_cloudwatch.return_value = mock_cw_client
+
+    test_queries = [cwi.MetricQuery("metric-0", "namespace", "metric", {"Name": "0"}, "Sum")]
+
+    # Run our test
+    actual_value = cwi.get_metric_data(test_queries, datetime(2023, 5, 3), datetime(2023, 5, 6), 86400, mock_aws_provider,
+                                       with_timestamps=True)
+
+    # Check our results
+    expected_value = {"metric-0": [(datetime(2023, 5, 3), 1.0), (datetime(2023, 5, 5), 2.0)]}
+    assert expected_value == actual_value
@@ -50,6 +50,30 @@ def test_WHEN_get_subnets_of_vpc_called_AND_doesnt_exist_THEN_raises():
     with pytest.raises(ec2i.VpcDoesNotExist):
         result = ec2i.get_subnets_of_vpc("my-vpc", mock_aws_provider)
 
+def test_WHEN_get_azs_of_subnets_called_THEN_returns_them():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.describe_subnets.side_effect = [
+        {"Subnets": [{"SubnetId": "subnet-1", "AvailabilityZone": "az-1"}], "NextToken": "token-1"},
+        {"Subnets": [{"SubnetId": "subnet-2", "AvailabilityZone": "az-2"}]},
+    ]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    result = ec2i.get_azs_of_subnets(["subnet-1", "subnet-2"], mock_aws_provider)
+
+    # Check our results
+    expected_describe_calls = [
+        mock.call(SubnetIds=["subnet-1", "subnet-2"]),
+        mock.call(SubnetIds=["subnet-1", "subnet-2"], NextToken="token-1"),
+    ]
+    assert expected_describe_calls == mock_ec2_client.describe_subnets.call_args_list
+
+    expected_result = {"subnet-1": "az-1", "subnet-2": "az-2"}
+    assert expected_result == result
+
 def test_WHEN_get_enis_of_instance_called_THEN_returns_them():
     # Set up our mock
     mock_ec2_client = mock.Mock()
@@ -132,6 +156,42 @@ def test_WHEN_get_enis_of_subnet_called_THEN_returns_them():
     ]
     assert expected_result == result
 
+def test_WHEN_get_enis_of_vpc_called_THEN_returns_them():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.describe_network_interfaces.side_effect = [
+        {
+            "NetworkInterfaces": [
+                {"NetworkInterfaceId": "eni-1", "InterfaceType": "type-1", "VpcId": "vpc-1", "SubnetId": "subnet-1"},
+            ],
+            "NextToken": "next-1",
+        },
+        {
+            "NetworkInterfaces": [
+                {"NetworkInterfaceId": "eni-2", "InterfaceType": "type-2", "VpcId": "vpc-1", "SubnetId": "subnet-2"},
+            ],
+        }
+    ]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    result = ec2i.get_enis_of_vpc("vpc-1", mock_aws_provider)
+
+    # Check our results
+    expected_describe_calls = [
+        mock.call(Filters=[{"Name": "vpc-id", "Values": ["vpc-1"]}], MaxResults=ec2i.DESCRIBE_ENIS_PAGE_SIZE),
+        mock.call(Filters=[{"Name": "vpc-id", "Values": ["vpc-1"]}], MaxResults=ec2i.DESCRIBE_ENIS_PAGE_SIZE, NextToken="next-1"),
+    ]
+    assert expected_describe_calls == mock_ec2_client.describe_network_interfaces.call_args_list
+
+    expected_result = [
+        ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "type-1"),
+        ec2i.NetworkInterface("vpc-1", "subnet-2", "eni-2", "type-2"),
+    ]
+    assert expected_result == result
+
 def test_WHEN_get_enis_of_subnet_called_AND_no_enis_THEN_empty_list():
     # Set up our mock
     mock_ec2_client = mock.Mock()
@@ -186,11 +246,146 @@ def test_WHEN_mirror_eni_called_THEN_sets_up_session():
                     ]
                 },
             ],
+            ClientToken=ec2i.get_mirror_session_client_token("eni-1", "filter-1", 1234),
         )
     ]
     assert expected_create_calls == mock_ec2_client.create_traffic_mirror_session.call_args_list
 
-    expected_result = "session-1"
+    expected_result = ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 1234)
+    assert expected_result == result
+
+def test_WHEN_mirror_eni_called_AND_packet_length_THEN_truncates():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.create_traffic_mirror_session.return_value = {
+        "TrafficMirrorSession": {
+            "TrafficMirrorSessionId": "session-1"
+        }
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    test_eni = ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "type-1")
+    ec2i.mirror_eni(test_eni, "target-1", "filter-1", "vpc-1", mock_aws_provider, virtual_network=1234, packet_length=128)
+
+    # Check our results
+    _, create_kwargs = mock_ec2_client.create_traffic_mirror_session.call_args
+    assert 128 == create_kwargs["PacketLength"]
+
+def test_WHEN_get_mirror_session_client_token_called_THEN_deterministic():
+    # Run our test
+    token_1 = ec2i.get_mirror_session_client_token("eni-1", "filter-1", 1234)
+    token_2 = ec2i.get_mirror_session_client_token("eni-1", "filter-1", 1234)
+    token_3 = ec2i.get_mirror_session_client_token("eni-1", "filter-1", 1235)
+    token_4 = ec2i.get_mirror_session_client_token("eni-2", "filter-1", 1234)
+    token_5 = ec2i.get_mirror_session_client_token("eni-1", "filter-2", 1234)
+
+    # Check our results
+    assert token_1 == token_2
+    assert token_1 != token_3
+    assert token_1 != token_4
+    assert token_1 != token_5
+    assert 64 >= len(token_1)
+
+def test_WHEN_mirror_eni_called_AND_session_exists_THEN_returns_existing():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.create_traffic_mirror_session.side_effect = [
+        ClientError(error_response={"Error": {"Code": "IdempotentParameterMismatch"}}, operation_name="")
+    ]
+    mock_ec2_client.describe_traffic_mirror_sessions.return_value = {
+        "TrafficMirrorSessions": [
+            {
+                "TrafficMirrorSessionId": "session-1",
+                "NetworkInterfaceId": "eni-1",
+                "TrafficMirrorTargetId": "target-2", # A racing invocation placed it on another Target
+                "TrafficMirrorFilterId": "filter-1",
+                "VirtualNetworkId": 1234,
+            }
+        ]
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    test_eni = ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "type-1")
+    result = ec2i.mirror_eni(test_eni, "target-1", "filter-1", "vpc-1", mock_aws_provider, virtual_network=1234)
+
+    # Check our results
+    expected_describe_calls = [
+        mock.call(Filters=[
+            {"Name": "network-interface-id", "Values": ["eni-1"]},
+            {"Name": "traffic-mirror-filter-id", "Values": ["filter-1"]},
+            {"Name": "virtual-network-id", "Values": ["1234"]},
+        ])
+    ]
+    assert expected_describe_calls == mock_ec2_client.describe_traffic_mirror_sessions.call_args_list
+
+    expected_result = ec2i.MirrorSession("session-1", "eni-1", "target-2", "filter-1", 1234)
+    assert expected_result == result
+
+def test_WHEN_mirror_eni_called_AND_other_error_THEN_raises():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.create_traffic_mirror_session.side_effect = [
+        ClientError(error_response={"Error": {"Code": "TrafficMirrorSessionLimitExceeded"}}, operation_name="")
+    ]
+    mock_ec2_client.describe_traffic_mirror_sessions.return_value = {"TrafficMirrorSessions": []}
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    test_eni = ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "type-1")
+    with pytest.raises(ClientError):
+        ec2i.mirror_eni(test_eni, "target-1", "filter-1", "vpc-1", mock_aws_provider, virtual_network=1234)
+
+    # Check our results; only a conflicting request means the Session might already exist
+    assert not mock_ec2_client.describe_traffic_mirror_sessions.called
+
+def test_WHEN_get_duplicate_mirror_sessions_called_THEN_returns_them():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.describe_traffic_mirror_sessions.side_effect = [
+        {
+            "TrafficMirrorSessions": [
+                {"TrafficMirrorSessionId": "session-1", "NetworkInterfaceId": "eni-1", "TrafficMirrorTargetId": "target-1",
+                 "TrafficMirrorFilterId": "filter-1", "VirtualNetworkId": 1234},
+                {"TrafficMirrorSessionId": "session-2", "NetworkInterfaceId": "eni-2", "TrafficMirrorTargetId": "target-1",
+                 "TrafficMirrorFilterId": "filter-1", "VirtualNetworkId": 1234},
+            ],
+            "NextToken": "next-1",
+        },
+        {
+            "TrafficMirrorSessions": [
+                {"TrafficMirrorSessionId": "session-3", "NetworkInterfaceId": "eni-1", "TrafficMirrorTargetId": "target-1",
+                 "TrafficMirrorFilterId": "filter-1", "VirtualNetworkId": 1234},
+            ],
+        }
+    ]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    result = ec2i.get_duplicate_mirror_sessions("filter-1", mock_aws_provider)
+
+    # Check our results
+    expected_describe_calls = [
+        mock.call(Filters=[{"Name": "traffic-mirror-filter-id", "Values": ["filter-1"]}]),
+        mock.call(Filters=[{"Name": "traffic-mirror-filter-id", "Values": ["filter-1"]}], NextToken="next-1"),
+    ]
+    assert expected_describe_calls == mock_ec2_client.describe_traffic_mirror_sessions.call_args_list
+
+    expected_result = {
+        "eni-1": [
+            ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 1234),
+            ec2i.MirrorSession("session-3", "eni-1", "target-1", "filter-1", 1234),
+        ]
+    }
     assert expected_result == result
 
 def test_WHEN_mirror_eni_called_AND_excluded_type_THEN_raises():
@@ -321,4 +516,24 @@ def test_WHEN_get_azs_in_region_called_THEN_returns_them():
 
     # Check our results
     expected_result = ["us-fake-1a", "us-fake-1b", "us-fake-1c"]
-    assert expected_result == result
\ No newline at end of file
+    assert expected_result == result
+def test_WHEN_get_gwlb_arns_of_endpoint_service_called_THEN_returns_them():
+    # Set up our mock
+    mock_ec2_client = mock.Mock()
+    mock_ec2_client.describe_vpc_endpoint_service_configurations.return_value = {
+        "ServiceConfigurations": [
+            {"ServiceId": "vpce-svc-1", "GatewayLoadBalancerArns": ["arn-1"]},
+        ]
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ec2.return_value = mock_ec2_client
+
+    # Run our test
+    actual_value = ec2i.get_gwlb_arns_of_endpoint_service("vpce-svc-1", mock_aws_provider)
+
+    # Check our results
+    assert ["arn-1"] == actual_value
+
+    expected_describe_calls = [mock.call(ServiceIds=["vpce-svc-1"])]
+    assert expected_describe_calls == mock_ec2_client.describe_vpc_endpoint_service_configurations.call_args_list
@@ -39,3 +39,139 @@ def test_WHEN_put_events_called_THEN_events_are_put():
         ])
     ]
     assert expected_put_calls == mock_events_client.put_events.call_args_list
+
+def test_WHEN_put_events_in_batches_called_THEN_events_are_put_in_full_batches():
+    # Set up our mock
+    mock_events_client = mock.Mock()
+    mock_events_client.put_events.side_effect = [{"FailedEntryCount": 0}, {"FailedEntryCount": 1}, {"FailedEntryCount": 0}]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_events.return_value = mock_events_client
+
+    test_events = [events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", f"eni-{i}") for i in range(25)]
+
+    # Run our test
+    actual_value = events.put_events_in_batches(test_events, "bus-1", mock_aws_provider, max_workers=1)
+
+    # Check our results
+    assert 1 == actual_value
+
+    actual_batch_sizes = [len(call.kwargs["Entries"]) for call in mock_events_client.put_events.call_args_list]
+    assert [10, 10, 5] == actual_batch_sizes
+
+    actual_eni_ids = [
+        json.loads(entry["Detail"])["eni_id"]
+        for call in mock_events_client.put_events.call_args_list
+        for entry in call.kwargs["Entries"]
+    ]
+    assert [f"eni-{i}" for i in range(25)] == actual_eni_ids
+
+def test_WHEN_put_events_in_batches_called_AND_batch_raises_THEN_counts_as_failed():
+    # Set up our mock
+    mock_events_client = mock.Mock()
+    mock_events_client.put_events.side_effect = [{"FailedEntryCount": 0}, Exception("throttled")]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_events.return_value = mock_events_client
+
+    test_events = [events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", f"eni-{i}") for i in range(15)]
+
+    # Run our test
+    actual_value = events.put_events_in_batches(test_events, "bus-1", mock_aws_provider, max_workers=1)
+
+    # Check our results
+    assert 5 == actual_value
+
+def test_WHEN_put_events_in_batches_called_AND_metrics_buffer_THEN_records_outcomes():
+    # Set up our mock
+    mock_events_client = mock.Mock()
+    mock_events_client.put_events.side_effect = [{"FailedEntryCount": 2}, Exception("throttled")]
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_events.return_value = mock_events_client
+
+    mock_metrics_buffer = mock.Mock()
+
+    test_events = [events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", f"eni-{i}") for i in range(15)]
+
+    # Run our test
+    events.put_events_in_batches(test_events, "bus-1", mock_aws_provider, max_workers=1, metrics_buffer=mock_metrics_buffer)
+
+    # Check our results
+    expected_add_calls = [
+        mock.call(events.METRIC_EVENTS_PUT, 8),
+        mock.call(events.METRIC_EVENTS_FAILED, 2),
+        mock.call(events.METRIC_PUT_EVENTS_LATENCY, mock.ANY, unit="Milliseconds"),
+        mock.call(events.METRIC_EVENTS_PUT, 0),
+        mock.call(events.METRIC_EVENTS_FAILED, 5),
+        mock.call(events.METRIC_PUT_EVENTS_LATENCY, mock.ANY, unit="Milliseconds"),
+    ]
+    assert expected_add_calls == mock_metrics_buffer.add.call_args_list
+
+def test_WHEN_get_event_timestamp_called_THEN_parses_event_time():
+    # Run our test
+    actual_value = events.get_event_timestamp({"time": "2023-05-03T15:14:39Z"})
+
+    # Check our results
+    assert 1683126879.0 == actual_value
+    assert events.get_event_timestamp({}) is None
+
+def test_WHEN_CreateEniMirrorEvent_has_timing_THEN_carried_in_details():
+    # Set up our mock
+    test_event = events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1", "interface", "filter-1", 1234,
+                                             source_event_time=1000.0, published_time=1002.5)
+
+    # Run our test
+    actual_value = events.CreateEniMirrorEvent.from_event_dict({"detail": test_event.details})
+
+    # Check our results
+    assert 1000.0 == actual_value.source_event_time
+    assert 1002.5 == actual_value.published_time
+    assert test_event == actual_value
+
+    untimed_event = events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1", "interface", "filter-1", 1234)
+    assert "source_event_time" not in untimed_event.details
+
+def test_WHEN_ConfigureIsmEvent_has_warm_tier_THEN_carried_in_details():
+    # Set up our mock
+    test_event = events.ConfigureIsmEvent(365, 30, 1, 12, 7, True)
+
+    # Run our test
+    actual_value = events.ConfigureIsmEvent.from_event_dict({"detail": test_event.details})
+
+    # Check our results
+    assert 7 == actual_value.hot_days
+    assert True == actual_value.warm_tier
+    assert test_event == actual_value
+
+    untiered_event = events.ConfigureIsmEvent(365, 30, 1, 12, 7, False)
+    assert "hot_days" not in untiered_event.details
+    assert "warm_tier" not in untiered_event.details
+
+def test_WHEN_ConfigureIsmEvent_has_index_profile_THEN_carried_in_details():
+    # Set up our mock
+    test_event = events.ConfigureIsmEvent(365, 30, 1, 12, index_profile="ingest")
+
+    # Run our test
+    actual_value = events.ConfigureIsmEvent.from_event_dict({"detail": test_event.details})
+
+    # Check our results
+    assert "ingest" == actual_value.index_profile
+    assert test_event == actual_value
+
+    unprofiled_event = events.ConfigureIsmEvent(365, 30, 1, 12)
+    assert "index_profile" not in unprofiled_event.details
+
+def test_WHEN_ConfigureIsmEvent_has_sessions_rotation_THEN_carried_in_details():
+    # Set up our mock
+    test_event = events.ConfigureIsmEvent(365, 30, 1, 128, sessions_rotation="hourly12")
+
+    # Run our test
+    actual_value = events.ConfigureIsmEvent.from_event_dict({"detail": test_event.details})
+
+    # Check our results
+    assert "hourly12" == actual_value.sessions_rotation
+    assert test_event == actual_value
+
+    daily_event = events.ConfigureIsmEvent(365, 30, 1, 12)
+    assert "sessions_rotation" not in daily_event.details
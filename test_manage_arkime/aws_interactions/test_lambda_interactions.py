@@ -0,0 +1,50 @@
+import io
+import json
+import unittest.mock as mock
+
+import pytest
+
+import aws_interactions.lambda_interactions as lambdai
+
+
+def test_WHEN_invoke_lambda_called_THEN_returns_response():
+    # Set up our mock
+    mock_lambda_client = mock.Mock()
+    mock_lambda_client.invoke.return_value = {
+        "StatusCode": 200,
+        "Payload": io.BytesIO(json.dumps({"statusCode": 200}).encode("utf-8"))
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_lambda.return_value = mock_lambda_client
+
+    # Run our test
+    actual_value = lambdai.invoke_lambda("function-1", {"detail": {}}, mock_aws_provider)
+
+    # Check our results
+    assert {"statusCode": 200} == actual_value
+
+    expected_invoke_calls = [
+        mock.call(
+            FunctionName="function-1",
+            InvocationType="RequestResponse",
+            Payload=json.dumps({"detail": {}}).encode("utf-8"),
+        )
+    ]
+    assert expected_invoke_calls == mock_lambda_client.invoke.call_args_list
+
+def test_WHEN_invoke_lambda_called_AND_function_error_THEN_raises():
+    # Set up our mock
+    mock_lambda_client = mock.Mock()
+    mock_lambda_client.invoke.return_value = {
+        "StatusCode": 200,
+        "FunctionError": "Unhandled",
+        "Payload": io.BytesIO(b'{"errorMessage": "Task timed out"}')
+    }
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_lambda.return_value = mock_lambda_client
+
+    # Run our test
+    with pytest.raises(lambdai.LambdaInvocationFailed):
+        lambdai.invoke_lambda("function-1", {"detail": {}}, mock_aws_provider)
@@ -1,3 +1,4 @@
+from datetime import date, datetime, timezone
 import pytest
 import unittest.mock as mock
 
@@ -258,6 +259,45 @@ def test_WHEN_list_bucket_objects_called_THEN_as_expected():
     assert expected_paginate_calls == mock_paginator.paginate.call_args_list
 
 
+def test_WHEN_get_bytes_written_by_day_called_THEN_sums_objects_in_window():
+    # Set up our mock
+    mock_s3_client = mock.Mock()
+    mock_paginator = mock.Mock()
+    mock_s3_client.get_paginator.return_value = mock_paginator
+
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_s3.return_value = mock_s3_client
+
+    page_1 = {
+        "Contents": [
+            {"Key": "node1/file1.pcap", "LastModified": datetime(2023, 5, 1, 23, 59, tzinfo=timezone.utc), "Size": 1},
+            {"Key": "node1/file2.pcap", "LastModified": datetime(2023, 5, 2, 0, 0, tzinfo=timezone.utc), "Size": 10}
+        ]
+    }
+    page_2 = {
+        "Contents": [
+            {"Key": "node2/file3.pcap", "LastModified": datetime(2023, 5, 3, 12, 0, tzinfo=timezone.utc), "Size": 100},
+            {"Key": "node2/file4.pcap", "LastModified": datetime(2023, 5, 4, 0, 0, tzinfo=timezone.utc), "Size": 1000}
+        ]
+    }
+    mock_paginator.paginate.return_value = [page_1, page_2]
+
+    # Run our test
+    result = s3.get_bytes_written_by_day(
+        "my-bucket",
+        datetime(2023, 5, 2, tzinfo=timezone.utc),
+        datetime(2023, 5, 4, tzinfo=timezone.utc),
+        mock_aws_provider
+    )
+
+    # Check the results
+    assert {date(2023, 5, 2): 10, date(2023, 5, 3): 100} == result
+
+    expected_paginate_calls = [
+        mock.call(Bucket="my-bucket")
+    ]
+    assert expected_paginate_calls == mock_paginator.paginate.call_args_list
+
 def test_WHEN_get_object_user_metadata_called_THEN_as_expected():
     # Set up our mock
     mock_s3_client = mock.Mock()
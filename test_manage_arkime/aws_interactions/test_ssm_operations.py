@@ -157,6 +157,17 @@ def test_WHEN_put_ssm_param_called_THEN_puts_it():
     ]
     assert expected_put_calls == mock_ssm_client.put_parameter.call_args_list
 
+def test_WHEN_put_ssm_param_called_AND_already_exists_THEN_raises():
+    # Set up our mock
+    mock_ssm_client = mock.Mock()
+    mock_ssm_client.put_parameter.side_effect = ClientError(error_response={"Error": {"Code": "ParameterAlreadyExists"}}, operation_name="")
+    mock_aws_provider = mock.Mock()
+    mock_aws_provider.get_ssm.return_value = mock_ssm_client
+
+    # Run our test
+    with pytest.raises(ssm.ParamAlreadyExists):
+        ssm.put_ssm_param("my-param", "param-value", mock_aws_provider)
+
 def test_WHEN_delete_ssm_param_called_THEN_deletes_it():
     # Set up our mock
     mock_ssm_client = mock.Mock()
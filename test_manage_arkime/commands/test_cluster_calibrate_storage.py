@@ -0,0 +1,281 @@
+from datetime import date, datetime, timezone
+import json
+import unittest.mock as mock
+
+import requests
+
+from aws_interactions.ssm_operations import ParamDoesNotExist
+from commands.cluster_calibrate_storage import cmd_cluster_calibrate_storage, SECONDS_PER_DAY
+from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, OSDomainPlan, DataNodesPlan,
+                                    MasterNodesPlan, ClusterPlan, VpcPlan, S3Plan, DEFAULT_VPC_CIDR, DEFAULT_CAPTURE_PUBLIC_MASK,
+                                    DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS)
+import core.constants as constants
+from core.storage_calibration import StorageCalibration, OS_RESERVED_STORAGE_FACTOR
+from core.traffic_profile import TRAFFIC_QUERY_KEY, get_observed_traffic_query
+
+
+NOW = datetime(2023, 5, 8, 13, 30, tzinfo=timezone.utc)
+
+def _get_test_plan(sessions_rotation: str = None) -> ClusterPlan:
+    return ClusterPlan(
+        CaptureNodesPlan("m5.xlarge", 2, 3, 2),
+        VpcPlan(DEFAULT_VPC_CIDR, ["az1", "az2"], DEFAULT_CAPTURE_PUBLIC_MASK),
+        EcsSysResourcePlan(3584, 15360),
+        OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "t3.small.search"), 1,
+                     sessionsRotation=sessions_rotation),
+        S3Plan(DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS),
+        ViewerNodesPlan(4, 2),
+        None
+    )
+
+def _get_ssm_value(param_name: str, aws_provider):
+    if param_name == constants.get_cluster_ssm_param_name("cluster-1"):
+        return json.dumps({"osDomainName": "domain-1", "vpceServiceId": "vpce-svc-1",
+                           "capacityPlan": _get_test_plan().to_dict()})
+    if param_name == constants.get_opensearch_domain_ssm_param_name("cluster-1"):
+        return json.dumps({"domainArn": "arn", "domainName": "domain-1", "domainSecret": "secret-1"})
+    if param_name == constants.get_capture_bucket_ssm_param_name("cluster-1"):
+        return "bucket-1"
+    raise ParamDoesNotExist(param_name)
+
+@mock.patch("commands.cluster_calibrate_storage.datetime")
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider")
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ec2i")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_THEN_saves_calibration(mock_ssm, mock_ec2i, mock_cwi, mock_s3, mock_get_os_client,
+                                                                           mock_provider_cls, mock_datetime):
+    # Set up our mock
+    mock_datetime.now.return_value = NOW
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_provider = mock.Mock()
+    mock_provider_cls.return_value = mock_provider
+
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = [
+        "arn:aws:elasticloadbalancing:region-1:XXXXXXXXXXXX:loadbalancer/gwy/gwlb-1/1234"
+    ]
+    mock_cwi.get_metric_data.return_value = {TRAFFIC_QUERY_KEY: [
+        (datetime(2023, 5, 6, tzinfo=timezone.utc), 400),
+        (datetime(2023, 5, 7, tzinfo=timezone.utc), 600),
+    ]}
+
+    mock_os_client = mock.Mock()
+    mock_os_client.cat_indices.return_value = mock.Mock(succeeded=True, response_json=[
+        {"index": "arkime_sessions3-230505", "pri.store.size": "999", "docs.count": "1"}, # before the window
+        {"index": "arkime_sessions3-230506", "pri.store.size": "5", "docs.count": "1"},
+        {"index": "arkime_sessions3-230507", "pri.store.size": "15", "docs.count": "1"},
+        {"index": "arkime_sessions3-230508", "pri.store.size": "999", "docs.count": "1"}, # today; incomplete
+    ])
+    mock_get_os_client.return_value = mock_os_client
+
+    mock_s3.get_bytes_written_by_day.return_value = {date(2023, 5, 6): 100, date(2023, 5, 7): 200}
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 2, None)
+
+    # Check our results
+    expected_value = StorageCalibration(
+        spiRatio=20 * OS_RESERVED_STORAGE_FACTOR / 1000,
+        pcapRatio=0.3,
+        days=2,
+        trafficBytes=1000,
+        calibratedAt=NOW.isoformat(),
+    )
+    assert expected_value == actual_value
+
+    window_start = datetime(2023, 5, 6, tzinfo=timezone.utc)
+    window_end = datetime(2023, 5, 8, tzinfo=timezone.utc)
+    expected_get_data_calls = [
+        mock.call([get_observed_traffic_query("gwy/gwlb-1/1234")], window_start, window_end, SECONDS_PER_DAY, mock_provider,
+                  with_timestamps=True)
+    ]
+    assert expected_get_data_calls == mock_cwi.get_metric_data.call_args_list
+
+    expected_os_client_calls = [
+        mock.call("cluster-1", mock_provider, None)
+    ]
+    assert expected_os_client_calls == mock_get_os_client.call_args_list
+
+    expected_s3_calls = [
+        mock.call("bucket-1", window_start, window_end, mock_provider)
+    ]
+    assert expected_s3_calls == mock_s3.get_bytes_written_by_day.call_args_list
+
+    expected_put_calls = [
+        mock.call(
+            constants.get_storage_calibration_ssm_param_name("cluster-1"),
+            json.dumps(expected_value.to_dict()),
+            mock_provider,
+            description=mock.ANY,
+            overwrite=True
+        )
+    ]
+    assert expected_put_calls == mock_ssm.put_ssm_param.call_args_list
+
+@mock.patch("commands.cluster_calibrate_storage.datetime")
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider")
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ec2i")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_AND_os_unreachable_THEN_aborts(mock_ssm, mock_ec2i, mock_cwi, mock_s3,
+                                                                                   mock_get_os_client, mock_provider_cls, mock_datetime):
+    # Set up our mock
+    mock_datetime.now.return_value = NOW
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_provider = mock.Mock()
+    mock_provider_cls.return_value = mock_provider
+
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = []
+    mock_get_os_client.return_value.cat_indices.side_effect = requests.exceptions.ConnectionError("boom")
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 7, "localhost")
+
+    # Check our results
+    assert None == actual_value
+
+    expected_os_client_calls = [
+        mock.call("cluster-1", mock_provider, "localhost")
+    ]
+    assert expected_os_client_calls == mock_get_os_client.call_args_list
+    assert not mock_ssm.put_ssm_param.called
+
+@mock.patch("commands.cluster_calibrate_storage.datetime")
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ec2i")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_AND_no_traffic_THEN_aborts(mock_ssm, mock_ec2i, mock_cwi, mock_s3,
+                                                                               mock_get_os_client, mock_datetime):
+    # Set up our mock
+    mock_datetime.now.return_value = NOW
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = []
+    mock_get_os_client.return_value.cat_indices.return_value = mock.Mock(succeeded=True, response_json=[])
+    mock_s3.get_bytes_written_by_day.return_value = {}
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 7, None)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_cwi.get_metric_data.called
+    assert not mock_ssm.put_ssm_param.called
+
+@mock.patch("commands.cluster_calibrate_storage.shell")
+@mock.patch("commands.cluster_calibrate_storage.datetime")
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ec2i")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_AND_missing_sessions_THEN_compares_matching_days(mock_ssm, mock_ec2i, mock_cwi,
+                                                                                                     mock_s3, mock_get_os_client,
+                                                                                                     mock_datetime, mock_shell):
+    # Set up our mock
+    mock_datetime.now.return_value = NOW
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = [
+        "arn:aws:elasticloadbalancing:region-1:XXXXXXXXXXXX:loadbalancer/gwy/gwlb-1/1234"
+    ]
+    mock_cwi.get_metric_data.return_value = {TRAFFIC_QUERY_KEY: [
+        (datetime(2023, 5, 6, tzinfo=timezone.utc), 4000), # its sessions index has aged out
+        (datetime(2023, 5, 7, tzinfo=timezone.utc), 1000),
+    ]}
+    mock_get_os_client.return_value.cat_indices.return_value = mock.Mock(succeeded=True, response_json=[
+        {"index": "arkime_sessions3-230507", "pri.store.size": "20", "docs.count": "1"},
+    ])
+    mock_s3.get_bytes_written_by_day.return_value = {date(2023, 5, 6): 1200, date(2023, 5, 7): 300}
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 2, None)
+
+    # Check our results
+    expected_value = StorageCalibration(
+        spiRatio=20 * OS_RESERVED_STORAGE_FACTOR / 1000,
+        pcapRatio=0.3,
+        days=1,
+        trafficBytes=1000,
+        calibratedAt=NOW.isoformat(),
+    )
+    assert expected_value == actual_value
+    assert not mock_shell.louder_input.called
+    assert mock_ssm.put_ssm_param.called
+
+@mock.patch("commands.cluster_calibrate_storage.shell")
+@mock.patch("commands.cluster_calibrate_storage.datetime")
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ec2i")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_AND_implausible_AND_declined_THEN_aborts(mock_ssm, mock_ec2i, mock_cwi, mock_s3,
+                                                                                             mock_get_os_client, mock_datetime,
+                                                                                             mock_shell):
+    # Set up our mock
+    mock_datetime.now.return_value = NOW
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = [
+        "arn:aws:elasticloadbalancing:region-1:XXXXXXXXXXXX:loadbalancer/gwy/gwlb-1/1234"
+    ]
+    mock_cwi.get_metric_data.return_value = {TRAFFIC_QUERY_KEY: [(datetime(2023, 5, 7, tzinfo=timezone.utc), 10**12)]}
+    mock_get_os_client.return_value.cat_indices.return_value = mock.Mock(succeeded=True, response_json=[
+        {"index": "arkime_sessions3-230507", "pri.store.size": "20", "docs.count": "1"}, # a tiny fraction of the traffic
+    ])
+    mock_s3.get_bytes_written_by_day.return_value = {date(2023, 5, 7): 2 * 10**11}
+
+    mock_shell.louder_input.return_value = "no"
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 2, None)
+
+    # Check our results
+    assert None == actual_value
+    assert mock_shell.louder_input.called
+    assert not mock_ssm.put_ssm_param.called
+
+@mock.patch("commands.cluster_calibrate_storage.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_calibrate_storage.get_cluster_os_client")
+@mock.patch("commands.cluster_calibrate_storage.s3")
+@mock.patch("commands.cluster_calibrate_storage.cwi")
+@mock.patch("commands.cluster_calibrate_storage.ssm_ops")
+def test_WHEN_cmd_cluster_calibrate_storage_called_AND_weekly_rotation_THEN_aborts(mock_ssm, mock_cwi, mock_s3,
+                                                                                    mock_get_os_client):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.return_value = json.dumps({
+        "osDomainName": "domain-1", "vpceServiceId": "vpce-svc-1", "capacityPlan": _get_test_plan("weekly").to_dict()
+    })
+
+    # Run our test
+    actual_value = cmd_cluster_calibrate_storage("profile", "region", "cluster-1", 7, None)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_cwi.get_metric_data.called
+    assert not mock_get_os_client.called
+    assert not mock_s3.get_bytes_written_by_day.called
+    assert not mock_ssm.put_ssm_param.called
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 import json
 import pytest
 import shlex
@@ -12,14 +13,18 @@ import cdk_interactions.cdk_context as context
 
 from commands.cluster_create import (cmd_cluster_create, _set_up_viewer_cert, _get_next_capacity_plan, _get_next_user_config, _confirm_usage,
                                      _get_previous_capacity_plan, _get_previous_user_config, _configure_ism, _set_up_arkime_config,
-                                     _should_proceed_with_operation, _is_initial_invocation, _get_stacks_to_deploy, _get_cdk_context)
+                                     _should_proceed_with_operation, _is_initial_invocation, _get_stacks_to_deploy, _get_cdk_context,
+                                     _get_observed_traffic_profile, _get_storage_calibration)
+from core.capture_tuning import get_capture_tuning
 from core.compatibility import CliClusterVersionMismatch
 import core.constants as constants
 from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, MINIMUM_TRAFFIC, OSDomainPlan, DataNodesPlan, MasterNodesPlan,
                                     VpcPlan, ClusterPlan, DEFAULT_SPI_DAYS, DEFAULT_REPLICAS, DEFAULT_NUM_AZS, S3Plan,
                                     DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS, DEFAULT_HISTORY_DAYS, Cidr, DEFAULT_VPC_CIDR, DEFAULT_CAPTURE_PUBLIC_MASK,
-                                    DEFAULT_VIEWER_PUBLIC_MASK)
+                                    DEFAULT_VIEWER_PUBLIC_MASK, MAGIC_FACTOR)
 import core.local_file as local_file
+from core.storage_calibration import StorageCalibration
+from core.traffic_profile import NoTrafficObserved, TrafficProfile, TRAFFIC_QUERY_KEY, get_observed_traffic_query
 from core.user_config import UserConfig
 from core.versioning import VersionInfo
 
@@ -31,6 +36,7 @@ from core.versioning import VersionInfo
 @mock.patch("commands.cluster_create._set_up_arkime_config")
 @mock.patch("commands.cluster_create._configure_ism")
 @mock.patch("commands.cluster_create._get_previous_user_config")
+@mock.patch("commands.cluster_create._get_storage_calibration", mock.Mock(return_value=None))
 @mock.patch("commands.cluster_create._get_previous_capacity_plan")
 @mock.patch("commands.cluster_create._should_proceed_with_operation")
 @mock.patch("commands.cluster_create._get_next_user_config")
@@ -95,12 +101,13 @@ def test_WHEN_cmd_cluster_create_called_THEN_cdk_command_correct(mock_cdk_client
     assert expected_set_up_calls == mock_set_up.call_args_list
 
     expected_configure_calls = [
-        mock.call("my-cluster", 365, 30, 2, mock.ANY)
+        mock.call("my-cluster", 365, 30, 2, None, mock.ANY, hot_days=None, warm_tier=False, index_profile=None,
+                  sessions_rotation=None)
     ]
     assert expected_configure_calls == mock_configure.call_args_list
 
     expected_set_up_arkime_conf_calls = [
-        mock.call("my-cluster", mock.ANY)
+        mock.call("my-cluster", mock.ANY, cluster_plan, user_config)
     ]
     assert expected_set_up_arkime_conf_calls == mock_set_up_arkime_conf.call_args_list
 
@@ -110,6 +117,7 @@ def test_WHEN_cmd_cluster_create_called_THEN_cdk_command_correct(mock_cdk_client
 @mock.patch("commands.cluster_create._set_up_arkime_config")
 @mock.patch("commands.cluster_create._configure_ism")
 @mock.patch("commands.cluster_create._get_previous_user_config")
+@mock.patch("commands.cluster_create._get_storage_calibration", mock.Mock(return_value=None))
 @mock.patch("commands.cluster_create._get_previous_capacity_plan")
 @mock.patch("commands.cluster_create._should_proceed_with_operation")
 @mock.patch("commands.cluster_create._get_next_user_config")
@@ -162,6 +170,7 @@ def test_WHEN_cmd_cluster_create_called_AND_ver_mismatch_THEN_as_expected(mock_c
 @mock.patch("commands.cluster_create._set_up_arkime_config")
 @mock.patch("commands.cluster_create._configure_ism")
 @mock.patch("commands.cluster_create._get_previous_user_config")
+@mock.patch("commands.cluster_create._get_storage_calibration", mock.Mock(return_value=None))
 @mock.patch("commands.cluster_create._get_previous_capacity_plan")
 @mock.patch("commands.cluster_create._should_proceed_with_operation")
 @mock.patch("commands.cluster_create._get_next_user_config")
@@ -193,7 +202,8 @@ def test_WHEN_cmd_cluster_create_called_AND_shouldnt_proceed_THEN_as_expected(mo
 
     # Check our results
     expected_proceed_calls = [
-        mock.call(True, cluster_plan, cluster_plan, user_config, user_config, True, "1.2.3.4/24", "2.3.4.5/26")
+        mock.call(True, cluster_plan, cluster_plan, user_config, user_config, True, "1.2.3.4/24", "2.3.4.5/26",
+                  storage_calibration=None)
     ]
     assert expected_proceed_calls == mock_proceed.call_args_list
 
@@ -221,6 +231,7 @@ def test_WHEN_cmd_cluster_create_called_AND_shouldnt_proceed_THEN_as_expected(mo
 @mock.patch("commands.cluster_create._set_up_arkime_config")
 @mock.patch("commands.cluster_create._configure_ism")
 @mock.patch("commands.cluster_create._get_previous_user_config")
+@mock.patch("commands.cluster_create._get_storage_calibration", mock.Mock(return_value=None))
 @mock.patch("commands.cluster_create._get_previous_capacity_plan")
 @mock.patch("commands.cluster_create._should_proceed_with_operation")
 @mock.patch("commands.cluster_create._get_next_user_config")
@@ -296,12 +307,12 @@ def test_WHEN_cmd_cluster_create_called_AND_just_print_THEN_as_expected(mock_cdk
     assert expected_configure_calls == mock_configure.call_args_list
 
     expected_set_up_arkime_conf_calls = [
-        mock.call("my-cluster", mock.ANY)
+        mock.call("my-cluster", mock.ANY, cluster_plan, user_config)
     ]
     assert expected_set_up_arkime_conf_calls == mock_set_up_arkime_conf.call_args_list
 
     expected_set_up_arkime_conf_calls = [
-        mock.call("my-cluster", mock.ANY)
+        mock.call("my-cluster", mock.ANY, cluster_plan, user_config)
     ]
     assert expected_set_up_arkime_conf_calls == mock_set_up_arkime_conf.call_args_list
 
@@ -315,6 +326,114 @@ def test_WHEN_cmd_cluster_create_called_AND_just_print_THEN_as_expected(mock_cdk
     ]
     assert expected_set_up_cfn_calls == mock_set_up_cfn.call_args_list
 
+@mock.patch("commands.cluster_create.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_create.compat", mock.Mock())
+@mock.patch("commands.cluster_create._get_observed_traffic_profile")
+@mock.patch("commands.cluster_create._is_initial_invocation")
+@mock.patch("commands.cluster_create._get_previous_user_config", mock.Mock())
+@mock.patch("commands.cluster_create._get_storage_calibration", mock.Mock(return_value=None))
+@mock.patch("commands.cluster_create._get_previous_capacity_plan", mock.Mock())
+@mock.patch("commands.cluster_create._should_proceed_with_operation")
+@mock.patch("commands.cluster_create._get_next_user_config")
+@mock.patch("commands.cluster_create._get_next_capacity_plan", mock.Mock())
+@mock.patch("commands.cluster_create.CdkClient", mock.Mock())
+def test_WHEN_cmd_cluster_create_called_AND_right_size_THEN_uses_observed_traffic(mock_get_config, mock_proceed, mock_initial,
+                                                                                 mock_get_profile):
+    # Set up our mock
+    mock_initial.return_value = False
+    mock_get_profile.return_value = TrafficProfile(100, 300, 0.5, 1.231, 1.5, 1.6)
+    mock_proceed.return_value = False
+
+    # Run our test
+    cmd_cluster_create("profile", "region", "my-cluster", None, None, None, None, None, False, False, None, None, None, None,
+                       right_size_days=14, right_size_percentile="p95")
+
+    # Check our results
+    expected_get_profile_calls = [
+        mock.call("my-cluster", 14, mock.ANY)
+    ]
+    assert expected_get_profile_calls == mock_get_profile.call_args_list
+
+    expected_get_config_calls = [
+        mock.call("my-cluster", 1.24, None, None, None, None, None, None, mock.ANY, hot_days=None, index_profile=None)
+    ]
+    assert expected_get_config_calls == mock_get_config.call_args_list
+
+@mock.patch("commands.cluster_create.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_create.compat", mock.Mock())
+@mock.patch("commands.cluster_create._get_observed_traffic_profile")
+@mock.patch("commands.cluster_create._is_initial_invocation")
+@mock.patch("commands.cluster_create._get_next_user_config")
+@mock.patch("commands.cluster_create.CdkClient", mock.Mock())
+def test_WHEN_cmd_cluster_create_called_AND_right_size_not_possible_THEN_aborts(mock_get_config, mock_initial, mock_get_profile):
+    # TEST: Expected traffic also specified
+    mock_initial.return_value = False
+    cmd_cluster_create("profile", "region", "my-cluster", 1.0, None, None, None, None, False, False, None, None, None, None,
+                       right_size_days=14)
+    assert not mock_get_profile.called
+    assert not mock_get_config.called
+
+    # TEST: Cluster doesn't exist yet
+    mock_initial.return_value = True
+    cmd_cluster_create("profile", "region", "my-cluster", None, None, None, None, None, False, False, None, None, None, None,
+                       right_size_days=14)
+    assert not mock_get_profile.called
+    assert not mock_get_config.called
+
+    # TEST: No traffic observed
+    mock_initial.return_value = False
+    mock_get_profile.side_effect = NoTrafficObserved()
+    cmd_cluster_create("profile", "region", "my-cluster", None, None, None, None, None, False, False, None, None, None, None,
+                       right_size_days=14)
+    assert mock_get_profile.called
+    assert not mock_get_config.called
+
+@mock.patch("commands.cluster_create.cwi.get_metric_data")
+@mock.patch("commands.cluster_create.ec2")
+@mock.patch("commands.cluster_create.ssm_ops")
+def test_WHEN_get_observed_traffic_profile_called_THEN_as_expected(mock_ssm_ops, mock_ec2, mock_get_data):
+    # Set up our mock
+    mock_ssm_ops.get_ssm_param_json_value.return_value = "vpce-svc-1"
+    mock_ec2.get_gwlb_arns_of_endpoint_service.return_value = [
+        "arn:aws:elasticloadbalancing:region:XXXXXXXXXXXX:loadbalancer/gwy/gwlb-1/1234"
+    ]
+    mock_get_data.return_value = {TRAFFIC_QUERY_KEY: [37.5e9, 75e9]}
+    mock_provider = mock.Mock()
+
+    # Run our test
+    actual_value = _get_observed_traffic_profile("my-cluster", 1, mock_provider)
+
+    # Check our results
+    expected_get_data_calls = [
+        mock.call(
+            [get_observed_traffic_query("gwy/gwlb-1/1234")],
+            mock.ANY,
+            mock.ANY,
+            300,
+            mock_provider
+        )
+    ]
+    assert expected_get_data_calls == mock_get_data.call_args_list
+
+    assert 2 == actual_value.samples
+    assert 1.5 == actual_value.mean
+    assert 2.0 == actual_value.peak
+
+@mock.patch("commands.cluster_create.cwi.get_metric_data")
+@mock.patch("commands.cluster_create.ec2")
+@mock.patch("commands.cluster_create.ssm_ops")
+def test_WHEN_get_observed_traffic_profile_called_AND_no_gwlb_THEN_raises(mock_ssm_ops, mock_ec2, mock_get_data):
+    # Set up our mock
+    mock_ssm_ops.get_ssm_param_json_value.return_value = "vpce-svc-1"
+    mock_ec2.get_gwlb_arns_of_endpoint_service.return_value = []
+
+    # Run our test
+    with pytest.raises(NoTrafficObserved):
+        _get_observed_traffic_profile("my-cluster", 1, mock.Mock())
+
+    # Check our results
+    assert not mock_get_data.called
+
 @mock.patch("commands.cluster_create._confirm_usage")
 def test_WHEN_should_proceed_with_operation_AND_happy_path_THEN_as_expected(mock_confirm):
     # Set up our mock
@@ -341,7 +460,7 @@ def test_WHEN_should_proceed_with_operation_AND_happy_path_THEN_as_expected(mock
     assert True == actual_value
 
     expected_confirm_calls = [
-        mock.call(cluster_plan, cluster_plan, user_config, user_config, True)
+        mock.call(cluster_plan, cluster_plan, user_config, user_config, True, storage_calibration=None)
     ]
     assert expected_confirm_calls == mock_confirm.call_args_list
 
@@ -461,7 +580,7 @@ def test_WHEN_should_proceed_with_operation_AND_abort_usage_THEN_as_expected(moc
     assert False == actual_value
 
     expected_confirm_calls = [
-        mock.call(cluster_plan, cluster_plan, user_config, user_config, True)
+        mock.call(cluster_plan, cluster_plan, user_config, user_config, True, storage_calibration=None)
     ]
     assert expected_confirm_calls == mock_confirm.call_args_list
 
@@ -490,7 +609,7 @@ def test_WHEN_should_proceed_with_operation_AND_doesnt_fit_THEN_as_expected(mock
     assert False == actual_value
 
     expected_confirm_calls = [
-        mock.call(cluster_plan, cluster_plan, user_config, user_config, True)
+        mock.call(cluster_plan, cluster_plan, user_config, user_config, True, storage_calibration=None)
     ]
     assert expected_confirm_calls == mock_confirm.call_args_list
 
@@ -592,6 +711,55 @@ def test_WHEN_get_next_user_config_called_AND_partial_update_THEN_as_expected(mo
     ]
     assert expected_get_ssm_calls == mock_ssm_ops.get_ssm_param_json_value.call_args_list
 
+@mock.patch("commands.cluster_create.ssm_ops")
+def test_WHEN_get_next_user_config_called_AND_hot_days_THEN_as_expected(mock_ssm_ops):
+    # Set up our mock
+    mock_ssm_ops.ParamDoesNotExist = ssm_ops.ParamDoesNotExist
+
+    mock_ssm_ops.get_ssm_param_json_value.return_value = {
+        "expectedTraffic": 1.2,
+        "spiDays": 40,
+        "historyDays": 120,
+        "replicas": 2,
+        "pcapDays": 35,
+        "hotDays": 7,
+    }
+
+    mock_provider = mock.Mock()
+
+    # TEST 1: Stored value is kept
+    actual_value = _get_next_user_config("my-cluster", None, None, None, None, None, None, None, mock_provider)
+    assert UserConfig(1.2, 40, 120, 2, 35, hotDays=7) == actual_value
+
+    # TEST 2: Provided value replaces it
+    actual_value = _get_next_user_config("my-cluster", None, None, None, None, None, None, None, mock_provider, hot_days=14)
+    assert UserConfig(1.2, 40, 120, 2, 35, hotDays=14) == actual_value
+
+@mock.patch("commands.cluster_create.ssm_ops")
+def test_WHEN_get_next_user_config_called_AND_index_profile_THEN_as_expected(mock_ssm_ops):
+    # Set up our mock
+    mock_ssm_ops.ParamDoesNotExist = ssm_ops.ParamDoesNotExist
+
+    mock_ssm_ops.get_ssm_param_json_value.return_value = {
+        "expectedTraffic": 1.2,
+        "spiDays": 40,
+        "historyDays": 120,
+        "replicas": 2,
+        "pcapDays": 35,
+        "indexProfile": "ingest",
+    }
+
+    mock_provider = mock.Mock()
+
+    # TEST 1: Stored value is kept
+    actual_value = _get_next_user_config("my-cluster", None, None, None, None, None, None, None, mock_provider)
+    assert UserConfig(1.2, 40, 120, 2, 35, indexProfile="ingest") == actual_value
+
+    # TEST 2: Provided value replaces it
+    actual_value = _get_next_user_config("my-cluster", None, None, None, None, None, None, None, mock_provider,
+                                         index_profile="default")
+    assert UserConfig(1.2, 40, 120, 2, 35, indexProfile="default") == actual_value
+
 @mock.patch("commands.cluster_create.ssm_ops")
 def test_WHEN_get_next_user_config_called_AND_use_default_THEN_as_expected(mock_ssm_ops):
     # Set up our mock
@@ -789,7 +957,7 @@ def test_WHEN_get_next_capacity_plan_called_THEN_as_expected(mock_ssm_ops, mock_
     assert expected_get_cap_calls == mock_get_cap.call_args_list
 
     expected_get_os_calls = [
-        mock.call(1, 40, 2, len(azs))
+        mock.call(1, 40, 2, len(azs), None, storage_ratio=MAGIC_FACTOR)
     ]
     assert expected_get_os_calls == mock_get_os.call_args_list
 
@@ -804,6 +972,97 @@ def test_WHEN_get_next_capacity_plan_called_THEN_as_expected(mock_ssm_ops, mock_
     assert expected_get_viewer_vpc_calls == mock_get_viewer.call_args_list
 
 
+@mock.patch("commands.cluster_create.ssm_ops")
+def test_WHEN_get_storage_calibration_called_THEN_as_expected(mock_ssm_ops):
+    # Set up our mock
+    mock_ssm_ops.ParamDoesNotExist = ssm_ops.ParamDoesNotExist
+    calibration = StorageCalibration(0.05, 0.3, 7, 10**12, "2023-05-08T00:00:00+00:00")
+    mock_provider = mock.Mock()
+
+    # TEST: The Cluster has been calibrated
+    mock_ssm_ops.get_ssm_param_value.return_value = json.dumps(calibration.to_dict())
+
+    actual_value = _get_storage_calibration("cluster-name", mock_provider)
+
+    assert calibration == actual_value
+    expected_get_ssm_calls = [
+        mock.call(constants.get_storage_calibration_ssm_param_name("cluster-name"), mock_provider)
+    ]
+    assert expected_get_ssm_calls == mock_ssm_ops.get_ssm_param_value.call_args_list
+
+    # TEST: The Cluster hasn't been calibrated
+    mock_ssm_ops.get_ssm_param_value.side_effect = ssm_ops.ParamDoesNotExist("")
+
+    actual_value = _get_storage_calibration("cluster-name", mock_provider)
+
+    assert None == actual_value
+
+@mock.patch("commands.cluster_create.ec2")
+@mock.patch("commands.cluster_create.get_viewer_vpc_plan", mock.Mock())
+@mock.patch("commands.cluster_create.get_capture_vpc_plan")
+@mock.patch("commands.cluster_create.get_os_domain_plan")
+@mock.patch("commands.cluster_create.get_capture_node_capacity_plan")
+def test_WHEN_get_next_capacity_plan_called_AND_calibrated_THEN_uses_calibrated_ratio(mock_get_cap, mock_get_os, mock_get_capture,
+                                                                                     mock_ec2):
+    # Set up our mock
+    azs = ["az1", "az2"]
+    mock_ec2.get_azs_in_region.return_value = azs
+    mock_get_cap.return_value = CaptureNodesPlan("m5.xlarge", 1, 2, 1)
+    mock_get_capture.return_value = VpcPlan(Cidr("1.2.3.4/20"), azs, DEFAULT_CAPTURE_PUBLIC_MASK)
+    mock_get_os.return_value = OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "m6g.large.search"))
+
+    calibration = StorageCalibration(0.05, 0.3, 7, 10**12, "2023-05-08T00:00:00+00:00")
+
+    # Run our test
+    _get_next_capacity_plan(UserConfig(1, 40, 120, 2, 35), mock.Mock(), None, None, mock.Mock(),
+                            storage_calibration=calibration)
+
+    # Check our results
+    expected_get_os_calls = [
+        mock.call(1, 40, 2, len(azs), None, storage_ratio=0.05),
+        mock.call(1, 40, 2, len(azs), None, storage_ratio=MAGIC_FACTOR), # To report the calibration's effect
+    ]
+    assert expected_get_os_calls == mock_get_os.call_args_list
+
+@mock.patch("commands.cluster_create.datetime")
+@mock.patch("commands.cluster_create.ec2")
+@mock.patch("commands.cluster_create.get_viewer_vpc_plan", mock.Mock())
+@mock.patch("commands.cluster_create.get_capture_vpc_plan")
+@mock.patch("commands.cluster_create.get_os_domain_plan")
+@mock.patch("commands.cluster_create.get_capture_node_capacity_plan")
+def test_WHEN_get_next_capacity_plan_called_AND_rotation_changed_THEN_records_when(mock_get_cap, mock_get_os, mock_get_capture,
+                                                                                   mock_ec2, mock_datetime):
+    # Set up our mock
+    mock_get_cap.return_value = CaptureNodesPlan("m5.xlarge", 1, 2, 1)
+    now = datetime(2023, 5, 8, 13, 30, tzinfo=timezone.utc)
+    mock_datetime.now.return_value = now
+
+    azs = ["az1", "az2"]
+    mock_ec2.get_azs_in_region.return_value = azs
+    mock_get_capture.return_value = VpcPlan(Cidr("1.2.3.4/20"), azs, DEFAULT_CAPTURE_PUBLIC_MASK)
+
+    previous_cluster_plan = mock.Mock()
+    previous_cluster_plan.osDomain = OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "m6g.large.search"),
+                                                  1, sessionsRotation="weekly")
+
+    # TEST 1: The rotation changed, so the time it did is recorded
+    mock_get_os.return_value = OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "m6g.large.search"),
+                                            1, sessionsRotation="daily")
+
+    actual_value = _get_next_capacity_plan(UserConfig(1, 40, 120, 2, 35), previous_cluster_plan, None, None, mock.Mock())
+
+    assert now.isoformat() == actual_value.osDomain.sessionsRotationChangedAt
+
+    # TEST 2: The rotation is unchanged, so the previous change is carried forward
+    previous_cluster_plan.osDomain = actual_value.osDomain
+    mock_get_os.return_value = OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "m6g.large.search"),
+                                            1, sessionsRotation="daily")
+    mock_datetime.now.return_value = datetime(2023, 5, 9, tzinfo=timezone.utc)
+
+    actual_value = _get_next_capacity_plan(UserConfig(1, 40, 120, 2, 35), previous_cluster_plan, None, None, mock.Mock())
+
+    assert now.isoformat() == actual_value.osDomain.sessionsRotationChangedAt
+
 @mock.patch("commands.cluster_create.UsageReport")
 @mock.patch("commands.cluster_create.PriceReport")
 def test_WHEN_confirm_usage_called_THEN_as_expected(mock_price_report_cls, mock_report_cls):
@@ -840,6 +1099,17 @@ def test_WHEN_confirm_usage_called_THEN_as_expected(mock_price_report_cls, mock_
     assert False == actual_value
     assert mock_report.get_confirmation.called
 
+    # TEST: The Cluster's storage has been calibrated
+    mock_price_report_cls.reset_mock()
+    calibration = StorageCalibration(0.05, 0.3, 7, 10**12, "2023-05-08T00:00:00+00:00")
+
+    _confirm_usage(mock_plan_prev, mock_plan_next, mock_config_prev, mock_config_next, True, storage_calibration=calibration)
+
+    expected_price_report_calls = [
+        mock.call(mock_plan_next, mock_config_next, pcap_ratio=0.3)
+    ]
+    assert expected_price_report_calls == mock_price_report_cls.call_args_list
+
 @mock.patch("commands.cluster_create.upload_default_elb_cert")
 @mock.patch("commands.cluster_create.ssm_ops")
 def test_WHEN_set_up_viewer_cert_called_THEN_set_up_correctly(mock_ssm_ops, mock_upload):
@@ -915,7 +1185,7 @@ def test_WHEN_configure_ism_called_THEN_as_expected(mock_events, mock_ssm):
     mock_provider = mock.Mock()
 
     # Run our test
-    actual_value = _configure_ism("my-cluster", 365, 30, 1, mock_provider)
+    actual_value = _configure_ism("my-cluster", 365, 30, 1, 4, mock_provider)
 
     # Check our results
     expected_get_ssm_calls = [
@@ -929,7 +1199,7 @@ def test_WHEN_configure_ism_called_THEN_as_expected(mock_events, mock_ssm):
 
     expected_put_events_calls = [
         mock.call(
-            [ConfigureIsmEvent(365, 30, 1)],
+            [ConfigureIsmEvent(365, 30, 1, 4)],
             "arn",
             mock_provider
         )
@@ -1120,6 +1390,46 @@ def test_WHEN_set_up_arkime_config_called_AND_couldnt_make_bucket_THEN_as_expect
     expected_exit_calls = [mock.call(1)]
     assert expected_exit_calls == mock_exit.call_args_list
 
+@mock.patch("commands.cluster_create._upload_arkime_config_if_necessary", mock.Mock())
+@mock.patch("commands.cluster_create.s3.ensure_bucket_exists", mock.Mock())
+@mock.patch("commands.cluster_create.config_wrangling.render_viewer_tuning")
+@mock.patch("commands.cluster_create.config_wrangling.render_capture_tuning")
+@mock.patch("commands.cluster_create.config_wrangling.set_up_arkime_config_dir", mock.Mock())
+def test_WHEN_set_up_arkime_config_called_AND_plan_THEN_tunes_capture(mock_render, mock_render_viewer):
+    # Set up our mock
+    test_env = AwsEnvironment("XXXXXXXXXXX", "my-region-1", "profile")
+
+    mock_provider = mock.Mock()
+    mock_provider.get_aws_env.return_value = test_env
+
+    capacity_plan = mock.Mock()
+    capacity_plan.captureNodes = CaptureNodesPlan("c6i.xlarge", 2, 3, 2)
+    capacity_plan.osDomain.sessionsRotation = "hourly12"
+
+    # Run our test
+    _set_up_arkime_config("cluster-name", mock_provider, capacity_plan, UserConfig(2, 30, 365, 1, 30))
+
+    # Check our results
+    expected_render_calls = [
+        mock.call(
+            "cluster-name",
+            test_env,
+            constants.get_repo_root_dir(),
+            get_capture_tuning(CaptureNodesPlan("c6i.xlarge", 2, 3, 2), 2, "hourly12").to_config_settings()
+        )
+    ]
+    assert expected_render_calls == mock_render.call_args_list
+
+    expected_render_viewer_calls = [
+        mock.call(
+            "cluster-name",
+            test_env,
+            constants.get_repo_root_dir(),
+            {"rotateIndex": "hourly12", "queryAllIndices": "true"}
+        )
+    ]
+    assert expected_render_viewer_calls == mock_render_viewer.call_args_list
+
 @mock.patch("commands.cluster_create.ssm_ops.get_ssm_param_value")
 def test_WHEN_is_initial_invocation_called_THEN_as_expected(mock_get_ssm):
     # Set up our mock
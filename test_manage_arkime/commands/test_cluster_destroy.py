@@ -6,7 +6,7 @@ from aws_interactions.aws_environment import AwsEnvironment
 from aws_interactions.ssm_operations import ParamDoesNotExist
 import cdk_interactions.cdk_context as context
 from commands.cluster_destroy import (cmd_cluster_destroy, _destroy_viewer_cert, _delete_arkime_config_from_datastore, _get_stacks_to_destroy,
-                                      _get_cdk_context)
+                                      _get_cdk_context, _delete_storage_calibration)
 import core.constants as constants
 from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, OSDomainPlan, DataNodesPlan, MasterNodesPlan,
                                     ClusterPlan, VpcPlan, S3Plan, DEFAULT_S3_STORAGE_CLASS, DEFAULT_VPC_CIDR, DEFAULT_CAPTURE_PUBLIC_MASK,
@@ -21,6 +21,7 @@ TEST_CLUSTER = "my-cluster"
 @mock.patch("commands.cluster_destroy._get_cdk_context")
 @mock.patch("commands.cluster_destroy._get_stacks_to_destroy")
 @mock.patch("commands.cluster_destroy.AwsClientProvider")
+@mock.patch("commands.cluster_destroy._delete_storage_calibration", mock.Mock())
 @mock.patch("commands.cluster_destroy._delete_arkime_config_from_datastore")
 @mock.patch("commands.cluster_destroy._destroy_viewer_cert")
 @mock.patch("commands.cluster_destroy.get_ssm_names_by_path")
@@ -96,6 +97,7 @@ def test_WHEN_cmd_cluster_destroy_called_AND_dont_destroy_everything_THEN_expect
 @mock.patch("commands.cluster_destroy._get_cdk_context")
 @mock.patch("commands.cluster_destroy._get_stacks_to_destroy")
 @mock.patch("commands.cluster_destroy.AwsClientProvider")
+@mock.patch("commands.cluster_destroy._delete_storage_calibration", mock.Mock())
 @mock.patch("commands.cluster_destroy._delete_arkime_config_from_datastore")
 @mock.patch("commands.cluster_destroy._destroy_viewer_cert")
 @mock.patch("commands.cluster_destroy.get_ssm_names_by_path")
@@ -343,6 +345,30 @@ def test_WHEN_destroy_viewer_cert_called_AND_doesnt_exist_THEN_skip(mock_ssm_get
     expected_delete_ssm_calls = []
     assert expected_delete_ssm_calls == mock_ssm_delete.call_args_list
 
+@mock.patch("commands.cluster_destroy.delete_ssm_param")
+@mock.patch("commands.cluster_destroy.get_ssm_param_value")
+def test_WHEN_delete_storage_calibration_called_THEN_as_expected(mock_ssm_get, mock_ssm_delete):
+    # Set up our mock
+    mock_provider = mock.Mock()
+
+    # TEST: The Cluster was calibrated
+    mock_ssm_get.return_value = "{}"
+
+    _delete_storage_calibration(TEST_CLUSTER, mock_provider)
+
+    expected_delete_ssm_calls = [
+        mock.call(constants.get_storage_calibration_ssm_param_name(TEST_CLUSTER), mock_provider)
+    ]
+    assert expected_delete_ssm_calls == mock_ssm_delete.call_args_list
+
+    # TEST: The Cluster was never calibrated
+    mock_ssm_delete.reset_mock()
+    mock_ssm_get.side_effect = ParamDoesNotExist("")
+
+    _delete_storage_calibration(TEST_CLUSTER, mock_provider)
+
+    assert [] == mock_ssm_delete.call_args_list
+
 @mock.patch("commands.cluster_destroy.destroy_bucket")
 @mock.patch("commands.cluster_destroy.delete_ssm_param")
 def test_WHEN_delete_arkime_config_from_datastore_called_THEN_as_expected(mock_ssm_delete, mock_destroy_bucket):
@@ -0,0 +1,137 @@
+import json
+import unittest.mock as mock
+
+import requests
+
+from aws_interactions.ssm_operations import ParamDoesNotExist
+from commands.cluster_domain_sizing import cmd_cluster_domain_sizing
+from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, OSDomainPlan, DataNodesPlan,
+                                    MasterNodesPlan, ClusterPlan, VpcPlan, S3Plan, DEFAULT_VPC_CIDR, DEFAULT_CAPTURE_PUBLIC_MASK,
+                                    DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS)
+from core.domain_sizing import DomainObservation
+from core.user_config import UserConfig
+
+
+GIB = 1024 ** 3
+
+TEST_PLAN = ClusterPlan(
+    CaptureNodesPlan("m5.xlarge", 2, 3, 2),
+    VpcPlan(DEFAULT_VPC_CIDR, ["az1", "az2"], DEFAULT_CAPTURE_PUBLIC_MASK),
+    EcsSysResourcePlan(3584, 15360),
+    OSDomainPlan(DataNodesPlan(2, "t3.small.search", 100), MasterNodesPlan(3, "t3.small.search"), 1),
+    S3Plan(DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS),
+    ViewerNodesPlan(4, 2),
+    None
+)
+
+def _get_ssm_value(param_name: str, aws_provider):
+    return json.dumps({"capacityPlan": TEST_PLAN.to_dict(), "userConfig": UserConfig(0.1, 30, 365, 1, 30).to_dict()})
+
+@mock.patch("commands.cluster_domain_sizing.AwsClientProvider")
+@mock.patch("commands.cluster_domain_sizing.get_cluster_os_client")
+@mock.patch("commands.cluster_domain_sizing.observe_domain")
+@mock.patch("commands.cluster_domain_sizing.ssm_ops")
+def test_WHEN_cmd_cluster_domain_sizing_called_THEN_reports_recommendation(mock_ssm, mock_observe, mock_get_client,
+                                                                            mock_provider_cls):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    mock_provider = mock.Mock()
+    mock_provider_cls.return_value = mock_provider
+
+    mock_client = mock.Mock()
+    mock_client.cat_allocation.return_value = mock.Mock(succeeded=True, response_json=["allocation"])
+    mock_client.get_nodes_stats.return_value = mock.Mock(succeeded=True, response_json={"nodes": {}})
+    mock_client.get_cluster_settings.return_value = mock.Mock(succeeded=True, response_json={"defaults": {}})
+    mock_client.cat_indices.return_value = mock.Mock(succeeded=True, response_json=["indices"])
+    mock_get_client.return_value = mock_client
+
+    mock_observe.return_value = DomainObservation(2, 3, 120 * GIB, 200 * GIB, 90, 50, 30, 0, 8 * GIB)
+
+    # Run our test
+    actual_value = cmd_cluster_domain_sizing("profile", "region", "cluster-1", "localhost", True)
+
+    # Check our results
+    assert TEST_PLAN.osDomain == actual_value.current
+    assert DataNodesPlan(2, "t3.medium.search", 200) == actual_value.recommended.dataNodes
+    assert 30 == actual_value.retention_days
+
+    expected_get_client_calls = [
+        mock.call("cluster-1", mock_provider, "localhost")
+    ]
+    assert expected_get_client_calls == mock_get_client.call_args_list
+
+    expected_observe_calls = [
+        mock.call(
+            allocation=["allocation"],
+            nodes_stats={"nodes": {}},
+            cluster_settings={"defaults": {}},
+            sessions_indices=["indices"],
+            replicas=1,
+            today=mock.ANY,
+        )
+    ]
+    assert expected_observe_calls == mock_observe.call_args_list
+
+@mock.patch("commands.cluster_domain_sizing.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_domain_sizing.get_cluster_os_client")
+@mock.patch("commands.cluster_domain_sizing.observe_domain")
+@mock.patch("commands.cluster_domain_sizing.ssm_ops")
+def test_WHEN_cmd_cluster_domain_sizing_called_AND_query_fails_THEN_aborts(mock_ssm, mock_observe, mock_get_client):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+
+    # TEST 1: The Domain rejects a query
+    mock_get_client.return_value.cat_allocation.return_value = mock.Mock(succeeded=False, status_code=403)
+
+    actual_value = cmd_cluster_domain_sizing("profile", "region", "cluster-1", None, False)
+
+    assert None == actual_value
+    assert not mock_observe.called
+
+    # TEST 2: The Domain isn't reachable
+    mock_get_client.return_value.cat_allocation.side_effect = requests.exceptions.ConnectionError("boom")
+
+    actual_value = cmd_cluster_domain_sizing("profile", "region", "cluster-1", None, False)
+
+    assert None == actual_value
+    assert not mock_observe.called
+
+@mock.patch("commands.cluster_domain_sizing.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_domain_sizing.get_cluster_os_client")
+@mock.patch("commands.cluster_domain_sizing.observe_domain")
+@mock.patch("commands.cluster_domain_sizing.ssm_ops")
+def test_WHEN_cmd_cluster_domain_sizing_called_AND_weekly_rotation_THEN_aborts(mock_ssm, mock_observe, mock_get_client):
+    # Set up our mock
+    weekly_plan = ClusterPlan.from_dict(TEST_PLAN.to_dict())
+    weekly_plan.osDomain.sessionsRotation = "weekly"
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.return_value = json.dumps({
+        "capacityPlan": weekly_plan.to_dict(), "userConfig": UserConfig(0.1, 30, 365, 1, 30).to_dict()
+    })
+
+    # Run our test
+    actual_value = cmd_cluster_domain_sizing("profile", "region", "cluster-1", None, False)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_get_client.called
+    assert not mock_observe.called
+
+@mock.patch("commands.cluster_domain_sizing.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_domain_sizing.get_cluster_os_client")
+@mock.patch("commands.cluster_domain_sizing.ssm_ops")
+def test_WHEN_cmd_cluster_domain_sizing_called_AND_no_cluster_THEN_aborts(mock_ssm, mock_get_client):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    # Run our test
+    actual_value = cmd_cluster_domain_sizing("profile", "region", "cluster-1", None, False)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_get_client.called
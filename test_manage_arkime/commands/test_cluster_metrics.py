@@ -0,0 +1,78 @@
+import json
+import unittest.mock as mock
+
+from aws_interactions.aws_environment import AwsEnvironment
+from aws_interactions.ssm_operations import ParamDoesNotExist
+from commands.cluster_metrics import cmd_cluster_metrics
+from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, OSDomainPlan, DataNodesPlan,
+                                    MasterNodesPlan, ClusterPlan, VpcPlan, S3Plan, DEFAULT_VPC_CIDR, DEFAULT_NUM_AZS,
+                                    DEFAULT_CAPTURE_PUBLIC_MASK, DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS)
+import core.constants as constants
+
+
+TEST_PLAN = ClusterPlan(
+    CaptureNodesPlan("m5.xlarge", 2, 3, 2),
+    VpcPlan(DEFAULT_VPC_CIDR, DEFAULT_NUM_AZS, DEFAULT_CAPTURE_PUBLIC_MASK),
+    EcsSysResourcePlan(3584, 15360),
+    OSDomainPlan(DataNodesPlan(2, "r6g.large.search", 1024), MasterNodesPlan(3, "m6g.large.search")),
+    S3Plan(DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS),
+    ViewerNodesPlan(4, 2),
+    None
+)
+
+def _get_ssm_value(param_name: str, aws_provider):
+    if param_name == constants.get_cluster_ssm_param_name("cluster-1"):
+        return json.dumps({"osDomainName": "domain-1", "vpceServiceId": "vpce-svc-1", "capacityPlan": TEST_PLAN.to_dict()})
+    if param_name == constants.get_capture_details_ssm_param_name("cluster-1"):
+        return json.dumps({"ecsCluster": "ecs-cluster-1", "ecsService": "ecs-service-1"})
+    raise ParamDoesNotExist(param_name)
+
+@mock.patch("commands.cluster_metrics.AwsClientProvider")
+@mock.patch("commands.cluster_metrics.cwi.get_metric_data")
+@mock.patch("commands.cluster_metrics.ec2i")
+@mock.patch("commands.cluster_metrics.ssm_ops")
+def test_WHEN_cmd_cluster_metrics_called_THEN_reports_each_region(mock_ssm, mock_ec2i, mock_get_data, mock_aws_provider_cls):
+    # Set up our mock
+    mock_aws_provider_cls.side_effect = lambda aws_profile, aws_region: mock.Mock(
+        get_aws_env=mock.Mock(return_value=AwsEnvironment("XXXXXXXXXXXX", aws_region, aws_profile))
+    )
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = _get_ssm_value
+    mock_ssm.get_ssm_names_by_path.return_value = ["vpc-1", "vpc-2"]
+    mock_ec2i.get_gwlb_arns_of_endpoint_service.return_value = [
+        "arn:aws:elasticloadbalancing:region-1:XXXXXXXXXXXX:loadbalancer/gwy/gwlb-1/1234"
+    ]
+    mock_get_data.return_value = {"CaptureCPU/average": [50.0], "CaptureCPU/peak": [80.0]}
+
+    # Run our test
+    actual_value = cmd_cluster_metrics("profile", None, "cluster-1", 24, ["region-1", "region-2"], True)
+
+    # Check our results
+    assert ["region-1", "region-2"] == sorted([report["region"] for report in actual_value])
+
+    for call in mock_get_data.call_args_list:
+        queries = call.args[0]
+        assert 2 * (7 + 3 * 2) == len(queries)
+        traffic_query = next(query for query in queries if query.key == "CaptureTraffic/peak")
+        assert {"LoadBalancer": "gwy/gwlb-1/1234"} == traffic_query.dimensions
+
+    cpu = next(metric for metric in actual_value[0]["metrics"] if metric["name"] == "CaptureCPU")
+    assert 80.0 == cpu["peak"]
+    assert 0.8 == cpu["utilization"]
+
+@mock.patch("commands.cluster_metrics.AwsClientProvider", mock.Mock())
+@mock.patch("commands.cluster_metrics.cwi.get_metric_data")
+@mock.patch("commands.cluster_metrics.ec2i", mock.Mock())
+@mock.patch("commands.cluster_metrics.ssm_ops")
+def test_WHEN_cmd_cluster_metrics_called_AND_no_cluster_THEN_aborts(mock_ssm, mock_get_data):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    # Run our test
+    actual_value = cmd_cluster_metrics("profile", "region-1", "cluster-1", 24, [], False)
+
+    # Check our results
+    assert [] == actual_value
+    assert not mock_get_data.called
@@ -0,0 +1,72 @@
+import unittest.mock as mock
+
+from commands.clusters_health import cmd_clusters_health
+import core.constants as constants
+from opensearch_interactions.fleet_runner import FleetResult
+
+
+HEALTH = {"status": "green", "number_of_nodes": 5, "unassigned_shards": 0}
+
+@mock.patch("commands.clusters_health.AwsClientProvider")
+@mock.patch("commands.clusters_health.run_on_fleet")
+@mock.patch("commands.clusters_health.get_cluster_os_client")
+@mock.patch("commands.clusters_health.ssm_ops")
+def test_WHEN_cmd_clusters_health_called_THEN_checks_every_cluster(mock_ssm, mock_get_client, mock_run, mock_provider_cls):
+    # Set up our mock
+    mock_ssm.get_ssm_names_by_path.return_value = ["cluster-1", "cluster-2"]
+
+    mock_provider = mock.Mock()
+    mock_provider_cls.return_value = mock_provider
+
+    mock_run.return_value = [
+        FleetResult("cluster-1", True, HEALTH, None, 0.25, {}),
+        FleetResult("cluster-2", False, None, "unreachable", 5.0, {}),
+    ]
+
+    # Run our test
+    actual_value = cmd_clusters_health("profile", "region", [], 4, True)
+
+    # Check our results
+    assert [result.to_dict() for result in mock_run.return_value] == actual_value
+
+    expected_get_names_calls = [
+        mock.call(constants.SSM_CLUSTERS_PREFIX, mock_provider)
+    ]
+    assert expected_get_names_calls == mock_ssm.get_ssm_names_by_path.call_args_list
+
+    expected_run_calls = [
+        mock.call(["cluster-1", "cluster-2"], mock.ANY, mock.ANY, max_workers=4)
+    ]
+    assert expected_run_calls == mock_run.call_args_list
+
+    # The client and operation passed to the runner are the Domain's admin client and its health check
+    get_client = mock_run.call_args.args[1]
+    operation = mock_run.call_args.args[2]
+
+    get_client("cluster-1")
+    assert [mock.call("cluster-1", mock_provider)] == mock_get_client.call_args_list
+
+    mock_os_client = mock.Mock()
+    assert mock_os_client.get_cluster_health.return_value == operation(mock_os_client)
+
+@mock.patch("commands.clusters_health.AwsClientProvider", mock.Mock())
+@mock.patch("commands.clusters_health.run_on_fleet")
+@mock.patch("commands.clusters_health.ssm_ops")
+def test_WHEN_cmd_clusters_health_called_AND_names_THEN_checks_them(mock_ssm, mock_run):
+    # Set up our mock
+    mock_ssm.get_ssm_names_by_path.return_value = ["cluster-1", "cluster-2"]
+    mock_run.return_value = [FleetResult("cluster-2", True, HEALTH, None, 0.25, {})]
+
+    # TEST 1: Only the named Clusters are checked
+    cmd_clusters_health("profile", "region", ["cluster-2"], 4, False)
+
+    expected_run_calls = [
+        mock.call(["cluster-2"], mock.ANY, mock.ANY, max_workers=4)
+    ]
+    assert expected_run_calls == mock_run.call_args_list
+
+    # TEST 2: A Cluster that doesn't exist aborts
+    actual_value = cmd_clusters_health("profile", "region", ["cluster-3"], 4, False)
+
+    assert [] == actual_value
+    assert 1 == mock_run.call_count
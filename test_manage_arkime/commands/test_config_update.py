@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 import json
 import pytest
 import unittest.mock as mock
@@ -5,14 +6,21 @@ import unittest.mock as mock
 import arkime_interactions.config_wrangling as config_wrangling
 from aws_interactions.aws_environment import AwsEnvironment
 import aws_interactions.s3_interactions as s3
+import aws_interactions.ssm_operations as ssm_ops
 from commands.config_update import (cmd_config_update, _update_config_if_necessary, _revert_arkime_config, 
-                                    NoPreviousConfig, _bounce_ecs_service)
+                                    NoPreviousConfig, _bounce_ecs_service, _render_capture_tuning,
+                                    _render_viewer_tuning)
+import core.capacity_planning as cap
+from core.capture_tuning import get_capture_tuning
 from core.compatibility import CliClusterVersionMismatch
 import core.constants as constants
 import core.local_file as local_file
+from core.user_config import UserConfig
 from core.versioning import VersionInfo
 
 
+@mock.patch("commands.config_update._render_capture_tuning", mock.Mock())
+@mock.patch("commands.config_update._render_viewer_tuning", mock.Mock())
 @mock.patch("commands.cluster_register_vpc.compat.confirm_aws_aio_version_compatibility", mock.Mock())
 @mock.patch("commands.config_update._bounce_ecs_service")
 @mock.patch("commands.config_update.ssm_ops.get_ssm_param_value")
@@ -91,6 +99,8 @@ def test_WHEN_cmd_config_update_called_AND_happy_path_THEN_as_expected(mock_prov
     ]
     assert expected_bounce_calls == mock_bounce.call_args_list
 
+@mock.patch("commands.config_update._render_capture_tuning", mock.Mock())
+@mock.patch("commands.config_update._render_viewer_tuning", mock.Mock())
 @mock.patch("commands.cluster_register_vpc.compat.confirm_aws_aio_version_compatibility", mock.Mock())
 @mock.patch("commands.config_update._bounce_ecs_service")
 @mock.patch("commands.config_update.ssm_ops.get_ssm_param_value")
@@ -142,6 +152,8 @@ def test_WHEN_cmd_config_update_called_AND_shouldnt_bounce_THEN_as_expected(mock
     expected_bounce_calls = []
     assert expected_bounce_calls == mock_bounce.call_args_list
 
+@mock.patch("commands.config_update._render_capture_tuning", mock.Mock())
+@mock.patch("commands.config_update._render_viewer_tuning", mock.Mock())
 @mock.patch("commands.cluster_register_vpc.compat.confirm_aws_aio_version_compatibility", mock.Mock())
 @mock.patch("commands.config_update._bounce_ecs_service")
 @mock.patch("commands.config_update.ssm_ops.get_ssm_param_value")
@@ -714,3 +726,87 @@ def test_WHEN_bounce_ecs_service_called_AND_sigint_THEN_as_expected(mock_force_d
 
     expected_exit_calls = [mock.call(0)]
     assert expected_exit_calls == mock_exit.call_args_list
+
+@mock.patch("commands.config_update.config_wrangling.render_capture_tuning")
+@mock.patch("commands.config_update.ssm_ops.get_ssm_param_json_value")
+def test_WHEN_render_capture_tuning_called_THEN_uses_cluster_plan(mock_get_json, mock_render):
+    # Set up our mock
+    capture_plan = cap.CaptureNodesPlan("c6i.xlarge", 2, 3, 2)
+    capacity_plan = cap.ClusterPlan(
+        capture_plan,
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, ["az1", "az2"], cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(3584, 7168),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search")),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(4, 2),
+        None
+    )
+    mock_get_json.side_effect = [capacity_plan.to_dict(), UserConfig(2, 30, 365, 1, 30).to_dict()]
+
+    mock_provider = mock.Mock()
+    test_env = AwsEnvironment("XXXXXXXXXXX", "my-region-1", "profile")
+    mock_provider.get_aws_env.return_value = test_env
+
+    # Run our test
+    _render_capture_tuning("my-cluster", mock_provider)
+
+    # Check our results
+    expected_render_calls = [
+        mock.call("my-cluster", test_env, constants.get_repo_root_dir(), get_capture_tuning(capture_plan, 2).to_config_settings())
+    ]
+    assert expected_render_calls == mock_render.call_args_list
+
+@mock.patch("commands.config_update.config_wrangling.render_capture_tuning")
+@mock.patch("commands.config_update.ssm_ops.get_ssm_param_json_value")
+def test_WHEN_render_capture_tuning_called_AND_no_plan_THEN_skips(mock_get_json, mock_render):
+    # Set up our mock
+    mock_get_json.side_effect = ssm_ops.ParamDoesNotExist("param")
+
+    # Run our test
+    _render_capture_tuning("my-cluster", mock.Mock())
+
+    # Check our results
+    assert not mock_render.called
+
+@mock.patch("commands.config_update.config_wrangling.render_viewer_tuning")
+@mock.patch("commands.config_update.ssm_ops.get_ssm_param_json_value")
+def test_WHEN_render_viewer_tuning_called_THEN_uses_cluster_plan(mock_get_json, mock_render):
+    # Set up our mock
+    capacity_plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan("c6i.xlarge", 2, 3, 2),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, ["az1", "az2"], cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(3584, 7168),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search"), 1,
+                         sessionsRotation="weekly"),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(4, 2),
+        None
+    )
+    user_config = UserConfig(2, 30, 365, 1, 30)
+
+    mock_provider = mock.Mock()
+    test_env = AwsEnvironment("XXXXXXXXXXX", "my-region-1", "profile")
+    mock_provider.get_aws_env.return_value = test_env
+
+    # TEST 1: The plan's rotation is used
+    mock_get_json.side_effect = [capacity_plan.to_dict(), user_config.to_dict()]
+
+    _render_viewer_tuning("my-cluster", mock_provider)
+
+    expected_render_calls = [
+        mock.call("my-cluster", test_env, constants.get_repo_root_dir(), {"rotateIndex": "weekly", "queryAllIndices": "true"})
+    ]
+    assert expected_render_calls == mock_render.call_args_list
+
+    # TEST 2: A Cluster that just went back to daily rotation still searches the old rotation's indices
+    mock_render.reset_mock()
+    capacity_plan.osDomain.sessionsRotation = "daily"
+    capacity_plan.osDomain.sessionsRotationChangedAt = datetime.now(timezone.utc).isoformat()
+    mock_get_json.side_effect = [capacity_plan.to_dict(), user_config.to_dict()]
+
+    _render_viewer_tuning("my-cluster", mock_provider)
+
+    expected_render_calls = [
+        mock.call("my-cluster", test_env, constants.get_repo_root_dir(), {"rotateIndex": "daily", "queryAllIndices": "true"})
+    ]
+    assert expected_render_calls == mock_render.call_args_list
@@ -0,0 +1,49 @@
+import unittest.mock as mock
+
+from commands.plan_sweep import cmd_plan_sweep
+from core.capacity_sweep import NumpyNotInstalled
+
+
+@mock.patch("commands.plan_sweep.sweep_capacity_plans")
+def test_WHEN_cmd_plan_sweep_called_THEN_as_expected(mock_sweep):
+    # Set up our mock
+    mock_result = mock.Mock()
+    mock_result.size = 4
+    mock_sweep.return_value = mock_result
+
+    # Run our test
+    actual_value = cmd_plan_sweep("1,2", "30", "0:1:1", "30", "2", "traffic", 10, "/path/sweep.csv", False)
+
+    # Check our results
+    assert mock_result == actual_value
+
+    sweep_args = mock_sweep.call_args.args
+    assert [1.0, 2.0] == sweep_args[0].tolist()
+    assert [30.0] == sweep_args[1].tolist()
+    assert [0.0, 1.0] == sweep_args[2].tolist()
+
+    assert [mock.call(10)] == mock_result.get_table.call_args_list
+    assert [mock.call("traffic")] == mock_result.get_curve_report.call_args_list
+    assert [mock.call("/path/sweep.csv")] == mock_result.to_csv.call_args_list
+
+@mock.patch("commands.plan_sweep.sweep_capacity_plans")
+def test_WHEN_cmd_plan_sweep_called_AND_invalid_values_THEN_aborts(mock_sweep):
+    # Run our test
+    actual_value = cmd_plan_sweep("lots", "30", "1", "30", "2", "traffic", 10, None, False)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_sweep.called
+
+@mock.patch("commands.plan_sweep.confirm_numpy_installed")
+@mock.patch("commands.plan_sweep.sweep_capacity_plans")
+def test_WHEN_cmd_plan_sweep_called_AND_no_numpy_THEN_aborts(mock_sweep, mock_confirm):
+    # Set up our mock
+    mock_confirm.side_effect = NumpyNotInstalled()
+
+    # Run our test
+    actual_value = cmd_plan_sweep("1", "30", "1", "30", "2", "traffic", 10, None, False)
+
+    # Check our results
+    assert None == actual_value
+    assert not mock_sweep.called
@@ -9,6 +9,7 @@ import aws_interactions.events_interactions as events
 from aws_interactions.ssm_operations import ParamDoesNotExist
 import core.compatibility as compat
 import core.constants as constants
+from core.mirror_profile import MirrorProfile
 import core.vni_provider as vnis
 
 
@@ -90,7 +91,8 @@ def test_WHEN_cmd_vpc_add_called_AND_no_user_vni_THEN_sets_up_mirroring(mock_cdk
                     "idVpceService": "service-1",
                     "listSubnetIds": subnet_ids,
                     "listSubnetSsmParams": [constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", subnet_id) for subnet_id in subnet_ids],
-                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"]
+                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"],
+                    "mirrorProfile": MirrorProfile().to_dict()
                 }))
             }
         )
@@ -173,7 +175,8 @@ def test_WHEN_cmd_vpc_add_called_AND_just_print_cfn_THEN_expected(mock_cdk_clien
                     "idVpceService": "service-1",
                     "listSubnetIds": subnet_ids,
                     "listSubnetSsmParams": [constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", subnet_id) for subnet_id in subnet_ids],
-                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"]
+                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"],
+                    "mirrorProfile": MirrorProfile().to_dict()
                 }))
             }
         )
@@ -291,7 +294,8 @@ def test_WHEN_cmd_vpc_add_called_AND_is_available_user_vni_THEN_sets_up_mirrorin
                     "idVpceService": "service-1",
                     "listSubnetIds": subnet_ids,
                     "listSubnetSsmParams": [constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", subnet_id) for subnet_id in subnet_ids],
-                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"]
+                    "vpcCidrs": ["192.168.0.0/24", "192.168.128.0/24"],
+                    "mirrorProfile": MirrorProfile().to_dict()
                 }))
             }
         )
@@ -527,6 +531,101 @@ def test_WHEN_cmd_vpc_add_called_AND_vpc_doesnt_exist_THEN_skips(mock_cdk_client
     assert expected_vni_calls == mock_vni_provider.register_user_vni.call_args_list
     assert expected_vni_calls == mock_vni_provider.use_next_vni.call_args_list
 
+@mock.patch("commands.vpc_add.AwsClientProvider")
+@mock.patch("commands.vpc_add.CdkClient")
+def test_WHEN_cmd_vpc_add_called_AND_invalid_profile_THEN_aborts(mock_cdk_client_cls, mock_aws_provider_cls, tmp_path):
+    # Set up our mock
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps({"packetLength": -1}))
+
+    # Run our test
+    cmd_vpc_add("profile", "region", "cluster-1", "vpc-1", 1234, False, str(profile_path))
+
+    # Check our results
+    assert not mock_aws_provider_cls.called
+    assert not mock_cdk_client_cls.called
+
+@mock.patch("commands.vpc_add.compat.confirm_aws_aio_version_compatibility", mock.Mock())
+@mock.patch("commands.vpc_add.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_add.SsmVniProvider")
+@mock.patch("commands.vpc_add._mirror_enis_in_subnet")
+@mock.patch("commands.vpc_add.ssm_ops")
+@mock.patch("commands.vpc_add.ec2i")
+@mock.patch("commands.vpc_add.CdkClient")
+def test_WHEN_cmd_vpc_add_called_AND_profile_needs_too_many_rules_THEN_aborts(mock_cdk_client_cls, mock_ec2i, mock_ssm, mock_mirror,
+                                                                              mock_vni_provider_cls, tmp_path):
+    # Set up our mock
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps({
+        "excludeRules": [{"protocol": "tcp", "fromPort": port} for port in [22, 80, 443, 8080]]
+    }))
+
+    mock_vni_provider = mock.Mock()
+    mock_vni_provider.is_vni_available.return_value = True
+    mock_vni_provider_cls.return_value = mock_vni_provider
+
+    mock_ec2i.get_subnets_of_vpc.return_value = ["subnet-1"]
+    mock_ec2i.get_vpc_details.return_value = ec2i.VpcDetails("vpc-1", "1234", ["10.0.0.0/16", "10.2.0.0/16"], "default")
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = [
+        ParamDoesNotExist(""), # Cross-account link check
+        ""  # Cluster existence check
+    ]
+
+    mock_cdk = mock.Mock()
+    mock_cdk_client_cls.return_value = mock_cdk
+
+    # Run our test
+    cmd_vpc_add("profile", "region", "cluster-1", "vpc-1", 1234, False, str(profile_path))
+
+    # Check our results
+    expected_cdk_calls = []
+    assert expected_cdk_calls == mock_cdk.deploy.call_args_list
+
+    expected_mirror_calls = []
+    assert expected_mirror_calls == mock_mirror.call_args_list
+
+@mock.patch("commands.vpc_add.compat.confirm_aws_aio_version_compatibility", mock.Mock())
+@mock.patch("commands.vpc_add.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_add.SsmVniProvider")
+@mock.patch("commands.vpc_add._mirror_enis_in_subnet")
+@mock.patch("commands.vpc_add.ssm_ops")
+@mock.patch("commands.vpc_add.ec2i")
+@mock.patch("commands.vpc_add.CdkClient")
+def test_WHEN_cmd_vpc_add_called_AND_too_many_cidrs_THEN_aborts(mock_cdk_client_cls, mock_ec2i, mock_ssm, mock_mirror, mock_vni_provider_cls):
+    # Set up our mock
+    mock_vni_provider = mock.Mock()
+    mock_vni_provider.is_vni_available.return_value = True
+    mock_vni_provider_cls.return_value = mock_vni_provider
+
+    mock_ec2i.get_subnets_of_vpc.return_value = ["subnet-1"]
+    mock_ec2i.get_vpc_details.return_value = ec2i.VpcDetails(
+        "vpc-1", "1234", [f"10.{i * 2}.0.0/16" for i in range(10)], "default"
+    )
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = [
+        ParamDoesNotExist(""), # Cross-account link check
+        ""  # Cluster existence check
+    ]
+
+    mock_cdk = mock.Mock()
+    mock_cdk_client_cls.return_value = mock_cdk
+
+    # Run our test
+    cmd_vpc_add("profile", "region", "cluster-1", "vpc-1", 1234, False)
+
+    # Check our results
+    expected_cdk_calls = []
+    assert expected_cdk_calls == mock_cdk.deploy.call_args_list
+
+    expected_mirror_calls = []
+    assert expected_mirror_calls == mock_mirror.call_args_list
+
+    expected_vni_calls = []
+    assert expected_vni_calls == mock_vni_provider.register_user_vni.call_args_list
+
 @mock.patch("commands.vpc_add.compat.confirm_aws_aio_version_compatibility", mock.Mock())
 @mock.patch("commands.vpc_add.AwsClientProvider")
 @mock.patch("commands.vpc_add.SsmVniProvider")
@@ -0,0 +1,92 @@
+import json
+import unittest.mock as mock
+
+from commands.vpc_dedupe_sessions import cmd_vpc_dedupe_sessions
+import aws_interactions.ec2_interactions as ec2i
+from aws_interactions.ssm_operations import ParamDoesNotExist
+import core.constants as constants
+
+
+@mock.patch("commands.vpc_dedupe_sessions.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_dedupe_sessions.ssm_ops")
+@mock.patch("commands.vpc_dedupe_sessions.ec2i")
+def test_WHEN_cmd_vpc_dedupe_sessions_called_AND_delete_THEN_removes_extras(mock_ec2i, mock_ssm):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_json_value.return_value = "filter-1"
+    mock_ssm.get_ssm_params_by_path.return_value = [
+        {
+            "Name": f"{constants.get_subnet_ssm_param_name('cluster-1', 'vpc-1', 'subnet-1')}",
+            "Value": json.dumps({"subnetId": "subnet-1"})
+        },
+        {
+            "Name": f"{constants.get_eni_ssm_param_name('cluster-1', 'vpc-1', 'subnet-1', 'eni-1')}",
+            "Value": json.dumps({"eniId": "eni-1", "trafficSessionId": "session-3"})
+        },
+    ]
+
+    mock_ec2i.MirrorDoesntExist = ec2i.MirrorDoesntExist
+    mock_ec2i.get_duplicate_mirror_sessions.return_value = {
+        "eni-1": [
+            ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 1234),
+            ec2i.MirrorSession("session-3", "eni-1", "target-1", "filter-1", 1234),
+        ],
+        "eni-2": [
+            ec2i.MirrorSession("session-4", "eni-2", "target-1", "filter-1", 1234),
+            ec2i.MirrorSession("session-2", "eni-2", "target-1", "filter-1", 1234),
+        ],
+    }
+
+    # Run our test
+    result = cmd_vpc_dedupe_sessions("profile", "region", "cluster-1", "vpc-1", True)
+
+    # Check our results
+    expected_result = {
+        "eni-1": ["session-1"], # Keeps the one recorded in SSM
+        "eni-2": ["session-4"], # Nothing recorded, so keeps the first
+    }
+    assert expected_result == result
+
+    expected_delete_calls = [
+        mock.call("session-1", mock.ANY),
+        mock.call("session-4", mock.ANY),
+    ]
+    assert expected_delete_calls == mock_ec2i.delete_eni_mirroring.call_args_list
+
+@mock.patch("commands.vpc_dedupe_sessions.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_dedupe_sessions.ssm_ops")
+@mock.patch("commands.vpc_dedupe_sessions.ec2i")
+def test_WHEN_cmd_vpc_dedupe_sessions_called_AND_no_delete_THEN_only_reports(mock_ec2i, mock_ssm):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_json_value.return_value = "filter-1"
+    mock_ssm.get_ssm_params_by_path.return_value = []
+
+    mock_ec2i.get_duplicate_mirror_sessions.return_value = {
+        "eni-1": [
+            ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 1234),
+            ec2i.MirrorSession("session-3", "eni-1", "target-1", "filter-1", 1234),
+        ],
+    }
+
+    # Run our test
+    result = cmd_vpc_dedupe_sessions("profile", "region", "cluster-1", "vpc-1", False)
+
+    # Check our results
+    assert {"eni-1": ["session-3"]} == result
+    assert [] == mock_ec2i.delete_eni_mirroring.call_args_list
+
+@mock.patch("commands.vpc_dedupe_sessions.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_dedupe_sessions.ssm_ops")
+@mock.patch("commands.vpc_dedupe_sessions.ec2i")
+def test_WHEN_cmd_vpc_dedupe_sessions_called_AND_vpc_not_added_THEN_aborts(mock_ec2i, mock_ssm):
+    # Set up our mock
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_json_value.side_effect = ParamDoesNotExist("")
+
+    # Run our test
+    result = cmd_vpc_dedupe_sessions("profile", "region", "cluster-1", "vpc-1", True)
+
+    # Check our results
+    assert {} == result
+    assert [] == mock_ec2i.get_duplicate_mirror_sessions.call_args_list
@@ -0,0 +1,50 @@
+import unittest.mock as mock
+
+import aws_interactions.cloudwatch_interactions as cwi
+from commands.vpc_mirror_latency import cmd_vpc_mirror_latency
+import core.constants as constants
+
+
+@mock.patch("commands.vpc_mirror_latency.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_mirror_latency.cwi.get_metric_percentiles")
+def test_WHEN_cmd_vpc_mirror_latency_called_THEN_gets_each_stage(mock_get_percentiles):
+    # Set up our mock
+    mock_get_percentiles.side_effect = [
+        {"SampleCount": 10.0, "p50": 400.0, "p99": 900.0},
+        {"SampleCount": 10.0, "p50": 3000.0, "p99": 21000.0},
+        {"SampleCount": 10.0, "p50": 1200.0, "p99": 2500.0},
+        {"SampleCount": 10.0, "p50": 4700.0, "p99": 24000.0},
+    ]
+
+    # Run our test
+    actual_value = cmd_vpc_mirror_latency("profile", "region", "cluster-1", "vpc-1", 6)
+
+    # Check our results
+    expected_dimensions = {
+        "ClusterName": "cluster-1",
+        "VpcId": "vpc-1",
+        "EventType": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+    }
+    expected_get_calls = [
+        mock.call(cwi.CW_ARKIME_EVENT_NAMESPACE, metric_name, expected_dimensions, mock.ANY, mock.ANY, ["p50", "p99"], mock.ANY)
+        for metric_name in cwi.LATENCY_METRICS
+    ]
+    assert expected_get_calls == mock_get_percentiles.call_args_list
+
+    start_time, end_time = mock_get_percentiles.call_args_list[0].args[3:5]
+    assert 6 * 3600 == (end_time - start_time).total_seconds()
+
+    assert {"SampleCount": 10.0, "p50": 4700.0, "p99": 24000.0} == actual_value[cwi.LATENCY_METRIC_END_TO_END]
+
+@mock.patch("commands.vpc_mirror_latency.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_mirror_latency.cwi.get_metric_percentiles")
+def test_WHEN_cmd_vpc_mirror_latency_called_AND_no_data_THEN_returns_empty(mock_get_percentiles):
+    # Set up our mock
+    mock_get_percentiles.return_value = {}
+
+    # Run our test
+    actual_value = cmd_vpc_mirror_latency("profile", "region", "cluster-1", "vpc-1", 24)
+
+    # Check our results
+    expected_value = {metric_name: {} for metric_name in cwi.LATENCY_METRICS}
+    assert expected_value == actual_value
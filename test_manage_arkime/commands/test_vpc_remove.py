@@ -8,7 +8,14 @@ import aws_interactions.events_interactions as events
 from aws_interactions.ssm_operations import ParamDoesNotExist
 import core.compatibility as compat
 import core.constants as constants
+from core.mirror_profile import MirrorProfile
 
+TEST_VPC_PARAMS = [
+    {"Name": constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", "subnet-1"), "Value": json.dumps({"subnetId": "subnet-1"})},
+    {"Name": constants.get_eni_ssm_param_name("cluster-1", "vpc-1", "subnet-1", "eni-1"), "Value": json.dumps({"eniId": "eni-1"})},
+    {"Name": constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", "subnet-2"), "Value": json.dumps({"subnetId": "subnet-2"})},
+    {"Name": constants.get_eni_ssm_param_name("cluster-1", "vpc-1", "subnet-2", "eni-2"), "Value": json.dumps({"eniId": "eni-2"})},
+]
 
 @mock.patch("commands.vpc_remove.compat.confirm_aws_aio_version_compatibility", mock.Mock())
 @mock.patch("commands.vpc_remove.AwsClientProvider")
@@ -16,9 +23,12 @@ import core.constants as constants
 @mock.patch("commands.vpc_remove.ssm_ops")
 @mock.patch("commands.vpc_remove.events")
 @mock.patch("commands.vpc_remove.CdkClient")
-def test_WHEN_cmd_vpc_remove_called_THEN_removes_mirroring(mock_cdk_client_cls, mock_events, mock_ssm,
+@mock.patch("commands.vpc_remove.MetricsBuffer")
+def test_WHEN_cmd_vpc_remove_called_THEN_removes_mirroring(mock_metrics_buffer_cls, mock_cdk_client_cls, mock_events, mock_ssm,
                                                            mock_vni_provider_cls, mock_aws_provider_cls):
     # Set up our mock
+    mock_metrics_buffer = mock_metrics_buffer_cls.return_value.__enter__.return_value
+
     mock_vni_provider = mock.Mock()
     mock_vni_provider_cls.return_value = mock_vni_provider
 
@@ -28,15 +38,12 @@ def test_WHEN_cmd_vpc_remove_called_THEN_removes_mirroring(mock_cdk_client_cls,
     mock_aws_provider_cls.return_value = mock_aws_provider
 
     mock_events.DestroyEniMirrorEvent = events.DestroyEniMirrorEvent
+    mock_events.put_events_in_batches.return_value = 0
 
     mock_ssm.ParamDoesNotExist = ParamDoesNotExist
     mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
     mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", 1337]
-    mock_ssm.get_ssm_params_by_path.return_value = [
-        {"Name": "param-1", "Value": json.dumps({"subnetId": "subnet-1"})},
-        {"Name": "param-2", "Value": json.dumps({"subnetId": "subnet-2"})},
-    ]
-    mock_ssm.get_ssm_names_by_path.side_effect = [["eni-1"], ["eni-2"]]
+    mock_ssm.get_ssm_params_by_path.return_value = TEST_VPC_PARAMS
 
     mock_cdk = mock.Mock()
     mock_cdk_client_cls.return_value = mock_cdk
@@ -61,7 +68,8 @@ def test_WHEN_cmd_vpc_remove_called_THEN_removes_mirroring(mock_cdk_client_cls,
                     "idVpceService": "service-1",
                     "listSubnetIds": ["subnet-1", "subnet-2"],
                     "listSubnetSsmParams": [constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", subnet_id) for subnet_id in ["subnet-1", "subnet-2"]],
-                    "vpcCidrs": ["0.0.0.0/0"]
+                    "vpcCidrs": ["0.0.0.0/0"],
+                    "mirrorProfile": MirrorProfile().to_dict()
                 }))
             }
         )
@@ -74,10 +82,23 @@ def test_WHEN_cmd_vpc_remove_called_THEN_removes_mirroring(mock_cdk_client_cls,
     assert expected_cdk_client_create_calls == mock_cdk_client_cls.call_args_list
 
     expected_put_event_calls = [
-        mock.call([events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1")], "bus-1", mock.ANY),
-        mock.call([events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-2", "eni-2")], "bus-1", mock.ANY),
+        mock.call(
+            [
+                events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1"),
+                events.DestroyEniMirrorEvent("cluster-1", "vpc-1", "subnet-2", "eni-2"),
+            ],
+            "bus-1",
+            mock.ANY,
+            metrics_buffer=mock_metrics_buffer
+        ),
     ]
-    assert expected_put_event_calls == mock_events.put_events.call_args_list
+    assert expected_put_event_calls == mock_events.put_events_in_batches.call_args_list
+
+    expected_metrics_buffer_calls = [
+        mock.call(mock.ANY, dimensions={"ClusterName": "cluster-1", "VpcId": "vpc-1", "EventType": "VpcRemove"}),
+    ]
+    assert expected_metrics_buffer_calls == mock_metrics_buffer_cls.call_args_list
+    assert mock_metrics_buffer_cls.return_value.__exit__.called
 
     expected_vni_calls = [mock.call(1337, "vpc-1")]
     assert expected_vni_calls == mock_vni_provider.relinquish_vni.call_args_list
@@ -110,7 +131,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_cluster_doesnt_exist_THEN_aborts(mock_cd
     assert expected_cdk_calls == mock_cdk.destroy.call_args_list
 
     expected_put_event_calls = []
-    assert expected_put_event_calls == mock_events.put_events.call_args_list
+    assert expected_put_event_calls == mock_events.put_events_in_batches.call_args_list
 
     expected_vni_calls = []
     assert expected_vni_calls == mock_vni_provider.relinquish_vni.call_args_list
@@ -143,7 +164,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_cli_version_THEN_aborts(mock_cdk_client_
     assert expected_cdk_calls == mock_cdk.destroy.call_args_list
 
     expected_put_event_calls = []
-    assert expected_put_event_calls == mock_events.put_events.call_args_list
+    assert expected_put_event_calls == mock_events.put_events_in_batches.call_args_list
 
     expected_vni_calls = []
     assert expected_vni_calls == mock_vni_provider.relinquish_vni.call_args_list
@@ -167,6 +188,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_cross_account_THEN_uses_correct_clients(
     mock_aws_provider_cls.side_effect = [mock_vpc_aws_provider, mock_cluster_aws_provider]
 
     mock_events.DestroyEniMirrorEvent = events.DestroyEniMirrorEvent
+    mock_events.put_events_in_batches.return_value = 0
 
     mock_ssm.ParamDoesNotExist = ParamDoesNotExist
     mock_ssm.get_ssm_param_value.return_value = json.dumps({
@@ -178,11 +200,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_cross_account_THEN_uses_correct_clients(
             "vpceServiceId": "vpce_id",
     })
     mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", 1337]
-    mock_ssm.get_ssm_params_by_path.return_value = [
-        {"Name": "param-1", "Value": json.dumps({"subnetId": "subnet-1"})},
-        {"Name": "param-2", "Value": json.dumps({"subnetId": "subnet-2"})},
-    ]
-    mock_ssm.get_ssm_names_by_path.side_effect = [["eni-1"], ["eni-2"]]
+    mock_ssm.get_ssm_params_by_path.return_value = TEST_VPC_PARAMS
 
     mock_cdk = mock.Mock()
     mock_cdk_client_cls.return_value = mock_cdk
@@ -209,21 +227,14 @@ def test_WHEN_cmd_vpc_remove_called_AND_cross_account_THEN_uses_correct_clients(
     assert expected_ssm_get_param_json_calls == mock_ssm.get_ssm_param_json_value.call_args_list
 
     expected_get_ssm_params_by_path_calls = [
-        mock.call(mock.ANY, mock_vpc_aws_provider), # Get Subnet IDs from VPC Path
+        mock.call(mock.ANY, mock_vpc_aws_provider, recursive=True), # Get Subnets and ENIs from VPC Path
     ]
     assert expected_get_ssm_params_by_path_calls == mock_ssm.get_ssm_params_by_path.call_args_list
 
-    expected_get_ssm_names_by_path_calls = [
-        mock.call(mock.ANY, mock_vpc_aws_provider), # Get ENIs from Subnet Path
-        mock.call(mock.ANY, mock_vpc_aws_provider), # Get ENIs from Subnet Path
-    ]
-    assert expected_get_ssm_names_by_path_calls == mock_ssm.get_ssm_names_by_path.call_args_list
-
     expected_put_event_calls = [
-        mock.call(mock.ANY, mock.ANY, mock_vpc_aws_provider),
-        mock.call(mock.ANY, mock.ANY, mock_vpc_aws_provider),
+        mock.call(mock.ANY, mock.ANY, mock_vpc_aws_provider, metrics_buffer=mock.ANY),
     ]
-    assert expected_put_event_calls == mock_events.put_events.call_args_list
+    assert expected_put_event_calls == mock_events.put_events_in_batches.call_args_list
 
     expected_vni_provider_create_calls = [
         mock.call("cluster-1", mock_cluster_aws_provider)
@@ -247,6 +258,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_wrong_account_THEN_aborts(mock_cdk_clien
     mock_aws_provider_cls.return_value = mock_aws_provider
 
     mock_events.DestroyEniMirrorEvent = events.DestroyEniMirrorEvent
+    mock_events.put_events_in_batches.return_value = 0
 
     mock_ssm.ParamDoesNotExist = ParamDoesNotExist
     mock_ssm.get_ssm_param_value.return_value = json.dumps({
@@ -258,11 +270,7 @@ def test_WHEN_cmd_vpc_remove_called_AND_wrong_account_THEN_aborts(mock_cdk_clien
             "vpceServiceId": "vpce_id",
     })
     mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", 1337]
-    mock_ssm.get_ssm_params_by_path.return_value = [
-        {"Name": "param-1", "Value": json.dumps({"subnetId": "subnet-1"})},
-        {"Name": "param-2", "Value": json.dumps({"subnetId": "subnet-2"})},
-    ]
-    mock_ssm.get_ssm_names_by_path.side_effect = [["eni-1"], ["eni-2"]]
+    mock_ssm.get_ssm_params_by_path.return_value = TEST_VPC_PARAMS
 
     mock_cdk = mock.Mock()
     mock_cdk_client_cls.return_value = mock_cdk
@@ -280,7 +288,110 @@ def test_WHEN_cmd_vpc_remove_called_AND_wrong_account_THEN_aborts(mock_cdk_clien
     assert expected_cdk_client_create_calls == mock_cdk_client_cls.call_args_list
 
     expected_put_event_calls = []
-    assert expected_put_event_calls == mock_events.put_events.call_args_list
+    assert expected_put_event_calls == mock_events.put_events_in_batches.call_args_list
 
     expected_vni_calls = []
-    assert expected_vni_calls == mock_vni_provider.relinquish_vni.call_args_list
\ No newline at end of file
+    assert expected_vni_calls == mock_vni_provider.relinquish_vni.call_args_list
+@mock.patch("commands.vpc_remove.compat.confirm_aws_aio_version_compatibility", mock.Mock())
+@mock.patch("commands.vpc_remove.AwsClientProvider")
+@mock.patch("commands.vpc_remove.SsmVniProvider")
+@mock.patch("commands.vpc_remove.ssm_ops")
+@mock.patch("commands.vpc_remove.events")
+@mock.patch("commands.vpc_remove.CdkClient")
+def test_WHEN_cmd_vpc_remove_called_AND_events_fail_THEN_aborts(mock_cdk_client_cls, mock_events, mock_ssm,
+                                                                mock_vni_provider_cls, mock_aws_provider_cls):
+    # Set up our mock
+    mock_vni_provider = mock.Mock()
+    mock_vni_provider_cls.return_value = mock_vni_provider
+
+    mock_events.put_events_in_batches.return_value = 1
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", 1337]
+    mock_ssm.get_ssm_params_by_path.return_value = TEST_VPC_PARAMS
+
+    mock_cdk = mock.Mock()
+    mock_cdk_client_cls.return_value = mock_cdk
+
+    # Run our test
+    cmd_vpc_remove("profile", "region", "cluster-1", "vpc-1")
+
+    # Check our results
+    assert [] == mock_cdk.destroy.call_args_list
+    assert [] == mock_vni_provider.relinquish_vni.call_args_list
+
+@mock.patch("commands.vpc_remove.compat.confirm_aws_aio_version_compatibility", mock.Mock())
+@mock.patch("commands.vpc_remove.time")
+@mock.patch("commands.vpc_remove.ec2i")
+@mock.patch("commands.vpc_remove.AwsClientProvider")
+@mock.patch("commands.vpc_remove.SsmVniProvider")
+@mock.patch("commands.vpc_remove.ssm_ops")
+@mock.patch("commands.vpc_remove.events")
+@mock.patch("commands.vpc_remove.CdkClient")
+def test_WHEN_cmd_vpc_remove_called_AND_wait_THEN_waits_for_teardown(mock_cdk_client_cls, mock_events, mock_ssm,
+                                                                     mock_vni_provider_cls, mock_aws_provider_cls,
+                                                                     mock_ec2i, mock_time):
+    # Set up our mock
+    mock_vni_provider = mock.Mock()
+    mock_vni_provider_cls.return_value = mock_vni_provider
+
+    mock_events.put_events_in_batches.return_value = 0
+    mock_time.time.return_value = 0
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", "filter-1", 1337]
+    mock_ssm.get_ssm_params_by_path.side_effect = [
+        TEST_VPC_PARAMS, # Initial listing
+        TEST_VPC_PARAMS[0:2], # One ENI torn down
+        [TEST_VPC_PARAMS[0], TEST_VPC_PARAMS[2]], # Both ENIs torn down
+        [TEST_VPC_PARAMS[0], TEST_VPC_PARAMS[2]],
+    ]
+    mock_ec2i.get_mirror_sessions_of_filter.side_effect = [["session-1"], ["session-1"], []]
+
+    mock_cdk = mock.Mock()
+    mock_cdk_client_cls.return_value = mock_cdk
+
+    # Run our test
+    cmd_vpc_remove("profile", "region", "cluster-1", "vpc-1", wait=True)
+
+    # Check our results
+    assert 2 == mock_time.sleep.call_count
+    assert [mock.call("filter-1", mock.ANY)] * 3 == mock_ec2i.get_mirror_sessions_of_filter.call_args_list
+    assert 1 == mock_cdk.destroy.call_count
+    assert [mock.call(1337, "vpc-1")] == mock_vni_provider.relinquish_vni.call_args_list
+
+@mock.patch("commands.vpc_remove.compat.confirm_aws_aio_version_compatibility", mock.Mock())
+@mock.patch("commands.vpc_remove.time")
+@mock.patch("commands.vpc_remove.ec2i")
+@mock.patch("commands.vpc_remove.AwsClientProvider")
+@mock.patch("commands.vpc_remove.SsmVniProvider")
+@mock.patch("commands.vpc_remove.ssm_ops")
+@mock.patch("commands.vpc_remove.events")
+@mock.patch("commands.vpc_remove.CdkClient")
+def test_WHEN_cmd_vpc_remove_called_AND_wait_times_out_THEN_aborts(mock_cdk_client_cls, mock_events, mock_ssm,
+                                                                   mock_vni_provider_cls, mock_aws_provider_cls,
+                                                                   mock_ec2i, mock_time):
+    # Set up our mock
+    mock_vni_provider = mock.Mock()
+    mock_vni_provider_cls.return_value = mock_vni_provider
+
+    mock_events.put_events_in_batches.return_value = 0
+    mock_time.time.side_effect = [0, 0, 10000]
+
+    mock_ssm.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ssm.get_ssm_param_json_value.side_effect = ["service-1", "bus-1", "filter-1", 1337]
+    mock_ssm.get_ssm_params_by_path.return_value = TEST_VPC_PARAMS
+    mock_ec2i.get_mirror_sessions_of_filter.return_value = ["session-1"]
+
+    mock_cdk = mock.Mock()
+    mock_cdk_client_cls.return_value = mock_cdk
+
+    # Run our test
+    cmd_vpc_remove("profile", "region", "cluster-1", "vpc-1", wait=True)
+
+    # Check our results
+    assert [] == mock_cdk.destroy.call_args_list
+    assert [] == mock_vni_provider.relinquish_vni.call_args_list
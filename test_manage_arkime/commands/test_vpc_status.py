@@ -0,0 +1,61 @@
+import unittest.mock as mock
+
+from commands.vpc_status import cmd_vpc_status
+from aws_interactions.ssm_operations import ParamDoesNotExist
+
+
+@mock.patch("commands.vpc_status.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_status.time")
+@mock.patch("commands.vpc_status.refresh_vpc")
+@mock.patch("commands.vpc_status.MirrorInventory")
+def test_WHEN_cmd_vpc_status_called_AND_inventory_fresh_THEN_no_refresh(mock_inventory_cls, mock_refresh, mock_time):
+    # Set up our mock
+    mock_inventory = mock.Mock()
+    mock_inventory.get_refreshed_at.return_value = 1000
+    mock_inventory_cls.return_value = mock_inventory
+    mock_time.time.return_value = 1100
+
+    # Run our test
+    actual_value = cmd_vpc_status("profile", "region", "cluster-1", "vpc-1", False, 300)
+
+    # Check our results
+    assert [] == mock_refresh.call_args_list
+    assert mock_inventory.get_vpc_status.return_value == actual_value
+    assert [mock.call("vpc-1")] == mock_inventory.get_vpc_status.call_args_list
+    assert 1 == mock_inventory.close.call_count
+
+@mock.patch("commands.vpc_status.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_status.time")
+@mock.patch("commands.vpc_status.refresh_vpc")
+@mock.patch("commands.vpc_status.MirrorInventory")
+def test_WHEN_cmd_vpc_status_called_AND_inventory_stale_THEN_refreshes(mock_inventory_cls, mock_refresh, mock_time):
+    # Set up our mock
+    mock_inventory = mock.Mock()
+    mock_inventory.get_refreshed_at.return_value = 1000
+    mock_inventory_cls.return_value = mock_inventory
+    mock_time.time.return_value = 2000
+
+    # Run our test
+    cmd_vpc_status("profile", "region", "cluster-1", "vpc-1", False, 300)
+
+    # Check our results
+    assert [mock.call(mock_inventory, "cluster-1", "vpc-1", mock.ANY)] == mock_refresh.call_args_list
+    assert [mock.call("vpc-1")] == mock_inventory.get_vpc_status.call_args_list
+
+@mock.patch("commands.vpc_status.AwsClientProvider", mock.Mock())
+@mock.patch("commands.vpc_status.refresh_vpc")
+@mock.patch("commands.vpc_status.MirrorInventory")
+def test_WHEN_cmd_vpc_status_called_AND_vpc_not_added_THEN_aborts(mock_inventory_cls, mock_refresh):
+    # Set up our mock
+    mock_inventory = mock.Mock()
+    mock_inventory.get_refreshed_at.return_value = None
+    mock_inventory_cls.return_value = mock_inventory
+    mock_refresh.side_effect = ParamDoesNotExist("param")
+
+    # Run our test
+    actual_value = cmd_vpc_status("profile", "region", "cluster-1", "vpc-1", True, 300)
+
+    # Check our results
+    assert None == actual_value
+    assert [] == mock_inventory.get_vpc_status.call_args_list
+    assert 1 == mock_inventory.close.call_count
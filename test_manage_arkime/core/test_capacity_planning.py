@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 import pytest
 
 import core.capacity_planning as cap
@@ -28,14 +29,14 @@ def test_WHEN_get_capture_node_capacity_plan_called_THEN_as_expected():
     # TEST 3: Mid-range expected traffic number
 
     actual_value = cap.get_capture_node_capacity_plan(20, azs)
-    expected_value = cap.CaptureNodesPlan(cap.M5_XLARGE.instanceType, 10, 13, 2)
+    expected_value = cap.CaptureNodesPlan(cap.C5N_2XLARGE.instanceType, 5, 7, 2)
 
     assert expected_value == actual_value
 
     # TEST 4: Max expected traffic number
 
     actual_value = cap.get_capture_node_capacity_plan(cap.MAX_TRAFFIC, azs)
-    expected_value = cap.CaptureNodesPlan(cap.M5_XLARGE.instanceType, 50, 63, 2)
+    expected_value = cap.CaptureNodesPlan(cap.C5N_2XLARGE.instanceType, 25, 32, 2)
 
     assert expected_value == actual_value
 
@@ -45,6 +46,59 @@ def test_WHEN_get_capture_node_capacity_plan_called_THEN_as_expected():
         cap.get_capture_node_capacity_plan(cap.MAX_TRAFFIC + 10, azs)
 
 
+def test_WHEN_choose_capture_instance_called_THEN_cheapest_feasible():
+    # TEST 1: Small nodes are cheapest for light traffic
+    actual_value = cap.choose_capture_instance(0.5)
+    assert cap.T3_MEDIUM == actual_value.instance
+    assert 4 == actual_value.desiredCount
+    assert 4 * 0.0416 * cap.HOURS_PER_MONTH == pytest.approx(actual_value.monthlyCost)
+
+    # TEST 2: Past what the small nodes can handle, we pick the cheapest x86 option
+    actual_value = cap.choose_capture_instance(1)
+    assert cap.C6I_XLARGE == actual_value.instance
+    assert 2 == actual_value.desiredCount
+
+    # TEST 3: Once there's enough traffic, the network-optimized instances win on bandwidth
+    actual_value = cap.choose_capture_instance(5)
+    assert cap.C5N_2XLARGE == actual_value.instance
+    assert 2 == actual_value.desiredCount
+
+    assert actual_value.explanation[0].startswith("Chose 2 c5n.2xlarge Capture Node(s)")
+    assert "t3.medium: rejected; only suited to clusters of up to 0.5 Gbps" in actual_value.explanation
+    assert "c6gn.xlarge: rejected; the Capture Node image and AMI are x86_64 only" in actual_value.explanation
+    assert "m5.xlarge: 8 node(s) at 0.625 Gbps each for $1,121.28/mo" in actual_value.explanation
+
+def test_WHEN_capture_instance_created_THEN_traffic_capped_by_bandwidth():
+    # TEST 1: The baseline bandwidth has to carry the traffic and the PCAP uploads
+    assert 0.625 == cap.M5_XLARGE.trafficPer
+    assert 0.781 == cap.C6I_XLARGE.trafficPer
+
+    # TEST 2: Instances with bandwidth to spare are limited by their vCPUs
+    assert 4.0 == cap.C5N_2XLARGE.trafficPer
+    assert 8.0 == cap.C6IN_4XLARGE.trafficPer
+
+def test_WHEN_choose_capture_instance_called_AND_custom_catalog_THEN_respects_constraints(monkeypatch):
+    # Set up our mock
+    cheap_but_starved = cap.CaptureInstance("cheap.network", 4.0, cap.MAX_TRAFFIC, 2, 7680, 15360, 5, 0.15)
+    cheap_but_forgetful = cap.CaptureInstance("cheap.memory", 4.0, cap.MAX_TRAFFIC, 2, 7680, 1024, 25, 0.01)
+    fewer_nodes = cap.CaptureInstance("big", 4.0, cap.MAX_TRAFFIC, 2, 7680, 15360, 25, 0.2)
+    more_nodes = cap.CaptureInstance("small", 2.0, cap.MAX_TRAFFIC, 2, 3584, 7168, 25, 0.1)
+    monkeypatch.setattr(cap, "CAPTURE_INSTANCES", [cheap_but_starved, cheap_but_forgetful, more_nodes, fewer_nodes])
+
+    # Run our test
+    actual_value = cap.choose_capture_instance(8)
+
+    # Check our results
+    assert fewer_nodes == actual_value.instance
+    assert 2 == actual_value.desiredCount
+    assert "cheap.network: 4 node(s) at 2.5 Gbps each" in actual_value.explanation[1]
+    assert "ECS memory" in actual_value.explanation[2]
+
+def test_CONFIRM_all_capture_instance_types_are_complete():
+    for instance in cap.CAPTURE_INSTANCES:
+        assert instance.networkBandwidth
+        assert instance.hourlyPrice
+
 def test_WHEN_get_ecs_sys_resource_plan_called_THEN_as_expected():
     # TEST 1: Get an m5.xlarge instance
     actual_value = cap.get_ecs_sys_resource_plan(cap.M5_XLARGE.instanceType)
@@ -176,10 +230,158 @@ def test_WHEN_get_os_domain_plan_called_THEN_as_expected():
     actual_value = cap.get_os_domain_plan(20, 30, 1, 2)
     expected_value = cap.OSDomainPlan(
         cap.DataNodesPlan(64, R6G_4XLARGE_SEARCH.type, R6G_4XLARGE_SEARCH.volSize),
-        cap.MasterNodesPlan(3, "r6g.2xlarge.search")
+        cap.MasterNodesPlan(3, "r6g.2xlarge.search"),
+        128,
+        sessionsRotation="hourly12"
+    )
+    assert expected_value == actual_value
+
+def test_WHEN_get_os_domain_plan_called_AND_warm_tier_THEN_as_expected():
+    # TEST 1: Only the hot days are on the data nodes, which can't be burstable; the rest go to UltraWarm
+    actual_value = cap.get_os_domain_plan(1, 30, 1, 2, hot_days=7)
+    expected_value = cap.OSDomainPlan(
+        cap.DataNodesPlan(6, "r6g.large.search", 1024),
+        cap.MasterNodesPlan(3, "m6g.large.search"),
+        12,
+        cap.WarmNodesPlan(5, "ultrawarm1.medium.search", 7452),
+        "daily"
     )
     assert expected_value == actual_value
 
+    # TEST 2: Tiny warm tier still gets the minimum UltraWarm node count
+    actual_value = cap.get_os_domain_plan(0.01, 30, 1, 2, hot_days=7)
+    assert cap.DataNodesPlan(2, "r6g.large.search", 1024) == actual_value.dataNodes
+    assert cap.WarmNodesPlan(cap.MIN_WARM_NODES, "ultrawarm1.medium.search", 75) == actual_value.warmNodes
+    assert "daily" == actual_value.sessionsRotation # Weekly indices would stay hot for their whole week
+
+    # TEST 3: Hot days covering the whole retention period means there's no warm tier
+    actual_value = cap.get_os_domain_plan(1, 30, 1, 2, hot_days=30)
+    assert cap.get_os_domain_plan(1, 30, 1, 2) == actual_value
+    assert None == actual_value.warmNodes
+
+def test_WHEN_get_os_domain_plan_called_AND_calibrated_THEN_as_expected():
+    # TEST 1: The default ratio is the MAGIC_FACTOR
+    assert cap.get_os_domain_plan(20, 30, 1, 2) == cap.get_os_domain_plan(20, 30, 1, 2, storage_ratio=cap.MAGIC_FACTOR)
+
+    # TEST 2: A Cluster that uses a third of the storage we'd guessed needs a third of the data nodes
+    actual_value = cap.get_os_domain_plan(20, 30, 1, 2, storage_ratio=cap.MAGIC_FACTOR / 3)
+    assert cap.DataNodesPlan(22, R6G_4XLARGE_SEARCH.type, R6G_4XLARGE_SEARCH.volSize) == actual_value.dataNodes
+    assert 44 == actual_value.sessionsShards
+
+def test_WHEN_get_warm_node_plan_called_THEN_as_expected():
+    # TEST 1: Fits on the medium instances
+    assert cap.WarmNodesPlan(3, "ultrawarm1.medium.search", 4000) == cap._get_warm_node_plan(4000)
+
+    # TEST 2: Too much for the medium instances
+    assert cap.WarmNodesPlan(2, "ultrawarm1.large.search", 20000) == cap._get_warm_node_plan(20000)
+
+def test_WHEN_os_domain_plan_to_from_dict_called_AND_warm_tier_THEN_round_trips():
+    plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(6, "r6g.large.search", 1024),
+        cap.MasterNodesPlan(3, "m6g.large.search"),
+        12,
+        cap.WarmNodesPlan(5, "ultrawarm1.medium.search", 7452)
+    )
+
+    actual_value = cap.OSDomainPlan.from_dict(plan.to_dict())
+
+    assert plan == actual_value
+    assert {"count": 5, "instanceType": "ultrawarm1.medium.search", "storage": 7452} == plan.to_dict()["warmNodes"]
+
+def test_WHEN_get_sessions_shard_count_called_THEN_as_expected():
+    # TEST 1: Small daily indices get the fewest shards that divide evenly across the data nodes
+    assert 1 == cap.get_sessions_shard_count(0.01, 2)
+    assert 1 == cap.get_sessions_shard_count(0.1, 6) # ~32 GiB/day
+
+    # TEST 2: Fewer shards needed than data nodes; use the next count that divides evenly
+    assert 6 == cap.get_sessions_shard_count(0.5, 6) # ~162 GiB/day needs 4 shards
+    assert 4 == cap.get_sessions_shard_count(0.5, 8)
+
+    # TEST 3: More shards needed than data nodes; use the next multiple of the node count
+    assert 192 == cap.get_sessions_shard_count(20, 64) # 6480 GiB/day needs 130 shards
+    assert 130 == cap.get_sessions_shard_count(20, 130)
+
+    # TEST 4: Capped at the OpenSearch per-index limit
+    assert cap.MAX_SHARDS_PER_INDEX == cap.get_sessions_shard_count(cap.MAX_TRAFFIC * 10, 80)
+
+    # TEST 5: Indices rotated more or less often than daily hold that much more or less data
+    assert 32 == cap.get_sessions_shard_count(20, 64, rotation="hourly4") # 1080 GiB/index needs 22 shards
+    assert 1 == cap.get_sessions_shard_count(0.01, 2, rotation="weekly")
+
+def test_WHEN_get_sessions_rotation_called_THEN_as_expected():
+    # TEST 1: Most Clusters rotate daily
+    assert "daily" == cap.get_sessions_rotation(1, 6, allow_weekly=True) # ~324 GiB/day
+    assert "daily" == cap.get_sessions_rotation(20, 130, allow_weekly=True) # ~6480 GiB/day fits 260 shards
+
+    # TEST 2: A day's data needs more than a couple of shards per data node; rotate as rarely as will fit
+    assert "hourly12" == cap.get_sessions_rotation(20, 64, allow_weekly=True)
+    assert "hourly6" == cap.get_sessions_rotation(20, 20, allow_weekly=True)
+    assert "hourly" == cap.get_sessions_rotation(cap.MAX_TRAFFIC * 10, 2, allow_weekly=True)
+
+    # TEST 3: A week's data fits in one shard, if weekly indices are allowed
+    assert "weekly" == cap.get_sessions_rotation(0.01, 2, allow_weekly=True)
+    assert "daily" == cap.get_sessions_rotation(0.01, 2, allow_weekly=False)
+
+def test_WHEN_get_os_domain_plan_called_AND_low_traffic_THEN_rotates_weekly():
+    # TEST 1: Long retention
+    actual_value = cap.get_os_domain_plan(0.01, 30, 1, 2)
+    assert "weekly" == actual_value.sessionsRotation
+    assert 1 == actual_value.sessionsShards
+
+    # TEST 2: Too short a retention to delete a week at a time
+    actual_value = cap.get_os_domain_plan(0.01, cap.MIN_WEEKLY_SPI_DAYS - 1, 1, 2)
+    assert "daily" == actual_value.sessionsRotation
+
+def test_WHEN_os_domain_plan_to_from_dict_called_AND_rotation_THEN_round_trips():
+    plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(64, R6G_4XLARGE_SEARCH.type, R6G_4XLARGE_SEARCH.volSize),
+        cap.MasterNodesPlan(3, "r6g.2xlarge.search"),
+        128,
+        sessionsRotation="hourly12",
+        sessionsRotationChangedAt="2023-05-08T00:00:00+00:00"
+    )
+
+    actual_value = cap.OSDomainPlan.from_dict(plan.to_dict())
+
+    assert plan == actual_value
+    assert "hourly12" == plan.to_dict()["sessionsRotation"]
+    assert "2023-05-08T00:00:00+00:00" == plan.to_dict()["sessionsRotationChangedAt"]
+
+def test_WHEN_get_sessions_rotation_changed_at_called_THEN_as_expected():
+    now = datetime(2023, 5, 8, tzinfo=timezone.utc)
+    data_nodes = cap.DataNodesPlan(2, "t3.small.search", 100)
+    master_nodes = cap.MasterNodesPlan(3, "m6g.large.search")
+
+    # TEST 1: A new Domain has no earlier rotation
+    prev_plan = cap.OSDomainPlan(cap.DataNodesPlan(None, None, None), cap.MasterNodesPlan(None, None))
+    assert None == cap.get_sessions_rotation_changed_at(prev_plan, "weekly", now)
+
+    # TEST 2: Plans without a rotation rotated daily
+    prev_plan = cap.OSDomainPlan(data_nodes, master_nodes, 1)
+    assert None == cap.get_sessions_rotation_changed_at(prev_plan, "daily", now)
+    assert now.isoformat() == cap.get_sessions_rotation_changed_at(prev_plan, "hourly12", now)
+
+    # TEST 3: The last change is carried forward until the rotation changes again
+    prev_plan = cap.OSDomainPlan(data_nodes, master_nodes, 1, sessionsRotation="daily",
+                                 sessionsRotationChangedAt="2023-04-01T00:00:00+00:00")
+    assert "2023-04-01T00:00:00+00:00" == cap.get_sessions_rotation_changed_at(prev_plan, "daily", now)
+    assert now.isoformat() == cap.get_sessions_rotation_changed_at(prev_plan, "weekly", now)
+
+def test_WHEN_os_domain_plan_from_dict_called_AND_no_shards_THEN_as_expected():
+    # Plans stored before shard planning was added don't have a shard count
+    input = {
+        "dataNodes": {"count": 2, "instanceType": "t3.small.search", "volumeSize": 100},
+        "masterNodes": {"count": 3, "instanceType": "m6g.large.search"},
+    }
+
+    actual_value = cap.OSDomainPlan.from_dict(input)
+
+    expected_value = cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search"))
+    assert expected_value == actual_value
+    assert None == actual_value.sessionsShards
+    assert None == actual_value.sessionsRotation
+    assert None == actual_value.warmNodes
+
 def test_WHEN_cidr_created_THEN_as_expected():
     # Test: Valid CIDR
     cap.Cidr("1.2.3.4/19")
@@ -303,3 +505,15 @@ def test_WHEN_will_capture_plan_fit_called_THEN_as_expected():
     actual_value = test_plan.will_capture_plan_fit()
 
     assert True == actual_value
+
+def test_WHEN_get_os_domain_plan_for_storage_called_THEN_as_expected():
+    # TEST 1: Matches the traffic-based plan when given the same storage
+    expected_traffic = 20
+    total_storage = cap._get_total_storage(expected_traffic, 30, 1)
+    daily_index_size = cap._get_storage_per_replica(expected_traffic, 1)
+    actual_value = cap.get_os_domain_plan_for_storage(total_storage, 1, 2, daily_index_size)
+    assert cap.get_os_domain_plan(expected_traffic, 30, 1, 2) == actual_value
+
+    # TEST 2: Burstable data nodes can be ruled out
+    actual_value = cap.get_os_domain_plan_for_storage(50, 1, 2, 1, allow_burstable=False)
+    assert cap.DataNodesPlan(2, "r6g.large.search", 1024) == actual_value.dataNodes
@@ -0,0 +1,149 @@
+import time
+
+import numpy as np
+import pytest
+
+import core.capacity_planning as cap
+from core.capacity_sweep import InvalidSweepValues, parse_sweep_values, sweep_capacity_plans
+from core.price_report import PriceReport
+from core.user_config import UserConfig
+
+
+def test_WHEN_parse_sweep_values_called_THEN_as_expected():
+    # Run our test + check our results
+    assert [1.0] == parse_sweep_values("1").tolist()
+    assert [0.5, 1.0, 2.0] == parse_sweep_values("2, 0.5,1").tolist()
+    assert [0.5, 1.0, 1.5, 2.0, 10.0] == parse_sweep_values("0.5:2:0.5,10").tolist()
+    assert [0.1, 0.2, 0.3] == pytest.approx(parse_sweep_values("0.1:0.3:0.1").tolist())
+    assert [0.5, 2.0] == parse_sweep_values(".5,2.").tolist()
+
+def test_WHEN_parse_sweep_values_called_AND_invalid_THEN_raises():
+    # Run our test + check our results
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values("one")
+
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values("1:2")
+
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values("1:2:0")
+
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values("1.2.3")
+
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values(".")
+
+    with pytest.raises(InvalidSweepValues):
+        parse_sweep_values("0:1.2.3:1")
+
+def test_CONFIRM_sweep_matches_the_planners_and_price_report():
+    # Set up our mock
+    traffic = np.array([0.001, 0.01, 0.3, 0.5, 0.75, 3, 17.5, 60, 100])
+    spi_days = np.array([1, 30, 365])
+    replicas = np.array([0, 1, 2])
+    pcap_days = np.array([1, 30, 400])
+    num_azs = np.array([2, 3])
+
+    # Run our test
+    sweep = sweep_capacity_plans(traffic, spi_days, replicas, pcap_days, num_azs)
+
+    # Check our results
+    assert traffic.size * spi_days.size * replicas.size * pcap_days.size * num_azs.size == sweep.size
+    for row in range(sweep.size):
+        point_traffic = float(sweep.columns["traffic"][row])
+        point_spi_days = int(sweep.columns["spiDays"][row])
+        point_replicas = int(sweep.columns["replicas"][row])
+        point_pcap_days = int(sweep.columns["pcapDays"][row])
+        point_azs = int(sweep.columns["numAzs"][row])
+
+        capture_plan = cap.get_capture_node_capacity_plan(point_traffic, ["az"] * point_azs)
+        os_plan = cap.get_os_domain_plan(point_traffic, point_spi_days, point_replicas, point_azs)
+        plan = cap.ClusterPlan(
+            capture_plan,
+            cap.VpcPlan(cap.DEFAULT_VPC_CIDR, ["az"] * point_azs, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+            cap.get_ecs_sys_resource_plan(capture_plan.instanceType),
+            os_plan,
+            cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, point_pcap_days),
+            cap.get_viewer_node_capacity_plan(point_traffic),
+            None
+        )
+        price_report = PriceReport(plan, UserConfig(point_traffic, point_spi_days, 365, point_replicas, point_pcap_days))
+        price_report.get_report()
+
+        assert capture_plan.instanceType == cap.CAPTURE_INSTANCES[sweep.columns["captureInstance"][row]].instanceType
+        assert capture_plan.desiredCount == sweep.columns["captureNodes"][row]
+        assert os_plan.dataNodes.instanceType == cap.DATA_INSTANCES[sweep.columns["dataInstance"][row]].type
+        assert os_plan.dataNodes.count == sweep.columns["dataNodes"][row]
+        assert os_plan.masterNodes.instanceType == cap.MASTER_INSTANCES[sweep.columns["masterInstance"][row]].instanceType
+        assert price_report._total == pytest.approx(sweep.columns["monthlyCost"][row])
+
+def test_WHEN_sweep_capacity_plans_called_AND_too_much_traffic_THEN_skips_it():
+    # Run our test
+    sweep = sweep_capacity_plans(np.array([1, cap.MAX_TRAFFIC + 1]), np.array([30]), np.array([1]), np.array([30]),
+                                 np.array([2]))
+
+    # Check our results
+    assert [1.0] == sweep.columns["traffic"].tolist()
+
+def test_WHEN_sweep_capacity_plans_called_AND_large_grid_THEN_fast():
+    # Set up our mock
+    traffic = parse_sweep_values("0.5:100:0.5") # 200
+    spi_days = parse_sweep_values("1:100:1") # 100
+    replicas = parse_sweep_values("0,1") # 2
+    pcap_days = parse_sweep_values("30,60,90") # 3
+
+    # Run our test
+    start_time = time.time()
+    sweep = sweep_capacity_plans(traffic, spi_days, replicas, pcap_days, np.array([2]))
+    sweep.get_curve("traffic")
+    elapsed = time.time() - start_time
+
+    # Check our results
+    assert 120000 == sweep.size
+    assert elapsed < 1
+
+def test_WHEN_get_curve_called_THEN_as_expected():
+    # Set up our mock
+    sweep = sweep_capacity_plans(np.array([0.5, 20]), np.array([7, 30]), np.array([1]), np.array([30]), np.array([2]))
+
+    # Run our test
+    actual_value = sweep.get_curve("traffic")
+
+    # Check our results
+    assert [0.5, 20.0] == [point["traffic"] for point in actual_value]
+    assert actual_value[0]["minCost"] < actual_value[0]["maxCost"]
+    assert actual_value[0]["maxCost"] < actual_value[1]["minCost"]
+    assert 4 == actual_value[0]["maxCaptureNodes"]
+    assert 5 == actual_value[1]["maxCaptureNodes"]
+
+    report = sweep.get_curve_report("traffic")
+    assert "Max Capture Nodes" in report
+    assert 3 == len(report.splitlines())
+
+def test_WHEN_get_table_called_THEN_as_expected():
+    # Set up our mock
+    sweep = sweep_capacity_plans(np.array([0.5, 20]), np.array([7, 30]), np.array([1]), np.array([30]), np.array([2]))
+
+    # Run our test
+    actual_value = sweep.get_table(max_rows=3)
+
+    # Check our results
+    lines = actual_value.splitlines()
+    assert 5 == len(lines)
+    assert "4 x t3.medium" in lines[1]
+    assert "... and 1 more" in lines[4]
+
+def test_WHEN_to_csv_called_THEN_as_expected(tmp_path):
+    # Set up our mock
+    sweep = sweep_capacity_plans(np.array([0.5, 20]), np.array([30]), np.array([1]), np.array([30]), np.array([2]))
+    csv_path = str(tmp_path / "sweep.csv")
+
+    # Run our test
+    sweep.to_csv(csv_path)
+
+    # Check our results
+    with open(csv_path) as csv_file:
+        lines = csv_file.read().splitlines()
+    assert lines[0].startswith("traffic,spiDays,replicas,pcapDays,numAzs,")
+    assert 3 == len(lines)
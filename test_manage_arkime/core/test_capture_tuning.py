@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+import pytest
+
+import core.capacity_planning as cap
+from core.capture_tuning import CaptureTuning, get_capture_tuning, get_viewer_tuning_settings, MAX_PCAP_FILE_TIME_M
+
+
+def test_WHEN_get_capture_tuning_called_THEN_as_expected():
+    # TEST 1: Small, quiet Cluster rolls its PCAP files less often
+    actual_value = get_capture_tuning(cap.CaptureNodesPlan("t3.medium", 1, 2, 1), 0.01)
+    expected_value = CaptureTuning(
+        packetThreads=1,
+        tpacketv3NumThreads=1,
+        tpacketv3BlockSize=8 * 1024 * 1024,
+        dbBulkSize=300000,
+        maxESConns=30,
+        maxFileSizeG=5,
+        maxFileTimeM=MAX_PCAP_FILE_TIME_M,
+    )
+    assert expected_value == actual_value
+
+    # TEST 2: Larger instance gets more threads, a bigger ring buffer, and bigger bulk requests
+    actual_value = get_capture_tuning(cap.CaptureNodesPlan("c6in.4xlarge", 4, 6, 2), 20)
+    expected_value = CaptureTuning(
+        packetThreads=11,
+        tpacketv3NumThreads=4,
+        tpacketv3BlockSize=16 * 1024 * 1024,
+        dbBulkSize=4000000,
+        maxESConns=110,
+        maxFileSizeG=12,
+        maxFileTimeM=1,
+    )
+    assert expected_value == actual_value
+
+def test_WHEN_get_capture_tuning_called_AND_unknown_instance_THEN_raises():
+    with pytest.raises(cap.UnknownInstanceType):
+        get_capture_tuning(cap.CaptureNodesPlan("blah.xlarge", 1, 2, 1), 1)
+
+def test_WHEN_CaptureTuning_to_config_settings_called_THEN_as_expected():
+    # Set up our mock
+    tuning = CaptureTuning(2, 1, 16777216, 2000000, 30, 12, 1)
+
+    # Run our test
+    actual_value = tuning.to_config_settings()
+
+    # Check our results
+    expected_value = {
+        "debug": "0",
+        "logESRequests": "false",
+        "tpacketv3NumThreads": "1",
+        "tpacketv3BlockSize": "16777216",
+        "maxFileSizeG": "12",
+        "maxFileTimeM": "1",
+        "packetThreads": "2",
+        "dbBulkSize": "2000000",
+        "maxESConns": "30",
+        "rotateIndex": "daily",
+    }
+    assert expected_value == actual_value
+
+def test_WHEN_get_capture_tuning_called_AND_sessions_rotation_THEN_rotates_index():
+    # TEST 1: Plans without a rotation rotate daily
+    assert "daily" == get_capture_tuning(cap.CaptureNodesPlan("m5.xlarge", 1, 2, 1), 1).rotateIndex
+
+    # TEST 2: The planned rotation is used
+    actual_value = get_capture_tuning(cap.CaptureNodesPlan("m5.xlarge", 1, 2, 1), 1, "hourly12")
+    assert "hourly12" == actual_value.to_config_settings()["rotateIndex"]
+
+def test_WHEN_get_viewer_tuning_settings_called_THEN_as_expected():
+    # TEST 1: Daily rotation searches only the indices covering the query's time range
+    assert {"rotateIndex": "daily", "queryAllIndices": "false"} == get_viewer_tuning_settings(None)
+
+    # TEST 2: Other rotations search every index, so those made under an earlier rotation are still found
+    assert {"rotateIndex": "weekly", "queryAllIndices": "true"} == get_viewer_tuning_settings("weekly")
+
+def test_WHEN_get_viewer_tuning_settings_called_AND_rotation_changed_THEN_searches_all_until_aged_out():
+    # Set up our mock
+    changed_at = "2023-05-01T00:00:00+00:00"
+
+    # TEST 1: Back to daily, but the old rotation's indices may still be retained
+    actual_value = get_viewer_tuning_settings("daily", changed_at, 30, datetime(2023, 5, 31, tzinfo=timezone.utc))
+    assert {"rotateIndex": "daily", "queryAllIndices": "true"} == actual_value
+
+    actual_value = get_viewer_tuning_settings("daily", changed_at, 30, datetime(2023, 6, 6, 23, tzinfo=timezone.utc))
+    assert "true" == actual_value["queryAllIndices"]
+
+    # TEST 2: Once ISM has aged them out, only the indices covering the query's time range are searched
+    actual_value = get_viewer_tuning_settings("daily", changed_at, 30, datetime(2023, 6, 7, tzinfo=timezone.utc))
+    assert {"rotateIndex": "daily", "queryAllIndices": "false"} == actual_value
@@ -0,0 +1,184 @@
+from datetime import date
+import pytest
+
+import core.capacity_planning as cap
+from core.domain_sizing import (DomainObservation, DomainSizingReport, NoDataNodesObserved, HIGH_WATERMARK_SETTING,
+                                DEFAULT_HIGH_WATERMARK, observe_domain, parse_high_watermark, recommend_os_domain_plan)
+
+GIB = 1024 ** 3
+
+def _get_node(name: str, roles, heap: int, rejected: int = 0, box_type: str = "hot"):
+    return {
+        "name": name,
+        "roles": roles,
+        "attributes": {"box_type": box_type},
+        "jvm": {"mem": {"heap_used_percent": heap}},
+        "thread_pool": {"write": {"rejected": rejected}},
+    }
+
+TEST_NODES_STATS = {
+    "nodes": {
+        "id1": _get_node("data-1", ["data", "ingest"], 60, rejected=2),
+        "id2": _get_node("data-2", ["data", "ingest"], 70, rejected=3),
+        "id3": _get_node("master-1", ["cluster_manager"], 40),
+        "id4": _get_node("master-2", ["master"], 45),
+        "id5": _get_node("warm-1", ["data"], 90, box_type="warm"),
+    }
+}
+
+TEST_ALLOCATION = [
+    {"node": "data-1", "shards": "10", "disk.used": str(60 * GIB), "disk.total": str(100 * GIB)},
+    {"node": "data-2", "shards": "10", "disk.used": str(60 * GIB), "disk.total": str(100 * GIB)},
+    {"node": "warm-1", "shards": "30", "disk.used": str(900 * GIB), "disk.total": str(1000 * GIB)},
+    {"node": "UNASSIGNED", "shards": "1", "disk.used": None, "disk.total": None},
+]
+
+TEST_SESSIONS_INDICES = [
+    {"index": "arkime_sessions3-230430", "pri.store.size": str(99 * GIB)}, # before the window
+    {"index": "arkime_sessions3-230506", "pri.store.size": str(3 * GIB)},
+    {"index": "arkime_sessions3-230507", "pri.store.size": str(5 * GIB)},
+    {"index": "arkime_sessions3-230508", "pri.store.size": str(99 * GIB)}, # today; incomplete
+]
+
+def test_WHEN_parse_high_watermark_called_THEN_as_expected():
+    # TEST 1: Defaults only
+    assert 90 == parse_high_watermark({"defaults": {HIGH_WATERMARK_SETTING: "90%"}})
+
+    # TEST 2: Explicit settings override the defaults, and ratios are accepted
+    settings = {"persistent": {HIGH_WATERMARK_SETTING: "0.85"}, "defaults": {HIGH_WATERMARK_SETTING: "90%"}}
+    assert 85 == parse_high_watermark(settings)
+
+    # TEST 3: Absolute watermarks and missing settings fall back to OpenSearch's default
+    assert DEFAULT_HIGH_WATERMARK == parse_high_watermark({"transient": {HIGH_WATERMARK_SETTING: "10gb"}})
+    assert DEFAULT_HIGH_WATERMARK == parse_high_watermark({})
+
+def test_WHEN_observe_domain_called_THEN_as_expected():
+    # Run our test
+    settings = {"defaults": {HIGH_WATERMARK_SETTING: "85%"}}
+    actual_value = observe_domain(TEST_ALLOCATION, TEST_NODES_STATS, settings, TEST_SESSIONS_INDICES, 1, date(2023, 5, 8))
+
+    # Check our results
+    expected_value = DomainObservation(
+        dataNodeCount=2,
+        masterNodeCount=2,
+        diskUsed=120 * GIB,
+        diskTotal=200 * GIB,
+        highWatermark=85,
+        dataJvmPressure=70,
+        masterJvmPressure=45,
+        writeRejections=5,
+        dailyGrowth=8 * GIB,
+    )
+    assert expected_value == actual_value
+
+def test_WHEN_observe_domain_called_AND_no_data_nodes_THEN_raises():
+    with pytest.raises(NoDataNodesObserved):
+        observe_domain([], TEST_NODES_STATS, {}, [], 1, date(2023, 5, 8))
+
+def test_WHEN_get_headroom_days_called_THEN_as_expected():
+    observed = DomainObservation(2, 3, 120 * GIB, 200 * GIB, 90, 50, 30, 0, 8 * GIB)
+
+    # TEST 1: The retention period's data doesn't fit below the watermark
+    assert 7.5 == observed.get_headroom_days(30)
+
+    # TEST 2: The data expires before it reaches the watermark
+    assert None == observed.get_headroom_days(7)
+    assert None == observed.get_headroom_days(30, 400 * GIB)
+
+    # TEST 3: Not growing
+    observed.dailyGrowth = 0
+    assert None == observed.get_headroom_days(30)
+
+def test_WHEN_recommend_os_domain_plan_called_THEN_as_expected():
+    current_plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(2, "t3.small.search", 100),
+        cap.MasterNodesPlan(3, "t3.small.search"),
+        1
+    )
+
+    # TEST 1: Healthy, but the retention period's growth won't fit on the disk
+    observed = DomainObservation(2, 3, 120 * GIB, 200 * GIB, 90, 50, 30, 0, 8 * GIB)
+    actual_value = recommend_os_domain_plan(current_plan, observed, 30, 1, 2)
+    expected_value = cap.OSDomainPlan(
+        cap.DataNodesPlan(2, "t3.medium.search", 200),
+        cap.MasterNodesPlan(3, "t3.small.search"),
+        1,
+        sessionsRotation="weekly" # A week's growth fits in one shard
+    )
+    assert expected_value == actual_value
+
+    # TEST 2: Heap pressure and write rejections call for more data nodes, even though the disk is fine
+    observed = DomainObservation(2, 3, 20 * GIB, 200 * GIB, 90, 95, 30, 10, 0.5 * GIB)
+    actual_value = recommend_os_domain_plan(current_plan, observed, 30, 1, 2)
+    assert cap.DataNodesPlan(2, "t3.medium.search", 200) == actual_value.dataNodes
+
+    # TEST 3: Master heap pressure steps the master nodes up a size
+    observed = DomainObservation(2, 3, 20 * GIB, 200 * GIB, 90, 50, 80, 0, 0.5 * GIB)
+    actual_value = recommend_os_domain_plan(current_plan, observed, 30, 1, 2)
+    assert cap.DataNodesPlan(2, "t3.small.search", 100) == actual_value.dataNodes
+    assert cap.MasterNodesPlan(3, "t3.medium.search") == actual_value.masterNodes
+
+    # TEST 4: A warm tier is carried over as-is and rules out burstable data nodes
+    warm_plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(2, "r6g.large.search", 1024),
+        cap.MasterNodesPlan(3, "m6g.large.search"),
+        1,
+        cap.WarmNodesPlan(2, "ultrawarm1.medium.search", 100)
+    )
+    observed = DomainObservation(2, 3, 20 * GIB, 2048 * GIB, 90, 50, 30, 0, 0.5 * GIB)
+    actual_value = recommend_os_domain_plan(warm_plan, observed, 7, 1, 2)
+    assert warm_plan.dataNodes == actual_value.dataNodes
+    assert warm_plan.warmNodes == actual_value.warmNodes
+    assert "daily" == actual_value.sessionsRotation
+
+    # TEST 5: Too short a retention period to rotate weekly
+    observed = DomainObservation(2, 3, 120 * GIB, 200 * GIB, 90, 50, 30, 0, 8 * GIB)
+    actual_value = recommend_os_domain_plan(current_plan, observed, cap.MIN_WEEKLY_SPI_DAYS - 1, 1, 2)
+    assert "daily" == actual_value.sessionsRotation
+
+def test_WHEN_domain_sizing_report_called_THEN_as_expected():
+    # Set up our test
+    current_plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(2, "t3.small.search", 100),
+        cap.MasterNodesPlan(3, "t3.small.search"),
+        1
+    )
+    recommended_plan = cap.OSDomainPlan(
+        cap.DataNodesPlan(2, "t3.medium.search", 200),
+        cap.MasterNodesPlan(3, "t3.small.search"),
+        1
+    )
+    observed = DomainObservation(2, 3, 120 * GIB, 200 * GIB, 90, 50, 30, 0, 8 * GIB)
+
+    # Run our test
+    report = DomainSizingReport(current_plan, recommended_plan, observed, 30)
+
+    # Check our results
+    expected_report = (
+        "Observed:\n"
+        + "    Data Node Count: 2\n"
+        + "    Dedicated Master Node Count: 3\n"
+        + "    Data Node Disk Used [GB]: 120\n"
+        + "    Data Node Disk Total [GB]: 200\n"
+        + "    High Disk Watermark [%]: 90\n"
+        + "    Daily Growth [GB]: 8\n"
+        + "    Steady-State Disk Used [GB]: 240\n"
+        + "    Max Data Node JVM Memory Pressure [%]: 50\n"
+        + "    Max Master Node JVM Memory Pressure [%]: 30\n"
+        + "    Write Rejections: 0\n"
+        + "OpenSearch Domain:\n"
+        + "    Master Node Count: 3\n"
+        + "    Master Node Type: t3.small.search\n"
+        + "    Data Node Count: 2\n"
+        + "    Data Node Type: \033[1mt3.small.search -> t3.medium.search\033[0m\n"
+        + "    Data Node Volume Size [GB]: \033[1m100 -> 200\033[0m\n"
+        + "    Sessions Index Rotation: daily\n"
+        + "    Sessions Index Shards: 1\n"
+        + "    Headroom [days]: \033[1m7 -> unbounded\033[0m\n"
+    )
+    assert expected_report == report.get_report()
+    assert report.needs_resizing()
+
+    assert 7.5 == report.to_dict()["currentHeadroomDays"]
+    assert None == report.to_dict()["recommendedHeadroomDays"]
+    assert recommended_plan.to_dict() == report.to_dict()["recommended"]
@@ -0,0 +1,40 @@
+import pytest
+
+import core.filter_cidrs as fc
+
+def test_WHEN_aggregate_cidrs_called_THEN_merges_and_orders():
+    # Set up our mock
+    cidrs = [
+        "10.0.1.0/24",
+        "10.0.0.0/24",      # Adjacent to the above; together they are 10.0.0.0/23
+        "10.0.0.128/25",    # Contained in the above
+        "192.168.0.0/16",
+        "172.16.0.0/28",
+        "2600:1f18::/56",
+    ]
+
+    # Run our test
+    actual_value = fc.aggregate_cidrs(cidrs)
+
+    # Check our results
+    expected_value = ["2600:1f18::/56", "192.168.0.0/16", "10.0.0.0/23", "172.16.0.0/28"]
+    assert expected_value == actual_value
+
+def test_WHEN_get_filter_cidrs_called_AND_fits_THEN_returns_aggregated():
+    # Set up our mock
+    cidrs = [f"10.0.{i}.0/24" for i in range(16)]
+
+    # Run our test
+    actual_value = fc.get_filter_cidrs(cidrs)
+
+    # Check our results
+    expected_value = ["10.0.0.0/20"]
+    assert expected_value == actual_value
+
+def test_WHEN_get_filter_cidrs_called_AND_too_many_THEN_raises():
+    # Set up our mock
+    cidrs = [f"10.{i * 2}.0.0/16" for i in range(fc.MAX_REJECT_RULES_PER_DIRECTION + 1)]
+
+    # Run our test
+    with pytest.raises(fc.TooManyFilterCidrs):
+        fc.get_filter_cidrs(cidrs)
@@ -0,0 +1,94 @@
+import aws_interactions.cloudwatch_interactions as cwi
+from core.capacity_planning import (CaptureNodesPlan, ViewerNodesPlan, EcsSysResourcePlan, OSDomainPlan, DataNodesPlan,
+                                    MasterNodesPlan, ClusterPlan, VpcPlan, S3Plan, DEFAULT_VPC_CIDR, DEFAULT_NUM_AZS,
+                                    DEFAULT_CAPTURE_PUBLIC_MASK, DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS)
+import core.metrics_report as cm
+
+
+TEST_PLAN = ClusterPlan(
+    CaptureNodesPlan("m5.xlarge", 2, 3, 2),
+    VpcPlan(DEFAULT_VPC_CIDR, DEFAULT_NUM_AZS, DEFAULT_CAPTURE_PUBLIC_MASK),
+    EcsSysResourcePlan(3584, 15360),
+    OSDomainPlan(DataNodesPlan(2, "r6g.large.search", 1024), MasterNodesPlan(3, "m6g.large.search")),
+    S3Plan(DEFAULT_S3_STORAGE_CLASS, DEFAULT_S3_STORAGE_DAYS),
+    ViewerNodesPlan(4, 2),
+    None
+)
+
+TEST_SOURCES = cm.ClusterMetricsSources(
+    "cluster-1", "XXXXXXXXXXXX", "gwy/gwlb-1/1234", "ecs-cluster-1", "ecs-service-1", "domain-1", ["vpc-1", "vpc-2"]
+)
+
+def test_WHEN_get_cluster_metrics_queries_called_THEN_queries_every_source():
+    # Run our test
+    actual_value = cm.get_cluster_metrics_queries(TEST_SOURCES, TEST_PLAN, 300)
+
+    # Check our results
+    actual_keys = [query.key for query in actual_value]
+    assert len(actual_keys) == len(set(actual_keys))
+    assert 2 * (7 + 3 * 2) == len(actual_value)
+
+    actual_namespaces = {query.namespace for query in actual_value}
+    assert {"AWS/GatewayELB", "AWS/ECS", "AWS/ES", cwi.CW_ARKIME_EVENT_NAMESPACE} == actual_namespaces
+
+    traffic_query = next(query for query in actual_value if query.key == "CaptureTraffic/peak")
+    assert {"LoadBalancer": "gwy/gwlb-1/1234"} == traffic_query.dimensions
+    assert "Sum" == traffic_query.stat
+
+    os_query = next(query for query in actual_value if query.key == "OSCPU/peak")
+    assert {"DomainName": "domain-1", "ClientId": "XXXXXXXXXXXX"} == os_query.dimensions
+
+def test_WHEN_get_cluster_metrics_queries_called_AND_no_gwlb_THEN_skips_traffic():
+    # Set up our mock
+    test_sources = cm.ClusterMetricsSources("cluster-1", "XXXXXXXXXXXX", None, "ecs-cluster-1", "ecs-service-1", "domain-1")
+
+    # Run our test
+    actual_value = cm.get_cluster_metrics_queries(test_sources, TEST_PLAN, 300)
+
+    # Check our results
+    assert not [query for query in actual_value if query.namespace == "AWS/GatewayELB"]
+
+def test_WHEN_summarize_cluster_metrics_called_THEN_compares_against_plan():
+    # Set up our mock
+    test_results = {
+        "CaptureTraffic/average": [37.5e9, 75e9], # bytes per 300s period; 1 Gbps and 2 Gbps
+        "CaptureTraffic/peak": [37.5e9, 75e9],
+        "CaptureCPU/average": [40.0, 60.0],
+        "CaptureCPU/peak": [55.0, 90.0],
+        "OSStorageUsedPerNode/average": [512 * 1024.0],
+        "OSStorageUsedPerNode/peak": [256 * 1024.0],
+        "vpc-1/EniMirrorsCreated/average": [3.0, 4.0],
+        "vpc-1/EniMirrorsCreated/peak": [3.0, 4.0],
+    }
+
+    # Run our test
+    actual_value = cm.summarize_cluster_metrics(TEST_SOURCES, TEST_PLAN, 300, "region-1", test_results)
+
+    # Check our results
+    summaries = {summary.name: summary for summary in actual_value.summaries}
+
+    traffic = summaries["CaptureTraffic"]
+    assert 1.5 == traffic.average
+    assert 2.0 == traffic.peak
+    assert 1.25 == traffic.capacity # 2 m5.xlarge @ 0.625 Gbps each, as limited by their network bandwidth
+    assert 1.6 == traffic.utilization
+
+    cpu = summaries["CaptureCPU"]
+    assert 50.0 == cpu.average
+    assert 90.0 == cpu.peak
+    assert 0.9 == cpu.utilization
+
+    storage = summaries["OSStorageUsedPerNode"]
+    assert 512 == storage.average
+    assert 768 == storage.peak
+    assert 0.75 == storage.utilization
+
+    created = summaries["vpc-1/EniMirrorsCreated"]
+    assert 7.0 == created.total
+    assert created.utilization is None
+
+    no_data = summaries["OSIndexingRate"]
+    assert no_data.average is None and no_data.peak is None
+
+    assert "CaptureTraffic" in actual_value.get_report()
+    assert "region-1" == actual_value.to_dict()["region"]
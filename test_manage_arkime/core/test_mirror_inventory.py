@@ -0,0 +1,124 @@
+import json
+import unittest.mock as mock
+
+import aws_interactions.ec2_interactions as ec2i
+import core.constants as constants
+from core.mirror_inventory import MirrorInventory, RefreshStats, refresh_vpc
+
+
+TEST_CONTENTS = {
+    "subnets": {"subnet-1": ("target-1",), "subnet-2": ("target-2",)},
+    "enis": {
+        "eni-1": ("subnet-1", "interface"),
+        "eni-2": ("subnet-1", "interface"),
+        "eni-3": ("subnet-2", "interface"),
+        "eni-4": ("subnet-2", "nat_gateway"),
+        "eni-5": ("subnet-3", "interface"), # Not in a subnet we monitor
+    },
+    "sessions": {
+        "session-1": ("eni-1", "target-1"),
+        "session-2": ("eni-1", "target-2"),
+        "session-3": ("eni-3", "target-2"),
+        "session-4": ("eni-9", "target-2"),
+        "session-5": ("eni-7", "target-2"),
+    },
+    "records": {
+        "eni-1": ("subnet-1", "session-1"),
+        "eni-3": ("subnet-2", "session-3"),
+        "eni-9": ("subnet-2", "session-4"),
+        "eni-8": ("subnet-2", "session-5"),
+    },
+}
+
+def test_WHEN_MirrorInventory_get_vpc_status_called_THEN_as_expected():
+    # Set up our mock
+    test_inventory = MirrorInventory(":memory:")
+    test_inventory.sync_vpc("vpc-1", "filter-1", TEST_CONTENTS)
+    test_inventory.sync_vpc("vpc-2", "filter-2", {"enis": {"eni-20": ("subnet-1", "interface")}})
+
+    # Run our test
+    actual_value = test_inventory.get_vpc_status("vpc-1")
+
+    # Check our results
+    assert 5 == actual_value.total_enis
+    assert 3 == actual_value.mirrorable_enis
+    assert 2 == actual_value.mirrored_enis
+    assert [ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-2", "interface")] == actual_value.unmirrored
+    assert ["eni-1"] == actual_value.duplicate_enis
+    assert ["session-5"] == actual_value.orphaned_sessions
+    assert ["eni-8", "eni-9"] == actual_value.stale_records
+    assert "2/3 mirrorable ENIs are mirrored [66.7%]" in actual_value.get_report()
+
+def test_WHEN_MirrorInventory_sync_vpc_called_THEN_only_writes_changes():
+    # Set up our mock
+    test_inventory = MirrorInventory(":memory:")
+    first_stats = test_inventory.sync_vpc("vpc-1", "filter-1", TEST_CONTENTS)
+
+    updated_contents = {table: dict(rows) for table, rows in TEST_CONTENTS.items()}
+    updated_contents["enis"]["eni-6"] = ("subnet-1", "interface")
+    del updated_contents["enis"]["eni-5"]
+    updated_contents["sessions"]["session-3"] = ("eni-3", "target-1")
+
+    # Run our test
+    unchanged_stats = test_inventory.sync_vpc("vpc-1", "filter-1", TEST_CONTENTS)
+    changed_stats = test_inventory.sync_vpc("vpc-1", "filter-1", updated_contents)
+
+    # Check our results
+    assert RefreshStats(added=16, updated=0, removed=0) == first_stats
+    assert RefreshStats(added=0, updated=0, removed=0) == unchanged_stats
+    assert RefreshStats(added=1, updated=1, removed=1) == changed_stats
+    assert 5 == test_inventory.get_vpc_status("vpc-1").total_enis
+
+def test_WHEN_MirrorInventory_get_refreshed_at_called_THEN_as_expected():
+    # Set up our mock
+    test_inventory = MirrorInventory(":memory:")
+
+    # Run our test
+    before_value = test_inventory.get_refreshed_at("vpc-1")
+    test_inventory.sync_vpc("vpc-1", "filter-1", {})
+    after_value = test_inventory.get_refreshed_at("vpc-1")
+
+    # Check our results
+    assert None == before_value
+    assert None != after_value
+
+@mock.patch("core.mirror_inventory.ssm_ops")
+@mock.patch("core.mirror_inventory.ec2i")
+def test_WHEN_refresh_vpc_called_THEN_syncs_aws_state(mock_ec2i, mock_ssm):
+    # Set up our mock
+    mock_ssm.get_ssm_param_json_value.return_value = "filter-1"
+    mock_ssm.get_ssm_params_by_path.return_value = [
+        {
+            "Name": constants.get_subnet_ssm_param_name("cluster-1", "vpc-1", "subnet-1"),
+            "Value": json.dumps({"mirrorTargetId": "target-1", "subnetId": "subnet-1", "vpcEndpointId": "vpce-1"})
+        },
+        {
+            "Name": constants.get_eni_ssm_param_name("cluster-1", "vpc-1", "subnet-1", "eni-1"),
+            "Value": json.dumps({"eniId": "eni-1", "trafficSessionId": "session-1"})
+        },
+    ]
+    mock_ec2i.get_enis_of_vpc.return_value = [ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "interface")]
+    mock_ec2i.get_mirror_sessions_of_filter.return_value = [
+        ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 123)
+    ]
+
+    mock_inventory = mock.Mock()
+
+    # Run our test
+    refresh_vpc(mock_inventory, "cluster-1", "vpc-1", "provider")
+
+    # Check our results
+    expected_sync_calls = [
+        mock.call("vpc-1", "filter-1", {
+            "subnets": {"subnet-1": ("target-1",)},
+            "enis": {"eni-1": ("subnet-1", "interface")},
+            "sessions": {"session-1": ("eni-1", "target-1")},
+            "records": {"eni-1": ("subnet-1", "session-1")},
+        })
+    ]
+    assert expected_sync_calls == mock_inventory.sync_vpc.call_args_list
+
+    expected_by_path_calls = [
+        mock.call(f"{constants.get_vpc_ssm_param_name('cluster-1', 'vpc-1')}/subnets", "provider", recursive=True)
+    ]
+    assert expected_by_path_calls == mock_ssm.get_ssm_params_by_path.call_args_list
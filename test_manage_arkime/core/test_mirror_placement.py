@@ -0,0 +1,104 @@
+import json
+import pytest
+import unittest.mock as mock
+
+import aws_interactions.ec2_interactions as ec2i
+import core.constants as constants
+import core.mirror_placement as placement
+
+def test_WHEN_place_called_THEN_spreads_within_az():
+    # Set up our mock
+    targets = [
+        placement.TargetLoad("target-1", "subnet-1", "az-1", 2, 10),
+        placement.TargetLoad("target-2", "subnet-2", "az-1", 0, 10),
+        placement.TargetLoad("target-3", "subnet-3", "az-2", 0, 10),
+    ]
+    planner = placement.MirrorPlacementPlanner(targets)
+
+    # Run our test
+    actual_targets = [planner.place("subnet-1").target_id for _ in range(5)]
+
+    # Check our results
+    expected_targets = ["target-2", "target-2", "target-1", "target-2", "target-1"]
+    assert expected_targets == actual_targets
+    assert [4, 3, 0] == [target.sessions for target in targets]
+
+def test_WHEN_place_called_AND_az_full_THEN_raises():
+    # Set up our mock
+    targets = [
+        placement.TargetLoad("target-1", "subnet-1", "az-1", 10, 10),
+        placement.TargetLoad("target-2", "subnet-2", "az-1", 10, 10),
+        placement.TargetLoad("target-3", "subnet-3", "az-2", 0, 10),
+    ]
+    planner = placement.MirrorPlacementPlanner(targets)
+
+    # Run our test
+    with pytest.raises(placement.TargetsAtCapacity):
+        planner.place("subnet-1")
+
+    with pytest.raises(placement.NoTargetForSubnet):
+        planner.place("subnet-4")
+
+def test_WHEN_place_called_AND_az_full_AND_over_capacity_allowed_THEN_uses_least_loaded():
+    # Set up our mock
+    targets = [
+        placement.TargetLoad("target-1", "subnet-1", "az-1", 12, 10),
+        placement.TargetLoad("target-2", "subnet-2", "az-1", 10, 10),
+        placement.TargetLoad("target-3", "subnet-3", "az-2", 0, 10),
+    ]
+    planner = placement.MirrorPlacementPlanner(targets)
+
+    # Run our test
+    actual_value = planner.place("subnet-1", allow_over_capacity=True)
+
+    # Check our results
+    assert "target-2" == actual_value.target_id
+    assert [12, 11, 0] == [target.sessions for target in targets]
+
+def test_WHEN_get_report_called_THEN_as_expected():
+    # Set up our mock
+    targets = [
+        placement.TargetLoad("target-2", "subnet-2", "az-2", 5, 10),
+        placement.TargetLoad("target-1", "subnet-1", "az-1", 1, 4),
+    ]
+
+    # Run our test
+    actual_value = placement.MirrorPlacementPlanner(targets).get_report()
+
+    # Check our results
+    expected_value = (
+        "Traffic Mirroring Target Load:\n"
+        + "    target-1 (subnet-1, az-1): 1/4 Sessions [25%]\n"
+        + "    target-2 (subnet-2, az-2): 5/10 Sessions [50%]\n"
+    )
+    assert expected_value == actual_value
+
+@mock.patch("core.mirror_placement.ec2i")
+@mock.patch("core.mirror_placement.ssm_ops")
+def test_WHEN_get_target_loads_called_THEN_counts_sessions(mock_ssm_ops, mock_ec2i):
+    # Set up our mock
+    mock_ssm_ops.get_ssm_params_by_path.return_value = [
+        {"Name": "/arkime/.../subnet-1", "Value": json.dumps({"mirrorTargetId": "target-1", "subnetId": "subnet-1"})},
+        {"Name": "/arkime/.../subnet-2", "Value": json.dumps({"mirrorTargetId": "target-2", "subnetId": "subnet-2"})},
+    ]
+    mock_ec2i.get_azs_of_subnets.return_value = {"subnet-1": "az-1", "subnet-2": "az-2"}
+    mock_ec2i.get_mirror_sessions_of_filter.return_value = [
+        ec2i.MirrorSession("session-1", "eni-1", "target-1", "filter-1", 1),
+        ec2i.MirrorSession("session-2", "eni-2", "target-1", "filter-1", 1),
+    ]
+    mock_provider = mock.Mock()
+
+    # Run our test
+    actual_value = placement.get_target_loads("cluster-1", "vpc-1", "filter-1", mock_provider, 20)
+
+    # Check our results
+    expected_value = [
+        placement.TargetLoad("target-1", "subnet-1", "az-1", 2, 20),
+        placement.TargetLoad("target-2", "subnet-2", "az-2", 0, 20),
+    ]
+    assert expected_value == actual_value
+
+    expected_get_params_calls = [
+        mock.call(f"{constants.get_vpc_ssm_param_name('cluster-1', 'vpc-1')}/subnets", mock_provider),
+    ]
+    assert expected_get_params_calls == mock_ssm_ops.get_ssm_params_by_path.call_args_list
@@ -0,0 +1,135 @@
+import json
+import pytest
+import unittest.mock as mock
+
+import core.constants as constants
+import core.mirror_profile as mp
+
+def test_WHEN_MirrorProfile_from_dict_called_THEN_as_expected():
+    # Set up our mock
+    raw_profile = {
+        "packetLength": 256,
+        "includeRules": [{"protocol": "tcp", "fromPort": 80, "toPort": 90}],
+        "excludeRules": [{"protocol": "UDP", "fromPort": 53}, {"protocol": 50}],
+        "subnetOverrides": {"subnet-1": {"packetLength": None}},
+        "maxSessionsPerTarget": 1000,
+    }
+
+    # Run our test
+    actual_value = mp.MirrorProfile.from_dict(raw_profile)
+
+    # Check our results
+    expected_value = mp.MirrorProfile(
+        256,
+        [mp.PortRule(6, 80, 90)],
+        [mp.PortRule(17, 53, 53), mp.PortRule(50)],
+        {"subnet-1": {"packetLength": None}},
+        1000
+    )
+    assert expected_value == actual_value
+    assert expected_value == mp.MirrorProfile.from_dict(actual_value.to_dict())
+
+    assert None == actual_value.get_packet_length("subnet-1")
+    assert 256 == actual_value.get_packet_length("subnet-2")
+
+def test_WHEN_MirrorProfile_from_dict_called_AND_invalid_THEN_raises():
+    invalid_profiles = [
+        {"packetLength": 0},
+        {"packetLength": mp.MAX_PACKET_LENGTH + 1},
+        {"excludeRules": [{"protocol": "sctp"}]},
+        {"excludeRules": [{"protocol": "icmp", "fromPort": 1}]},
+        {"includeRules": [{"protocol": "tcp", "fromPort": 90, "toPort": 80}]},
+        {"subnetOverrides": {"subnet-1": {"excludeRules": []}}},
+        {"excludeRules": [{"protocol": "tcp", "fromPort": "80"}]},
+        {"excludeRules": [{"protocol": "tcp", "fromPort": 80, "toPort": 80.5}]},
+        {"excludeRules": [{"protocol": "tcp", "fromPort": True}]},
+        {"excludeRules": [{"protocol": "tcp", "toPort": 80}]},
+        {"subnetOverrides": {"subnet-1": 64}},
+        {"subnetOverrides": ["subnet-1"]},
+        {"maxSessionsPerTarget": 0},
+        {"maxSessionsPerTarget": "100"},
+        {"includeRules": {"protocol": "tcp"}},
+        {"includeRules": ["tcp"]},
+        ["packetLength"],
+    ]
+
+    for raw_profile in invalid_profiles:
+        with pytest.raises(mp.InvalidMirrorProfile):
+            mp.MirrorProfile.from_dict(raw_profile)
+
+def test_WHEN_MirrorProfile_from_dict_called_AND_invalid_THEN_names_setting():
+    invalid_settings = [
+        ({"excludeRules": [{"protocol": "tcp", "fromPort": "80"}]}, "fromPort"),
+        ({"excludeRules": [{"protocol": "tcp", "fromPort": 80, "toPort": "90"}]}, "toPort"),
+        ({"excludeRules": [{"protocol": "tcp", "toPort": 80}]}, "toPort"),
+        ({"subnetOverrides": {"subnet-1": 64}}, "subnet-1"),
+        ({"includeRules": "tcp"}, "includeRules"),
+    ]
+
+    for raw_profile, setting in invalid_settings:
+        with pytest.raises(mp.InvalidMirrorProfile, match=setting):
+            mp.MirrorProfile.from_dict(raw_profile)
+
+def test_WHEN_confirm_fits_filter_called_THEN_as_expected():
+    # Set up our mock
+    default_profile = mp.MirrorProfile()
+    port_profile = mp.MirrorProfile(
+        includeRules=[mp.PortRule(6, 443, 443)],
+        excludeRules=[mp.PortRule(17, 53, 53), mp.PortRule(6, 22, 22)]
+    )
+
+    # Run our test
+    assert 10 == default_profile.get_filter_rules_per_direction(9)
+    assert 8 == port_profile.get_filter_rules_per_direction(2)
+
+    default_profile.confirm_fits_filter(9)
+    port_profile.confirm_fits_filter(4)
+    with pytest.raises(mp.TooManyFilterRules):
+        port_profile.confirm_fits_filter(5)
+
+def test_WHEN_get_volume_ratio_called_THEN_as_expected():
+    assert 1.0 == mp.MirrorProfile().get_volume_ratio()
+    assert 0.25 == mp.MirrorProfile(packetLength=mp.AVERAGE_PACKET_SIZE // 4).get_volume_ratio()
+    assert 1.0 == mp.MirrorProfile(packetLength=mp.MAX_PACKET_LENGTH).get_volume_ratio()
+
+def test_WHEN_load_mirror_profile_called_THEN_as_expected(tmp_path):
+    # Set up our mock
+    good_path = tmp_path / "good.json"
+    good_path.write_text(json.dumps({"packetLength": 128}))
+    bad_path = tmp_path / "bad.json"
+    bad_path.write_text("{not json")
+
+    # Run our test
+    actual_value = mp.load_mirror_profile(str(good_path))
+
+    # Check our results
+    assert mp.MirrorProfile(packetLength=128) == actual_value
+
+    with pytest.raises(mp.InvalidMirrorProfile):
+        mp.load_mirror_profile(str(bad_path))
+
+    with pytest.raises(mp.InvalidMirrorProfile):
+        mp.load_mirror_profile(str(tmp_path / "missing.json"))
+
+@mock.patch("core.mirror_profile.ssm_ops")
+def test_WHEN_get_vpc_mirror_profile_called_THEN_as_expected(mock_ssm_ops):
+    # Set up our mock
+    mock_ssm_ops.get_ssm_param_value.side_effect = [
+        json.dumps({"busArn": "bus-1", "mirrorProfile": {"packetLength": 64}}),
+        json.dumps({"busArn": "bus-1"}),
+    ]
+    mock_provider = mock.Mock()
+
+    # Run our test
+    result_with = mp.get_vpc_mirror_profile("cluster-1", "vpc-1", mock_provider)
+    result_without = mp.get_vpc_mirror_profile("cluster-1", "vpc-1", mock_provider)
+
+    # Check our results
+    assert mp.MirrorProfile(packetLength=64) == result_with
+    assert mp.MirrorProfile() == result_without
+
+    expected_get_calls = [
+        mock.call(constants.get_vpc_ssm_param_name("cluster-1", "vpc-1"), mock_provider),
+        mock.call(constants.get_vpc_ssm_param_name("cluster-1", "vpc-1"), mock_provider),
+    ]
+    assert expected_get_calls == mock_ssm_ops.get_ssm_param_value.call_args_list
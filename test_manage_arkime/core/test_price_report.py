@@ -12,11 +12,21 @@ def test_CONFIRM_all_master_instance_types_have_a_price():
     for instance_type in cap.MASTER_INSTANCES:
         assert instance_type.instanceType in US_EAST_1_PRICES
 
+def test_CONFIRM_all_capture_instance_types_have_a_price():
+    # Run the test
+    for instance_type in cap.CAPTURE_INSTANCES:
+        assert instance_type.instanceType in US_EAST_1_PRICES
+
 def test_CONFIRM_all_data_instance_types_have_a_price():
     # Run the test
     for instance_type in cap.DATA_INSTANCES:
         assert instance_type.type in US_EAST_1_PRICES
 
+def test_CONFIRM_all_warm_instance_types_have_a_price():
+    # Run the test
+    for instance_type in cap.WARM_INSTANCES:
+        assert instance_type.type in US_EAST_1_PRICES
+
 def test_WHEN_PriceReport_get_report_THEN_as_expected():
     # Set up the test
     plan = cap.ClusterPlan(
@@ -53,3 +63,47 @@ def test_WHEN_PriceReport_get_report_THEN_as_expected():
     )
 
     assert expected_report == actual_report
+
+def test_WHEN_PriceReport_get_report_AND_warm_tier_THEN_as_expected():
+    # Set up the test
+    plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(1, 1),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "r6g.large.search", 1024), cap.MasterNodesPlan(3, "m6g.large.search"), 2,
+                         cap.WarmNodesPlan(2, "ultrawarm1.medium.search", 1000)),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(5, 3),
+        None,
+    )
+    config = UserConfig(0.5, 30, 365, 1, 120, hotDays=7)
+
+    # Run the test
+    actual_report = PriceReport(plan, config).get_report()
+
+    # Check the results
+    expected_warm_lines = (
+        "   OS Storage                  2,048 * $   0.1000/GB = $    204.80/mo\n"
+        + "   OS Warm Node                    2 * $ 173.7400/mo = $    347.48/mo\n"
+        + "   OS Warm Storage             1,000 * $   0.0240/GB = $     24.00/mo\n"
+    )
+    assert expected_warm_lines in actual_report
+
+def test_WHEN_PriceReport_get_report_AND_calibrated_pcap_ratio_THEN_as_expected():
+    # Set up the test
+    plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(1, 1),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search")),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(5, 3),
+        None,
+    )
+    config = UserConfig(0.5, 30, 365, 1, 120)
+
+    # Run the test
+    actual_report = PriceReport(plan, config, pcap_ratio=0.125).get_report()
+
+    # Check the results
+    assert "   PCAP Storage first 50TB    20,250 * $   0.0230/GB = $    465.75/mo\n" in actual_report
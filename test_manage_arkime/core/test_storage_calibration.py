@@ -0,0 +1,88 @@
+from datetime import date, datetime, timezone
+import pytest
+
+from core.capacity_planning import MAGIC_FACTOR
+from core.price_report import PCAP_STORAGE_RATIO
+from core.storage_calibration import (StorageCalibration, NotEnoughObservations, OS_RESERVED_STORAGE_FACTOR, calibrate_storage,
+                                      get_sessions_bytes_by_day)
+
+
+def test_WHEN_get_sessions_bytes_by_day_called_THEN_as_expected():
+    # Set up our test
+    indices = [
+        {"index": "arkime_sessions3-230501", "pri.store.size": "100", "docs.count": "10"},
+        {"index": "arkime_sessions3-230502h00", "pri.store.size": "20", "docs.count": "2"},
+        {"index": "arkime_sessions3-230502h01", "pri.store.size": "30", "docs.count": "3"},
+        {"index": "arkime_sessions3-23w18", "pri.store.size": "1000", "docs.count": "100"}, # weekly; can't attribute
+        {"index": "arkime_sessions3-230503", "pri.store.size": None, "docs.count": None}, # still being created
+    ]
+
+    # Run our test
+    actual_value = get_sessions_bytes_by_day(indices)
+
+    # Check our results
+    expected_value = {
+        date(2023, 5, 1): 100,
+        date(2023, 5, 2): 50,
+        date(2023, 5, 3): 0,
+    }
+    assert expected_value == actual_value
+
+def test_WHEN_calibrate_storage_called_THEN_as_expected():
+    # Set up our test
+    calibrated_at = datetime(2023, 5, 8, tzinfo=timezone.utc)
+    day_1 = date(2023, 5, 6)
+    day_2 = date(2023, 5, 7)
+
+    # TEST 1: Ratios are relative to the observed traffic, with the Domain's reserved storage added to the SPI
+    actual_value = calibrate_storage({day_1: 400, day_2: 600}, {day_1: 8, day_2: 12}, {day_1: 100, day_2: 200}, 2, calibrated_at)
+    expected_value = StorageCalibration(
+        spiRatio=0.02 * OS_RESERVED_STORAGE_FACTOR,
+        pcapRatio=0.3,
+        days=2,
+        trafficBytes=1000,
+        calibratedAt="2023-05-08T00:00:00+00:00",
+    )
+    assert expected_value == actual_value
+
+    # TEST 2: Only days with both traffic and sessions indices are compared
+    actual_value = calibrate_storage({day_1: 5000, day_2: 1000}, {day_2: 20}, {day_1: 900, day_2: 300}, 2, calibrated_at)
+    expected_value = StorageCalibration(
+        spiRatio=0.02 * OS_RESERVED_STORAGE_FACTOR,
+        pcapRatio=0.3,
+        days=1,
+        trafficBytes=1000,
+        calibratedAt="2023-05-08T00:00:00+00:00",
+    )
+    assert expected_value == actual_value
+
+    # TEST 3: No traffic means nothing to calibrate from
+    with pytest.raises(NotEnoughObservations):
+        calibrate_storage({}, {day_1: 20}, {day_1: 300}, 7, calibrated_at)
+
+    # TEST 4: No sessions indices on the days with traffic (e.g. weekly indices, or the wrong endpoint)
+    with pytest.raises(NotEnoughObservations):
+        calibrate_storage({day_1: 1000}, {day_2: 20}, {day_1: 300}, 7, calibrated_at)
+
+    # TEST 5: No PCAP on the days being compared
+    with pytest.raises(NotEnoughObservations):
+        calibrate_storage({day_1: 1000}, {day_1: 20}, {day_2: 300}, 7, calibrated_at)
+
+def test_WHEN_get_implausible_ratios_called_THEN_as_expected():
+    # Set up our test
+    plausible = StorageCalibration(MAGIC_FACTOR * 9, PCAP_STORAGE_RATIO / 9, 7, 10**12, "2023-05-08T00:00:00+00:00")
+    implausible = StorageCalibration(MAGIC_FACTOR / 11, PCAP_STORAGE_RATIO * 11, 7, 10**12, "2023-05-08T00:00:00+00:00")
+
+    # Run our test + check our results
+    assert [] == plausible.get_implausible_ratios()
+    assert 2 == len(implausible.get_implausible_ratios())
+
+def test_WHEN_storage_calibration_to_from_dict_called_THEN_round_trips():
+    # Set up our test
+    calibration = StorageCalibration(0.05, 0.3, 7, 10**12, "2023-05-08T00:00:00+00:00")
+
+    # Run our test
+    actual_value = StorageCalibration.from_dict(calibration.to_dict())
+
+    # Check our results
+    assert calibration == actual_value
@@ -0,0 +1,89 @@
+import pytest
+
+import aws_interactions.cloudwatch_interactions as cwi
+from core.capacity_planning import MINIMUM_TRAFFIC
+from core.traffic_profile import (NoTrafficObserved, TrafficProfile, TRAFFIC_QUERY_KEY, bytes_to_gbps,
+                                  get_observed_traffic_query, get_traffic_profile)
+
+
+def test_WHEN_get_observed_traffic_query_called_THEN_as_expected():
+    # Run our test
+    actual_value = get_observed_traffic_query("gwy/gwlb-1/1234")
+
+    # Check our results
+    expected_value = cwi.MetricQuery(
+        TRAFFIC_QUERY_KEY, "AWS/GatewayELB", "ProcessedBytes", {"LoadBalancer": "gwy/gwlb-1/1234"}, "Sum"
+    )
+    assert expected_value == actual_value
+
+def test_WHEN_bytes_to_gbps_called_THEN_as_expected():
+    # 37.5 GB over 300 seconds is 1 Gbps
+    assert 1.0 == bytes_to_gbps(37.5e9, 300)
+
+def test_WHEN_get_traffic_profile_called_THEN_as_expected():
+    # Set up our mock
+    throughputs = [float(value) for value in range(1, 101)]
+    throughputs.reverse()
+
+    # Run our test
+    actual_value = get_traffic_profile(throughputs, 300)
+
+    # Check our results
+    assert 100 == actual_value.samples
+    assert 300 == actual_value.period
+    assert 50.5 == actual_value.mean
+    assert 95.05 == pytest.approx(actual_value.p95)
+    assert 99.01 == pytest.approx(actual_value.p99)
+    assert 100.0 == actual_value.peak
+    assert 100.0 / 50.5 == pytest.approx(actual_value.peakToMean)
+
+def test_WHEN_get_traffic_profile_called_AND_single_sample_THEN_as_expected():
+    # Run our test
+    actual_value = get_traffic_profile([2.0], 300)
+
+    # Check our results
+    assert TrafficProfile(1, 300, 2.0, 2.0, 2.0, 2.0) == actual_value
+
+def test_WHEN_get_traffic_profile_called_AND_no_samples_THEN_raises():
+    # Run our test
+    with pytest.raises(NoTrafficObserved):
+        get_traffic_profile([], 300)
+
+def test_WHEN_get_recommended_traffic_called_THEN_as_expected():
+    # Set up our mock
+    profile = TrafficProfile(100, 300, 0.5, 1.231, 1.5, 1.6)
+
+    # Run our test/Check our results
+    assert 1.24 == profile.get_recommended_traffic("p95")
+    assert 1.5 == profile.get_recommended_traffic("p99")
+    assert 1.5 == profile.get_recommended_traffic()
+
+def test_WHEN_get_recommended_traffic_called_AND_idle_THEN_minimum():
+    # Set up our mock
+    profile = TrafficProfile(100, 300, 0.0, 0.0, 0.0, 0.0)
+
+    # Run our test/Check our results
+    assert MINIMUM_TRAFFIC == profile.get_recommended_traffic()
+    assert None == profile.peakToMean
+
+def test_WHEN_is_bursty_called_THEN_as_expected():
+    # Set up our mock
+    steady_profile = TrafficProfile(100, 300, 1.0, 1.0, 1.0, 1.2)
+    bursty_profile = TrafficProfile(100, 300, 1.0, 1.0, 1.0, 3.0)
+
+    # Run our test/Check our results
+    assert not steady_profile.is_bursty()
+    assert bursty_profile.is_bursty()
+
+def test_WHEN_get_report_called_THEN_as_expected():
+    # Set up our mock
+    profile = TrafficProfile(100, 300, 0.5, 1.0, 1.5, 2.0)
+
+    # Run our test
+    actual_value = profile.get_report()
+
+    # Check our results
+    assert "100 samples of 300s" in actual_value
+    assert "p95: 1.000 Gbps" in actual_value
+    assert "p99: 1.500 Gbps" in actual_value
+    assert "Peak-to-Mean: 4.00" in actual_value
@@ -22,7 +22,7 @@ def test_WHEN_UsageReport_get_report_THEN_as_expected():
         cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
         cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
         cap.EcsSysResourcePlan(1, 1),
-        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search")),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search"), 1),
         cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
         cap.ViewerNodesPlan(5, 3),
         None
@@ -52,12 +52,107 @@ def test_WHEN_UsageReport_get_report_THEN_as_expected():
         + "    Data Node Count: 2\n"
         + "    Data Node Type: t3.small.search\n"
         + "    Data Node Volume Size [GB]: 100\n"
+        + "    Sessions Index Shards: 1\n"
         + "S3:\n"
         + "    PCAP Retention [days]: 30\n"
     )
 
     assert expected_report == actual_report
 
+def test_WHEN_UsageReport_get_report_AND_warm_tier_THEN_as_expected():
+    # Set up the test
+    prev_plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(1, 1),
+        cap.OSDomainPlan(cap.DataNodesPlan(20, "r6g.large.search", 1024), cap.MasterNodesPlan(3, "c6g.2xlarge.search"), 10),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(5, 3),
+        None
+    )
+    next_plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(1, 1),
+        cap.OSDomainPlan(cap.DataNodesPlan(6, "r6g.large.search", 1024), cap.MasterNodesPlan(3, "m6g.large.search"), 12,
+                         cap.WarmNodesPlan(5, "ultrawarm1.medium.search", 7452)),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(5, 3),
+        None
+    )
+    prev_config = UserConfig(1, 30, 365, 1, 30)
+    next_config = UserConfig(1, 30, 365, 1, 30, hotDays=7)
+
+    # Run the test
+    actual_report = UsageReport(prev_plan, next_plan, prev_config, next_config).get_report()
+
+    # Check the results
+    expected_warm_lines = (
+        "    Sessions Index Shards: \033[1m10 -> 12\033[0m\n"
+        + "    Hot Retention [days]: 7\n"
+        + "    Warm Node Count: 5\n"
+        + "    Warm Node Type: ultrawarm1.medium.search\n"
+        + "    Warm Storage [GB]: 7452\n"
+        + "S3:\n"
+    )
+    assert expected_warm_lines in actual_report
+
+def test_WHEN_UsageReport_get_report_AND_index_profile_THEN_as_expected():
+    # Set up the test
+    plan = cap.ClusterPlan(
+        cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+        cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+        cap.EcsSysResourcePlan(1, 1),
+        cap.OSDomainPlan(cap.DataNodesPlan(2, "t3.small.search", 100), cap.MasterNodesPlan(3, "m6g.large.search")),
+        cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+        cap.ViewerNodesPlan(4, 2),
+        None
+    )
+
+    # TEST 1: Neither config has chosen a profile
+    actual_report = UsageReport(plan, plan, UserConfig(1, 30, 365, 1, 30), UserConfig(1, 30, 365, 1, 30)).get_report()
+    assert "Index Settings Profile" not in actual_report
+
+    # TEST 2: The profile is changing
+    prev_config = UserConfig(1, 30, 365, 1, 30, indexProfile="default")
+    next_config = UserConfig(1, 30, 365, 1, 30, indexProfile="ingest")
+    actual_report = UsageReport(plan, plan, prev_config, next_config).get_report()
+
+    expected_lines = (
+        "    User History Retention [days]: 365\n"
+        + "    Index Settings Profile: \033[1mdefault -> ingest\033[0m\n"
+        + "Capture Nodes:\n"
+    )
+    assert expected_lines in actual_report
+
+def test_WHEN_UsageReport_get_report_AND_sessions_rotation_THEN_as_expected():
+    # Set up the test
+    def get_plan(sessions_shards: int, sessions_rotation: str):
+        return cap.ClusterPlan(
+            cap.CaptureNodesPlan(INSTANCE_TYPE_CAPTURE_NODE, 1, 2, 1),
+            cap.VpcPlan(cap.DEFAULT_VPC_CIDR, 1, cap.DEFAULT_CAPTURE_PUBLIC_MASK),
+            cap.EcsSysResourcePlan(1, 1),
+            cap.OSDomainPlan(cap.DataNodesPlan(64, "r6g.4xlarge.search", 6144), cap.MasterNodesPlan(3, "r6g.2xlarge.search"),
+                             sessions_shards, sessionsRotation=sessions_rotation),
+            cap.S3Plan(cap.DEFAULT_S3_STORAGE_CLASS, 30),
+            cap.ViewerNodesPlan(5, 3),
+            None
+        )
+    config = UserConfig(20, 30, 365, 1, 30)
+
+    # TEST 1: Neither plan has a rotation
+    actual_report = UsageReport(get_plan(192, None), get_plan(192, None), config, config).get_report()
+    assert "Sessions Index Rotation" not in actual_report
+
+    # TEST 2: A plan made before the rotation was planned rotated daily
+    actual_report = UsageReport(get_plan(192, None), get_plan(128, "hourly12"), config, config).get_report()
+
+    expected_lines = (
+        "    Sessions Index Rotation: \033[1mdaily -> hourly12\033[0m\n"
+        + "    Sessions Index Shards: \033[1m192 -> 128\033[0m\n"
+    )
+    assert expected_lines in actual_report
+
 @mock.patch('core.usage_report.shell')
 def test_WHEN_UsageReport_get_confirmation_AND_yes_THEN_as_expected(mock_shell):
     # Set up the test
@@ -2,6 +2,7 @@ import json
 import unittest.mock as mock
 
 from lambda_aws_event_listener.aws_event_listener_handler import AwsEventListenerHandler
+import aws_interactions.cloudwatch_interactions as cwi
 import aws_interactions.ec2_interactions as ec2i
 import aws_interactions.events_interactions as events
 import core.constants as constants
@@ -160,11 +161,15 @@ def test_WHEN_AwsEventListenerHandler_handle_called_AND_wacky_error_THEN_handles
     expected_return = {"statusCode": 500}
     assert expected_return == actual_return
 
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.time")
 @mock.patch("lambda_aws_event_listener.aws_event_listener_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_aws_event_listener.aws_event_listener_handler.ec2i")
 @mock.patch("lambda_aws_event_listener.aws_event_listener_handler.events")
-def test_WHEN_handle_ec2_running_called_THEN_as_expected(mock_events, mock_ec2i):
+def test_WHEN_handle_ec2_running_called_THEN_as_expected(mock_events, mock_ec2i, mock_time):
     # Set up our mock
+    mock_time.time.return_value = 1683127000.5
+    mock_events.get_event_timestamp = events.get_event_timestamp
+
     mock_ec2i.get_enis_of_instance.return_value = [
         ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "type-1"),
         ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-2", "type-1"),
@@ -194,8 +199,10 @@ def test_WHEN_handle_ec2_running_called_THEN_as_expected(mock_events, mock_ec2i)
     expected_put_events_calls = [
         mock.call(
             [
-                events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1", "type-1", "filter-1", 1234),
-                events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-2", "type-1", "filter-1", 1234),
+                events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1", "type-1", "filter-1", 1234,
+                                            source_event_time=1683126879.0, published_time=1683127000.5),
+                events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-2", "type-1", "filter-1", 1234,
+                                            source_event_time=1683126879.0, published_time=1683127000.5),
             ],
             "bus-1",
             mock.ANY
@@ -349,10 +356,88 @@ def test_WHEN_handle_ec2_shutting_down_called_AND_wrong_vpc_THEN_handles_gracefu
     expected_put_events_calls = []
     assert expected_put_events_calls == mock_events.put_events.call_args_list
 
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.cwi")
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.ec2i")
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.events")
+def test_WHEN_handle_ec2_running_called_AND_instance_cached_THEN_skips_lookup(mock_events, mock_ec2i, mock_cwi):
+    # Set up our mock
+    mock_ec2i.get_enis_of_instance.return_value = [
+        ec2i.NetworkInterface("vpc-2", "subnet-1", "eni-1", "type-1")
+    ]
+    mock_cwi.AwsEventListenerOutcome = cwi.AwsEventListenerOutcome
+
+    test_handler = AwsEventListenerHandler()
+
+    # Run our test
+    for _ in range(3):
+        actual_return = test_handler._handle_ec2_running(TEST_EVENT_EC2_RUNNING, "bus-1", "cluster-1", "vpc-1", "filter-1", 1234)
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_get_enis_calls = [
+        mock.call(TEST_EVENT_EC2_RUNNING["detail"]["instance-id"], mock.ANY),
+    ]
+    assert expected_get_enis_calls == mock_ec2i.get_enis_of_instance.call_args_list
+
+    expected_metrics_calls = [
+        mock.call("cluster-1", "vpc-1", cwi.AwsEventListenerOutcome.FILTERED_OTHER_VPC, cache_hit=False),
+        mock.call("cluster-1", "vpc-1", cwi.AwsEventListenerOutcome.FILTERED_OTHER_VPC, cache_hit=True),
+        mock.call("cluster-1", "vpc-1", cwi.AwsEventListenerOutcome.FILTERED_OTHER_VPC, cache_hit=True),
+    ]
+    assert expected_metrics_calls == mock_cwi.AwsEventListenerMetrics.call_args_list
+
+    expected_put_events_calls = []
+    assert expected_put_events_calls == mock_events.put_events.call_args_list
+
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.time")
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.cwi")
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.ec2i")
+@mock.patch("lambda_aws_event_listener.aws_event_listener_handler.events")
+def test_WHEN_handle_ec2_running_called_AND_non_mirrorable_enis_THEN_filters_them(mock_events, mock_ec2i, mock_cwi, mock_time):
+    # Set up our mock
+    mock_time.time.return_value = 1683127000.5
+    mock_events.get_event_timestamp = events.get_event_timestamp
+    mock_ec2i.get_enis_of_instance.return_value = [
+        ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "interface"),
+        ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-2", "nat_gateway"),
+    ]
+    mock_ec2i.NON_MIRRORABLE_ENI_TYPES = ec2i.NON_MIRRORABLE_ENI_TYPES
+    mock_cwi.AwsEventListenerOutcome = cwi.AwsEventListenerOutcome
+    mock_events.CreateEniMirrorEvent = events.CreateEniMirrorEvent
+
+    # Run our test
+    actual_return = AwsEventListenerHandler()._handle_ec2_running(
+        TEST_EVENT_EC2_RUNNING, "bus-1", "cluster-1", "vpc-1", "filter-1", 1234
+    )
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_metrics_calls = [
+        mock.call("cluster-1", "vpc-1", cwi.AwsEventListenerOutcome.PROCESSED, filtered_enis=1, cache_hit=False),
+    ]
+    assert expected_metrics_calls == mock_cwi.AwsEventListenerMetrics.call_args_list
+
+    expected_put_events_calls = [
+        mock.call(
+            [events.CreateEniMirrorEvent("cluster-1", "vpc-1", "subnet-1", "eni-1", "interface", "filter-1", 1234,
+                                         source_event_time=1683126879.0, published_time=1683127000.5)],
+            "bus-1",
+            mock.ANY
+        ),
+    ]
+    assert expected_put_events_calls == mock_events.put_events.call_args_list
+
 @mock.patch("lambda_aws_event_listener.aws_event_listener_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_aws_event_listener.aws_event_listener_handler.events")
 def test_WHEN_handle_fargate_running_called_THEN_as_expected(mock_events):
     # Set up our mock
+    mock_events.get_event_timestamp = events.get_event_timestamp
     mock_events.CreateEniMirrorEvent = events.CreateEniMirrorEvent
 
     # Run our test
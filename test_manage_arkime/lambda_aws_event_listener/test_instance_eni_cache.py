@@ -0,0 +1,37 @@
+import unittest.mock as mock
+
+import aws_interactions.ec2_interactions as ec2i
+from lambda_aws_event_listener.instance_eni_cache import InstanceEniCache
+
+@mock.patch("lambda_aws_event_listener.instance_eni_cache.time")
+def test_WHEN_InstanceEniCache_get_called_THEN_own_vpc_entries_expire(mock_time):
+    # Set up our mock
+    mock_time.time.return_value = 100
+    test_cache = InstanceEniCache(own_vpc_ttl=60)
+    test_cache.put("i-1", [ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "interface")])
+    test_cache.put("i-2", [ec2i.NetworkInterface("vpc-2", "subnet-2", "eni-2", "interface")])
+
+    # Run our test
+    mock_time.time.return_value = 200
+    result_own = test_cache.get("i-1", "vpc-1")
+    result_other = test_cache.get("i-2", "vpc-1")
+
+    # Check our results
+    assert None == result_own
+    assert [ec2i.NetworkInterface("vpc-2", "subnet-2", "eni-2", "interface")] == result_other
+    assert 1 == len(test_cache)
+
+def test_WHEN_InstanceEniCache_put_called_AND_full_THEN_evicts_least_recent():
+    # Set up our mock
+    test_cache = InstanceEniCache(max_entries=2)
+    test_cache.put("i-1", [])
+    test_cache.put("i-2", [])
+    test_cache.get("i-1", "vpc-1")
+
+    # Run our test
+    test_cache.put("i-3", [])
+
+    # Check our results
+    assert [] == test_cache.get("i-1", "vpc-1")
+    assert None == test_cache.get("i-2", "vpc-1")
+    assert [] == test_cache.get("i-3", "vpc-1")
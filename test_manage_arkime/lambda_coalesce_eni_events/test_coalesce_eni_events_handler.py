@@ -0,0 +1,131 @@
+import json
+import unittest.mock as mock
+
+import aws_interactions.cloudwatch_interactions as cwi
+import aws_interactions.lambda_interactions as lambdai
+import aws_interactions.ssm_operations as ssm_ops
+import core.constants as constants
+from lambda_coalesce_eni_events.coalesce_eni_events_handler import CoalesceEniEventsHandler
+
+TEST_ENV = {
+    "CLUSTER_NAME": "cluster-1",
+    "VPC_ID": "vpc-1",
+    "CREATE_LAMBDA_NAME": "create-1",
+    "DESTROY_LAMBDA_NAME": "destroy-1",
+    "DISPATCH_CONCURRENCY": "2",
+}
+
+def _raw_event(detail_type: str, eni_id: str, time: str):
+    return {
+        "detail-type": detail_type,
+        "source": constants.EVENT_SOURCE,
+        "time": time,
+        "detail": {"cluster_name": "cluster-1", "vpc_id": "vpc-1", "subnet_id": "subnet-1", "eni_id": eni_id},
+    }
+
+def _record(message_id: str, raw_event):
+    return {"messageId": message_id, "body": json.dumps(raw_event)}
+
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.cwi.emit_event_metrics")
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.ssm_ops")
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.lambdai")
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.os")
+def test_WHEN_CoalesceEniEventsHandler_handle_called_THEN_dispatches_coalesced_events(mock_os, mock_lambdai, mock_ssm_ops,
+                                                                                     mock_emit_metrics):
+    # Set up our mock
+    mock_os.environ = TEST_ENV
+
+    create_1 = _raw_event(constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, "eni-1", "2023-01-01T00:00:00Z")
+    create_2 = _raw_event(constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, "eni-2", "2023-01-01T00:00:00Z")
+    destroy_2 = _raw_event(constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR, "eni-2", "2023-01-01T00:00:05Z")
+    create_3 = _raw_event(constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, "eni-3", "2023-01-01T00:00:00Z")
+    destroy_3 = _raw_event(constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR, "eni-3", "2023-01-01T00:00:05Z")
+    test_event = {
+        "Records": [
+            _record("m-1", create_1),
+            _record("m-2", create_1),
+            _record("m-3", create_2),
+            _record("m-4", destroy_2),
+            _record("m-5", create_3),
+            _record("m-6", destroy_3),
+        ]
+    }
+
+    # eni-2 was never mirrored; eni-3 was mirrored by an earlier batch
+    mock_ssm_ops.ParamDoesNotExist = ssm_ops.ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = [ssm_ops.ParamDoesNotExist("param"), "{}"]
+    mock_lambdai.invoke_lambda.return_value = {"statusCode": 200}
+
+    # Run our test
+    actual_return = CoalesceEniEventsHandler().handler(test_event, {})
+
+    # Check our results
+    assert {"batchItemFailures": []} == actual_return
+
+    expected_invoke_calls = [
+        mock.call("create-1", create_1, mock.ANY),
+        mock.call("destroy-1", destroy_3, mock.ANY),
+    ]
+    assert sorted(expected_invoke_calls) == sorted(mock_lambdai.invoke_lambda.call_args_list)
+
+    expected_metrics_calls = [
+        mock.call(cwi.CoalesceEniEventsMetrics("cluster-1", "vpc-1", received=6, dispatched=2, coalesced=4, failed=0))
+    ]
+    assert expected_metrics_calls == mock_emit_metrics.call_args_list
+
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.cwi.emit_event_metrics")
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.lambdai")
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.os")
+def test_WHEN_CoalesceEniEventsHandler_handle_called_AND_dispatch_fails_THEN_reports_failures(mock_os, mock_lambdai,
+                                                                                             mock_emit_metrics):
+    # Set up our mock
+    mock_os.environ = TEST_ENV
+
+    create_1 = _raw_event(constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, "eni-1", "2023-01-01T00:00:00Z")
+    create_2 = _raw_event(constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR, "eni-2", "2023-01-01T00:00:00Z")
+    destroy_3 = _raw_event(constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR, "eni-3", "2023-01-01T00:00:00Z")
+    test_event = {
+        "Records": [
+            _record("m-1", create_1),
+            _record("m-2", create_1),
+            _record("m-3", create_2),
+            _record("m-4", destroy_3),
+            {"messageId": "m-5", "body": "garbage"},
+        ]
+    }
+
+    def mock_invoke(function_name, raw_event, aws_provider):
+        if raw_event == create_1:
+            return {"statusCode": 500}
+        if raw_event == destroy_3:
+            raise lambdai.LambdaInvocationFailed(function_name, "timed out")
+        return {"statusCode": 200}
+    mock_lambdai.invoke_lambda.side_effect = mock_invoke
+    mock_lambdai.LambdaInvocationFailed = lambdai.LambdaInvocationFailed
+
+    # Run our test
+    actual_return = CoalesceEniEventsHandler().handler(test_event, {})
+
+    # Check our results
+    expected_failures = [{"itemIdentifier": m} for m in ["m-5", "m-1", "m-2", "m-4"]]
+    assert {"batchItemFailures": expected_failures} == actual_return
+
+    expected_metrics_calls = [
+        mock.call(cwi.CoalesceEniEventsMetrics("cluster-1", "vpc-1", received=5, dispatched=3, coalesced=1, failed=3))
+    ]
+    assert expected_metrics_calls == mock_emit_metrics.call_args_list
+
+@mock.patch("lambda_coalesce_eni_events.coalesce_eni_events_handler.os")
+def test_WHEN_CoalesceEniEventsHandler_handle_called_AND_unexpected_error_THEN_retries_everything(mock_os):
+    # Set up our mock
+    mock_os.environ = {}
+
+    test_event = {"Records": [{"messageId": "m-1", "body": "{}"}, {"messageId": "m-2", "body": "{}"}]}
+
+    # Run our test
+    actual_return = CoalesceEniEventsHandler().handler(test_event, {})
+
+    # Check our results
+    assert {"batchItemFailures": [{"itemIdentifier": "m-1"}, {"itemIdentifier": "m-2"}]} == actual_return
@@ -0,0 +1,74 @@
+import json
+
+import core.constants as constants
+from lambda_coalesce_eni_events.eni_event_coalescer import coalesce_eni_events
+
+
+def _record(message_id: str, detail_type: str, eni_id: str, time: str):
+    return {
+        "messageId": message_id,
+        "body": json.dumps({
+            "detail-type": detail_type,
+            "source": constants.EVENT_SOURCE,
+            "time": time,
+            "detail": {"cluster_name": "cluster-1", "vpc_id": "vpc-1", "subnet_id": "subnet-1", "eni_id": eni_id},
+        })
+    }
+
+CREATE = constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR
+DESTROY = constants.EVENT_DETAIL_TYPE_DESTROY_ENI_MIRROR
+
+def test_WHEN_coalesce_eni_events_called_AND_duplicates_THEN_collapsed():
+    # Set up our mock
+    test_records = [
+        _record("m-1", CREATE, "eni-1", "2023-01-01T00:00:00Z"),
+        _record("m-2", CREATE, "eni-1", "2023-01-01T00:00:01Z"),
+        _record("m-3", CREATE, "eni-2", "2023-01-01T00:00:01Z"),
+        _record("m-4", DESTROY, "eni-3", "2023-01-01T00:00:02Z"),
+        _record("m-5", DESTROY, "eni-3", "2023-01-01T00:00:02Z"),
+    ]
+
+    # Run our test
+    actual_batch = coalesce_eni_events(test_records)
+
+    # Check our results
+    assert 5 == actual_batch.num_received
+    assert [] == actual_batch.cancelled
+    assert [("eni-1", CREATE, ["m-1", "m-2"]), ("eni-2", CREATE, ["m-3"]), ("eni-3", DESTROY, ["m-4", "m-5"])] == [
+        (e.eni_id, e.detail_type, e.message_ids) for e in actual_batch.to_dispatch
+    ]
+
+def test_WHEN_coalesce_eni_events_called_AND_create_destroy_pair_THEN_cancelled():
+    # Set up our mock
+    test_records = [
+        _record("m-2", DESTROY, "eni-1", "2023-01-01T00:00:09Z"),
+        _record("m-1", CREATE, "eni-1", "2023-01-01T00:00:00Z"),
+        _record("m-3", DESTROY, "eni-2", "2023-01-01T00:00:00Z"),
+        _record("m-4", CREATE, "eni-2", "2023-01-01T00:00:09Z"),
+    ]
+
+    # Run our test
+    actual_batch = coalesce_eni_events(test_records)
+
+    # Check our results
+    assert [("eni-1", DESTROY, ["m-1", "m-2"])] == [
+        (e.eni_id, e.detail_type, e.message_ids) for e in actual_batch.cancelled
+    ]
+    assert [("eni-2", CREATE, ["m-3", "m-4"])] == [
+        (e.eni_id, e.detail_type, e.message_ids) for e in actual_batch.to_dispatch
+    ]
+
+def test_WHEN_coalesce_eni_events_called_AND_malformed_THEN_flagged():
+    # Set up our mock
+    test_records = [
+        {"messageId": "m-1", "body": "not json"},
+        {"messageId": "m-2", "body": json.dumps({"detail-type": "Other", "detail": {"eni_id": "eni-1"}})},
+        _record("m-3", CREATE, "eni-1", "2023-01-01T00:00:00Z"),
+    ]
+
+    # Run our test
+    actual_batch = coalesce_eni_events(test_records)
+
+    # Check our results
+    assert ["m-1", "m-2"] == actual_batch.malformed_message_ids
+    assert ["eni-1"] == [e.eni_id for e in actual_batch.to_dispatch]
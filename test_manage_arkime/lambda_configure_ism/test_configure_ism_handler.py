@@ -57,7 +57,10 @@ def test_WHEN_ConfigureIsmHandler_handle_called_THEN_sets_up_mirroring(mock_cwi,
         mock.call(
             30,
             1,
-            mock.ANY
+            mock.ANY,
+            None,
+            False,
+            None
         ),
     ]
     assert expected_setup_sessions_calls == mock_setup_sessions.call_args_list
@@ -67,11 +70,77 @@ def test_WHEN_ConfigureIsmHandler_handle_called_THEN_sets_up_mirroring(mock_cwi,
             cwi.ConfigureIsmEventMetrics(
                 "cluster_name",
                 cwi.ConfigureIsmEventOutcome.SUCCESS
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+
+@mock.patch("lambda_configure_ism.configure_ism_handler.os")
+@mock.patch("lambda_configure_ism.configure_ism_handler.templates.setup_sessions_shards_template")
+@mock.patch("lambda_configure_ism.configure_ism_handler.ism.setup_sessions_ism", mock.Mock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.ism.setup_user_history_ism", mock.Mock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.AwsClientProvider", mock.MagicMock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.cwi", mock.Mock())
+def test_WHEN_ConfigureIsmHandler_handle_called_AND_shards_planned_THEN_sets_up_template(mock_setup_template, mock_os):
+    # Set up our mock
+    mock_os.environ = {"CLUSTER_NAME": "cluster_name", "OPENSEARCH_ENDPOINT": "endpoint", "OPENSEARCH_SECRET_ARN": "arn"}
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CONFIGURE_ISM,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "history_days": 365,
+            "spi_days": 30,
+            "replicas": 1,
+            "sessions_shards": 6,
+        }
+    }
+
+    actual_return = ConfigureIsmHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_setup_template_calls = [
+        mock.call(6, mock.ANY),
+    ]
+    assert expected_setup_template_calls == mock_setup_template.call_args_list
+
+@mock.patch("lambda_configure_ism.configure_ism_handler.os")
+@mock.patch("lambda_configure_ism.configure_ism_handler.templates.setup_sessions_index_profile")
+@mock.patch("lambda_configure_ism.configure_ism_handler.ism.setup_sessions_ism", mock.Mock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.ism.setup_user_history_ism", mock.Mock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.AwsClientProvider", mock.MagicMock())
+@mock.patch("lambda_configure_ism.configure_ism_handler.cwi", mock.Mock())
+def test_WHEN_ConfigureIsmHandler_handle_called_AND_index_profile_THEN_sets_it_up(mock_setup_profile, mock_os):
+    # Set up our mock
+    mock_os.environ = {"CLUSTER_NAME": "cluster_name", "OPENSEARCH_ENDPOINT": "endpoint", "OPENSEARCH_SECRET_ARN": "arn"}
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CONFIGURE_ISM,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "history_days": 365,
+            "spi_days": 30,
+            "replicas": 1,
+            "index_profile": "ingest",
+            "sessions_rotation": "weekly",
+        }
+    }
+
+    actual_return = ConfigureIsmHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_setup_profile_calls = [
+        mock.call("ingest", False, mock.ANY, "weekly"),
+    ]
+    assert expected_setup_profile_calls == mock_setup_profile.call_args_list
 
 @mock.patch("lambda_configure_ism.configure_ism_handler.os")
 @mock.patch("lambda_configure_ism.configure_ism_handler.ism.setup_sessions_ism")
@@ -124,8 +193,7 @@ def test_WHEN_ConfigureIsmHandler_handle_called_AND_unhandled_ex_THEN_handles_gr
             cwi.ConfigureIsmEventMetrics(
                 "cluster_name",
                 cwi.ConfigureIsmEventOutcome.FAILURE
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
\ No newline at end of file
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
\ No newline at end of file
@@ -4,24 +4,33 @@ import unittest.mock as mock
 from lambda_create_eni_mirror.create_eni_mirror_handler import CreateEniMirrorHandler
 import aws_interactions.cloudwatch_interactions as cwi
 import aws_interactions.ec2_interactions as ec2i
-from aws_interactions.ssm_operations import ParamDoesNotExist
+from aws_interactions.ssm_operations import ParamAlreadyExists, ParamDoesNotExist
 import core.constants as constants
+from core.mirror_placement import TargetLoad
+from core.mirror_profile import MirrorProfile
 
+def _mirror_eni(eni: ec2i.NetworkInterface, traffic_target: str, traffic_filter: str, vpc_id: str, aws_provider,
+                virtual_network: int = 123, packet_length: int = None) -> ec2i.MirrorSession:
+    return ec2i.MirrorSession("session-1", eni.eni_id, traffic_target, traffic_filter, virtual_network)
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
-def test_WHEN_CreateEniMirrorHandler_handle_called_THEN_sets_up_mirroring(mock_ec2i, mock_ssm_ops, mock_cwi):
+def test_WHEN_CreateEniMirrorHandler_handle_called_THEN_sets_up_mirroring(mock_ec2i, mock_ssm_ops, mock_cwi, mock_placement):
     # Set up our mock
     mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
     mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
 
     mock_ec2i.NetworkInterface = ec2i.NetworkInterface
-    mock_ec2i.mirror_eni.return_value = "session-1"
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
 
     mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
     mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
-    mock_ssm_ops.get_ssm_param_json_value.return_value = "target-1"
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
 
     # Run our test
     test_event = {
@@ -51,7 +60,8 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_THEN_sets_up_mirroring(mock_e
             "filter-1",
             "vpc-1",
             mock.ANY,
-            virtual_network=1234
+            virtual_network=1234,
+            packet_length=None
         ),
     ]
     assert expected_mirror_calls == mock_ec2i.mirror_eni.call_args_list
@@ -59,7 +69,7 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_THEN_sets_up_mirroring(mock_e
     expected_put_calls = [
         mock.call(
             constants.get_eni_ssm_param_name("cluster-1", "vpc-1", "subnet-1", "eni-1"), 
-            json.dumps({"eniId": "eni-1", "trafficSessionId": "session-1"}),
+            json.dumps({"eniId": "eni-1", "trafficSessionId": "session-1", "mirrorTargetId": "target-1"}),
             mock.ANY,
             description=mock.ANY,
             pattern=".*"
@@ -73,11 +83,118 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_THEN_sets_up_mirroring(mock_e
                 "cluster-1", 
                 "vpc-1",
                 cwi.CreateEniMirrorEventOutcome.SUCCESS
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_mirrored_concurrently_elsewhere_THEN_records_its_target(mock_ec2i, mock_ssm_ops,
+                                                                                                               mock_placement):
+    # Set up our mock
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.return_value = ec2i.MirrorSession("session-2", "eni-1", "target-2", "filter-1", 1234)
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_put_calls = [
+        mock.call(
+            constants.get_eni_ssm_param_name("cluster-1", "vpc-1", "subnet-1", "eni-1"),
+            json.dumps({"eniId": "eni-1", "trafficSessionId": "session-2", "mirrorTargetId": "target-2"}),
+            mock.ANY,
+            description=mock.ANY,
+            pattern=".*"
+        ),
+    ]
+    assert expected_put_calls == mock_ssm_ops.put_ssm_param.call_args_list
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.time")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_source_time_THEN_emits_latency(mock_ec2i, mock_ssm_ops, mock_cwi,
+                                                                                     mock_placement, mock_time):
+    # Set up our mock
+    mock_time.time.side_effect = [1000.5, 1002.0]
+
+    mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
+    mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
+    mock_cwi.CreateEniMirrorLatencyMetrics = cwi.CreateEniMirrorLatencyMetrics
+
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234,
+            "source_event_time": 990.0,
+            "published_time": 999.0
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_put_metrics_calls = [
+        mock.call(cwi.CreateEniMirrorEventMetrics("cluster-1", "vpc-1", cwi.CreateEniMirrorEventOutcome.SUCCESS)),
+        mock.call(cwi.CreateEniMirrorLatencyMetrics("cluster-1", "vpc-1", 990.0, 999.0, 1000.5, 1002.0)),
+    ]
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+
+    actual_latency_metrics = mock_cwi.emit_event_metrics.call_args_list[1].args[0]
+    assert 9000 == actual_latency_metrics.value_listener
+    assert 1500 == actual_latency_metrics.value_delivery
+    assert 1500 == actual_latency_metrics.value_create
+    assert 12000 == actual_latency_metrics.value_end_to_end
 
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
@@ -89,7 +206,7 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_already_mirrored_THEN_abo
     mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
 
     mock_ec2i.NetworkInterface = ec2i.NetworkInterface
-    mock_ec2i.mirror_eni.return_value = "session-1"
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
 
     mock_ssm_ops.get_ssm_param_value.return_value = "blah"
     mock_ssm_ops.get_ssm_param_json_value.return_value = "target-1"
@@ -127,17 +244,71 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_already_mirrored_THEN_abo
                 "cluster-1", 
                 "vpc-1",
                 cwi.CreateEniMirrorEventOutcome.ABORTED_EXISTS
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
     
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_concurrently_mirrored_THEN_aborts(mock_ec2i, mock_ssm_ops, mock_cwi, mock_placement):
+    # Set up our mock
+    mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
+    mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
+
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.ParamAlreadyExists = ParamAlreadyExists
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
+    mock_ssm_ops.put_ssm_param.side_effect = ParamAlreadyExists("")
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_put_metrics_calls = [
+        mock.call(
+            cwi.CreateEniMirrorEventMetrics(
+                "cluster-1",
+                "vpc-1",
+                cwi.CreateEniMirrorEventOutcome.ABORTED_EXISTS
+            )
+        ),
+    ]
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
-def test_WHEN_CreateEniMirrorHandler_handle_called_AND_wrong_type_THEN_aborts(mock_ec2i, mock_ssm_ops, mock_cwi):
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_wrong_type_THEN_aborts(mock_ec2i, mock_ssm_ops, mock_cwi, mock_placement):
     # Set up our mock
     mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
     mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
@@ -148,7 +319,8 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_wrong_type_THEN_aborts(mo
 
     mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
     mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
-    mock_ssm_ops.get_ssm_param_json_value.return_value = "target-1"
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
 
     # Run our test
     test_event = {
@@ -178,7 +350,8 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_wrong_type_THEN_aborts(mo
             "filter-1",
             "vpc-1",
             mock.ANY,
-            virtual_network=1234
+            virtual_network=1234,
+            packet_length=None
         ),
     ]
     assert expected_mirror_calls == mock_ec2i.mirror_eni.call_args_list
@@ -192,11 +365,10 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_wrong_type_THEN_aborts(mo
                 "cluster-1", 
                 "vpc-1",
                 cwi.CreateEniMirrorEventOutcome.ABORTED_ENI_TYPE
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
 
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
@@ -208,7 +380,7 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_unhandled_ex_THEN_handles
     mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
 
     mock_ec2i.NetworkInterface = ec2i.NetworkInterface
-    mock_ec2i.mirror_eni.return_value = "session-1"
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
 
     mock_ssm_ops.get_ssm_param_value.side_effect = Exception("boom")
     mock_ssm_ops.get_ssm_param_json_value.return_value = "target-1"
@@ -246,8 +418,239 @@ def test_WHEN_CreateEniMirrorHandler_handle_called_AND_unhandled_ex_THEN_handles
                 "cluster-1", 
                 "vpc-1",
                 cwi.CreateEniMirrorEventOutcome.FAILURE
-            ),
-            mock.ANY
+            )
+        ),
+    ]
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_session_exists_THEN_reuses_target(mock_ec2i, mock_ssm_ops, mock_cwi, mock_placement):
+    # Set up our mock
+    mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
+    mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
+
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = [
+        ec2i.MirrorSession("session-0", "eni-1", "target-0", "other-filter", 1),
+        ec2i.MirrorSession("session-1", "eni-1", "target-2", "filter-1", 1234),
+    ]
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    assert not mock_placement.get_target_loads.called
+
+    expected_mirror_calls = [
+        mock.call(
+            ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "eni-type-1"),
+            "target-2",
+            "filter-1",
+            "vpc-1",
+            mock.ANY,
+            virtual_network=1234,
+            packet_length=None
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
\ No newline at end of file
+    assert expected_mirror_calls == mock_ec2i.mirror_eni.call_args_list
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile",
+            mock.Mock(return_value=MirrorProfile(maxSessionsPerTarget=2)))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement.get_target_loads")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_targets_full_THEN_uses_least_loaded(mock_ec2i, mock_ssm_ops, mock_cwi,
+                                                                                         mock_get_loads):
+    # Set up our mock
+    mock_cwi.CreateEniMirrorEventMetrics = cwi.CreateEniMirrorEventMetrics
+    mock_cwi.CreateEniMirrorEventOutcome = cwi.CreateEniMirrorEventOutcome
+
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+
+    mock_get_loads.return_value = [
+        TargetLoad("target-1", "subnet-1", "az-1", 3, 2),
+        TargetLoad("target-2", "subnet-2", "az-1", 2, 2),
+    ]
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_get_loads_calls = [mock.call("cluster-1", "vpc-1", "filter-1", mock.ANY, 2)]
+    assert expected_get_loads_calls == mock_get_loads.call_args_list
+
+    expected_mirror_calls = [
+        mock.call(
+            ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "eni-type-1"),
+            "target-2",
+            "filter-1",
+            "vpc-1",
+            mock.ANY,
+            virtual_network=1234,
+            packet_length=None
+        ),
+    ]
+    assert expected_mirror_calls == mock_ec2i.mirror_eni.call_args_list
+
+    expected_put_metrics_calls = [
+        mock.call(
+            cwi.CreateEniMirrorEventMetrics(
+                "cluster-1",
+                "vpc-1",
+                cwi.CreateEniMirrorEventOutcome.SUCCESS,
+                over_capacity=True
+            )
+        ),
+    ]
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile", mock.Mock(return_value=MirrorProfile()))
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement.get_target_loads")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_warm_THEN_reuses_target_loads(mock_ec2i, mock_ssm_ops, mock_get_loads):
+    # Set up our mock
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+
+    mock_get_loads.return_value = [
+        TargetLoad("target-1", "subnet-1", "az-1", 0, 10),
+        TargetLoad("target-2", "subnet-2", "az-1", 0, 10),
+    ]
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    def build_event(eni_id: str):
+        return {
+            "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+            "source": constants.EVENT_SOURCE,
+            "detail": {
+                "cluster_name": "cluster-1",
+                "vpc_id": "vpc-1",
+                "subnet_id": "subnet-1",
+                "eni_id": eni_id,
+                "eni_type": "eni-type-1",
+                "traffic_filter_id": "filter-1",
+                "vni": 1234
+            }
+        }
+
+    # Run our test
+    handler = CreateEniMirrorHandler()
+    handler.handler(build_event("eni-1"), {})
+    handler.handler(build_event("eni-2"), {})
+
+    # Check our results
+    assert 1 == mock_get_loads.call_count
+
+    expected_targets = ["target-1", "target-2"]
+    assert expected_targets == [mirror_call.args[1] for mirror_call in mock_ec2i.mirror_eni.call_args_list]
+
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.get_vpc_mirror_profile")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.placement")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.AwsClientProvider", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.cwi", mock.Mock())
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ssm_ops")
+@mock.patch("lambda_create_eni_mirror.create_eni_mirror_handler.ec2i")
+def test_WHEN_CreateEniMirrorHandler_handle_called_AND_profile_truncates_THEN_applies_subnet_length(mock_ec2i, mock_ssm_ops, mock_placement,
+                                                                                                    mock_get_profile):
+    # Set up our mock
+    mock_ec2i.NetworkInterface = ec2i.NetworkInterface
+    mock_ec2i.mirror_eni.side_effect = _mirror_eni
+    mock_ec2i.get_mirror_sessions_of_eni.return_value = []
+    mock_placement.MirrorPlacementPlanner.return_value.place.return_value = TargetLoad("target-1", "subnet-1", "az-1", 1, 10)
+
+    mock_ssm_ops.ParamDoesNotExist = ParamDoesNotExist
+    mock_ssm_ops.get_ssm_param_value.side_effect = ParamDoesNotExist("")
+
+    mock_get_profile.return_value = MirrorProfile(packetLength=128, subnetOverrides={"subnet-1": {"packetLength": 64}})
+
+    # Run our test
+    test_event = {
+        "detail-type": constants.EVENT_DETAIL_TYPE_CREATE_ENI_MIRROR,
+        "source": constants.EVENT_SOURCE,
+        "detail": {
+            "cluster_name": "cluster-1",
+            "vpc_id": "vpc-1",
+            "subnet_id": "subnet-1",
+            "eni_id": "eni-1",
+            "eni_type": "eni-type-1",
+            "traffic_filter_id": "filter-1",
+            "vni": 1234
+        }
+    }
+
+    actual_return = CreateEniMirrorHandler().handler(test_event, {})
+
+    # Check our results
+    expected_return = {"statusCode": 200}
+    assert expected_return == actual_return
+
+    expected_get_profile_calls = [mock.call("cluster-1", "vpc-1", mock.ANY)]
+    assert expected_get_profile_calls == mock_get_profile.call_args_list
+
+    expected_mirror_calls = [
+        mock.call(
+            ec2i.NetworkInterface("vpc-1", "subnet-1", "eni-1", "eni-type-1"),
+            "target-1",
+            "filter-1",
+            "vpc-1",
+            mock.ANY,
+            virtual_network=1234,
+            packet_length=64
+        ),
+    ]
+    assert expected_mirror_calls == mock_ec2i.mirror_eni.call_args_list
@@ -0,0 +1,26 @@
+import unittest.mock as mock
+
+from core.mirror_placement import TargetLoad
+from lambda_create_eni_mirror.target_load_cache import TargetLoadCache
+
+@mock.patch("lambda_create_eni_mirror.target_load_cache.time")
+def test_WHEN_TargetLoadCache_get_called_THEN_entries_expire(mock_time):
+    # Set up our mock
+    mock_time.time.return_value = 100
+    test_cache = TargetLoadCache(ttl=300)
+    test_loads = [TargetLoad("target-1", "subnet-1", "az-1", 1, 10)]
+    test_cache.put("vpc-1", "filter-1", 10, test_loads)
+
+    # Run our test
+    mock_time.time.return_value = 300
+    result_fresh = test_cache.get("vpc-1", "filter-1", 10)
+    result_other_limit = test_cache.get("vpc-1", "filter-1", 20)
+
+    mock_time.time.return_value = 500
+    result_stale = test_cache.get("vpc-1", "filter-1", 10)
+
+    # Check our results
+    assert test_loads == result_fresh
+    assert None == result_other_limit
+    assert None == result_stale
+    assert 0 == len(test_cache)
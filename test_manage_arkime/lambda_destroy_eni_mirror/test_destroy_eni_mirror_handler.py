@@ -57,11 +57,10 @@ def test_WHEN_DestroyEniMirrorHandler_handle_called_THEN_destroys_mirroring(mock
                 "cluster-1", 
                 "vpc-1",
                 cwi.DestroyEniMirrorEventOutcome.SUCCESS
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
 
 @mock.patch("lambda_destroy_eni_mirror.destroy_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_destroy_eni_mirror.destroy_eni_mirror_handler.cwi")
@@ -117,11 +116,10 @@ def test_WHEN_DestroyEniMirrorHandler_handle_called_AND_session_doesnt_exist_THE
                 "cluster-1", 
                 "vpc-1",
                 cwi.DestroyEniMirrorEventOutcome.SUCCESS
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
 
 @mock.patch("lambda_destroy_eni_mirror.destroy_eni_mirror_handler.AwsClientProvider", mock.Mock())
 @mock.patch("lambda_destroy_eni_mirror.destroy_eni_mirror_handler.cwi")
@@ -164,8 +162,7 @@ def test_WHEN_DestroyEniMirrorHandler_handle_called_AND_unhandled_ex_THEN_handle
                 "cluster-1", 
                 "vpc-1",
                 cwi.DestroyEniMirrorEventOutcome.FAILURE
-            ),
-            mock.ANY
+            )
         ),
     ]
-    assert expected_put_metrics_calls == mock_cwi.put_event_metrics.call_args_list
\ No newline at end of file
+    assert expected_put_metrics_calls == mock_cwi.emit_event_metrics.call_args_list
\ No newline at end of file
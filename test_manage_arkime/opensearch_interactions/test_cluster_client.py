@@ -0,0 +1,51 @@
+import json
+from requests.auth import HTTPBasicAuth
+import unittest.mock as mock
+
+import core.constants as constants
+from opensearch_interactions.cluster_client import get_cluster_os_client
+from opensearch_interactions.opensearch_client import OpenSearchClient
+
+
+@mock.patch("opensearch_interactions.cluster_client.ssm_ops")
+def test_WHEN_get_cluster_os_client_called_THEN_as_expected(mock_ssm):
+    # Set up our mock
+    mock_ssm.get_ssm_param_value.return_value = json.dumps(
+        {"domainArn": "arn", "domainName": "domain-1", "domainSecret": "secret-1"}
+    )
+
+    mock_provider = mock.Mock()
+    mock_provider.get_opensearch.return_value.describe_domain.return_value = {
+        "DomainStatus": {"Endpoints": {"vpc": "vpc-domain-1.region.es.amazonaws.com"}}
+    }
+    mock_provider.get_secretsmanager.return_value.get_secret_value.return_value = {"SecretString": "password"}
+
+    # TEST 1: Defaults to the Domain's VPC endpoint
+    actual_value = get_cluster_os_client("cluster-1", mock_provider)
+
+    expected_value = OpenSearchClient("https://vpc-domain-1.region.es.amazonaws.com", 443, HTTPBasicAuth("admin", "password"))
+    assert expected_value == actual_value
+
+    expected_get_ssm_calls = [
+        mock.call(constants.get_opensearch_domain_ssm_param_name("cluster-1"), mock_provider)
+    ]
+    assert expected_get_ssm_calls == mock_ssm.get_ssm_param_value.call_args_list
+
+    expected_describe_calls = [
+        mock.call(DomainName="domain-1")
+    ]
+    assert expected_describe_calls == mock_provider.get_opensearch.return_value.describe_domain.call_args_list
+
+    expected_secret_calls = [
+        mock.call(SecretId="secret-1")
+    ]
+    assert expected_secret_calls == mock_provider.get_secretsmanager.return_value.get_secret_value.call_args_list
+
+    # TEST 2: Uses the supplied endpoint instead
+    mock_provider.get_opensearch.reset_mock()
+
+    actual_value = get_cluster_os_client("cluster-1", mock_provider, "localhost")
+
+    expected_value = OpenSearchClient("https://localhost", 443, HTTPBasicAuth("admin", "password"))
+    assert expected_value == actual_value
+    assert not mock_provider.get_opensearch.called
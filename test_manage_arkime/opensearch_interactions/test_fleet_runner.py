@@ -0,0 +1,72 @@
+import threading
+import unittest.mock as mock
+
+import requests
+
+import opensearch_interactions.fleet_runner as fleet
+
+
+def _get_client(cluster_name: str) -> mock.Mock:
+    client = mock.Mock()
+    client.cluster_name = cluster_name
+    client.timings.get_summary.return_value = {"GET /_cluster/health": {"count": 1, "mean": 0.1, "max": 0.1}}
+    return client
+
+def test_WHEN_run_on_fleet_called_THEN_as_expected():
+    # Set up our test
+    def operation(client):
+        if client.cluster_name == "cluster-2":
+            return mock.Mock(spec=fleet.ops.RESTResponse, succeeded=False, status_code=503, response_text="busy",
+                             response_json=None)
+        if client.cluster_name == "cluster-3":
+            raise requests.exceptions.ConnectionError("unreachable")
+        return mock.Mock(spec=fleet.ops.RESTResponse, succeeded=True, response_json={"status": "green"})
+
+    # Run our test
+    actual_value = fleet.run_on_fleet(["cluster-1", "cluster-2", "cluster-3"], _get_client, operation)
+
+    # Check our results
+    assert ["cluster-1", "cluster-2", "cluster-3"] == [result.clusterName for result in actual_value]
+
+    assert actual_value[0].succeeded
+    assert {"status": "green"} == actual_value[0].result
+    assert None == actual_value[0].error
+    assert {"GET /_cluster/health": {"count": 1, "mean": 0.1, "max": 0.1}} == actual_value[0].requestTimings
+
+    assert not actual_value[1].succeeded
+    assert "503: busy" == actual_value[1].error
+
+    assert not actual_value[2].succeeded
+    assert "unreachable" == actual_value[2].error
+
+    assert all(result.durationSeconds >= 0 for result in actual_value)
+
+def test_WHEN_run_on_fleet_called_AND_client_fails_THEN_captured():
+    # Set up our test
+    def get_client(cluster_name):
+        raise Exception("no secret")
+
+    # Run our test
+    actual_value = fleet.run_on_fleet(["cluster-1"], get_client, lambda client: client.get_cluster_health())
+
+    # Check our results
+    expected_value = fleet.FleetResult("cluster-1", False, None, "no secret", mock.ANY, {})
+    assert [expected_value] == actual_value
+
+def test_WHEN_run_on_fleet_called_THEN_runs_concurrently():
+    # Set up our test; each operation waits until all of them have started
+    barrier = threading.Barrier(3, timeout=5)
+
+    def operation(client):
+        barrier.wait()
+        return client.cluster_name
+
+    # Run our test
+    actual_value = fleet.run_on_fleet(["cluster-1", "cluster-2", "cluster-3"], _get_client, operation, max_workers=3)
+
+    # Check our results
+    assert ["cluster-1", "cluster-2", "cluster-3"] == [result.result for result in actual_value]
+    assert all(result.succeeded for result in actual_value)
+
+    # No clusters, no work
+    assert [] == fleet.run_on_fleet([], _get_client, operation)
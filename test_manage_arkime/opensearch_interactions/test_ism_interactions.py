@@ -17,14 +17,28 @@ REPLICAS = 2
 SEQ_NO = 1
 PRIMARY_TERM = 1
 
+def _get_explain_response(index_policies: dict) -> mock.Mock:
+    explain_resp = mock.Mock()
+    explain_resp.succeeded = True
+    explain_resp.response_json = {
+        index: {ism.EXPLAIN_POLICY_ID_KEY: policy_id}
+        for index, policy_id in index_policies.items()
+    }
+    explain_resp.response_json["total_managed_indices"] = len([p for p in index_policies.values() if p])
+    return explain_resp
+
 def test_WHEN_setup_user_history_ism_AND_exists_THEN_as_expected():
     # Set up our mock
     mock_client = mock.Mock()
 
     policy_resp = mock.Mock()
-    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM}
+    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM, "policy": POLICY}
     policy_resp.succeeded = True
     mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({
+        "arkime_history_v1-23w18": policies.ISM_ID_HISTORY,
+        "arkime_history_v1-23w19": None,
+    })
 
     # Run our test
     ism.setup_user_history_ism(HISTORY_DAYS, mock_client)
@@ -45,10 +59,15 @@ def test_WHEN_setup_user_history_ism_AND_exists_THEN_as_expected():
     ]
     assert expected_update_ism_calls == mock_client.update_ism_policy.call_args_list
 
+    expected_explain_calls = [
+        mock.call(policies.INDEX_PATTERN_HISTORY)
+    ]
+    assert expected_explain_calls == mock_client.explain_ism_policy.call_args_list
+
     expected_set_ism_calls = [
         mock.call(
             policies.ISM_ID_HISTORY,
-            policies.INDEX_PATTERN_HISTORY,
+            "arkime_history_v1-23w18",
         )
     ]
     assert expected_set_ism_calls == mock_client.set_ism_policy_of_index.call_args_list
@@ -56,7 +75,7 @@ def test_WHEN_setup_user_history_ism_AND_exists_THEN_as_expected():
     expected_add_ism_calls = [
         mock.call(
             policies.ISM_ID_HISTORY,
-            policies.INDEX_PATTERN_HISTORY,
+            "arkime_history_v1-23w19",
         )
     ]
     assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
@@ -68,6 +87,10 @@ def test_WHEN_setup_user_history_ism_AND_doesnt_exists_THEN_as_expected():
     policy_resp = mock.Mock()
     policy_resp.succeeded = False
     mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({
+        "arkime_history_v1-23w18": None,
+        "arkime_history_v1-23w19": None,
+    })
 
     # Run our test
     ism.setup_user_history_ism(HISTORY_DAYS, mock_client)
@@ -95,7 +118,7 @@ def test_WHEN_setup_user_history_ism_AND_doesnt_exists_THEN_as_expected():
     expected_add_ism_calls = [
         mock.call(
             policies.ISM_ID_HISTORY,
-            policies.INDEX_PATTERN_HISTORY,
+            "arkime_history_v1-23w18,arkime_history_v1-23w19",
         )
     ]
     assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
@@ -105,9 +128,13 @@ def test_WHEN_setup_sessions_ism_AND_exists_THEN_as_expected():
     mock_client = mock.Mock()
 
     policy_resp = mock.Mock()
-    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM}
+    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM, "policy": POLICY}
     policy_resp.succeeded = True
     mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({
+        "arkime_sessions3-230507": policies.ISM_ID_SESSIONS,
+        "arkime_sessions3-230508": policies.ISM_ID_SESSIONS,
+    })
 
     # Run our test
     ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client)
@@ -131,16 +158,73 @@ def test_WHEN_setup_sessions_ism_AND_exists_THEN_as_expected():
     expected_set_ism_calls = [
         mock.call(
             policies.ISM_ID_SESSIONS,
-            policies.INDEX_PATTERN_SESSIONS,
+            "arkime_sessions3-230507,arkime_sessions3-230508",
         )
     ]
     assert expected_set_ism_calls == mock_client.set_ism_policy_of_index.call_args_list
 
+    expected_add_ism_calls = []
+    assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
+
+def test_WHEN_setup_sessions_ism_AND_unchanged_THEN_skips_update():
+    # Set up our mock
+    mock_client = mock.Mock()
+
+    # OpenSearch returns the stored policy with extra fields filled in
+    stored_policy = policies.get_sessions_ism_policy(1, SPI_DAYS - 1, REPLICAS, 1)["policy"]
+    stored_policy["policy_id"] = policies.ISM_ID_SESSIONS
+    stored_policy["last_updated_time"] = 1683504000000
+    stored_policy["states"][0]["actions"] = []
+    stored_policy["states"][1]["actions"][1]["retry"] = {"count": 3, "backoff": "exponential", "delay": "1m"}
+
+    policy_resp = mock.Mock()
+    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM, "policy": stored_policy}
+    policy_resp.succeeded = True
+    mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({
+        "arkime_sessions3-230506": "other_policy",
+        "arkime_sessions3-230507": policies.ISM_ID_SESSIONS,
+        "arkime_sessions3-230508": None,
+    })
+
+    # Run our test
+    ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client)
+
+    # Check the results
+    assert not mock_client.update_ism_policy.called
+    assert not mock_client.create_ism_policy.called
+
+    expected_set_ism_calls = [
+        mock.call(policies.ISM_ID_SESSIONS, "arkime_sessions3-230506")
+    ]
+    assert expected_set_ism_calls == mock_client.set_ism_policy_of_index.call_args_list
+
     expected_add_ism_calls = [
-        mock.call(
-            policies.ISM_ID_SESSIONS,
-            policies.INDEX_PATTERN_SESSIONS,
-        )
+        mock.call(policies.ISM_ID_SESSIONS, "arkime_sessions3-230508")
+    ]
+    assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
+
+def test_WHEN_setup_sessions_ism_AND_cant_explain_THEN_uses_pattern():
+    # Set up our mock
+    mock_client = mock.Mock()
+
+    policy_resp = mock.Mock()
+    policy_resp.response_json = {"_seq_no": SEQ_NO, "_primary_term": PRIMARY_TERM, "policy": POLICY}
+    policy_resp.succeeded = True
+    mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = mock.Mock(succeeded=False)
+
+    # Run our test
+    ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client)
+
+    # Check the results
+    expected_set_ism_calls = [
+        mock.call(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS)
+    ]
+    assert expected_set_ism_calls == mock_client.set_ism_policy_of_index.call_args_list
+
+    expected_add_ism_calls = [
+        mock.call(policies.ISM_ID_SESSIONS, policies.INDEX_PATTERN_SESSIONS)
     ]
     assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
 
@@ -151,6 +235,7 @@ def test_WHEN_setup_sessions_ism_AND_doesnt_exists_THEN_as_expected():
     policy_resp = mock.Mock()
     policy_resp.succeeded = False
     mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({})
 
     # Run our test
     ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client)
@@ -175,10 +260,114 @@ def test_WHEN_setup_sessions_ism_AND_doesnt_exists_THEN_as_expected():
     ]
     assert expected_create_ism_calls == mock_client.create_ism_policy.call_args_list
 
-    expected_add_ism_calls = [
+    expected_add_ism_calls = []
+    assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
+
+def test_WHEN_is_policy_current_called_THEN_as_expected():
+    desired = policies.get_user_history_ism_policy(HISTORY_DAYS)["policy"]
+
+    # TEST 1: Extra fields filled in by OpenSearch are ignored
+    existing = policies.get_user_history_ism_policy(HISTORY_DAYS)["policy"]
+    existing["schema_version"] = 17
+    existing["ism_template"][0]["last_updated_time"] = 1683504000000
+    assert ism.is_policy_current(desired, existing)
+
+    # TEST 2: Changed values are detected
+    existing = policies.get_user_history_ism_policy(HISTORY_DAYS + 1)["policy"]
+    assert not ism.is_policy_current(desired, existing)
+
+    # TEST 3: Missing or extra list items are detected
+    existing = policies.get_user_history_ism_policy(HISTORY_DAYS)["policy"]
+    existing["states"].append({"name": "cold"})
+    assert not ism.is_policy_current(desired, existing)
+    assert not ism.is_policy_current(desired, None)
+
+def test_WHEN_get_index_strs_called_THEN_batches():
+    # Run our test
+    indices = [f"arkime_sessions3-{day:06d}" for day in range(300)]
+    actual_value = ism._get_index_strs(indices)
+
+    # Check the results
+    assert all(len(index_str) <= ism.MAX_INDEX_STR_LENGTH for index_str in actual_value)
+    assert indices == ",".join(actual_value).split(",")
+    assert 1 < len(actual_value)
+    assert [] == ism._get_index_strs([])
+
+def test_WHEN_setup_sessions_ism_AND_warm_tier_THEN_migrates_after_hot_days():
+    # Set up our mock
+    mock_client = mock.Mock()
+
+    policy_resp = mock.Mock()
+    policy_resp.succeeded = False
+    mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({})
+
+    # Run our test
+    ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client, hot_days=7, warm_tier=True)
+
+    # Check the results
+    expected_create_ism_calls = [
+        mock.call(
+            policies.ISM_ID_SESSIONS,
+            policies.get_sessions_ism_policy(7, SPI_DAYS - 7, REPLICAS, 1, True),
+        )
+    ]
+    assert expected_create_ism_calls == mock_client.create_ism_policy.call_args_list
+
+def test_WHEN_get_sessions_ism_policy_called_AND_warm_tier_THEN_uses_warm_migration():
+    # Run our test
+    tiered_policy = policies.get_sessions_ism_policy(7, 23, REPLICAS, 1, True)
+    untiered_policy = policies.get_sessions_ism_policy(1, 29, REPLICAS, 1)
+
+    # Check the results
+    tiered_warm = tiered_policy["policy"]["states"][1]
+    assert ["force_merge", "warm_migration"] == [[key for key in action if key != "retry"][0] for action in tiered_warm["actions"]]
+    assert "7d" == tiered_policy["policy"]["states"][0]["transitions"][0]["conditions"]["min_index_age"]
+    assert "30d" == tiered_warm["transitions"][0]["conditions"]["min_index_age"]
+
+    untiered_warm = untiered_policy["policy"]["states"][1]
+    assert ["replica_count", "force_merge"] == [[key for key in action if key != "retry"][0] for action in untiered_warm["actions"]]
+
+def test_WHEN_get_sessions_ism_policy_called_THEN_restores_replicas_before_anything_else():
+    # Run our test
+    policy = policies.get_sessions_ism_policy(1, 29, REPLICAS, 1)
+
+    # Check the results
+    warm_actions = policy["policy"]["states"][1]["actions"]
+    assert {"number_of_replicas": REPLICAS} == warm_actions[0]["replica_count"]
+    assert not any("allocation" in action for action in warm_actions)
+
+def test_WHEN_get_sessions_ism_ages_called_THEN_as_expected():
+    # TEST 1: Daily indices keep their ages
+    assert (1, 29) == policies.get_sessions_ism_ages(30, 1, 1)
+    assert (7, 23) == policies.get_sessions_ism_ages(30, 7, 1)
+
+    # TEST 2: Sub-daily indices are complete within the day
+    assert (1, 29) == policies.get_sessions_ism_ages(30, 1, 12 / 24)
+
+    # TEST 3: Weekly indices stay hot for their week and are deleted once their newest data has aged out
+    assert (7, 29) == policies.get_sessions_ism_ages(30, 1, 7)
+
+    # TEST 4: Retention shorter than the rotation period
+    assert (7, 0) == policies.get_sessions_ism_ages(1, 1, 7)
+
+def test_WHEN_setup_sessions_ism_AND_weekly_rotation_THEN_ages_from_week():
+    # Set up our mock
+    mock_client = mock.Mock()
+
+    policy_resp = mock.Mock()
+    policy_resp.succeeded = False
+    mock_client.get_ism_policy.return_value = policy_resp
+    mock_client.explain_ism_policy.return_value = _get_explain_response({})
+
+    # Run our test
+    ism.setup_sessions_ism(SPI_DAYS, REPLICAS, mock_client, rotation="weekly")
+
+    # Check the results
+    expected_create_ism_calls = [
         mock.call(
             policies.ISM_ID_SESSIONS,
-            policies.INDEX_PATTERN_SESSIONS,
+            policies.get_sessions_ism_policy(7, SPI_DAYS - 1, REPLICAS, 1, False),
         )
     ]
-    assert expected_add_ism_calls == mock_client.add_ism_policy_to_index.call_args_list
\ No newline at end of file
+    assert expected_create_ism_calls == mock_client.create_ism_policy.call_args_list
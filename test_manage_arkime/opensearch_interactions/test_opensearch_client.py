@@ -31,7 +31,8 @@ def test_WHEN_get_ism_policy_THEN_as_expected(mock_get):
     expected_calls = [
         mock.call(
             rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/policies/{POLICY_ID}"),
-            auth=AUTH
+            auth=AUTH,
+            session=test_client.session
         )
     ]
     assert expected_calls == mock_get.call_args_list
@@ -54,7 +55,8 @@ def test_WHEN_create_ism_policy_THEN_as_expected(mock_put):
             rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/policies/{POLICY_ID}"),
             data=json.dumps(POLICY),
             headers={"Content-Type": "application/json"},
-            auth=AUTH
+            auth=AUTH,
+            session=test_client.session
         )
     ]
     assert expected_calls == mock_put.call_args_list
@@ -77,7 +79,8 @@ def test_WHEN_update_ism_policy_THEN_as_expected(mock_put):
             rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/policies/{POLICY_ID}?if_seq_no={SEQ_NO}&if_primary_term={PRIMARY_TERM}"),
             data=json.dumps(POLICY),
             headers={"Content-Type": "application/json"},
-            auth=AUTH
+            auth=AUTH,
+            session=test_client.session
         )
     ]
     assert expected_calls == mock_put.call_args_list
@@ -100,7 +103,8 @@ def test_WHEN_add_ism_policy_to_index_THEN_as_expected(mock_post):
             rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/add/{INDEX_STR}"),
             data=json.dumps({"policy_id": POLICY_ID}),
             headers={"Content-Type": "application/json"},
-            auth=AUTH
+            auth=AUTH,
+            session=test_client.session
         )
     ]
     assert expected_calls == mock_post.call_args_list
@@ -123,9 +127,234 @@ def test_WHEN_update_ism_policy_of_index_THEN_as_expected(mock_post):
             rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/change_policy/{INDEX_STR}"),
             data=json.dumps({"policy_id": POLICY_ID}),
             headers={"Content-Type": "application/json"},
-            auth=AUTH
+            auth=AUTH,
+            session=test_client.session
         )
     ]
     assert expected_calls == mock_post.call_args_list
 
 
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_get_index_template_THEN_as_expected(mock_get):
+    # Set up our mock
+    return_val = mock.Mock()
+    mock_get.return_value = return_val
+
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.get_index_template("template")
+
+    # Check the results
+    assert actual_value == return_val
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix="_template/template"),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_put")
+def test_WHEN_put_index_template_THEN_as_expected(mock_put):
+    # Set up our mock
+    return_val = mock.Mock()
+    mock_put.return_value = return_val
+    template = {"index_patterns": [INDEX_STR], "settings": {"index": {"number_of_shards": 2}}}
+
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.put_index_template("template", template)
+
+    # Check the results
+    assert actual_value == return_val
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix="_template/template"),
+            data=json.dumps(template),
+            headers={"Content-Type": "application/json"},
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_put.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_cat_indices_THEN_as_expected(mock_get):
+    # Set up our mock
+    return_val = mock.Mock()
+    mock_get.return_value = return_val
+
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.cat_indices(INDEX_STR)
+
+    # Check the results
+    assert actual_value == return_val
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(
+                prefix=ENDPOINT,
+                port=PORT,
+                suffix=f"_cat/indices/{INDEX_STR}?format=json&bytes=b&h=index,pri.store.size,docs.count"
+            ),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_cat_allocation_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.cat_allocation()
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(
+                prefix=ENDPOINT,
+                port=PORT,
+                suffix="_cat/allocation?format=json&bytes=b&h=node,shards,disk.indices,disk.used,disk.total,disk.percent"
+            ),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_get_nodes_stats_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.get_nodes_stats()
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix="_nodes/stats/jvm,thread_pool"), auth=AUTH,
+                  session=test_client.session)
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_get_cluster_settings_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.get_cluster_settings()
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(
+                prefix=ENDPOINT,
+                port=PORT,
+                suffix="_cluster/settings?include_defaults=true&flat_settings=true"
+            ),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_explain_ism_policy_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.explain_ism_policy(INDEX_STR)
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"_plugins/_ism/explain/{INDEX_STR}"),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_delete")
+def test_WHEN_delete_index_template_THEN_as_expected(mock_delete):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.delete_index_template("template")
+
+    # Check the results
+    assert actual_value == mock_delete.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix="_template/template"),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_delete.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_get_index_settings_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.get_index_settings(INDEX_STR)
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"{INDEX_STR}/_settings?flat_settings=true"),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_put")
+def test_WHEN_put_index_settings_THEN_as_expected(mock_put):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.put_index_settings(INDEX_STR, {"index.refresh_interval": None})
+
+    # Check the results
+    assert actual_value == mock_put.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix=f"{INDEX_STR}/_settings"),
+            data=json.dumps({"index.refresh_interval": None}),
+            headers={"Content-Type": "application/json"},
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_put.call_args_list
+
+@mock.patch("opensearch_interactions.opensearch_client.ops.perform_get")
+def test_WHEN_get_cluster_health_THEN_as_expected(mock_get):
+    # Run our test
+    test_client = client.OpenSearchClient(ENDPOINT, PORT, AUTH)
+    actual_value = test_client.get_cluster_health()
+
+    # Check the results
+    assert actual_value == mock_get.return_value
+
+    expected_calls = [
+        mock.call(
+            rest_path=ops.RESTPath(prefix=ENDPOINT, port=PORT, suffix="_cluster/health"),
+            auth=AUTH,
+            session=test_client.session
+        )
+    ]
+    assert expected_calls == mock_get.call_args_list
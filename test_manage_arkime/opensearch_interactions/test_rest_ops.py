@@ -1,3 +1,5 @@
+import datetime
+import gzip
 import json
 import pytest
 import unittest.mock as mock
@@ -106,4 +108,104 @@ def test_WHEN_perform_put_AND_success_THEN_as_expected(mock_requests, success_re
         "succeeded": True,
         "url": str(REST_PATH)
     }
-    assert expected_value == actual_value.to_dict()
\ No newline at end of file
+    assert expected_value == actual_value.to_dict()
+
+def test_WHEN_perform_get_AND_session_THEN_uses_session(success_response):
+    # Set up our mock
+    mock_session = mock.Mock()
+    mock_session.get.return_value = success_response
+
+    # Run our test
+    actual_value = ops.perform_get(rest_path=REST_PATH, session=mock_session)
+
+    # Check the results
+    assert actual_value.succeeded
+
+    expected_calls = [
+        mock.call(url=str(REST_PATH), auth=None, params=None)
+    ]
+    assert expected_calls == mock_session.get.call_args_list
+
+
+def test_WHEN_build_session_THEN_as_expected():
+    # Run our test
+    timings = ops.RequestTimings()
+    actual_value = ops.build_session(pool_size=4, max_retries=3, backoff_factor=1, timings=timings)
+
+    # Check the results
+    adapter = actual_value.get_adapter("https://menegroth")
+    assert isinstance(adapter, ops.GzipAdapter)
+    assert isinstance(adapter.max_retries, ops.WriteSafeRetry)
+    assert 4 == adapter._pool_maxsize
+    assert 3 == adapter.max_retries.total
+    assert 0 == adapter.max_retries.read
+    assert 1 == adapter.max_retries.backoff_factor
+    assert ops.RETRY_STATUS_CODES == adapter.max_retries.status_forcelist
+    assert adapter.max_retries.is_retry("POST", 429)
+    assert not adapter.max_retries.is_retry("GET", 404)
+    assert [timings.record] == actual_value.hooks["response"]
+
+
+def test_WHEN_write_safe_retry_THEN_writes_only_retried_when_rejected():
+    # Set up our mock
+    retry = ops.WriteSafeRetry(total=3, status_forcelist=ops.RETRY_STATUS_CODES, allowed_methods=None)
+
+    # Check the results
+    assert retry.is_retry("GET", 502)
+    assert retry.is_retry("GET", 504)
+    assert retry.is_retry("PUT", 429)
+    assert retry.is_retry("POST", 503)
+    assert not retry.is_retry("PUT", 502)
+    assert not retry.is_retry("POST", 504)
+    assert not retry.is_retry("DELETE", 502)
+    assert not retry.is_retry("POST", 409)
+    assert isinstance(retry.increment(method="GET", url="/"), ops.WriteSafeRetry)
+
+
+@mock.patch("opensearch_interactions.rest_ops.HTTPAdapter.send")
+def test_WHEN_gzip_adapter_send_THEN_compresses_large_bodies(mock_send):
+    adapter = ops.GzipAdapter()
+
+    # TEST 1: Large bodies are compressed
+    large_body = json.dumps({"key": "v" * ops.GZIP_MIN_BYTES})
+    request = mock.Mock(body=large_body, headers={})
+    adapter.send(request)
+
+    assert "gzip" == request.headers["Content-Encoding"]
+    assert str(len(request.body)) == request.headers["Content-Length"]
+    assert large_body == gzip.decompress(request.body).decode("utf-8")
+
+    # TEST 2: Small and empty bodies are left alone
+    request = mock.Mock(body="{}", headers={})
+    adapter.send(request)
+    assert "{}" == request.body
+    assert {} == request.headers
+
+    request = mock.Mock(body=None, headers={})
+    adapter.send(request)
+    assert None == request.body
+
+    assert 3 == mock_send.call_count
+
+
+def test_WHEN_request_timings_record_THEN_as_expected():
+    # Set up our test
+    def _get_response(method: str, path: str, seconds: float):
+        response = mock.Mock()
+        response.request.method = method
+        response.url = f"https://menegroth:443/{path}?pretty"
+        response.elapsed = datetime.timedelta(seconds=seconds)
+        return response
+
+    # Run our test
+    timings = ops.RequestTimings()
+    timings.record(_get_response("GET", "_cat/indices", 1))
+    timings.record(_get_response("GET", "_cat/indices", 3))
+    timings.record(_get_response("PUT", "_template/sessions", 0.5))
+
+    # Check the results
+    expected_value = {
+        "GET /_cat/indices": {"count": 2, "mean": 2, "max": 3},
+        "PUT /_template/sessions": {"count": 1, "mean": 0.5, "max": 0.5},
+    }
+    assert expected_value == timings.get_summary()
@@ -0,0 +1,225 @@
+import pytest
+import unittest.mock as mock
+
+import opensearch_interactions.index_templates as templates
+import opensearch_interactions.rest_ops as ops
+import opensearch_interactions.template_interactions as template_interactions
+
+
+def test_WHEN_get_sessions_shards_template_called_THEN_as_expected():
+    # Run our test
+    actual_value = templates.get_sessions_shards_template(6)
+
+    # Check the results
+    expected_value = {
+        "index_patterns": ["arkime_sessions3-*"],
+        "order": templates.TEMPLATE_ORDER_SESSIONS_SHARDS,
+        "settings": {"index": {"number_of_shards": 6}}
+    }
+    assert expected_value == actual_value
+
+def test_WHEN_setup_sessions_shards_template_AND_doesnt_exist_THEN_puts_it():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(succeeded=False)
+    mock_client.put_index_template.return_value = mock.Mock(succeeded=True)
+
+    # Run our test
+    template_interactions.setup_sessions_shards_template(6, mock_client)
+
+    # Check the results
+    expected_put_calls = [
+        mock.call(templates.TEMPLATE_ID_SESSIONS_SHARDS, templates.get_sessions_shards_template(6))
+    ]
+    assert expected_put_calls == mock_client.put_index_template.call_args_list
+
+def test_WHEN_setup_sessions_shards_template_AND_plan_changed_THEN_puts_it():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(
+        succeeded=True,
+        response_json={templates.TEMPLATE_ID_SESSIONS_SHARDS: {"settings": {"index": {"number_of_shards": "4"}}}}
+    )
+    mock_client.put_index_template.return_value = mock.Mock(succeeded=True)
+
+    # Run our test
+    template_interactions.setup_sessions_shards_template(6, mock_client)
+
+    # Check the results
+    expected_put_calls = [
+        mock.call(templates.TEMPLATE_ID_SESSIONS_SHARDS, templates.get_sessions_shards_template(6))
+    ]
+    assert expected_put_calls == mock_client.put_index_template.call_args_list
+
+def test_WHEN_setup_sessions_shards_template_AND_unchanged_THEN_skips():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(
+        succeeded=True,
+        response_json={templates.TEMPLATE_ID_SESSIONS_SHARDS: {"settings": {"index": {"number_of_shards": "6"}}}}
+    )
+
+    # Run our test
+    template_interactions.setup_sessions_shards_template(6, mock_client)
+
+    # Check the results
+    assert not mock_client.put_index_template.called
+
+def test_WHEN_setup_sessions_shards_template_AND_put_fails_THEN_raises():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(succeeded=False)
+    mock_client.put_index_template.return_value = mock.Mock(succeeded=False, url="url", status_code=400,
+                                                            response_text="bad")
+
+    # Run our test
+    with pytest.raises(ops.RESTOperationFailedException):
+        template_interactions.setup_sessions_shards_template(6, mock_client)
+
+def test_WHEN_get_sessions_ingest_template_called_THEN_as_expected():
+    # TEST 1: Hot indices skip their replicas until ISM adds them
+    actual_value = templates.get_sessions_ingest_template(False)
+
+    expected_value = {
+        "index_patterns": ["arkime_sessions3-*"],
+        "order": templates.TEMPLATE_ORDER_SESSIONS_INGEST,
+        "settings": {
+            "index.refresh_interval": "60s",
+            "index.translog.durability": "async",
+            "index.translog.sync_interval": "30s",
+            "index.translog.flush_threshold_size": "1gb",
+            "index.number_of_replicas": "0",
+        }
+    }
+    assert expected_value == actual_value
+
+    # TEST 2: Indices bound for UltraWarm keep their replicas
+    actual_value = templates.get_sessions_ingest_template(True)
+    assert "index.number_of_replicas" not in actual_value["settings"]
+
+    # TEST 3: Indices rotated more often than daily are still only hot for a day
+    actual_value = templates.get_sessions_ingest_template(False, "hourly6")
+    assert "0" == actual_value["settings"]["index.number_of_replicas"]
+
+    # TEST 4: Weekly indices stay hot for a week, so they keep their replicas
+    actual_value = templates.get_sessions_ingest_template(False, "weekly")
+    assert "index.number_of_replicas" not in actual_value["settings"]
+
+def _get_explain_response(index_states: dict) -> mock.Mock:
+    return mock.Mock(
+        succeeded=True,
+        response_json={
+            **{index: {"policy_id": "arkime_sessions", "state": {"name": state}} for index, state in index_states.items()},
+            "total_managed_indices": len(index_states),
+        }
+    )
+
+def test_WHEN_setup_sessions_index_profile_AND_ingest_THEN_applies_it():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(succeeded=False)
+    mock_client.put_index_template.return_value = mock.Mock(succeeded=True)
+    mock_client.explain_ism_policy.return_value = _get_explain_response({
+        "arkime_sessions3-230507": "warm",
+        "arkime_sessions3-230508": "hot",
+    })
+    mock_client.get_index_settings.return_value = mock.Mock(
+        succeeded=True,
+        response_json={"arkime_sessions3-230508": {"settings": {"index.refresh_interval": "60s", "index.number_of_shards": "6"}}}
+    )
+    mock_client.put_index_settings.return_value = mock.Mock(succeeded=True)
+
+    # Run our test
+    template_interactions.setup_sessions_index_profile(templates.INDEX_PROFILE_INGEST, False, mock_client)
+
+    # Check the results
+    expected_put_template_calls = [
+        mock.call(templates.TEMPLATE_ID_SESSIONS_INGEST, templates.get_sessions_ingest_template(False))
+    ]
+    assert expected_put_template_calls == mock_client.put_index_template.call_args_list
+
+    expected_get_settings_calls = [
+        mock.call("arkime_sessions3-230508")
+    ]
+    assert expected_get_settings_calls == mock_client.get_index_settings.call_args_list
+
+    expected_put_settings_calls = [
+        mock.call(
+            "arkime_sessions3-230508",
+            {
+                "index.translog.durability": "async",
+                "index.translog.sync_interval": "30s",
+                "index.translog.flush_threshold_size": "1gb",
+            }
+        )
+    ]
+    assert expected_put_settings_calls == mock_client.put_index_settings.call_args_list
+
+def test_WHEN_setup_sessions_index_profile_AND_ingest_unchanged_THEN_skips():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(
+        succeeded=True,
+        response_json={
+            templates.TEMPLATE_ID_SESSIONS_INGEST: {
+                "settings": {
+                    "index": {
+                        "refresh_interval": "60s",
+                        "translog": {"durability": "async", "sync_interval": "30s", "flush_threshold_size": "1gb"},
+                    }
+                }
+            }
+        }
+    )
+    mock_client.explain_ism_policy.return_value = _get_explain_response({"arkime_sessions3-230508": "hot"})
+    mock_client.get_index_settings.return_value = mock.Mock(
+        succeeded=True,
+        response_json={"arkime_sessions3-230508": {"settings": templates.get_sessions_ingest_settings(True)}}
+    )
+
+    # Run our test
+    template_interactions.setup_sessions_index_profile(templates.INDEX_PROFILE_INGEST, True, mock_client)
+
+    # Check the results
+    assert not mock_client.put_index_template.called
+    assert not mock_client.put_index_settings.called
+
+def test_WHEN_setup_sessions_index_profile_AND_default_THEN_reverts_it():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(succeeded=True)
+    mock_client.delete_index_template.return_value = mock.Mock(succeeded=True)
+    mock_client.explain_ism_policy.return_value = _get_explain_response({"arkime_sessions3-230508": "hot"})
+    mock_client.get_index_settings.return_value = mock.Mock(
+        succeeded=True,
+        response_json={"arkime_sessions3-230508": {"settings": {"index.refresh_interval": "60s"}}}
+    )
+    mock_client.put_index_settings.return_value = mock.Mock(succeeded=True)
+
+    # Run our test
+    template_interactions.setup_sessions_index_profile(templates.INDEX_PROFILE_DEFAULT, False, mock_client)
+
+    # Check the results
+    expected_delete_template_calls = [
+        mock.call(templates.TEMPLATE_ID_SESSIONS_INGEST)
+    ]
+    assert expected_delete_template_calls == mock_client.delete_index_template.call_args_list
+
+    expected_put_settings_calls = [
+        mock.call("arkime_sessions3-230508", {"index.refresh_interval": None})
+    ]
+    assert expected_put_settings_calls == mock_client.put_index_settings.call_args_list
+
+def test_WHEN_setup_sessions_index_profile_AND_put_settings_fails_THEN_raises():
+    # Set up our mock
+    mock_client = mock.Mock()
+    mock_client.get_index_template.return_value = mock.Mock(succeeded=False)
+    mock_client.put_index_template.return_value = mock.Mock(succeeded=True)
+    mock_client.explain_ism_policy.return_value = _get_explain_response({"arkime_sessions3-230508": "hot"})
+    mock_client.get_index_settings.return_value = mock.Mock(succeeded=True, response_json={})
+    mock_client.put_index_settings.return_value = mock.Mock(succeeded=False, url="url", status_code=400,
+                                                            response_text="bad")
+
+    # Run our test
+    with pytest.raises(ops.RESTOperationFailedException):
+        template_interactions.setup_sessions_index_profile(templates.INDEX_PROFILE_INGEST, False, mock_client)